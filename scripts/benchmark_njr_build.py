@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for prompt-pack NJR building.
+
+Builds a throwaway matrix prompt pack in a temp directory and reports the
+per-NJR build time and allocation volume of
+PromptPackNormalizedJobBuilder.build_jobs(). The defaults are 4 prompts x 48
+matrix combinations.
+
+Usage:
+    python scripts/benchmark_njr_build.py [--prompts N] [--combinations N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.pipeline.job_builder_v2 import JobBuilderV2  # noqa: E402
+from src.pipeline.prompt_pack_job_builder import PromptPackNormalizedJobBuilder  # noqa: E402
+from src.contracts import PackJobEntry  # noqa: E402
+from src.utils.config import ConfigManager  # noqa: E402
+
+PACK_NAME = "bench_matrix_pack"
+
+
+def _write_pack(packs_dir: Path, prompts: int, combinations: int) -> None:
+    jobs = [f"job{i}" for i in range(combinations)]
+    lines = [f"portrait {index} of a [[job]], detailed, 8k" for index in range(prompts)]
+    (packs_dir / f"{PACK_NAME}.txt").write_text("\n\n".join(lines), encoding="utf-8")
+    pack_json = {
+        "pack_data": {
+            "matrix": {
+                "enabled": True,
+                "mode": "sequential",
+                "limit": combinations,
+                "slots": [{"name": "job", "values": jobs}],
+            }
+        },
+        "preset_data": {
+            "txt2img": {"model": "sdxl_base.safetensors", "steps": 30, "cfg_scale": 6.5},
+            "pipeline": {"adetailer_enabled": True, "upscale_enabled": True},
+        },
+    }
+    (packs_dir / f"{PACK_NAME}.json").write_text(json.dumps(pack_json), encoding="utf-8")
+
+
+def _entries(prompts: int) -> list[PackJobEntry]:
+    return [
+        PackJobEntry(
+            pack_id=f"{PACK_NAME}.txt",
+            pack_name=PACK_NAME,
+            pack_row_index=index,
+            config_snapshot={"randomization": {"enabled": False}},
+            stage_flags={"txt2img": True, "adetailer": True, "upscale": True},
+            randomizer_metadata={"enabled": False, "max_variants": 1},
+        )
+        for index in range(prompts)
+    ]
+
+
+def run(prompts: int, combinations: int, repeat: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        packs_dir = work / "packs"
+        packs_dir.mkdir()
+        _write_pack(packs_dir, prompts, combinations)
+        previous_cwd = os.getcwd()
+        os.chdir(work)
+        try:
+            builder = PromptPackNormalizedJobBuilder(
+                config_manager=ConfigManager(presets_dir=work / "presets"),
+                job_builder=JobBuilderV2(),
+                packs_dir=packs_dir,
+            )
+            entries = _entries(prompts)
+            builder.build_jobs(entries)  # warm the pack/config caches
+
+            elapsed = 0.0
+            records = 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                records += len(builder.build_jobs(entries))
+                elapsed += time.perf_counter() - started
+
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            built = builder.build_jobs(entries)
+            after = tracemalloc.take_snapshot()
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        finally:
+            os.chdir(previous_cwd)
+    per_njr = max(1, len(built))
+    return {
+        "njrs": float(len(built)),
+        "ms_per_njr": elapsed * 1000.0 / max(1, records),
+        "peak_kib_per_njr": peak / 1024.0 / per_njr,
+        "retained_kib_per_njr": retained / 1024.0 / per_njr,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--prompts", type=int, default=4)
+    parser.add_argument("--combinations", type=int, default=48)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    result = run(args.prompts, args.combinations, args.repeat)
+    print(f"NJRs built:           {int(result['njrs'])}")
+    print(f"build time per NJR:   {result['ms_per_njr']:.3f} ms")
+    print(f"peak alloc per NJR:   {result['peak_kib_per_njr']:.1f} KiB")
+    print(f"retained per NJR:     {result['retained_kib_per_njr']:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
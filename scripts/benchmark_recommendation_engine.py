@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Benchmark for RecommendationEngine on a synthetic learning_records.jsonl.
+
+Writes N synthetic rated records (default 100k) to a temporary file and times
+recommend() through the record-dict path and the columnar path, first cold
+and then after a single rating is appended (the review-UI case). Both paths
+must return identical recommendations.
+
+Usage:
+    python scripts/benchmark_recommendation_engine.py [--records N] [--queries N] [--seed N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.learning.recommendation_engine import RecommendationEngine  # noqa: E402
+
+PROMPTS = (
+    "a fantasy knight, castle, dramatic lighting",
+    "portrait of a woman, studio light",
+    "dragon over a castle, fire",
+    "city street at night, rain",
+)
+
+
+def _synthetic_record(rng: random.Random) -> dict:
+    experiment = rng.random() < 0.6
+    metadata = {
+        "record_kind": "learning_experiment_rating" if experiment else "review_tab_feedback",
+        "user_rating": rng.randint(1, 5),
+        "stage": rng.choice(("txt2img", "txt2img", "img2img")),
+        "variable_under_test": "CFG Scale" if experiment else "",
+        "variant_value": rng.choice((5.0, 6.5, 7.0, 8.0)) if experiment else None,
+    }
+    if rng.random() < 0.3:
+        metadata["subscores"] = {"anatomy": rng.randint(1, 5), "composition": rng.randint(1, 5)}
+        metadata["rating_context"] = {"has_people": rng.random() < 0.5}
+    return {
+        "timestamp": "2026-01-01T12:00:00",
+        "base_config": {"prompt": rng.choice(PROMPTS), "width": 832, "height": 1216},
+        "primary_model": rng.choice(("sdxl_base", "juggernaut")),
+        "primary_sampler": rng.choice(("Euler a", "DPM++ 2M", "DPM++ SDE")),
+        "primary_scheduler": rng.choice(("Karras", "Normal")),
+        "primary_steps": rng.choice((20, 25, 30, 40)),
+        "primary_cfg_scale": rng.choice((5.0, 6.5, 7.0, 8.0)),
+        "metadata": metadata,
+    }
+
+
+def _summary(rec_set) -> list:
+    return [(r.parameter_name, r.recommended_value, r.confidence_score, r.sample_count) for r in rec_set.recommendations]
+
+
+def _time_queries(engine: RecommendationEngine, queries: int) -> tuple[float, list]:
+    start = time.perf_counter()
+    result: list = []
+    for index in range(queries):
+        result = _summary(engine.recommend(PROMPTS[index % len(PROMPTS)], "txt2img"))
+    return (time.perf_counter() - start) / queries, result
+
+
+def run(records: int, queries: int, seed: int) -> dict[str, float]:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "learning_records.jsonl"
+        with path.open("w", encoding="utf-8") as handle:
+            for _ in range(records):
+                handle.write(json.dumps(_synthetic_record(rng)) + "\n")
+
+        dict_engine = RecommendationEngine(path, columnar=False)
+        columnar_engine = RecommendationEngine(path, columnar=True)
+        stats: dict[str, float] = {}
+        start = time.perf_counter()
+        dict_result = _summary(dict_engine.recommend(PROMPTS[0], "txt2img"))
+        stats["dict_cold_seconds"] = time.perf_counter() - start
+        start = time.perf_counter()
+        columnar_result = _summary(columnar_engine.recommend(PROMPTS[0], "txt2img"))
+        stats["columnar_cold_seconds"] = time.perf_counter() - start
+        if dict_result != columnar_result:
+            raise SystemExit("columnar recommendations differ from the record-dict path")
+
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(_synthetic_record(rng)) + "\n")
+        stats["dict_after_append_seconds"], dict_result = _time_queries(dict_engine, 1)
+        stats["columnar_after_append_seconds"], columnar_result = _time_queries(columnar_engine, 1)
+        if dict_result != columnar_result:
+            raise SystemExit("columnar recommendations differ after append")
+
+        stats["dict_warm_query_seconds"], _ = _time_queries(dict_engine, queries)
+        stats["columnar_warm_query_seconds"], _ = _time_queries(columnar_engine, queries)
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    stats = run(args.records, args.queries, args.seed)
+    print(f"records: {args.records}, warm queries averaged over {args.queries}")
+    for label, key in (
+        ("cold load + query", "cold"),
+        ("query after 1 append", "after_append"),
+        ("warm query", "warm_query"),
+    ):
+        dict_seconds = stats[f"dict_{key}_seconds"]
+        columnar_seconds = stats[f"columnar_{key}_seconds"]
+        speedup = dict_seconds / columnar_seconds if columnar_seconds else float("inf")
+        print(
+            f"{label:<22}: dict {dict_seconds * 1000:9.1f} ms | "
+            f"columnar {columnar_seconds * 1000:9.1f} ms | {speedup:6.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -214,6 +214,9 @@ class SDWebUIClient:
         self._resource_endpoint_cooldowns: dict[str, float] = {}
         self._startup_probe_grace_until = 0.0
         self._startup_probe_grace_logged: set[str] = set()
+        # Set by MultiNodeJobRunner: per-worker record of the loaded checkpoint/VAE
+        # that Pipeline keeps current on every switch.
+        self.resident_model_tracker: Any | None = None
 
     def _build_http_session(self) -> requests.Session:
         session = requests.Session()
@@ -0,0 +1,368 @@
+"""Shared WebUI progress sources.
+
+Stages used to start their own thread that polled ``/sdapi/v1/progress`` at a
+fixed interval. A ``ProgressSource`` instead fans progress samples out to any
+number of listeners, so every stage running against one WebUI shares a single
+stream:
+
+- ``AdaptiveProgressPoller`` polls ``/progress`` on one thread per WebUI while
+  anyone is subscribed. It backs off while progress is steady or flat and
+  tightens when the generation is near completion.
+- ``PushProgressSource`` is fed by whoever owns a push channel (``publish``)
+  and re-delivers its latest sample on a heartbeat so listeners can still time
+  out stalls when pushes stop.
+
+Background threads are spawned through the thread registry (non-daemon) and
+joined when the last listener unsubscribes, on ``shutdown()``, or when the
+registry requests shutdown.
+
+Listeners receive a ``ProgressInfo`` per sample, or ``None`` when the WebUI
+reports idle.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+from src.api.client import ProgressInfo
+from src.utils.thread_registry import get_thread_registry
+
+logger = logging.getLogger(__name__)
+
+ProgressListener = Callable[[ProgressInfo | None], None]
+
+DEFAULT_POLL_INTERVAL_SEC = 0.5
+MIN_POLL_INTERVAL_SEC = 0.1
+# Stall thresholds are tens of seconds, so a flat or steady generation only
+# needs to be sampled every couple of seconds.
+MAX_POLL_INTERVAL_SEC = 2.0
+POLL_BACKOFF_FACTOR = 1.5
+NEAR_COMPLETION_PROGRESS = 0.9
+PUSH_HEARTBEAT_INTERVAL_SEC = 1.0
+# Bounds how long the last unsubscriber waits for the thread to exit; an
+# in-flight ``/progress`` request is not interrupted.
+WORKER_JOIN_TIMEOUT_SEC = 2.0
+
+
+def next_poll_interval(
+    previous: ProgressInfo | None,
+    current: ProgressInfo | None,
+    interval: float,
+    *,
+    nominal: float = DEFAULT_POLL_INTERVAL_SEC,
+    min_interval: float = MIN_POLL_INTERVAL_SEC,
+    max_interval: float = MAX_POLL_INTERVAL_SEC,
+    backoff: float = POLL_BACKOFF_FACTOR,
+) -> float:
+    """Return how long to wait before the next ``/progress`` request.
+
+    Idle WebUIs are polled at ``nominal`` so a starting generation is noticed
+    quickly. Steady or flat progress grows the interval by ``backoff`` up to
+    ``max_interval`` (but never past a quarter of the reported ETA). Near
+    completion the interval drops to half the remaining ETA, floored at
+    ``min_interval``, so the final update lands close to the finish.
+    """
+    nominal = max(min_interval, min(nominal, max_interval))
+    if current is None:
+        return nominal
+    progress = max(0.0, min(1.0, float(current.progress or 0.0)))
+    eta = float(current.eta_relative) if current.eta_relative and current.eta_relative > 0 else None
+    if progress >= NEAR_COMPLETION_PROGRESS or (eta is not None and eta <= 2.0 * interval):
+        target = eta / 2.0 if eta is not None else min_interval
+        return max(min_interval, min(nominal, target))
+    if previous is None:
+        return nominal
+    grown = min(max_interval, max(interval, min_interval) * backoff)
+    if eta is not None:
+        grown = min(grown, max(min_interval, eta / 4.0))
+    return max(min_interval, grown)
+
+
+class ProgressSubscription:
+    """Handle returned by ``ProgressSource.subscribe``; ``close`` is idempotent."""
+
+    def __init__(self, source: ProgressSource, token: int) -> None:
+        self._source = source
+        self._token = token
+        self._closed = False
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._source._unsubscribe(self._token)
+
+    def __enter__(self) -> ProgressSubscription:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+class ProgressSource:
+    """Fan-out of progress samples to subscribed listeners."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listeners: dict[int, tuple[ProgressListener, float | None]] = {}
+        self._next_token = 0
+        self._samples_delivered = 0
+        self._wake = threading.Event()
+        # ``_thread`` is the running worker; a worker that has decided to exit
+        # moves itself to ``_exiting_thread`` so it can still be joined.
+        self._thread: threading.Thread | None = None
+        self._exiting_thread: threading.Thread | None = None
+        self._shut_down = False
+
+    def subscribe(
+        self,
+        listener: ProgressListener,
+        *,
+        interval: float | None = None,
+    ) -> ProgressSubscription:
+        """Register ``listener``; ``interval`` is the sampling rate it would like."""
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._listeners[token] = (listener, interval)
+            first = len(self._listeners) == 1
+        self._on_subscribed(first)
+        return ProgressSubscription(self, token)
+
+    def _unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._listeners.pop(token, None)
+            last = not self._listeners
+        self._on_unsubscribed(last)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._listeners)
+
+    def _requested_interval(self, default: float) -> float:
+        with self._lock:
+            requested = [interval for _, interval in self._listeners.values() if interval]
+        return min(requested) if requested else default
+
+    def _deliver(self, info: ProgressInfo | None) -> None:
+        with self._lock:
+            listeners = [listener for listener, _ in self._listeners.values()]
+            self._samples_delivered += 1
+        for listener in listeners:
+            try:
+                listener(info)
+            except Exception:
+                logger.debug("Progress listener failed", exc_info=True)
+
+    def _on_subscribed(self, first: bool) -> None:
+        pass
+
+    def _on_unsubscribed(self, last: bool) -> None:
+        if last:
+            self._stop_worker(WORKER_JOIN_TIMEOUT_SEC)
+
+    def _ensure_worker(self, target: Callable[[], None], *, name: str, purpose: str) -> None:
+        with self._lock:
+            if self._thread is None and not self._shut_down:
+                self._thread = get_thread_registry().spawn(
+                    target=target,
+                    name=name,
+                    daemon=False,
+                    purpose=purpose,
+                )
+
+    def _worker_should_exit(self) -> bool:
+        """Called by the worker with ``_lock`` held; retires it when nobody listens."""
+        if self._listeners and not self._shut_down and not get_thread_registry().is_shutdown_requested():
+            return False
+        self._exiting_thread, self._thread = self._thread, None
+        return True
+
+    def _stop_worker(self, timeout: float) -> None:
+        self._wake.set()
+        with self._lock:
+            thread = self._thread or self._exiting_thread
+        if thread is None or thread is threading.current_thread():
+            return
+        deadline = time.monotonic() + timeout
+        while thread.is_alive() and time.monotonic() < deadline:
+            with self._lock:
+                if self._listeners and not self._shut_down:
+                    return  # Re-subscribed meanwhile; the worker keeps running.
+            thread.join(0.05)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the background thread for good and wait for it to exit."""
+        with self._lock:
+            self._shut_down = True
+        self._stop_worker(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._listeners),
+                "samples_delivered": self._samples_delivered,
+            }
+
+
+class AdaptiveProgressPoller(ProgressSource):
+    """Polls ``fetch`` on one background thread while anyone is subscribed."""
+
+    def __init__(
+        self,
+        fetch: Callable[[], ProgressInfo | None],
+        *,
+        name: str = "webui",
+        min_interval: float = MIN_POLL_INTERVAL_SEC,
+        max_interval: float = MAX_POLL_INTERVAL_SEC,
+    ) -> None:
+        super().__init__()
+        self._fetch = fetch
+        self._name = name
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._requests = 0
+        self._interval = DEFAULT_POLL_INTERVAL_SEC
+
+    def _on_subscribed(self, first: bool) -> None:
+        self._ensure_worker(
+            self._run,
+            name=f"progress_poll[{self._name}]",
+            purpose="Poll WebUI /progress for subscribed stages",
+        )
+        # A new stage wants a sample now rather than after a backed-off wait.
+        self._wake.set()
+
+    def _run(self) -> None:
+        previous: ProgressInfo | None = None
+        interval = DEFAULT_POLL_INTERVAL_SEC
+        while True:
+            self._wake.clear()
+            with self._lock:
+                if self._worker_should_exit():
+                    return
+            nominal = self._requested_interval(DEFAULT_POLL_INTERVAL_SEC)
+            try:
+                info = self._fetch()
+            except Exception:
+                logger.debug("Progress poll for %s failed", self._name, exc_info=True)
+                info = None
+            with self._lock:
+                self._requests += 1
+            self._deliver(info)
+            interval = next_poll_interval(
+                previous,
+                info,
+                interval,
+                nominal=nominal,
+                min_interval=self._min_interval,
+                max_interval=self._max_interval,
+            )
+            previous = info
+            with self._lock:
+                self._interval = interval
+            self._wake.wait(interval)
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats.update(
+                {
+                    "requests": self._requests,
+                    "interval_seconds": self._interval,
+                    "running": self._thread is not None,
+                }
+            )
+        return stats
+
+
+class PushProgressSource(ProgressSource):
+    """Progress source fed by ``publish`` from a push channel."""
+
+    def __init__(self, *, heartbeat_interval: float = PUSH_HEARTBEAT_INTERVAL_SEC) -> None:
+        super().__init__()
+        self._heartbeat_interval = heartbeat_interval
+        self._latest: ProgressInfo | None = None
+        self._last_publish = time.monotonic()
+
+    def publish(self, info: ProgressInfo | None) -> None:
+        """Deliver a pushed sample (``None`` for idle) to every listener."""
+        with self._lock:
+            self._latest = info
+            self._last_publish = time.monotonic()
+        self._deliver(info)
+
+    def _on_subscribed(self, first: bool) -> None:
+        self._ensure_worker(
+            self._heartbeat,
+            name="progress_push_heartbeat",
+            purpose="Re-deliver the latest pushed progress sample",
+        )
+
+    def _heartbeat(self) -> None:
+        while True:
+            with self._lock:
+                if self._worker_should_exit():
+                    return
+                quiet = time.monotonic() - self._last_publish
+                latest = self._latest
+            if quiet >= self._heartbeat_interval:
+                self._deliver(latest)
+                wait = self._heartbeat_interval
+            else:
+                wait = self._heartbeat_interval - quiet
+            self._wake.wait(wait)
+            self._wake.clear()
+
+
+_SHARED_POLLERS: weakref.WeakKeyDictionary[Any, AdaptiveProgressPoller] = weakref.WeakKeyDictionary()
+_SHARED_POLLERS_LOCK = threading.Lock()
+
+
+def _client_fetch(client: Any) -> Callable[[], ProgressInfo | None]:
+    client_ref = weakref.ref(client)
+
+    def _fetch() -> ProgressInfo | None:
+        target = client_ref()
+        if target is None:
+            return None
+        return target.get_progress(skip_current_image=True)
+
+    return _fetch
+
+
+def shared_progress_poller(client: Any) -> AdaptiveProgressPoller:
+    """Return the one ``AdaptiveProgressPoller`` for ``client`` (one per WebUI).
+
+    Clients that cannot be weakly referenced get a private poller.
+    """
+    base_url = getattr(client, "base_url", None)
+    name = base_url if isinstance(base_url, str) and base_url else "webui"
+    with _SHARED_POLLERS_LOCK:
+        try:
+            poller = _SHARED_POLLERS.get(client)
+        except TypeError:
+            return AdaptiveProgressPoller(
+                lambda: client.get_progress(skip_current_image=True), name=name
+            )
+        if poller is None:
+            poller = AdaptiveProgressPoller(_client_fetch(client), name=name)
+            _SHARED_POLLERS[client] = poller
+        return poller
+
+
+__all__ = [
+    "AdaptiveProgressPoller",
+    "ProgressListener",
+    "ProgressSource",
+    "ProgressSubscription",
+    "PushProgressSource",
+    "next_poll_interval",
+    "shared_progress_poller",
+]
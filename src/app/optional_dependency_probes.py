@@ -4,6 +4,7 @@ from dataclasses import asdict, dataclass, field
 from typing import Any
 
 from src.video.comfy_dependency_probe import ComfyDependencyProbe
+from src.video.comfy_object_info_cache import get_comfy_object_info_cache
 from src.video.svd_capabilities import get_svd_postprocess_capabilities
 from src.video.workflow_registry import build_default_workflow_registry
 
@@ -61,10 +62,13 @@ def build_optional_dependency_snapshot(
             )
             continue
         try:
-            result = ComfyDependencyProbe(client=comfy_client).probe_workflow(
-                spec,
-                object_info=comfy_object_info,
-            )
+            if comfy_object_info is None:
+                result, _ = get_comfy_object_info_cache().probe_workflow(comfy_client, spec)
+            else:
+                result = ComfyDependencyProbe(client=comfy_client).probe_workflow(
+                    spec,
+                    object_info=comfy_object_info,
+                )
             capabilities[capability_id] = OptionalDependencyCapability(
                 capability_id=capability_id,
                 available=result.ready,
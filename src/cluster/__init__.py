@@ -4,6 +4,7 @@
 """Cluster primitives (worker descriptors, registry)."""
 
 __all__ = [
+    "resident_models",
     "worker_model",
     "worker_registry",
 ]
@@ -0,0 +1,115 @@
+# Subsystem: Cluster
+# Role: Records which checkpoint and VAE each WebUI worker currently has loaded.
+
+"""Per-worker resident model cache.
+
+The cache is refreshed from ``get_current_model``/``get_current_vae`` when a
+worker comes online and kept current by the worker's ``Pipeline``, which finds
+its ``ResidentModelTracker`` on the client (``client.resident_model_tracker``)
+and reports every checkpoint/VAE switch. Schedulers read it to place jobs on a
+worker that already has their model loaded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.cluster.worker_model import WorkerId
+
+
+@dataclass
+class ResidentModel:
+    model: str | None = None
+    vae: str | None = None
+    refreshed_at: float | None = None
+    model_switches: int = 0
+    vae_switches: int = 0
+    model_hits: int = 0
+
+
+class ResidentModelCache:
+    """Thread-safe worker id -> ``ResidentModel`` map."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[WorkerId, ResidentModel] = {}
+
+    def _entry(self, worker_id: WorkerId) -> ResidentModel:
+        return self._entries.setdefault(worker_id, ResidentModel())
+
+    def get(self, worker_id: WorkerId) -> ResidentModel | None:
+        with self._lock:
+            entry = self._entries.get(worker_id)
+            return ResidentModel(**asdict(entry)) if entry is not None else None
+
+    def refresh(self, worker_id: WorkerId, client: Any) -> ResidentModel | None:
+        """Re-read the loaded checkpoint/VAE from the worker's WebUI."""
+        try:
+            model = client.get_current_model()
+            vae = client.get_current_vae() if hasattr(client, "get_current_vae") else None
+        except Exception:
+            self.invalidate(worker_id)
+            return None
+        with self._lock:
+            entry = self._entry(worker_id)
+            entry.model = model or None
+            entry.vae = vae or None
+            entry.refreshed_at = time.monotonic()
+        return self.get(worker_id)
+
+    def record_model(self, worker_id: WorkerId, model: str | None, *, switched: bool) -> None:
+        with self._lock:
+            entry = self._entry(worker_id)
+            entry.model = model or None
+            if switched:
+                entry.model_switches += 1
+            else:
+                entry.model_hits += 1
+
+    def record_vae(self, worker_id: WorkerId, vae: str | None) -> None:
+        with self._lock:
+            entry = self._entry(worker_id)
+            entry.vae = vae or None
+            entry.vae_switches += 1
+
+    def invalidate(self, worker_id: WorkerId) -> None:
+        """Forget what is loaded (worker lost or a switch failed); counters are kept."""
+        with self._lock:
+            entry = self._entry(worker_id)
+            entry.model = None
+            entry.vae = None
+            entry.refreshed_at = None
+
+    def tracker(self, worker_id: WorkerId) -> ResidentModelTracker:
+        return ResidentModelTracker(self, worker_id)
+
+    def snapshot(self) -> dict[WorkerId, dict[str, Any]]:
+        with self._lock:
+            return {worker_id: asdict(entry) for worker_id, entry in self._entries.items()}
+
+
+class ResidentModelTracker:
+    """One worker's view of the cache, handed to that worker's Pipeline."""
+
+    def __init__(self, cache: ResidentModelCache, worker_id: WorkerId) -> None:
+        self.cache = cache
+        self.worker_id = worker_id
+
+    def current_model(self) -> str | None:
+        entry = self.cache.get(self.worker_id)
+        return entry.model if entry is not None else None
+
+    def model_loaded(self, model: str | None, *, switched: bool) -> None:
+        self.cache.record_model(self.worker_id, model, switched=switched)
+
+    def vae_loaded(self, vae: str | None) -> None:
+        self.cache.record_vae(self.worker_id, vae)
+
+    def invalidate(self) -> None:
+        self.cache.invalidate(self.worker_id)
+
+
+__all__ = ["ResidentModel", "ResidentModelCache", "ResidentModelTracker"]
@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import threading
+from datetime import datetime
 
 from src.cluster.worker_model import WorkerDescriptor, WorkerId, WorkerStatus, default_local_worker
 
@@ -29,6 +30,12 @@ class WorkerRegistry:
             if worker:
                 worker.status = status
 
+    def record_heartbeat(self, worker_id: WorkerId, when: datetime | None = None) -> None:
+        with self._lock:
+            worker = self._workers.get(worker_id)
+            if worker:
+                worker.last_heartbeat = when or datetime.utcnow()
+
     def get_worker(self, worker_id: WorkerId) -> WorkerDescriptor | None:
         with self._lock:
             return self._workers.get(worker_id)
@@ -11,6 +11,10 @@ from src.utils.watchdog_v2 import WatchdogConfig
 
 _learning_enabled: bool | None = None
 _job_history_path: str | None = None
+_job_history_backend: str | None = None
+_config_blob_store_enabled: bool | None = None
+_image_upload_cache_max_mb: int | None = None
+_artifact_writer_workers: int | None = None
 _queue_execution_enabled: bool | None = None
 _core_model_name: str | None = None
 _core_sampler_name: str | None = None
@@ -59,6 +63,9 @@ _WEBUI_LAUNCH_PROFILES: dict[str, list[str]] = {
 _watchdog_config: WatchdogConfig | None = None
 _process_container_config: ProcessContainerConfig | None = None
 _jsonl_log_config: JsonlFileLogConfig | None = None
+_queue_scheduling_config: QueueSchedulingConfig | None = None
+_learning_record_commit_config: LearningRecordCommitConfig | None = None
+_discovered_grouping_config: DiscoveredGroupingConfig | None = None
 
 
 def _bool_env_flag(name: str, default: bool) -> bool:
@@ -167,6 +174,107 @@ def set_jsonl_log_config(config: JsonlFileLogConfig) -> None:
     _jsonl_log_config = config
 
 
+@dataclass(frozen=True)
+class QueueSchedulingConfig:
+    """Model-affinity queue ordering (opt-in) and its starvation bounds.
+
+    The switch costs feed multi-worker placement (seconds a checkpoint / VAE
+    load is expected to take on a WebUI worker).
+    """
+
+    model_affinity_enabled: bool = False
+    max_bypass_count: int = 8
+    max_wait_seconds: float | None = 600.0
+    model_switch_cost_seconds: float = 20.0
+    vae_switch_cost_seconds: float = 2.0
+
+
+def queue_scheduling_config_default() -> QueueSchedulingConfig:
+    max_bypass = _int_env("STABLENEW_QUEUE_AFFINITY_MAX_BYPASS", 8)
+    return QueueSchedulingConfig(
+        model_affinity_enabled=_bool_env_flag("STABLENEW_QUEUE_MODEL_AFFINITY", False),
+        max_bypass_count=8 if max_bypass is None else max(0, max_bypass),
+        max_wait_seconds=_float_env("STABLENEW_QUEUE_AFFINITY_MAX_WAIT_SEC", 600.0),
+        model_switch_cost_seconds=max(
+            0.0, _float_env("STABLENEW_QUEUE_MODEL_SWITCH_COST_SEC", 20.0) or 0.0
+        ),
+        vae_switch_cost_seconds=max(0.0, _float_env("STABLENEW_QUEUE_VAE_SWITCH_COST_SEC", 2.0) or 0.0),
+    )
+
+
+def get_queue_scheduling_config() -> QueueSchedulingConfig:
+    global _queue_scheduling_config
+    if _queue_scheduling_config is None:
+        _queue_scheduling_config = queue_scheduling_config_default()
+    return _queue_scheduling_config
+
+
+def set_queue_scheduling_config(config: QueueSchedulingConfig) -> None:
+    global _queue_scheduling_config
+    _queue_scheduling_config = config
+
+
+@dataclass(frozen=True)
+class LearningRecordCommitConfig:
+    """Group-commit settings for the learning records JSONL.
+
+    ``window_ms`` of 0 fsyncs every record as it is appended.
+    """
+
+    window_ms: int = 200
+    max_records: int = 64
+
+
+def learning_record_commit_config_default() -> LearningRecordCommitConfig:
+    window_ms = _int_env("STABLENEW_LEARNING_COMMIT_WINDOW_MS", 200)
+    max_records = _int_env("STABLENEW_LEARNING_COMMIT_MAX_RECORDS", 64)
+    return LearningRecordCommitConfig(
+        window_ms=200 if window_ms is None else max(0, window_ms),
+        max_records=64 if max_records is None else max(1, max_records),
+    )
+
+
+def get_learning_record_commit_config() -> LearningRecordCommitConfig:
+    global _learning_record_commit_config
+    if _learning_record_commit_config is None:
+        _learning_record_commit_config = learning_record_commit_config_default()
+    return _learning_record_commit_config
+
+
+def set_learning_record_commit_config(config: LearningRecordCommitConfig) -> None:
+    global _learning_record_commit_config
+    _learning_record_commit_config = config
+
+
+@dataclass(frozen=True)
+class DiscoveredGroupingConfig:
+    """Discovered-review grouping: exact prompt match, or near-duplicate prompts
+    (MinHash/LSH) at ``similarity_threshold`` Jaccard similarity of prompt tags."""
+
+    similarity_enabled: bool = False
+    similarity_threshold: float = 0.6
+
+
+def discovered_grouping_config_default() -> DiscoveredGroupingConfig:
+    threshold = _float_env("STABLENEW_DISCOVERED_SIMILARITY_THRESHOLD", 0.6)
+    return DiscoveredGroupingConfig(
+        similarity_enabled=_bool_env_flag("STABLENEW_DISCOVERED_SIMILARITY_GROUPING", False),
+        similarity_threshold=0.6 if threshold is None else min(1.0, max(0.05, threshold)),
+    )
+
+
+def get_discovered_grouping_config() -> DiscoveredGroupingConfig:
+    global _discovered_grouping_config
+    if _discovered_grouping_config is None:
+        _discovered_grouping_config = discovered_grouping_config_default()
+    return _discovered_grouping_config
+
+
+def set_discovered_grouping_config(config: DiscoveredGroupingConfig) -> None:
+    global _discovered_grouping_config
+    _discovered_grouping_config = config
+
+
 def learning_enabled_default() -> bool:
     """Return default for learning toggle."""
 
@@ -217,6 +325,95 @@ def set_job_history_path(path: str) -> None:
     _job_history_path = path
 
 
+def job_history_backend_default() -> str:
+    """Return default job history backend ("jsonl" or "sqlite")."""
+
+    value = os.environ.get("STABLENEW_JOB_HISTORY_BACKEND", "jsonl").strip().lower()
+    return value if value in {"jsonl", "sqlite"} else "jsonl"
+
+
+def get_job_history_backend() -> str:
+    """Return current job history backend (module-level memory)."""
+
+    global _job_history_backend
+    if _job_history_backend is None:
+        _job_history_backend = job_history_backend_default()
+    return _job_history_backend
+
+
+def set_job_history_backend(backend: str) -> None:
+    """Override job history backend."""
+
+    global _job_history_backend
+    _job_history_backend = backend
+
+
+def config_blob_store_enabled_default() -> bool:
+    """Return default for content-addressed NJR config blobs in queue/history files."""
+
+    return _bool_env_flag("STABLENEW_CONFIG_BLOB_STORE", False)
+
+
+def is_config_blob_store_enabled() -> bool:
+    """Return whether queue/history writers externalize NJR config sub-documents."""
+
+    global _config_blob_store_enabled
+    if _config_blob_store_enabled is None:
+        _config_blob_store_enabled = config_blob_store_enabled_default()
+    return _config_blob_store_enabled
+
+
+def set_config_blob_store_enabled(enabled: bool) -> None:
+    """Override the config blob store toggle."""
+
+    global _config_blob_store_enabled
+    _config_blob_store_enabled = bool(enabled)
+
+
+def image_upload_cache_max_mb_default() -> int:
+    """Return default byte budget (MB) for cached base64 input images."""
+
+    return max(0, _int_env("STABLENEW_IMAGE_UPLOAD_CACHE_MB", 256) or 0)
+
+
+def get_image_upload_cache_max_mb() -> int:
+    """Return the byte budget (MB) for the executor's base64 input image cache."""
+
+    global _image_upload_cache_max_mb
+    if _image_upload_cache_max_mb is None:
+        _image_upload_cache_max_mb = image_upload_cache_max_mb_default()
+    return _image_upload_cache_max_mb
+
+
+def set_image_upload_cache_max_mb(value: int) -> None:
+    """Override the base64 input image cache budget (MB)."""
+
+    global _image_upload_cache_max_mb
+    _image_upload_cache_max_mb = max(0, int(value))
+
+
+def artifact_writer_workers_default() -> int:
+    """Return default thread count for saving stage output images."""
+
+    return max(1, _int_env("STABLENEW_ARTIFACT_WRITER_WORKERS", min(4, os.cpu_count() or 1)) or 1)
+
+
+def get_artifact_writer_workers() -> int:
+    """Return the artifact writer pool size used by pipeline stages."""
+
+    global _artifact_writer_workers
+    if _artifact_writer_workers is None:
+        _artifact_writer_workers = artifact_writer_workers_default()
+    return _artifact_writer_workers
+
+
+def set_artifact_writer_workers(value: int) -> None:
+    """Override the artifact writer pool size (applies before the pool is created)."""
+
+    global _artifact_writer_workers
+    _artifact_writer_workers = max(1, int(value))
+
+
 def queue_execution_enabled_default() -> bool:
     """Return default for queue-backed execution (disabled by default)."""
 
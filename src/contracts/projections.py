@@ -17,6 +17,7 @@ class QueueProjection:
     revision: int
     queue_items: tuple[str, ...] = ()
     queue_jobs: tuple[UnifiedJobSummary, ...] = ()
+    pending_job_count: int = 0
 
 
 @dataclass(frozen=True)
@@ -105,7 +105,9 @@ import logging
 import uuid
 
 from src.config.app_config import (
+    get_job_history_backend,
     get_jsonl_log_config,
+    get_queue_scheduling_config,
     is_debug_shutdown_inspector_enabled,
     set_webui_autostart_enabled,
     set_webui_health_initial_timeout_seconds,
@@ -128,9 +130,10 @@ from src.gui.app_state_projection_sink import AppStateProjectionSink
 from src.gui.app_state_v2 import AppStateV2
 from src.learning.model_profiles import get_model_profile_defaults_for_model
 from src.photo_optimize import get_photo_optimize_store
-from src.queue.job_history_store import JSONLJobHistoryStore
+from src.queue.job_history_store import create_job_history_store
 from src.queue.job_model import Job, JobStatus
 from src.queue.job_queue import JobQueue
+from src.queue.model_affinity import ModelAffinityPolicy
 from src.queue.single_node_runner import SingleNodeJobRunner
 from src.services.duration_stats_service import DurationStatsService
 from src.state.output_routing import OUTPUT_ROUTE_MOVIE_CLIPS, get_output_route_root
@@ -143,6 +146,7 @@ from src.utils import (
     log_with_ctx,
 )
 from src.utils.config import ConfigManager, LoraRuntimeConfig, normalize_lora_strengths
+from src.utils.config_blob_store import get_config_blob_stats
 from src.utils.debug_shutdown_inspector import log_shutdown_state
 from src.utils.diagnostics_bundle_v2 import build_crash_bundle
 from src.utils.error_envelope_v2 import (
@@ -449,6 +453,7 @@ class AppController:
             build_queue_projection=self._build_queue_projection,
             load_history_entries=self._load_history_entries,
             summarize_running_job=self._build_running_job_summary,
+            count_pending_jobs=self._count_pending_queue_jobs,
             logger=logger,
         )
         self._diagnostics_coordinator = DiagnosticsCoordinator()
@@ -2759,8 +2764,18 @@ class AppController:
 
     def _build_job_service(self) -> JobService:
         self._job_history_path.parent.mkdir(parents=True, exist_ok=True)
-        history_store = JSONLJobHistoryStore(self._job_history_path)
-        job_queue = JobQueue(history_store=history_store)
+        history_store = create_job_history_store(
+            self._job_history_path, backend=get_job_history_backend()
+        )
+        scheduling = get_queue_scheduling_config()
+        job_queue = JobQueue(
+            history_store=history_store,
+            model_affinity=ModelAffinityPolicy(
+                enabled=scheduling.model_affinity_enabled,
+                max_bypass_count=scheduling.max_bypass_count,
+                max_wait_seconds=scheduling.max_wait_seconds,
+            ),
+        )
         history_service = JobHistoryService(job_queue, history_store)
         return JobService(
             job_queue,
@@ -3101,6 +3116,11 @@ class AppController:
         except Exception:
             return []
 
+    def _count_pending_queue_jobs(self) -> int:
+        """Jobs still waiting in lazy (streamed) submissions, not yet in the queue."""
+        counter = getattr(self.job_service, "get_pending_virtual_job_count", None)
+        return int(counter()) if callable(counter) else 0
+
     def _list_service_jobs(self) -> list[Job]:
         queue = getattr(self.job_service, "queue", None)
         if queue and hasattr(queue, "list_active_jobs_ordered"):
@@ -3244,6 +3264,13 @@ class AppController:
         queue = getattr(self.job_service, "job_queue", None)
         if queue and hasattr(queue, "clear"):
             try:
+                discard_groups = getattr(self.job_service, "discard_virtual_job_groups", None)
+                if callable(discard_groups):
+                    discard_groups()
+                job_exec = getattr(getattr(self, "pipeline_controller", None), "_job_controller", None)
+                forget_restored = getattr(job_exec, "forget_restored_virtual_job_groups", None)
+                if callable(forget_restored):
+                    forget_restored()
                 result = int(queue.clear())
                 if result > 0:
                     self._refresh_app_state_queue()
@@ -3871,6 +3898,14 @@ class AppController:
                 }
             except Exception:
                 data["webui_connection"] = None
+        data["config_blobs"] = get_config_blob_stats()
+        job_exec = getattr(pipeline_controller, "_job_controller", None)
+        queue_persistence_getter = getattr(job_exec, "get_queue_persistence_stats", None)
+        if callable(queue_persistence_getter):
+            try:
+                data["queue_persistence"] = queue_persistence_getter()
+            except Exception:
+                data["queue_persistence"] = None
         snapshot = getattr(self, "_optional_dependency_snapshot", None)
         if snapshot is not None and hasattr(snapshot, "to_dict"):
             try:
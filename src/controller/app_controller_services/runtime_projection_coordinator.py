@@ -33,6 +33,7 @@ class RuntimeProjectionCoordinator:
         build_queue_projection: Callable[[], tuple[list[str], list[UnifiedJobSummary]]],
         load_history_entries: Callable[[int | None], list[JobHistoryEntry]],
         summarize_running_job: Callable[[Any], UnifiedJobSummary | None],
+        count_pending_jobs: Callable[[], int] | None = None,
         logger: logging.Logger | None = None,
     ) -> None:
         self._sink = sink
@@ -40,6 +41,7 @@ class RuntimeProjectionCoordinator:
         self._build_queue_projection = build_queue_projection
         self._load_history_entries = load_history_entries
         self._summarize_running_job = summarize_running_job
+        self._count_pending_jobs = count_pending_jobs
         self._logger = logger or logging.getLogger(__name__)
         self._lock = threading.RLock()
         self._revisions: dict[str, int] = {}
@@ -55,12 +57,13 @@ class RuntimeProjectionCoordinator:
         revision = self._next_revision("queue")
         self._background_tasks.submit(
             "projection:queue",
-            self._build_queue_projection,
+            lambda: (*self._build_queue_projection(), self._pending_job_count()),
             on_result=lambda result, revision=revision: self._sink.apply_queue_projection(
                 QueueProjection(
                     revision=revision,
                     queue_items=tuple(result[0]),
                     queue_jobs=tuple(result[1]),
+                    pending_job_count=result[2],
                 )
             ),
             on_error=lambda exc: self._logger.error(
@@ -72,6 +75,15 @@ class RuntimeProjectionCoordinator:
         )
         return revision
 
+    def _pending_job_count(self) -> int:
+        if self._count_pending_jobs is None:
+            return 0
+        try:
+            return max(0, int(self._count_pending_jobs()))
+        except Exception:
+            self._logger.debug("Pending job count unavailable", exc_info=True)
+            return 0
+
     def publish_history_refresh(self, *, limit: int | None = None) -> int:
         revision = self._next_revision("history")
         self._background_tasks.submit(
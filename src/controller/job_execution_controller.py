@@ -13,12 +13,12 @@ from pathlib import Path
 from typing import Any
 
 from src.cluster.worker_registry import WorkerRegistry
-from src.config.app_config import get_job_history_path
+from src.config.app_config import get_job_history_backend, get_job_history_path
 from src.history.history_record import HistoryRecord
 from src.pipeline.job_models_v2 import NormalizedJobRecord
 from src.pipeline.pipeline_runner import normalize_run_result
 from src.pipeline.replay_engine import ReplayEngine
-from src.queue.job_history_store import JobHistoryStore, JSONLJobHistoryStore
+from src.queue.job_history_store import JobHistoryStore, create_job_history_store
 from src.queue.job_model import Job, JobPriority, JobStatus, RetryAttempt, StageCheckpoint
 from src.queue.job_queue import JobQueue
 from src.queue.single_node_runner import SingleNodeJobRunner
@@ -26,6 +26,7 @@ from src.services.queue_store_v2 import (
     SCHEMA_VERSION,
     QueueSnapshotV1,
     UnsupportedQueueSchemaError,
+    get_queue_store_stats,
     load_queue_snapshot,
     save_queue_snapshot,
 )
@@ -120,6 +121,11 @@ class JobExecutionController:
         self._status_dispatcher: Callable[[Callable[[], None]], None] | None = None
         self._deferred_autostart = False  # PR-PERSIST-001: Track if we need to auto-start after init
         self._app_state: Any | None = None  # For runtime status updates
+        # Streamed job groups: live cursors come from the provider (JobService);
+        # restored entries are kept until their owner resumes or drops them.
+        self._virtual_job_group_provider: Callable[[], list[dict[str, Any]]] | None = None
+        self._restored_virtual_job_groups: dict[str, dict[str, Any]] = {}
+        self._virtual_job_groups_lock = threading.Lock()
         if restore_state:
             self._restore_queue_state()
         self._queue_persistence = QueuePersistenceManager(self)
@@ -404,6 +410,29 @@ class JobExecutionController:
         """Persist the current queue snapshot through the controller-owned store."""
         self._persist_queue_state()
 
+    def set_virtual_job_group_provider(
+        self, provider: Callable[[], list[dict[str, Any]]] | None
+    ) -> None:
+        """Register the source of streamed-group cursors saved with the queue."""
+        self._virtual_job_group_provider = provider
+
+    def get_restored_virtual_job_groups(self) -> list[dict[str, Any]]:
+        """Return streamed-group entries restored from disk and not resumed yet."""
+        with self._virtual_job_groups_lock:
+            return [dict(entry) for entry in self._restored_virtual_job_groups.values()]
+
+    def forget_restored_virtual_job_groups(self, group_id: str | None = None) -> None:
+        """Stop persisting a restored group entry (all of them when ``group_id`` is None)."""
+        with self._virtual_job_groups_lock:
+            if group_id is None:
+                self._restored_virtual_job_groups.clear()
+            else:
+                self._restored_virtual_job_groups.pop(group_id, None)
+
+    def get_queue_persistence_stats(self) -> dict[str, Any]:
+        """Return queue store write-cost counters (journal vs checkpoint) for diagnostics."""
+        return get_queue_store_stats()
+
     @property
     def is_queue_paused(self) -> bool:
         return self._queue_paused
@@ -444,11 +473,17 @@ class JobExecutionController:
                 restored_jobs.append(job)
         if restored_jobs:
             self._queue.restore_jobs(restored_jobs)
+        with self._virtual_job_groups_lock:
+            self._restored_virtual_job_groups = {
+                str(entry["group_id"]): dict(entry) for entry in snapshot.virtual_groups
+            }
         logger.info(
-            "[STARTUP-PERF] Restored queue state: auto_run=%s, paused=%s, %d restored job(s)",
+            "[STARTUP-PERF] Restored queue state: auto_run=%s, paused=%s, %d restored job(s), "
+            "%d streamed group(s) to resume",
             self._auto_run_enabled,
             self._queue_paused,
             len(restored_jobs),
+            len(snapshot.virtual_groups),
         )
         
         # PR-PERSIST-001: Auto-start runner if it was enabled before shutdown
@@ -471,10 +506,20 @@ class JobExecutionController:
             entry = self._build_queue_entry(job)
             if entry is not None:
                 entries.append(entry)
+        with self._virtual_job_groups_lock:
+            virtual_groups = dict(self._restored_virtual_job_groups)
+        provider = self._virtual_job_group_provider
+        if callable(provider):
+            try:
+                for group in provider():
+                    virtual_groups[str(group.get("group_id"))] = dict(group)
+            except Exception as exc:
+                logger.warning("Failed to collect streamed job groups for queue state: %s", exc)
         snapshot = QueueSnapshotV1(
             jobs=entries,
             auto_run_enabled=self._auto_run_enabled,
             paused=self._queue_paused,
+            virtual_groups=list(virtual_groups.values()),
         )
         try:
             save_queue_snapshot(snapshot)
@@ -599,7 +644,7 @@ class JobExecutionController:
 
     def _default_history_store(self) -> JobHistoryStore:
         path = Path(get_job_history_path())
-        return JSONLJobHistoryStore(path)
+        return create_job_history_store(path, backend=get_job_history_backend())
 
 
 class QueuePersistenceManager:
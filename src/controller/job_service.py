@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import logging
+import sys
 import time
+import uuid
 from collections import deque
-from collections.abc import Callable
-from dataclasses import asdict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from threading import Lock
+from threading import Lock, Thread
 from typing import Any, Literal, Protocol
 
 from src.config.app_config import get_process_container_config, get_watchdog_config
@@ -36,7 +39,9 @@ from src.utils.process_container_v2 import (
     build_process_container,
 )
 from src.utils.snapshot_builder_v2 import build_job_snapshot, normalized_job_from_snapshot
+from src.utils.thread_registry import get_thread_registry
 from src.utils.watchdog_v2 import WATCHDOG_LOG_PREFIX, JobWatchdog, WatchdogConfig
+from src.video.comfy_object_info_cache import get_comfy_object_info_cache
 
 try:
     import psutil  # type: ignore[import]
@@ -162,6 +167,22 @@ class RunnerProtocol(Protocol):
 RunnerFactory = Callable[[JobQueue, Callable[[Job], dict] | None], RunnerProtocol]
 
 
+@dataclass
+class _VirtualJobGroup:
+    """Jobs from a lazy source that have not all been materialized into the queue yet."""
+
+    group_id: str
+    jobs: Iterator[Job]
+    remaining: int
+    total: int | None = None
+    materialized: int = 0
+    limit: int | None = None
+    refilling: bool = False
+    queued_job_ids: set[str] = field(default_factory=set)
+    order: Callable[[list[Job]], list[Job]] | None = None
+    source: dict[str, Any] | None = None  # JSON-safe spec to rebuild ``jobs`` after a restart
+
+
 class JobService:
     """Bridge between JobQueue, runner, and history for higher-level orchestration.
 
@@ -180,6 +201,11 @@ class JobService:
     EVENT_QUEUE_EMPTY = "queue_empty"
     EVENT_QUEUE_STATUS = "queue_status"
 
+    # Lazy ``enqueue_njrs`` sources are materialized this many jobs at a time, and
+    # topped up once fewer than ``NJR_REFILL_LOW_WATER`` of them are still queued.
+    NJR_ENQUEUE_CHUNK_SIZE = 32
+    NJR_REFILL_LOW_WATER = 8
+
     @property
     def runner(self) -> RunnerProtocol:
         return self._runner
@@ -291,6 +317,10 @@ class JobService:
         self._callbacks: dict[str, list[Callable[..., None]]] = {}
         self._status_callbacks: dict[str, Callable[[Job, JobStatus], None]] = {}
         self._callback_lock = Lock()
+        self._virtual_groups: dict[str, _VirtualJobGroup] = {}
+        self._virtual_group_by_job: dict[str, str] = {}
+        self._virtual_group_lock = Lock()
+        self._virtual_group_refills: set[Thread] = set()
 
     @property
     def queue(self) -> JobQueue:
@@ -468,14 +498,262 @@ class JobService:
         return job
 
     def enqueue_njrs(
-        self, njrs: list[NormalizedJobRecord], run_request: PipelineRunRequest
+        self,
+        njrs: Iterable[NormalizedJobRecord],
+        run_request: PipelineRunRequest,
+        *,
+        total: int | None = None,
     ) -> list[str]:
-        """Enqueue a batch of NormalizedJobRecord instances."""
+        """Enqueue NormalizedJobRecord instances.
+
+        A list/tuple is enqueued in full. Any other iterable (for example
+        ``PromptPackNormalizedJobBuilder.iter_jobs``) becomes a virtual job group:
+        the first ``NJR_ENQUEUE_CHUNK_SIZE`` records are queued now and the rest
+        are pulled as the runner starts the queued ones. Only the job ids queued
+        so far are returned; ``total`` (e.g. from ``count_jobs``) is reported via
+        ``get_virtual_job_groups`` so the UI can show the full count.
+        """
+        if isinstance(njrs, Sequence):
+            job_ids: list[str] = []
+            for record in njrs[: run_request.max_njr_count]:
+                job = self._job_from_njr(record, run_request)
+                self.submit_job_with_run_mode(job)
+                job_ids.append(job.job_id)
+            return job_ids
+        return self.enqueue_job_stream(
+            (self._job_from_njr(record, run_request) for record in njrs),
+            total=total,
+            limit=run_request.max_njr_count,
+        )
+
+    def enqueue_job_stream(
+        self,
+        jobs: Iterable[Job],
+        *,
+        total: int | None = None,
+        limit: int | None = None,
+        order: Callable[[list[Job]], list[Job]] | None = None,
+        source: Mapping[str, Any] | None = None,
+        resume: Mapping[str, Any] | None = None,
+    ) -> list[str]:
+        """Queue jobs from a lazy source as a virtual job group.
+
+        Jobs are pulled from ``jobs`` ``NJR_ENQUEUE_CHUNK_SIZE`` at a time: the
+        first chunk now, later ones on a worker thread as the runner drains the
+        queue below ``NJR_REFILL_LOW_WATER``. At most ``limit`` jobs are taken and
+        ``order`` may rearrange each chunk before it is queued. Returns the ids
+        queued so far; ``total`` is the expected count for progress displays.
+
+        Groups with a JSON-safe ``source`` spec are reported by
+        ``get_persistable_virtual_job_groups`` so the queue store can keep their
+        cursor. To continue such a group after a restart, pass its persisted
+        entry as ``resume`` and a ``jobs`` iterator that already skips the
+        ``materialized`` jobs.
+        """
+        resume = resume or {}
+        materialized = max(0, int(resume.get("materialized") or 0))
+        if "limit" in resume:
+            limit = resume.get("limit")
+        remaining = max(0, limit - materialized) if limit is not None else sys.maxsize
+        if total is None:
+            total = resume.get("total")
+        group = _VirtualJobGroup(
+            group_id=str(resume.get("group_id") or f"njr-group-{uuid.uuid4().hex[:12]}"),
+            jobs=iter(jobs),
+            remaining=remaining,
+            total=min(total, materialized + remaining) if total is not None else None,
+            materialized=materialized,
+            limit=limit,
+            refilling=True,
+            order=order,
+            source=dict(source) if source is not None else None,
+        )
+        with self._virtual_group_lock:
+            self._virtual_groups[group.group_id] = group
+        return self._refill_virtual_group(group)
+
+    def get_virtual_job_groups(self) -> list[dict[str, Any]]:
+        """Return progress for lazily enqueued NJR groups that still have records pending."""
+        with self._virtual_group_lock:
+            return [
+                {
+                    "group_id": group.group_id,
+                    "materialized": group.materialized,
+                    "queued": len(group.queued_job_ids),
+                    "total": group.total,
+                }
+                for group in self._virtual_groups.values()
+            ]
+
+    def get_persistable_virtual_job_groups(self) -> list[dict[str, Any]]:
+        """Return the cursor of every group that can be rebuilt from its ``source``.
+
+        ``materialized`` only counts jobs already handed to the queue, so a queue
+        snapshot taken with these entries never skips jobs it does not hold.
+        """
+        with self._virtual_group_lock:
+            return [
+                {
+                    "group_id": group.group_id,
+                    "source": group.source,
+                    "materialized": group.materialized,
+                    "limit": group.limit,
+                    "total": group.total,
+                }
+                for group in self._virtual_groups.values()
+                if group.source is not None
+            ]
+
+    def get_virtual_group_id(self, job_id: str) -> str | None:
+        """Return the pending virtual group that queued ``job_id``, if any."""
+        with self._virtual_group_lock:
+            group_id = self._virtual_group_by_job.get(job_id)
+            return group_id if group_id in self._virtual_groups else None
+
+    def get_pending_virtual_job_count(self, group_id: str | None = None) -> int:
+        """Jobs announced by virtual groups (via ``total``) but not materialized yet."""
+        with self._virtual_group_lock:
+            return sum(
+                max(0, group.total - group.materialized)
+                for group in self._virtual_groups.values()
+                if group.total is not None and group_id in (None, group.group_id)
+            )
+
+    def discard_virtual_job_groups(self) -> int:
+        """Drop every pending virtual group (e.g. when the queue is cleared)."""
+        with self._virtual_group_lock:
+            count = len(self._virtual_groups)
+            self._virtual_groups.clear()
+            self._virtual_group_by_job.clear()
+        return count
+
+    def wait_for_virtual_group_refills(self, timeout_s: float = 5.0) -> bool:
+        """Block until background group refills finish; returns False on timeout."""
+        finish_by = time.monotonic() + max(0.0, float(timeout_s))
+        while True:
+            with self._virtual_group_lock:
+                threads = [thread for thread in self._virtual_group_refills if thread.is_alive()]
+                self._virtual_group_refills = set(threads)
+            if not threads:
+                return True
+            remaining = finish_by - time.monotonic()
+            if remaining <= 0:
+                return False
+            threads[0].join(remaining)
+
+    def _coalesced_queue_notifications(self) -> AbstractContextManager[Any]:
+        coalesce = getattr(self.job_queue, "coalesce_state_notifications", None)
+        return coalesce() if callable(coalesce) else nullcontext()
+
+    def _materialize_virtual_group(self, group: _VirtualJobGroup) -> list[str]:
+        """Build and queue the next chunk of ``group``; retire it once exhausted.
+
+        Only the refilling thread (``group.refilling``) calls this, so the source
+        is pulled without holding ``_virtual_group_lock``; building a chunk can
+        take a while and must not block queue status callbacks. The cursor moves
+        inside the same queue notification batch as the submission, so queue
+        persistence sees the chunk's jobs and the advanced cursor together.
+        """
+        with self._virtual_group_lock:
+            if self._virtual_groups.get(group.group_id) is not group:
+                return []
+            want = min(self.NJR_ENQUEUE_CHUNK_SIZE, group.remaining)
+        jobs: list[Job] = []
+        exhausted = want <= 0
+        while len(jobs) < want:
+            try:
+                jobs.append(next(group.jobs))
+            except StopIteration:
+                exhausted = True
+                break
+            except Exception as exc:
+                log_with_ctx(
+                    logger,
+                    logging.ERROR,
+                    "Virtual job group source failed; dropping remaining records",
+                    ctx=LogContext(subsystem="job_service"),
+                    extra_fields={"group_id": group.group_id, "error": str(exc)},
+                )
+                exhausted = True
+                break
+        if group.order is not None and len(jobs) > 1:
+            try:
+                jobs = list(group.order(jobs))
+            except Exception as exc:
+                log_with_ctx(
+                    logger,
+                    logging.WARNING,
+                    "Virtual job group ordering failed; queueing chunk in source order",
+                    ctx=LogContext(subsystem="job_service"),
+                    extra_fields={"group_id": group.group_id, "error": str(exc)},
+                )
+        with self._virtual_group_lock:
+            if self._virtual_groups.get(group.group_id) is not group:
+                # Discarded (e.g. queue cleared) while the chunk was being built.
+                return []
+            for job in jobs:
+                group.queued_job_ids.add(job.job_id)
+                self._virtual_group_by_job[job.job_id] = group.group_id
+        with self._coalesced_queue_notifications():
+            if jobs:
+                self.submit_jobs_with_run_mode(jobs)
+            with self._virtual_group_lock:
+                group.remaining -= len(jobs)
+                group.materialized += len(jobs)
+                if group.remaining <= 0:
+                    exhausted = True
+                if exhausted:
+                    self._virtual_groups.pop(group.group_id, None)
+                    if group.total is None or group.total > group.materialized:
+                        group.total = group.materialized
+        return [job.job_id for job in jobs]
+
+    def _advance_virtual_group(self, job: Job, status: JobStatus) -> None:
+        if status == JobStatus.QUEUED:
+            return
+        with self._virtual_group_lock:
+            group_id = self._virtual_group_by_job.pop(job.job_id, None)
+            if group_id is None:
+                return
+            group = self._virtual_groups.get(group_id)
+            if group is None:
+                return
+            group.queued_job_ids.discard(job.job_id)
+            # Jobs that fail validation during a refill re-enter here; the outer
+            # refill loop picks them up instead of recursing.
+            if group.refilling or len(group.queued_job_ids) >= self.NJR_REFILL_LOW_WATER:
+                return
+            group.refilling = True
+        # Status callbacks run on the runner thread; building NJRs there would
+        # hold up the job that just started.
+        try:
+            thread = get_thread_registry().spawn(
+                target=self._refill_virtual_group,
+                args=(group,),
+                name=f"{group.group_id}-refill",
+                purpose="Materialize the next chunk of a streamed job group",
+            )
+        except Exception:
+            logger.exception("Failed to start refill for virtual job group %s", group.group_id)
+            with self._virtual_group_lock:
+                group.refilling = False
+            return
+        with self._virtual_group_lock:
+            self._virtual_group_refills.add(thread)
+
+    def _refill_virtual_group(self, group: _VirtualJobGroup) -> list[str]:
+        """Materialize chunks until the low-water mark is met; caller sets ``refilling``."""
         job_ids: list[str] = []
-        for record in njrs[: run_request.max_njr_count]:
-            job = self._job_from_njr(record, run_request)
-            self.submit_job_with_run_mode(job)
-            job_ids.append(job.job_id)
+        try:
+            while True:
+                chunk = self._materialize_virtual_group(group)
+                job_ids.extend(chunk)
+                with self._virtual_group_lock:
+                    if not chunk or len(group.queued_job_ids) >= self.NJR_REFILL_LOW_WATER:
+                        break
+        finally:
+            with self._virtual_group_lock:
+                group.refilling = False
         return job_ids
 
     def submit_queued(self, job: Job, *, emit_queue_updated: bool = True) -> None:
@@ -844,6 +1122,33 @@ class JobService:
                 extra_fields={"error": str(exc)},
             )
 
+    def _queue_scheduling_stats(self) -> dict[str, Any]:
+        getter = getattr(self.job_queue, "get_scheduling_stats", None)
+        if not callable(getter):
+            return {}
+        try:
+            return dict(getter())
+        except Exception:
+            return {}
+
+    def _queue_dequeue_latency_stats(self) -> dict[str, Any]:
+        getter = getattr(self.job_queue, "get_dequeue_latency_stats", None)
+        if not callable(getter):
+            return {}
+        try:
+            return dict(getter())
+        except Exception:
+            return {}
+
+    def _runner_worker_states(self) -> list[dict[str, Any]]:
+        getter = getattr(self.runner, "get_worker_states", None)
+        if not callable(getter):
+            return []
+        try:
+            return list(getter())
+        except Exception:
+            return []
+
     def get_diagnostics_snapshot(self) -> dict[str, Any]:
         """Return diagnostics data surfaced to GUI/diagnostic tooling."""
         def _result_summary(result: dict[str, Any] | None, *, njr_snapshot: dict[str, Any] | None = None) -> dict[str, Any]:
@@ -911,6 +1216,10 @@ class JobService:
                 "current_job_id": getattr(current_job, "job_id", None),
                 "queued_job_ids": [job.job_id for job in queued_jobs],
                 "job_count": len(jobs),
+                "scheduling": self._queue_scheduling_stats(),
+                "dequeue_latency": self._queue_dequeue_latency_stats(),
+                "workers": self._runner_worker_states(),
+                "virtual_groups": self.get_virtual_job_groups(),
             },
             "cached_metadata": metadata_cache,
             "containers": containers,
@@ -918,6 +1227,7 @@ class JobService:
             "watchdog_events": list(self._watchdog_event_history),
             "cleanup_history": list(self._cleanup_history),
             "process_container_config": asdict(self._process_container_config),
+            "comfy_object_info_cache": get_comfy_object_info_cache().stats(),
         }
 
     def run_next_now(self) -> None:
@@ -977,6 +1287,7 @@ class JobService:
                 "prompt_pack_id": getattr(job, "prompt_pack_id", None),
             },
         )
+        self._advance_virtual_group(job, status)
         if status == JobStatus.RUNNING:
             self._log_job_started(job.job_id)
             self._emit(self.EVENT_JOB_STARTED, job)
@@ -9,11 +9,14 @@ GUI Run buttons -> AppController._start_run_v2 -> PipelineController.start_pipel
 
 from __future__ import annotations
 
+import itertools
+import json
 import logging
+import random
 import time
 import uuid
-from collections.abc import Callable, Mapping
-from dataclasses import dataclass, replace
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sized
+from dataclasses import asdict, dataclass, replace
 from typing import Any
 
 from src.contracts import PackJobEntry, PreviewRequest, SubmissionRequest
@@ -65,12 +68,15 @@ from src.utils.error_envelope_v2 import (
     serialize_envelope,
     wrap_exception,
 )
+from src.utils.thread_registry import get_thread_registry
 
 # Logger for this module
 _logger = logging.getLogger(__name__)
 
 _PREVIEW_BUILD_TIMING_INFO_MS = 150.0
 _PREVIEW_BUILD_TIMING_WARN_MS = 1000.0
+# ``source`` kind of streamed prompt-pack submissions persisted with the queue.
+_PACK_STREAM_SOURCE_KIND = "prompt_pack"
 
 
 @dataclass(frozen=True)
@@ -108,6 +114,21 @@ class PipelineController(CorePipelineController):
         _logger.debug(f"[PipelineController] First job: {njrs[0] if njrs else 'NONE'}")
         return njrs
 
+    def _iter_njrs_from_pack_bundle(
+        self, pack_entries: list[PackJobEntry], *, matrix_seed: int | None = None
+    ) -> tuple[Iterator[NormalizedJobRecord], int] | None:
+        """Return a lazy NJR iterator for a pack bundle plus the number of jobs it yields."""
+        builder = self._get_prompt_pack_builder()
+        if builder is None:
+            return None
+        total = builder.count_jobs(pack_entries, matrix_seed=matrix_seed)
+        _logger.info(
+            "[PipelineController] Streaming %d NormalizedJobRecord(s) from %d PackJobEntry objects",
+            total,
+            len(pack_entries),
+        )
+        return builder.iter_jobs(pack_entries, matrix_seed=matrix_seed), total
+
     def _normalize_run_mode(self, pipeline_state: PipelineState) -> str:
         mode = getattr(pipeline_state, "run_mode", "") or "queue"
         mode_lower = str(mode).lower()
@@ -732,8 +753,13 @@ class PipelineController(CorePipelineController):
                 self._job_service.set_status_callback("pipeline", self._on_job_status)
             except Exception:
                 pass
+        set_group_provider = getattr(self._job_controller, "set_virtual_job_group_provider", None)
+        get_persistable_groups = getattr(self._job_service, "get_persistable_virtual_job_groups", None)
+        if callable(set_group_provider) and callable(get_persistable_groups):
+            set_group_provider(get_persistable_groups)
         self._sync_auto_run_setting()
         self._setup_queue_callbacks()
+        self._resume_streamed_job_groups()
 
     def _sync_auto_run_setting(self, forced_value: bool | None = None) -> None:
         """Propagate auto-run preference from AppState into JobService."""
@@ -1349,6 +1375,14 @@ class PipelineController(CorePipelineController):
         queue = getattr(self._job_service, "job_queue", None)
         if queue and hasattr(queue, "clear"):
             try:
+                discard_groups = getattr(self._job_service, "discard_virtual_job_groups", None)
+                if callable(discard_groups):
+                    discard_groups()
+                forget_restored = getattr(
+                    self._job_controller, "forget_restored_virtual_job_groups", None
+                )
+                if callable(forget_restored):
+                    forget_restored()
                 queue.clear()
             except Exception:
                 _logger.exception("on_queue_clear_v2 failed", exc_info=True)
@@ -1621,7 +1655,8 @@ class PipelineController(CorePipelineController):
         """Submit preview jobs as queue jobs using NormalizedJobRecord data.
         
         Args:
-            records: Optional pre-fetched records to submit. If None, calls get_preview_jobs().
+            records: Optional pre-fetched records to submit. If None, the draft's pack
+                entries are streamed into the queue, falling back to get_preview_jobs().
             source: Source identifier for job tracking.
             prompt_source: Prompt source type ("pack", "manual", etc).
             run_config: Optional runtime configuration overrides.
@@ -1629,6 +1664,14 @@ class PipelineController(CorePipelineController):
         Returns:
             Number of jobs successfully submitted to queue.
         """
+        if records is None:
+            streamed = self._submit_draft_pack_stream(
+                source=source,
+                prompt_source=prompt_source,
+                run_config=run_config,
+            )
+            if streamed is not None:
+                return streamed
         request = SubmissionRequest(
             records=tuple(records or ()),
             source=source,
@@ -1668,6 +1711,149 @@ class PipelineController(CorePipelineController):
         )
         return submitted
 
+    def _submit_draft_pack_stream(
+        self,
+        *,
+        source: str,
+        prompt_source: str,
+        run_config: dict[str, Any] | None,
+    ) -> int | None:
+        """Stream the draft's pack jobs into the queue without building them all first.
+
+        Returns None when there is no pack draft to stream, so the caller can use
+        the preview path instead.
+        """
+        job_draft = getattr(getattr(self, "_app_state", None), "job_draft", None)
+        pack_entries = list(getattr(job_draft, "packs", None) or ())
+        if not pack_entries:
+            return None
+        matrix_seed = random.randrange(2**32)
+        stream = self._iter_njrs_from_pack_bundle(pack_entries, matrix_seed=matrix_seed)
+        if stream is None or stream[1] <= 0:
+            return None
+        records, total = stream
+        if run_config is not None:
+            self._last_run_config = run_config
+        return self._submit_normalized_jobs(
+            self._iter_queueable_records(records),
+            run_config=run_config,
+            source=source,
+            prompt_source=prompt_source,
+            total=total,
+            stream_source=self._pack_stream_source(
+                pack_entries,
+                matrix_seed=matrix_seed,
+                run_config=run_config,
+                source=source,
+                prompt_source=prompt_source,
+            ),
+        )
+
+    def _iter_queueable_records(
+        self, records: Iterable[NormalizedJobRecord]
+    ) -> Iterator[NormalizedJobRecord]:
+        queue_submission = self._get_queue_submission_service()
+        for record in records:
+            queueable, _non_queueable = queue_submission.split_queueable_records([record])
+            if queueable:
+                yield record
+            else:
+                _logger.warning(
+                    "[PipelineController] Skipping streamed job without prompt pack identity: %s",
+                    getattr(record, "job_id", None),
+                )
+
+    @staticmethod
+    def _pack_stream_source(
+        pack_entries: list[PackJobEntry],
+        *,
+        matrix_seed: int,
+        run_config: dict[str, Any] | None,
+        source: str,
+        prompt_source: str,
+    ) -> dict[str, Any] | None:
+        """Return the JSON-safe spec that rebuilds a pack stream after a restart."""
+        try:
+            spec = {
+                "kind": _PACK_STREAM_SOURCE_KIND,
+                "entries": [asdict(entry) for entry in pack_entries],
+                "matrix_seed": matrix_seed,
+                "run_config": run_config,
+                "source": source,
+                "prompt_source": prompt_source,
+            }
+            json.dumps(spec)
+        except (TypeError, ValueError) as exc:
+            _logger.warning(
+                "[PipelineController] Streamed pack submission cannot be persisted; "
+                "jobs not queued yet will not survive a restart: %s",
+                exc,
+            )
+            return None
+        return spec
+
+    def _resume_streamed_job_groups(self) -> None:
+        """Continue pack streams whose cursors were restored with the queue."""
+        get_restored = getattr(self._job_controller, "get_restored_virtual_job_groups", None)
+        entries = get_restored() if callable(get_restored) else []
+        if not entries:
+            return
+        get_thread_registry().spawn(
+            target=self._resume_pack_streams,
+            args=(entries,),
+            name="njr-group-resume",
+            purpose="Resume streamed prompt-pack submissions restored from the queue store",
+        )
+
+    def _resume_pack_streams(self, entries: list[dict[str, Any]]) -> None:
+        for entry in entries:
+            group_id = str(entry.get("group_id"))
+            restored_ids = {
+                str(restored.get("group_id"))
+                for restored in self._job_controller.get_restored_virtual_job_groups()
+            }
+            if group_id not in restored_ids:
+                continue  # dropped meanwhile, e.g. the queue was cleared
+            try:
+                resumed = self._resume_pack_stream(entry)
+                _logger.info(
+                    "[PipelineController] Resumed streamed job group %s (%d job(s) announced)",
+                    group_id,
+                    resumed,
+                )
+            except Exception:
+                _logger.exception(
+                    "[PipelineController] Failed to resume streamed job group %s; its remaining jobs are dropped",
+                    group_id,
+                )
+            finally:
+                self._job_controller.forget_restored_virtual_job_groups(group_id)
+
+    def _resume_pack_stream(self, entry: Mapping[str, Any]) -> int:
+        spec = entry.get("source") or {}
+        if spec.get("kind") != _PACK_STREAM_SOURCE_KIND:
+            _logger.warning(
+                "[PipelineController] Unknown streamed job group source %r; not resuming",
+                spec.get("kind"),
+            )
+            return 0
+        builder = self._get_prompt_pack_builder()
+        if builder is None:
+            return 0
+        pack_entries = [PackJobEntry(**item) for item in spec.get("entries") or ()]
+        records = builder.iter_jobs(pack_entries, matrix_seed=spec.get("matrix_seed"))
+        # The cursor counts queued jobs, i.e. records that passed the same filter.
+        materialized = int(entry.get("materialized") or 0)
+        return self._submit_normalized_jobs(
+            itertools.islice(self._iter_queueable_records(records), materialized, None),
+            run_config=spec.get("run_config"),
+            source=str(spec.get("source") or "gui"),
+            prompt_source=str(spec.get("prompt_source") or "pack"),
+            total=entry.get("total"),
+            stream_source=spec,
+            stream_resume=entry,
+        )
+
     def _resolve_submission_records(
         self,
         request: SubmissionRequest,
@@ -1747,15 +1933,18 @@ class PipelineController(CorePipelineController):
 
     def _submit_normalized_jobs(
         self,
-        records: list[NormalizedJobRecord],
+        records: Iterable[NormalizedJobRecord],
         *,
         run_config: dict[str, Any] | None = None,
         source: str = "gui",
         prompt_source: str = "pack",
+        total: int | None = None,
+        stream_source: Mapping[str, Any] | None = None,
+        stream_resume: Mapping[str, Any] | None = None,
     ) -> int:
         _logger.info(
-            "[PipelineController] _submit_normalized_jobs called with %d NormalizedJobRecord(s)",
-            len(records),
+            "[PipelineController] _submit_normalized_jobs called with %s NormalizedJobRecord(s)",
+            len(records) if isinstance(records, Sized) else total,
         )
         submitted = self._get_queue_submission_service().submit_normalized_jobs(
             records,
@@ -1770,6 +1959,9 @@ class PipelineController(CorePipelineController):
             to_queue_job=self._to_queue_job,
             log_add_to_queue_event=self._log_add_to_queue_event,
             run_job_payload_factory=lambda job: (lambda j=job: self._run_job(j)),
+            total=total,
+            stream_source=stream_source,
+            stream_resume=stream_resume,
         )
         _logger.info("[PipelineController] Successfully submitted %d jobs to queue", submitted)
         return submitted
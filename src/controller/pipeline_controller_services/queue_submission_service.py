@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from contextlib import nullcontext
 from typing import Any
 
@@ -96,7 +96,7 @@ class QueueSubmissionService:
 
     def submit_normalized_jobs(
         self,
-        records: list[NormalizedJobRecord],
+        records: Iterable[NormalizedJobRecord],
         *,
         run_config: dict[str, Any] | None,
         source: str,
@@ -109,11 +109,29 @@ class QueueSubmissionService:
         to_queue_job: Callable[..., Any],
         log_add_to_queue_event: Callable[[str], None],
         run_job_payload_factory: Callable[[Any], Callable[[], dict[str, Any]]] | None = None,
+        total: int | None = None,
+        stream_source: Mapping[str, Any] | None = None,
+        stream_resume: Mapping[str, Any] | None = None,
     ) -> int:
-        if not records or not self._job_service:
+        """Convert records to queue jobs and submit them; returns the job count.
+
+        A list/tuple is sorted by model and submitted now. Any other iterable
+        (e.g. ``PromptPackNormalizedJobBuilder.iter_jobs``) is handed to
+        ``JobService.enqueue_job_stream`` and converted chunk by chunk as the
+        queue drains, each chunk sorted by model; the returned count is then the
+        jobs queued now plus those the stream still announces (from ``total``).
+        ``stream_source``/``stream_resume`` are passed through so the stream's
+        cursor can be persisted and resumed.
+        """
+        streaming = not isinstance(records, Sequence)
+        if not self._job_service or (not streaming and not records):
             return 0
+        if streaming and not callable(getattr(self._job_service, "enqueue_job_stream", None)):
+            records = list(records)
+            streaming = False
         if str(source).startswith("learning_"):
-            allowed, reason = can_enqueue_learning_jobs(len(records))
+            requested = total if streaming else len(records)  # type: ignore[arg-type]
+            allowed, reason = can_enqueue_learning_jobs(int(requested or 0))
             if not allowed:
                 self._logger.warning("[QueueSubmissionService] Learning enqueue blocked: %s", reason)
                 return 0
@@ -123,19 +141,65 @@ class QueueSubmissionService:
             )
             return 0
 
+        run_config_to_use = run_config or last_run_config
+
+        def _queue_job(record: NormalizedJobRecord) -> Any:
+            cfg = record.config
+            prompt_pack_id = cfg.get("prompt_pack_id") if isinstance(cfg, dict) else None
+            if prompt_pack_id and not getattr(record, "prompt_pack_id", None):
+                try:
+                    record.prompt_pack_id = prompt_pack_id  # type: ignore[attr-defined]
+                except Exception:
+                    record.prompt_pack_id = prompt_pack_id
+            prompt_pack_name = None
+            if isinstance(cfg, dict):
+                prompt_pack_name = cfg.get("prompt_pack_name") or cfg.get("pack_name")
+            ensure_record_prompt_pack_metadata(record, prompt_pack_id, prompt_pack_name)
+            job = to_queue_job(
+                record,
+                run_mode="queue",
+                source=source,
+                prompt_source=prompt_source,
+                prompt_pack_id=prompt_pack_id,
+                run_config=run_config_to_use,
+            )
+            if run_job_payload_factory is not None:
+                job.payload = run_job_payload_factory(job)
+            if not hasattr(job, "_normalized_record") or job._normalized_record is None:
+                self._logger.warning(
+                    "PR-CORE1-B2: Job submitted without normalized_record in NJR-only mode. Source: %s",
+                    source,
+                )
+            return job
+
+        if streaming:
+            stream_options: dict[str, Any] = {}
+            if stream_source is not None:
+                stream_options["source"] = stream_source
+            if stream_resume is not None:
+                stream_options["resume"] = stream_resume
+            job_ids = self._job_service.enqueue_job_stream(
+                self._stream_queue_jobs(records, _queue_job, is_queue_submission_blocked),
+                total=total,
+                order=lambda jobs: self._sort_queue_jobs_by_model(jobs, sort_jobs_by_model),
+                **stream_options,
+            )
+            for job_id in job_ids:
+                log_add_to_queue_event(job_id)
+            return len(job_ids) + self._pending_stream_job_count(job_ids)
+
         submit_job = getattr(self._job_service, "submit_job_with_run_mode", None)
         emit_queue_updated = getattr(self._job_service, "_emit_queue_updated", None)
         queue = getattr(self._job_service, "job_queue", None)
         coalesce_queue_state = getattr(queue, "coalesce_state_notifications", None)
         submitted = 0
-        run_config_to_use = run_config or last_run_config
         batch_context = nullcontext()
         if callable(coalesce_queue_state):
             candidate_context = coalesce_queue_state()
             if hasattr(candidate_context, "__enter__") and hasattr(candidate_context, "__exit__"):
                 batch_context = candidate_context
 
-        records = sort_jobs_by_model(records)
+        records = sort_jobs_by_model(list(records))
         with batch_context:
             for record in records:
                 if is_queue_submission_blocked():
@@ -145,32 +209,7 @@ class QueueSubmissionService:
                         len(records),
                     )
                     break
-                cfg = record.config
-                prompt_pack_id = cfg.get("prompt_pack_id") if isinstance(cfg, dict) else None
-                if prompt_pack_id and not getattr(record, "prompt_pack_id", None):
-                    try:
-                        record.prompt_pack_id = prompt_pack_id  # type: ignore[attr-defined]
-                    except Exception:
-                        record.prompt_pack_id = prompt_pack_id
-                prompt_pack_name = None
-                if isinstance(cfg, dict):
-                    prompt_pack_name = cfg.get("prompt_pack_name") or cfg.get("pack_name")
-                ensure_record_prompt_pack_metadata(record, prompt_pack_id, prompt_pack_name)
-                job = to_queue_job(
-                    record,
-                    run_mode="queue",
-                    source=source,
-                    prompt_source=prompt_source,
-                    prompt_pack_id=prompt_pack_id,
-                    run_config=run_config_to_use,
-                )
-                if run_job_payload_factory is not None:
-                    job.payload = run_job_payload_factory(job)
-                if not hasattr(job, "_normalized_record") or job._normalized_record is None:
-                    self._logger.warning(
-                        "PR-CORE1-B2: Job submitted without normalized_record in NJR-only mode. Source: %s",
-                        source,
-                    )
+                job = _queue_job(record)
                 if callable(submit_job):
                     try:
                         submit_job(job, emit_queue_updated=False)
@@ -189,5 +228,47 @@ class QueueSubmissionService:
                 )
         return submitted
 
+    @staticmethod
+    def _sort_queue_jobs_by_model(
+        jobs: list[Any],
+        sort_jobs_by_model: Callable[[list[NormalizedJobRecord]], list[NormalizedJobRecord]],
+    ) -> list[Any]:
+        """Apply ``sort_jobs_by_model`` to a chunk of queue jobs via their NJRs."""
+        records = [getattr(job, "_normalized_record", None) for job in jobs]
+        if any(record is None for record in records):
+            return jobs
+        jobs_by_record = {id(record): job for record, job in zip(records, jobs)}
+        return [jobs_by_record[id(record)] for record in sort_jobs_by_model(records)]
+
+    def _pending_stream_job_count(self, job_ids: list[str]) -> int:
+        """Jobs the stream that queued ``job_ids`` still announces but has not queued."""
+        get_group_id = getattr(self._job_service, "get_virtual_group_id", None)
+        count_pending = getattr(self._job_service, "get_pending_virtual_job_count", None)
+        if not job_ids or not callable(get_group_id) or not callable(count_pending):
+            return 0
+        # Jobs the runner already started are no longer mapped to their group.
+        for job_id in job_ids:
+            group_id = get_group_id(job_id)
+            if group_id is not None:
+                return int(count_pending(group_id))
+        return 0
+
+    def _stream_queue_jobs(
+        self,
+        records: Iterable[NormalizedJobRecord],
+        queue_job: Callable[[NormalizedJobRecord], Any],
+        is_queue_submission_blocked: Callable[[], bool],
+    ) -> Iterator[Any]:
+        converted = 0
+        for record in records:
+            if is_queue_submission_blocked():
+                self._logger.info(
+                    "[QueueSubmissionService] Stopping streamed queue submission after %d jobs because shutdown is in progress",
+                    converted,
+                )
+                return
+            converted += 1
+            yield queue_job(record)
+
 
 __all__ = ["QueueSubmissionService"]
@@ -122,6 +122,9 @@ class AppStateProjectionSink:
         if app_state is None:
             return
         app_state.set_queue_items(list(projection.queue_items))
+        set_pending = getattr(app_state, "set_queue_pending_count", None)
+        if callable(set_pending):
+            set_pending(projection.pending_job_count)
         app_state.set_queue_jobs(list(projection.queue_jobs))
 
     def _apply_history(self, projection: HistoryProjection) -> None:
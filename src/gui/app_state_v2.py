@@ -76,6 +76,7 @@ class AppStateV2:
     resources: dict[str, list[Any]] = field(default_factory=build_empty_resource_map)
     queue_items: list[str] = field(default_factory=list)
     queue_jobs: list[UnifiedJobSummary] = field(default_factory=list)
+    queue_pending_count: int = 0
     running_job: UnifiedJobSummary | None = None
     runtime_status: RuntimeJobStatus | None = None  # Dynamic execution state for running job
     queue_status: str = "idle"
@@ -427,6 +428,13 @@ class AppStateV2:
         self.queue_items = list(items)
         self._notify("queue_items")
 
+    def set_queue_pending_count(self, count: int) -> None:
+        """Set how many streamed jobs are announced but not yet in the queue."""
+        count = max(0, int(count or 0))
+        if self.queue_pending_count != count:
+            self.queue_pending_count = count
+            self._notify("queue_jobs")
+
     def set_queue_jobs(self, jobs: list[UnifiedJobSummary] | None) -> None:
         if jobs is None:
             jobs = []
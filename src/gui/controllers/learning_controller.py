@@ -3203,6 +3203,7 @@ class LearningController:
         import threading
         from pathlib import Path
 
+        from src.config.app_config import get_discovered_grouping_config
         from src.learning.discovered_grouping import GroupingEngine
         from src.learning.output_scanner import OutputScanner
 
@@ -3210,12 +3211,25 @@ class LearningController:
             try:
                 store = self._get_discovered_store()
                 scan_index = store.load_scan_index()
-                scanner = OutputScanner(Path(output_root), scan_index=scan_index)
+                scanner = OutputScanner(
+                    Path(output_root),
+                    scan_index=scan_index,
+                    directory_index=store.load_directory_index(),
+                )
                 records = scanner.scan_incremental()
                 store.save_scan_index(scanner.scan_index)
-
-                existing_ids = {h.group_id for h in store.list_handles()}
-                engine = GroupingEngine()
+                store.save_directory_index(scanner.get_updated_directory_index())
+
+                existing_ids: set[str] = set()
+                for handle in store.list_handles():
+                    existing_ids.add(handle.group_id)
+                    existing_ids.update(handle.member_group_ids)
+                grouping_config = get_discovered_grouping_config()
+                engine = GroupingEngine(
+                    similarity_threshold=(
+                        grouping_config.similarity_threshold if grouping_config.similarity_enabled else None
+                    ),
+                )
                 candidates = engine.build_candidates(records, existing_group_ids=existing_ids)
 
                 for candidate in candidates:
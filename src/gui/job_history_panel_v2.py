@@ -882,6 +882,7 @@ class JobHistoryPanelV2(ttk.Frame):
         elapsed = metrics.get("elapsed_seconds")
         ipm = metrics.get("images_per_minute")
         model_switches = metrics.get("model_switches")
+        model_already_loaded = metrics.get("model_already_loaded")
         vae_switches = metrics.get("vae_switches")
         parts: list[str] = []
         if elapsed is not None:
@@ -890,6 +891,8 @@ class JobHistoryPanelV2(ttk.Frame):
             parts.append(f"img/min={ipm}")
         if model_switches is not None:
             parts.append(f"model_sw={model_switches}")
+        if model_already_loaded:
+            parts.append(f"model_resident={model_already_loaded}")
         if vae_switches is not None:
             parts.append(f"vae_sw={vae_switches}")
         return " | ".join(parts)
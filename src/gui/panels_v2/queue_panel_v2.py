@@ -746,7 +746,10 @@ class QueuePanelV2(ttk.Frame):
             rendered_rows.append(display_text)
 
         count = len(self._jobs)
+        pending = int(getattr(self.app_state, "queue_pending_count", 0) or 0)
         count_text = f"({count} job{'s' if count != 1 else ''})"
+        if pending > 0:
+            count_text = f"({count} job{'s' if count != 1 else ''}, +{pending} pending)"
 
         queue_eta_text = ""
         if count > 0:
@@ -5,6 +5,7 @@ from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 from typing import Any
 
+from src.config.app_config import get_learning_record_commit_config
 from src.controller.content_visibility_resolver import REDACTED_TEXT, ContentVisibilityResolver
 from src.gui.app_state_v2 import AppStateV2
 from src.gui.layout_v2 import configure_grid_columns
@@ -64,8 +65,13 @@ class LearningTabFrame(ttk.Frame):
         self.pipeline_controller = pipeline_controller
         self.app_controller = app_controller  # PR-LEARN-002: Store app_controller reference
         
-        # Initialize learning record writer
-        self.learning_record_writer = LearningRecordWriter(get_learning_records_path())
+        # Initialize learning record writer (group-committed; flushed at persistence-worker shutdown)
+        commit_config = get_learning_record_commit_config()
+        self.learning_record_writer = LearningRecordWriter(
+            get_learning_records_path(),
+            commit_window_ms=commit_config.window_ms,
+            commit_max_records=commit_config.max_records,
+        )
         self.experiment_store = LearningExperimentStore(get_learning_experiments_root())
         self._active_experiment_id: str | None = None
 
@@ -12,6 +12,14 @@ Groups ScanRecords by:
 Eligibility requires:
   - >= 3 artifacts in the group
   - At least 1 meaningful varying field (seed-only groups are rejected)
+
+With ``similarity_threshold`` set, exact-prompt buckets that share stage and
+input lineage are further merged when their prompt tag sets reach that
+Jaccard similarity (MinHash/LSH, see ``prompt_minhash``), so runs that differ
+by one tag or a LoRA weight form a single group. Differing prompts then count
+as the ``positive_prompt`` varying field. A merged group takes the id of its
+smallest exact key, and is treated as already stored when any member's exact
+id is, so the id does not change when neighbours join it later.
 """
 
 from __future__ import annotations
@@ -35,8 +43,10 @@ from src.learning.discovered_review_models import (
     _utc_now_iso,
     RATING_UNRATED,
 )
+from src.learning.prompt_minhash import DEFAULT_NUM_PERM, PromptLSHIndex, prompt_tokens
 
 MIN_GROUP_SIZE = 3
+PROMPT_VARYING_FIELD = "positive_prompt"
 
 
 @dataclass(frozen=True)
@@ -121,8 +131,16 @@ class GroupingEngine:
     against the existing store.
     """
 
-    def __init__(self, min_group_size: int = MIN_GROUP_SIZE) -> None:
+    def __init__(
+        self,
+        min_group_size: int = MIN_GROUP_SIZE,
+        *,
+        similarity_threshold: float | None = None,
+        num_perm: int = DEFAULT_NUM_PERM,
+    ) -> None:
         self.min_group_size = min_group_size
+        self.similarity_threshold = similarity_threshold
+        self.num_perm = num_perm
 
     def build_candidates(
         self,
@@ -136,7 +154,9 @@ class GroupingEngine:
         records:
             Normalized ScanRecords from the scanner.
         existing_group_ids:
-            IDs already present in the store — these groups will not be re-created.
+            IDs already present in the store, including the
+            ``member_group_ids`` of stored groups — records of those
+            exact-prompt buckets will not be grouped again.
         """
         if existing_group_ids is None:
             existing_group_ids = set()
@@ -157,19 +177,33 @@ class GroupingEngine:
             key = _group_key(rec)
             buckets[key].append(rec)
 
+        if self.similarity_threshold is None:
+            clusters = [[key] for key in buckets]
+        else:
+            clusters = self._similar_key_clusters(buckets)
+
         candidates: list[DiscoveredReviewExperiment] = []
-        for key, bucket_records in sorted(buckets.items(), key=lambda kv: str(kv[0])):
-            if len(bucket_records) < self.min_group_size:
+        for cluster in sorted(clusters, key=lambda keys: str(keys[0])):
+            # A member already stored (as its own group, or as a member of a
+            # stored similarity group) keeps its records there; whatever else
+            # the cluster holds is still new and is grouped on its own.
+            members = [member for member in cluster if _make_group_id(member) not in existing_group_ids]
+            if not members:
                 continue
-            varying = _find_varying_fields(bucket_records)
+            key = members[0]
+            group_records = [rec for member in members for rec in buckets[member]]
+            if len(group_records) < self.min_group_size:
+                continue
+            varying = _find_varying_fields(group_records)
+            if len(members) > 1:
+                varying.append(PROMPT_VARYING_FIELD)
             if not varying:
                 # Seed-only or no variation — skip
                 continue
-            group_id = _make_group_id(key)
-            if group_id in existing_group_ids:
-                continue
+            member_ids = [_make_group_id(member) for member in members]
+            group_id = member_ids[0]
             display_name = _make_display_name(key, varying)
-            items = [_scan_record_to_item(r) for r in bucket_records]
+            items = [_scan_record_to_item(r) for r in group_records]
             experiment = DiscoveredReviewExperiment(
                 group_id=group_id,
                 display_name=display_name,
@@ -181,11 +215,36 @@ class GroupingEngine:
                 updated_at=_utc_now_iso(),
                 items=items,
                 varying_fields=varying,
+                member_group_ids=member_ids,
             )
             candidates.append(experiment)
 
         return candidates
 
+    def _similar_key_clusters(self, buckets: dict[_GroupKey, list[ScanRecord]]) -> list[list[_GroupKey]]:
+        """Merge exact-prompt buckets with near-duplicate prompts.
+
+        Only buckets with the same stage and input lineage are compared; each
+        distinct prompt is hashed once however many records share it.
+        """
+        partitions: dict[tuple[str, str], list[_GroupKey]] = defaultdict(list)
+        for key in buckets:
+            partitions[(key.stage, key.input_lineage_key)].append(key)
+
+        clusters: list[list[_GroupKey]] = []
+        for keys in partitions.values():
+            if len(keys) == 1:
+                clusters.append(keys)
+                continue
+            index = PromptLSHIndex(threshold=float(self.similarity_threshold), num_perm=self.num_perm)
+            for key in keys:
+                sample = buckets[key][0]
+                index.add(key.prompt_hash, prompt_tokens(sample.positive_prompt, sample.negative_prompt))
+            by_hash = {key.prompt_hash: key for key in keys}
+            for members in index.clusters():
+                clusters.append(sorted((by_hash[prompt_hash] for prompt_hash in members), key=str))
+        return clusters
+
     def find_varying_fields(self, records: list[ScanRecord]) -> list[str]:
         """Public wrapper for testing."""
         return _find_varying_fields(records)
@@ -133,6 +133,7 @@ class DiscoveredReviewExperiment:
     scan_source_dirs: list[str] = field(default_factory=list)
     schema_version: str = DISCOVERED_REVIEW_SCHEMA_VERSION
     notes: str = ""
+    member_group_ids: list[str] = field(default_factory=list)  # Exact-prompt buckets covered
 
     def validate_status(self) -> bool:
         return self.status in VALID_STATUSES
@@ -163,6 +164,7 @@ class DiscoveredReviewExperiment:
             "scan_source_dirs": list(self.scan_source_dirs),
             "schema_version": self.schema_version,
             "notes": self.notes,
+            "member_group_ids": list(self.member_group_ids),
         }
 
     def to_items_list(self) -> list[dict[str, Any]]:
@@ -186,6 +188,7 @@ class DiscoveredReviewExperiment:
             scan_source_dirs=list(meta.get("scan_source_dirs") or []),
             schema_version=str(meta.get("schema_version") or DISCOVERED_REVIEW_SCHEMA_VERSION),
             notes=str(meta.get("notes") or ""),
+            member_group_ids=list(meta.get("member_group_ids") or []),
         )
         exp.items = [DiscoveredReviewItem.from_dict(i) for i in (items or [])]
         return exp
@@ -203,6 +206,7 @@ class DiscoveredReviewHandle:
     varying_fields: tuple[str, ...]
     created_at: str
     updated_at: str
+    member_group_ids: tuple[str, ...] = ()
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -214,6 +218,7 @@ class DiscoveredReviewHandle:
             "varying_fields": list(self.varying_fields),
             "created_at": self.created_at,
             "updated_at": self.updated_at,
+            "member_group_ids": list(self.member_group_ids),
         }
 
     @staticmethod
@@ -227,6 +232,7 @@ class DiscoveredReviewHandle:
             varying_fields=tuple(d.get("varying_fields") or []),
             created_at=str(d.get("created_at") or ""),
             updated_at=str(d.get("updated_at") or ""),
+            member_group_ids=tuple(d.get("member_group_ids") or []),
         )
 
 
@@ -258,3 +264,62 @@ class OutputScanIndexEntry:
             group_id=str(d.get("group_id") or ""),
             eligible=bool(d.get("eligible", False)),
         )
+
+
+@dataclass
+class OutputManifestStat:
+    """Size/mtime of a manifest file and the scan_key hashed at that stat."""
+
+    size: int
+    mtime_ns: int
+    scan_key: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"size": self.size, "mtime_ns": self.mtime_ns, "scan_key": self.scan_key}
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> OutputManifestStat:
+        return OutputManifestStat(
+            size=int(d.get("size") or 0),
+            mtime_ns=int(d.get("mtime_ns") or 0),
+            scan_key=str(d.get("scan_key") or ""),
+        )
+
+
+@dataclass
+class OutputDirectoryIndexEntry:
+    """Cached listing of one output directory, reused while its mtime is unchanged.
+
+    ``mtime_ns`` of -1 means the listing was taken too close to a change to be
+    trusted and the directory is listed again on the next scan.
+    """
+
+    path: str
+    mtime_ns: int
+    subdirs: tuple[str, ...] = ()
+    images: tuple[str, ...] = ()
+    manifests: dict[str, OutputManifestStat] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "mtime_ns": self.mtime_ns,
+            "subdirs": list(self.subdirs),
+            "images": list(self.images),
+            "manifests": {name: stat.to_dict() for name, stat in self.manifests.items()},
+        }
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> OutputDirectoryIndexEntry:
+        manifests = d.get("manifests") or {}
+        return OutputDirectoryIndexEntry(
+            path=str(d.get("path") or ""),
+            mtime_ns=int(d.get("mtime_ns") or 0),
+            subdirs=tuple(str(name) for name in d.get("subdirs") or []),
+            images=tuple(str(name) for name in d.get("images") or []),
+            manifests={
+                str(name): OutputManifestStat.from_dict(stat)
+                for name, stat in manifests.items()
+                if isinstance(stat, dict)
+            },
+        )
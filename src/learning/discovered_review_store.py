@@ -10,6 +10,7 @@ Directory layout under root:
             items.json         — list of DiscoveredReviewItem dicts
             review_state.json  — per-item rating state (mirrors items ratings)
         scan_index.json        — OutputScanIndexEntry records keyed by artifact_path
+        scan_directory_index.json — OutputDirectoryIndexEntry listings keyed by directory
 """
 
 from __future__ import annotations
@@ -32,6 +33,7 @@ from src.learning.discovered_review_models import (
     DiscoveredReviewExperiment,
     DiscoveredReviewHandle,
     DiscoveredReviewItem,
+    OutputDirectoryIndexEntry,
     OutputScanIndexEntry,
     _utc_now_iso,
 )
@@ -42,6 +44,7 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 OUTPUT_ROOT = REPO_ROOT / "output"
 
 _SCAN_INDEX_FILE = "scan_index.json"
+_DIRECTORY_INDEX_FILE = "scan_directory_index.json"
 _GROUPS_DIR = "discovered_experiments"
 _SELECTION_EVENTS_FILE = "selection_events.json"
 
@@ -56,6 +59,7 @@ class DiscoveredReviewStore:
         self.root = Path(root)
         self._groups_root = self.root / _GROUPS_DIR
         self._scan_index_path = self._groups_root / _SCAN_INDEX_FILE
+        self._directory_index_path = self._groups_root / _DIRECTORY_INDEX_FILE
         self._groups_root.mkdir(parents=True, exist_ok=True)
 
     # ------------------------------------------------------------------
@@ -275,6 +279,7 @@ class DiscoveredReviewStore:
                     varying_fields=tuple(meta.get("varying_fields") or []),
                     created_at=str(meta.get("created_at") or ""),
                     updated_at=str(meta.get("updated_at") or ""),
+                    member_group_ids=tuple(meta.get("member_group_ids") or []),
                 )
             except Exception as exc:
                 logger.warning("Skipping corrupt group dir %s: %s", group_dir, exc)
@@ -325,6 +330,25 @@ class DiscoveredReviewStore:
         index = self.load_scan_index()
         return artifact_path in index
 
+    def load_directory_index(self) -> dict[str, OutputDirectoryIndexEntry]:
+        """Return the output directory listings keyed by directory path."""
+        raw = self._read_json(self._directory_index_path) or {}
+        result: dict[str, OutputDirectoryIndexEntry] = {}
+        for path_str, entry_dict in raw.items():
+            try:
+                result[path_str] = OutputDirectoryIndexEntry.from_dict(entry_dict)
+            except Exception as exc:
+                logger.warning("Skipping corrupt directory index entry %s: %s", path_str, exc)
+        return result
+
+    def save_directory_index(self, index: dict[str, OutputDirectoryIndexEntry]) -> None:
+        """Persist the directory index (compact; it holds one entry per output dir)."""
+        self._write_json(
+            self._directory_index_path,
+            {k: v.to_dict() for k, v in index.items()},
+            indent=None,
+        )
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -357,9 +381,9 @@ class DiscoveredReviewStore:
         return raw
 
     @staticmethod
-    def _write_json(path: Path, data: Any) -> None:
+    def _write_json(path: Path, data: Any, indent: int | None = 2) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        path.write_text(json.dumps(data, indent=indent, sort_keys=True), encoding="utf-8")
 
     @staticmethod
     def _read_json(path: Path) -> Any:
@@ -8,6 +8,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 import time
 import uuid
 from collections.abc import Callable, Iterable
@@ -157,10 +158,192 @@ class LearningRecord:
         )
 
 
-class LearningRecordWriter:
-    """Writes learning records atomically to append-only JSONL."""
+class JsonlTailReader:
+    """Reads the records appended to a JSONL file since the previous call.
+
+    Only complete lines are consumed; a trailing line without a newline is
+    taken once it parses. The first and last bytes of the consumed prefix are
+    remembered so a truncated or rewritten file is detected and re-read from
+    the start.
+    """
+
+    FINGERPRINT_BYTES = 4096
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._clear()
+
+    def _clear(self) -> None:
+        self._offset = 0
+        self._size = -1
+        self._mtime_ns = -1
+        self._head = b""
+        self._tail = b""
+        self._line_count = 0
+
+    def read_new(self) -> tuple[bool, list[tuple[int, Any]]]:
+        """Return ``(reset, [(byte_offset, record), ...])`` for newly appended lines.
+
+        ``reset`` is True when records returned earlier are no longer valid
+        (file removed, truncated or rewritten); the records returned with it
+        then start from the beginning of the file.
+        """
+        try:
+            stat = self.path.stat()
+        except OSError:
+            if self._size == -1:
+                return False, []
+            self._clear()
+            return True, []
+        if stat.st_size == self._size and stat.st_mtime_ns == self._mtime_ns:
+            return False, []
+        reset = False
+        if self._size != -1 and not self._prefix_unchanged(stat.st_size):
+            self._clear()
+            reset = True
+        try:
+            with open(self.path, "rb") as handle:
+                handle.seek(self._offset)
+                data = handle.read()
+        except OSError as exc:
+            logger.error(f"Failed to read learning records from {self.path}: {exc}")
+            return reset, []
+        records, consumed = self._parse(data)
+        if consumed:
+            self._offset += consumed
+            self._remember_fingerprint()
+        self._size = stat.st_size
+        self._mtime_ns = stat.st_mtime_ns
+        return reset, records
+
+    def _prefix_unchanged(self, size: int) -> bool:
+        if size < self._offset:
+            return False
+        try:
+            with open(self.path, "rb") as handle:
+                head = handle.read(len(self._head))
+                handle.seek(self._offset - len(self._tail))
+                tail = handle.read(len(self._tail))
+        except OSError:
+            return False
+        return head == self._head and tail == self._tail
+
+    def _remember_fingerprint(self) -> None:
+        length = min(self._offset, self.FINGERPRINT_BYTES)
+        with open(self.path, "rb") as handle:
+            self._head = handle.read(length)
+            handle.seek(self._offset - length)
+            self._tail = handle.read(length)
+
+    def _parse(self, data: bytes) -> tuple[list[tuple[int, Any]], int]:
+        records: list[tuple[int, Any]] = []
+        consumed = 0
+        length = len(data)
+        while consumed < length:
+            newline = data.find(b"\n", consumed)
+            end = length if newline < 0 else newline + 1
+            line = data[consumed:end].strip()
+            if line:
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    if newline < 0:
+                        break
+                    self._line_count += 1
+                    logger.warning(f"Skipping malformed JSON at line {self._line_count}: {exc}")
+                    consumed = end
+                    continue
+                records.append((self._offset + consumed, record))
+            self._line_count += 1
+            consumed = end
+        return records, consumed
+
+
+def _index_key(value: Any) -> Any:
+    """Dict key that compares like ``==`` on JSON values (lists/dicts included)."""
+    try:
+        hash(value)
+    except TypeError:
+        return ("json", json.dumps(value, sort_keys=True, default=str))
+    return value
+
+
+class _LearningRecordRatingIndex:
+    """In-process rating lookups, updated from the records file's tail."""
+
+    def __init__(self, records_path: Path) -> None:
+        self._reader = JsonlTailReader(records_path)
+        self._lock = threading.Lock()
+        self._ratings: dict[Any, dict[Any, int]] = {}
+        self._variant_totals: dict[tuple[Any, Any], list[int]] = {}
+
+    def refresh(self) -> None:
+        with self._lock:
+            reset, records = self._reader.read_new()
+            if reset:
+                self._ratings.clear()
+                self._variant_totals.clear()
+            for _offset, record in records:
+                self._add(record)
+
+    def _add(self, record: Any) -> None:
+        metadata = record.get("metadata", {}) if isinstance(record, dict) else None
+        if not isinstance(metadata, dict):
+            return
+        rating = metadata.get("user_rating")
+        if rating is None:
+            return
+        try:
+            rating_value = int(rating)
+        except (TypeError, ValueError):
+            return
+        experiment = _index_key(metadata.get("experiment_name"))
+        image_path = metadata.get("image_path")
+        if image_path:
+            self._ratings.setdefault(experiment, {})[_index_key(image_path)] = rating_value
+        totals = self._variant_totals.setdefault((experiment, _index_key(metadata.get("variant_value"))), [0, 0])
+        totals[0] += rating_value
+        totals[1] += 1
+
+    def ratings_for(self, experiment_id: Any) -> dict[Any, int]:
+        self.refresh()
+        with self._lock:
+            return dict(self._ratings.get(_index_key(experiment_id), {}))
+
+    def rated_among(self, experiment_id: Any, image_paths: Iterable[Any]) -> set[Any]:
+        self.refresh()
+        with self._lock:
+            ratings = self._ratings.get(_index_key(experiment_id), {})
+            return {path for path in image_paths if _index_key(path) in ratings}
+
+    def average_for(self, experiment_id: Any, variant_value: Any) -> float | None:
+        self.refresh()
+        with self._lock:
+            totals = self._variant_totals.get((_index_key(experiment_id), _index_key(variant_value)))
+            if not totals:
+                return None
+            return totals[0] / totals[1]
 
-    def __init__(self, records_path: str | os.PathLike[str]) -> None:
+
+class LearningRecordWriter:
+    """Writes learning records atomically to append-only JSONL.
+
+    By default every record is fsynced before ``append_record`` returns. With
+    ``commit_window_ms > 0`` the writer group-commits: each record is still
+    appended as one complete line straight away (so in-process readers see
+    it), but the fsync is shared by every record appended within the window,
+    or issued early once ``commit_max_records`` are pending. ``flush()`` is a
+    durability barrier; ``close()`` flushes and stops the committer thread and
+    is also run by ``shutdown_persistence_worker()``.
+    """
+
+    def __init__(
+        self,
+        records_path: str | os.PathLike[str],
+        *,
+        commit_window_ms: int = 0,
+        commit_max_records: int = 64,
+    ) -> None:
         path_obj = Path(records_path)
         if path_obj.is_dir() or not path_obj.suffix:
             path_obj.mkdir(parents=True, exist_ok=True)
@@ -168,68 +351,134 @@ class LearningRecordWriter:
         else:
             path_obj.parent.mkdir(parents=True, exist_ok=True)
         self.records_path = path_obj
+        self._rating_index = _LearningRecordRatingIndex(path_obj)
+        self._rating_index_built = False
+        self._commit_window_s = max(0, int(commit_window_ms)) / 1000.0
+        self._commit_max_records = max(1, int(commit_max_records))
+        # Guards the file appends and the unsynced counters; never held across fsync.
+        self._commit_cond = threading.Condition()
+        # Serializes fsyncs so flush() waits for one already in progress.
+        self._fsync_lock = threading.Lock()
+        self._unsynced = 0
+        self._unsynced_since = 0.0
+        self._committer: threading.Thread | None = None
+        self._closed = False
+        self.fsync_count = 0
+        if self._commit_window_s > 0:
+            from src.services.persistence_worker import register_shutdown_flush
+
+            register_shutdown_flush(self.close)
+
+    @property
+    def group_commit_enabled(self) -> bool:
+        return self._commit_window_s > 0 and not self._closed
 
     def append_record(self, record: LearningRecord) -> None:
-        """Append a record as a single JSON line with fsync for durability."""
+        """Append a record as a single JSON line (fsynced now or at the next group commit)."""
         try:
-            line = record.to_json() + "\n"
-            temp_path = self.records_path.with_suffix(self.records_path.suffix + ".tmp")
-            with open(temp_path, "w", encoding="utf-8") as temp_file:
-                temp_file.write(line)
-                temp_file.flush()
-                os.fsync(temp_file.fileno())
-            with open(self.records_path, "a", encoding="utf-8") as dest:
-                with open(temp_path, encoding="utf-8") as src:
-                    data = src.read()
-                dest.write(data)
-                dest.flush()
-                os.fsync(dest.fileno())
-            try:
-                temp_path.unlink(missing_ok=True)  # type: ignore[arg-type]
-            except Exception:
-                pass
+            payload = (record.to_json() + "\n").encode("utf-8")
+            with self._commit_cond:
+                group_commit = self.group_commit_enabled
+                self._append_bytes(payload, sync=not group_commit)
+                if group_commit:
+                    if not self._unsynced:
+                        self._unsynced_since = time.monotonic()
+                    self._unsynced += 1
+                    self._ensure_committer()
+                    self._commit_cond.notify_all()
         except Exception:
             logger.debug("Failed to write learning record", exc_info=True)
+            return
+        if self._rating_index_built:
+            # Picks up just the appended line (and anything appended externally).
+            self._rating_index.refresh()
+
+    def _append_bytes(self, payload: bytes, *, sync: bool) -> None:
+        with open(self.records_path, "a+b") as handle:
+            if handle.seek(0, os.SEEK_END) > 0:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    # Terminate a torn line left by a crashed writer so this
+                    # record does not get glued onto it.
+                    payload = b"\n" + payload
+            handle.write(payload)
+            handle.flush()
+            if sync:
+                os.fsync(handle.fileno())
+                self.fsync_count += 1
+
+    def _ensure_committer(self) -> None:
+        # Called with _commit_cond held. The committer exits once nothing is
+        # pending, so it never outlives the records it has to sync.
+        if self._committer is None or not self._committer.is_alive():
+            from src.utils.thread_registry import get_thread_registry
+
+            self._committer = get_thread_registry().spawn(
+                target=self._commit_loop,
+                name="LearningRecordCommitter",
+                daemon=False,
+                purpose="Group-commit fsyncs for learning record appends",
+            )
+
+    def _commit_loop(self) -> None:
+        while True:
+            with self._commit_cond:
+                if not self._unsynced:
+                    if self._committer is threading.current_thread():
+                        self._committer = None
+                    return
+                deadline = self._unsynced_since + self._commit_window_s
+                while not self._closed and self._unsynced < self._commit_max_records:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._commit_cond.wait(remaining)
+            self._sync_appended()
+
+    def _sync_appended(self) -> None:
+        with self._fsync_lock:
+            with self._commit_cond:
+                if not self._unsynced:
+                    return
+                self._unsynced = 0
+            try:
+                with open(self.records_path, "ab") as handle:
+                    os.fsync(handle.fileno())
+                self.fsync_count += 1
+            except OSError:
+                logger.warning(f"Failed to fsync learning records at {self.records_path}", exc_info=True)
+
+    def flush(self) -> None:
+        """Block until every record appended so far has been fsynced."""
+        self._sync_appended()
+
+    def close(self) -> None:
+        """Flush pending records and stop group commit; later appends fsync immediately."""
+        with self._commit_cond:
+            self._closed = True
+            self._commit_cond.notify_all()
+            committer = self._committer
+        if committer is not None and committer is not threading.current_thread():
+            committer.join(timeout=5.0)
+        self._sync_appended()
 
     def write(self, record: LearningRecord) -> None:
         """Backward compatible alias for append_record."""
 
         self.append_record(record)
 
-    def get_ratings_for_experiment(self, experiment_id: str) -> dict[str, int]:
-        """Get all ratings for an experiment as {image_path: rating} dict."""
-        ratings: dict[str, int] = {}
+    def _built_rating_index(self) -> _LearningRecordRatingIndex:
+        self._rating_index_built = True
+        return self._rating_index
 
-        if not self.records_path.exists():
-            return ratings
-
-        try:
-            with open(self.records_path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                        metadata = record.get("metadata", {})
-
-                        # Check if this record is for our experiment
-                        if metadata.get("experiment_name") != experiment_id:
-                            continue
-
-                        # Extract rating and image path
-                        rating = metadata.get("user_rating")
-                        image_path = metadata.get("image_path")
-
-                        if rating is not None and image_path:
-                            ratings[image_path] = int(rating)
-
-                    except (json.JSONDecodeError, ValueError):
-                        continue
-        except Exception:
-            pass
+    def get_ratings_for_experiment(self, experiment_id: str) -> dict[str, int]:
+        """Get all ratings for an experiment as {image_path: rating} dict.
 
-        return ratings
+        Served from an in-process index that is built on first use and then
+        extended with lines appended to the records file; a rewritten file
+        is re-indexed from the start.
+        """
+        return self._built_rating_index().ratings_for(experiment_id)
 
     def get_average_rating_for_variant(
         self,
@@ -237,40 +486,15 @@ class LearningRecordWriter:
         variant_value: Any,
     ) -> float | None:
         """Get average rating for a specific variant."""
-        ratings = []
-
-        if not self.records_path.exists():
-            return None
-
-        try:
-            with open(self.records_path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                        metadata = record.get("metadata", {})
-
-                        if (metadata.get("experiment_name") == experiment_id and
-                            metadata.get("variant_value") == variant_value):
-                            rating = metadata.get("user_rating")
-                            if rating is not None:
-                                ratings.append(int(rating))
-
-                    except (json.JSONDecodeError, ValueError):
-                        continue
-        except Exception:
-            pass
-
-        if ratings:
-            return sum(ratings) / len(ratings)
-        return None
+        return self._built_rating_index().average_for(experiment_id, variant_value)
 
     def is_image_rated(self, experiment_id: str, image_path: str) -> bool:
         """Check if an image has already been rated."""
-        ratings = self.get_ratings_for_experiment(experiment_id)
-        return image_path in ratings
+        return bool(self._built_rating_index().rated_among(experiment_id, (image_path,)))
+
+    def get_rated_images(self, experiment_id: str, image_paths: Iterable[str]) -> set[str]:
+        """Return the subset of *image_paths* that already have a rating."""
+        return self._built_rating_index().rated_among(experiment_id, image_paths)
 
 
 logger = logging.getLogger(__name__)
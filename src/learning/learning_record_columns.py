@@ -0,0 +1,282 @@
+# Subsystem: Learning
+# Role: Columnar, tail-ingested view of scored learning records.
+
+"""Columnar learning-record store used by RecommendationEngine.
+
+Scored records are kept as typed ``array.array`` columns, with strings and
+parameter values dictionary-encoded to integer codes. ``refresh()`` ingests
+only the lines appended to ``learning_records.jsonl`` since the previous call.
+A file that shrank or whose already-ingested bytes changed is reloaded from
+the start. ``numpy_columns()`` exposes the columns as NumPy arrays so
+recommendation queries can run as vectorized reductions.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from src.learning.learning_record import JsonlTailReader
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+PRIMARY_PARAMETERS: tuple[str, ...] = ("sampler", "scheduler", "steps", "cfg_scale")
+_PRIMARY_FIELDS: tuple[str, ...] = (
+    "primary_sampler",
+    "primary_scheduler",
+    "primary_steps",
+    "primary_cfg_scale",
+)
+
+KIND_EXPERIMENT = 0
+KIND_REVIEW = 1
+
+# Rating-detail weighting, shared with RecommendationEngine._apply_rating_detail_adjustment:
+# context-weight change per subscore point away from 3.0, and the penalty for a
+# people-free record with poor anatomy when the query has people.
+SUBSCORE_WEIGHT_PER_POINT = 0.025
+PEOPLE_MISMATCH_PENALTY = 0.10
+
+_COLUMN_TYPES: dict[str, str] = {
+    "rating": "d",
+    "kind": "b",
+    "stage": "i",
+    "model": "i",
+    "prompt": "i",
+    "refinement_policy": "i",
+    "refinement_policy_ids": "i",
+    "refinement_scale_band": "i",
+    "refinement_intent_band": "i",
+    "motion_status": "i",
+    "motion_backend": "i",
+    "motion_policy": "i",
+    "motion_path": "i",
+    "has_subscores": "b",
+    "subscore_adjustment": "d",
+    "people_penalty": "b",
+    "sampler": "i",
+    "scheduler": "i",
+    "steps": "i",
+    "cfg_scale": "i",
+    "variable_parameter": "i",
+    "variable_value": "i",
+    "offset": "q",
+}
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class ParameterValues:
+    """Dictionary encoding for the values of one recommendation parameter.
+
+    Raw codes keep values of different types apart so the first-seen object
+    can be reported unchanged; group codes merge values that compare equal,
+    the way dict keys do (``20`` and ``20.0`` share a group).
+    """
+
+    def __init__(self) -> None:
+        self._raw_codes: dict[tuple[type, Any], int] = {}
+        self._group_codes: dict[Any, int] = {}
+        self.raw_values: list[Any] = []
+        self.raw_groups: list[int] = []
+
+    def encode(self, value: Any) -> int:
+        """Return the raw code for *value*, or -1 when it cannot be a dict key."""
+        key = (type(value), value)
+        try:
+            code = self._raw_codes.get(key)
+        except TypeError:
+            return -1
+        if code is None:
+            code = len(self.raw_values)
+            self._raw_codes[key] = code
+            self.raw_values.append(value)
+            self.raw_groups.append(self._group_codes.setdefault(value, len(self._group_codes)))
+        return code
+
+
+class LearningRecordColumns:
+    """Scored learning records held column-wise and refreshed by tailing the file.
+
+    ``scorer`` turns a list of raw record dicts into scored record dicts (see
+    ``RecommendationEngine._score_records``); records it drops are counted in
+    ``raw_record_count`` only.
+    """
+
+    def __init__(
+        self,
+        records_path: str | os.PathLike[str],
+        scorer: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    ) -> None:
+        self.records_path = Path(records_path)
+        self._scorer = scorer
+        self.reload_count = 0
+        self._reader = JsonlTailReader(self.records_path)
+        self._reset()
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def _reset(self) -> None:
+        self.raw_record_count = 0
+        self._strings: dict[str, int] = {"": 0}
+        self.string_values: list[str] = [""]
+        self._policy_id_sets: dict[tuple[str, ...], int] = {(): 0}
+        self.policy_id_set_values: list[tuple[str, ...]] = [()]
+        self._parameters: dict[str, int] = {name: index for index, name in enumerate(PRIMARY_PARAMETERS)}
+        self.parameter_names: list[str] = list(PRIMARY_PARAMETERS)
+        self.parameter_values: list[ParameterValues] = [ParameterValues() for _ in PRIMARY_PARAMETERS]
+        self._columns: dict[str, array] = {name: array(code) for name, code in _COLUMN_TYPES.items()}
+        self._numpy_cache: dict[str, Any] | None = None
+
+    def __len__(self) -> int:
+        return len(self._columns["rating"])
+
+    def refresh(self) -> bool:
+        """Ingest lines appended since the last refresh; returns True if anything changed."""
+        reset, records = self._reader.read_new()
+        if reset:
+            self._reset()
+            self.reload_count += 1
+        for offset, record in records:
+            self.raw_record_count += 1
+            if isinstance(record, dict):
+                for scored in self._scorer([record]):
+                    self._append(scored, offset)
+        if records:
+            self._numpy_cache = None
+        return reset or bool(records)
+
+    def _string(self, value: Any) -> int:
+        text = str(value or "")
+        code = self._strings.get(text)
+        if code is None:
+            code = len(self.string_values)
+            self._strings[text] = code
+            self.string_values.append(text)
+        return code
+
+    def string_code(self, value: Any) -> int:
+        """Code for an already-seen string, or -1 (matches no row) if unseen."""
+        return self._strings.get(str(value or ""), -1)
+
+    def parameter_code(self, name: str) -> int:
+        code = self._parameters.get(name)
+        if code is None:
+            code = len(self.parameter_names)
+            self._parameters[name] = code
+            self.parameter_names.append(name)
+            self.parameter_values.append(ParameterValues())
+        return code
+
+    def _append(self, scored: dict[str, Any], offset: int) -> None:
+        columns = self._columns
+        refinement = scored.get("adaptive_refinement") or {}
+        motion = scored.get("secondary_motion") or {}
+        subscores = scored.get("subscores") or {}
+        context_flags = scored.get("context_flags") or {}
+
+        policy_ids = tuple(refinement.get("policy_ids") or ())
+        policy_ids_code = self._policy_id_sets.get(policy_ids)
+        if policy_ids_code is None:
+            policy_ids_code = len(self.policy_id_set_values)
+            self._policy_id_sets[policy_ids] = policy_ids_code
+            self.policy_id_set_values.append(policy_ids)
+
+        # Same arithmetic as RecommendationEngine._apply_rating_detail_adjustment.
+        adjustment = 0.0
+        valid = [float(value) for value in subscores.values() if 1.0 <= float(value) <= 5.0]
+        if valid:
+            adjustment += (sum(valid) / len(valid) - 3.0) * SUBSCORE_WEIGHT_PER_POINT
+        people_penalty = False
+        record_has_people = context_flags.get("has_people")
+        anatomy = subscores.get("anatomy")
+        if record_has_people is not None and not bool(record_has_people) and anatomy is not None:
+            try:
+                people_penalty = float(anatomy) < 3.0
+            except (TypeError, ValueError):
+                people_penalty = False
+
+        columns["rating"].append(float(scored["rating"]))
+        columns["kind"].append(
+            KIND_EXPERIMENT if scored.get("record_kind") == "learning_experiment_rating" else KIND_REVIEW
+        )
+        columns["stage"].append(self._string(scored.get("stage") or "txt2img"))
+        columns["model"].append(self._string(str(scored.get("model", "")).strip().lower()))
+        columns["prompt"].append(self._string(scored.get("base_prompt", "")))
+        columns["refinement_policy"].append(self._string(refinement.get("policy_id")))
+        columns["refinement_policy_ids"].append(policy_ids_code)
+        columns["refinement_scale_band"].append(self._string(refinement.get("scale_band")))
+        columns["refinement_intent_band"].append(self._string(refinement.get("prompt_intent_band")))
+        columns["motion_status"].append(self._string(motion.get("status")))
+        columns["motion_backend"].append(self._string(motion.get("backend_id")))
+        columns["motion_policy"].append(self._string(motion.get("policy_id")))
+        columns["motion_path"].append(self._string(motion.get("application_path")))
+        columns["has_subscores"].append(1 if subscores else 0)
+        columns["subscore_adjustment"].append(adjustment)
+        columns["people_penalty"].append(1 if people_penalty else 0)
+        for index, (name, field_name) in enumerate(zip(PRIMARY_PARAMETERS, _PRIMARY_FIELDS)):
+            columns[name].append(self.parameter_values[index].encode(scored.get(field_name)))
+
+        variable_parameter = -1
+        variable_value = -1
+        variable_name = scored.get("variable_under_test")
+        if variable_name and scored.get("variant_value") is not None:
+            parameter = self.parameter_code(str(variable_name).lower().replace(" ", "_"))
+            variable_value = self.parameter_values[parameter].encode(scored["variant_value"])
+            if variable_value >= 0:
+                variable_parameter = parameter
+        columns["variable_parameter"].append(variable_parameter)
+        columns["variable_value"].append(variable_value)
+        columns["offset"].append(offset)
+
+    # ------------------------------------------------------------------
+    # Query helpers
+    # ------------------------------------------------------------------
+
+    def numpy_columns(self) -> dict[str, Any]:
+        """Columns as NumPy arrays plus ``group_lookup[parameter_code]`` arrays."""
+        if np is None:
+            raise RuntimeError("numpy is required for columnar learning-record queries")
+        if self._numpy_cache is None:
+            cache: dict[str, Any] = {name: np.array(column) for name, column in self._columns.items()}
+            cache["group_lookup"] = [
+                np.array(values.raw_groups, dtype=np.int64) for values in self.parameter_values
+            ]
+            self._numpy_cache = cache
+        return self._numpy_cache
+
+    def read_scored_row(self, row: int) -> dict[str, Any] | None:
+        """Re-read and score the record stored at *row* (used for rationale text)."""
+        try:
+            with open(self.records_path, "rb") as handle:
+                handle.seek(self._columns["offset"][row])
+                record = json.loads(handle.readline())
+        except (OSError, ValueError, IndexError):
+            return None
+        if not isinstance(record, dict):
+            return None
+        scored = self._scorer([record])
+        return scored[0] if scored else None
+
+
+__all__ = [
+    "KIND_EXPERIMENT",
+    "KIND_REVIEW",
+    "LearningRecordColumns",
+    "PEOPLE_MISMATCH_PENALTY",
+    "PRIMARY_PARAMETERS",
+    "ParameterValues",
+    "SUBSCORE_WEIGHT_PER_POINT",
+    "numpy_available",
+]
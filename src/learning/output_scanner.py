@@ -8,7 +8,10 @@ Scan order:
 2. Fallback to embedded image metadata when no manifest exists
 
 The scanner is incremental: previously indexed artifacts are skipped unless
-their scan_key (manifest mtime hash) has changed.
+their scan_key (manifest content hash) has changed. ``scan_incremental`` also
+keeps a directory index (per-directory mtime and listing, per-manifest size
+and mtime): directories whose mtime is unchanged are not listed again, and
+only manifests whose size or mtime changed are re-hashed.
 """
 
 from __future__ import annotations
@@ -16,14 +19,21 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from src.controller.content_visibility_resolver import build_content_visibility_payload
 from src.learning.output_scan_models import ScanRecord, _utc_now_iso
-from src.learning.discovered_review_models import OutputScanIndexEntry
+from src.learning.discovered_review_models import (
+    OutputDirectoryIndexEntry,
+    OutputManifestStat,
+    OutputScanIndexEntry,
+)
 from src.utils.image_metadata import (
     extract_embedded_metadata,
     resolve_prompt_fields,
@@ -33,6 +43,11 @@ from src.utils.image_metadata import (
 logger = logging.getLogger(__name__)
 
 _IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+_ARTIFACT_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+_MANIFESTS_DIR_NAME = "manifests"
+# Listings/stats whose mtime is this close to the scan start may still be
+# changing within the filesystem's timestamp granularity; they are not trusted.
+_RACY_MTIME_WINDOW_NS = 2_000_000_000
 
 
 def _sha256_short(data: bytes) -> str:
@@ -281,6 +296,27 @@ def _record_from_embedded(image_path: Path) -> ScanRecord | None:
     return _normalize_record(record)
 
 
+@dataclass
+class _ManifestCandidate:
+    manifest_path: Path
+    artifact_path: Path
+    stat: OutputManifestStat
+    cached_scan_key: str
+
+
+def _normcased_names(names: tuple[str, ...]) -> frozenset[str]:
+    return frozenset(os.path.normcase(name) for name in names)
+
+
+def _artifact_from_listing(stem: str, sources: list[tuple[Path, frozenset[str]]]) -> Path | None:
+    """Listing-based equivalent of ``OutputScanner._artifact_for_manifest``."""
+    for directory, names in sources:
+        for ext in _ARTIFACT_EXTENSIONS:
+            if os.path.normcase(f"{stem}{ext}") in names:
+                return directory / f"{stem}{ext}"
+    return None
+
+
 class OutputScanner:
     """Scans an output directory tree for image artifacts.
 
@@ -290,6 +326,13 @@ class OutputScanner:
         Root under which to search for ``manifests/`` directories.
     scan_index:
         Existing scan index keyed by artifact_path.  Updated in place.
+    directory_index:
+        Directory listings from a previous ``scan_incremental`` keyed by
+        directory path.  Replaced after each incremental scan; persist
+        ``get_updated_directory_index()`` to reuse it across sessions.
+    max_workers:
+        Thread count for hashing and parsing changed manifests during
+        ``scan_incremental``; 1 scans serially.
     """
 
     MANIFEST_GLOB = "**/manifests/*.json"
@@ -299,30 +342,42 @@ class OutputScanner:
         self,
         output_root: Path | str,
         scan_index: dict[str, OutputScanIndexEntry] | None = None,
+        directory_index: dict[str, OutputDirectoryIndexEntry] | None = None,
+        max_workers: int = 1,
     ) -> None:
         self.output_root = Path(output_root)
         self.scan_index: dict[str, OutputScanIndexEntry] = scan_index or {}
+        self.directory_index: dict[str, OutputDirectoryIndexEntry] = directory_index or {}
+        self.max_workers = max(1, int(max_workers))
+        self.last_scan_stats: dict[str, int] = {}
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def scan_incremental(self) -> list[ScanRecord]:
+    def scan_incremental(self, max_workers: int | None = None) -> list[ScanRecord]:
         """Return new ScanRecords for artifacts not yet in the index."""
+        workers = max(1, int(max_workers if max_workers is not None else self.max_workers))
+        candidates = self._collect_manifest_candidates()
+        if workers > 1 and len(candidates) > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="output-scan") as pool:
+                outcomes = list(pool.map(self._scan_candidate, candidates))
+        else:
+            outcomes = [self._scan_candidate(candidate) for candidate in candidates]
+
         records: list[ScanRecord] = []
-        for manifest_path in sorted(self.output_root.glob(self.MANIFEST_GLOB)):
-            artifact_path = self._artifact_for_manifest(manifest_path)
-            if artifact_path is None:
+        hashed = 0
+        for candidate, (scan_key, record, parsed) in zip(candidates, outcomes):
+            if not candidate.cached_scan_key:
+                hashed += 1
+            candidate.stat.scan_key = scan_key
+            if not parsed:
                 continue
-            scan_key = _manifest_scan_key(manifest_path)
-            key = str(artifact_path)
-            if self._already_indexed(key, scan_key):
-                continue
-            record = _record_from_manifest(manifest_path, artifact_path)
             if record is None:
-                self._mark_indexed(key, scan_key, group_id="", eligible=False)
+                self._mark_indexed(str(candidate.artifact_path), scan_key, group_id="", eligible=False)
                 continue
             records.append(record)
+        self.last_scan_stats["manifests_hashed"] = hashed
         return records
 
     def scan_full(self) -> list[ScanRecord]:
@@ -358,6 +413,9 @@ class OutputScanner:
     def get_updated_index(self) -> dict[str, OutputScanIndexEntry]:
         return dict(self.scan_index)
 
+    def get_updated_directory_index(self) -> dict[str, OutputDirectoryIndexEntry]:
+        return dict(self.directory_index)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -382,6 +440,130 @@ class OutputScanner:
                 return candidate
         return None
 
+    def _collect_manifest_candidates(self) -> list[_ManifestCandidate]:
+        """Walk the tree through the directory index and stat every manifest.
+
+        Rebuilds ``directory_index`` from the directories seen in this walk.
+        """
+        previous = self.directory_index
+        current: dict[str, OutputDirectoryIndexEntry] = {}
+        racy_after_ns = time.time_ns() - _RACY_MTIME_WINDOW_NS
+        stats = {"directories": 0, "directories_listed": 0, "manifests": 0, "manifests_hashed": 0}
+        candidates: list[_ManifestCandidate] = []
+        pending: list[tuple[Path, OutputDirectoryIndexEntry | None]] = [(self.output_root, None)]
+        while pending:
+            directory, parent_entry = pending.pop()
+            try:
+                dir_mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+            key = str(directory)
+            stats["directories"] += 1
+            entry = previous.get(key)
+            if entry is None or entry.mtime_ns < 0 or entry.mtime_ns != dir_mtime_ns:
+                entry = self._list_directory(directory, dir_mtime_ns, racy_after_ns, previous=entry)
+                if entry is None:
+                    continue
+                stats["directories_listed"] += 1
+            current[key] = entry
+            if directory != self.output_root and directory.name == _MANIFESTS_DIR_NAME:
+                candidates.extend(
+                    self._stat_manifests(directory, entry, parent_entry, racy_after_ns)
+                )
+            for name in entry.subdirs:
+                pending.append((directory / name, entry))
+        stats["manifests"] = len(candidates)
+        self.directory_index = current
+        self.last_scan_stats = stats
+        candidates.sort(key=lambda candidate: candidate.manifest_path)
+        return candidates
+
+    @staticmethod
+    def _list_directory(
+        directory: Path,
+        mtime_ns: int,
+        racy_after_ns: int,
+        previous: OutputDirectoryIndexEntry | None,
+    ) -> OutputDirectoryIndexEntry | None:
+        subdirs: list[str] = []
+        images: list[str] = []
+        manifests: dict[str, OutputManifestStat] = {}
+        known = previous.manifests if previous is not None else {}
+        collect_manifests = directory.name == _MANIFESTS_DIR_NAME
+        try:
+            with os.scandir(directory) as entries:
+                for item in entries:
+                    try:
+                        if item.is_dir():
+                            subdirs.append(item.name)
+                            continue
+                    except OSError:
+                        continue
+                    suffix = os.path.splitext(item.name)[1].lower()
+                    if suffix in _IMAGE_EXTENSIONS:
+                        images.append(item.name)
+                    elif collect_manifests and suffix == ".json":
+                        manifests[item.name] = known.get(item.name) or OutputManifestStat(-1, -1, "")
+        except OSError as exc:
+            logger.debug("Failed to list output directory %s: %s", directory, exc)
+            return None
+        return OutputDirectoryIndexEntry(
+            path=str(directory),
+            mtime_ns=-1 if mtime_ns >= racy_after_ns else mtime_ns,
+            subdirs=tuple(sorted(subdirs)),
+            images=tuple(sorted(images)),
+            manifests=manifests,
+        )
+
+    def _stat_manifests(
+        self,
+        manifests_dir: Path,
+        entry: OutputDirectoryIndexEntry,
+        parent_entry: OutputDirectoryIndexEntry | None,
+        racy_after_ns: int,
+    ) -> list[_ManifestCandidate]:
+        sibling_sources = [
+            (manifests_dir.parent, _normcased_names(parent_entry.images if parent_entry else ())),
+            (manifests_dir, _normcased_names(entry.images)),
+        ]
+        candidates: list[_ManifestCandidate] = []
+        for name, cached in entry.manifests.items():
+            manifest_path = manifests_dir / name
+            artifact_path = _artifact_from_listing(manifest_path.stem, sibling_sources)
+            if artifact_path is None:
+                continue
+            try:
+                file_stat = manifest_path.stat()
+            except OSError:
+                continue
+            unchanged = (
+                bool(cached.scan_key)
+                and cached.size == file_stat.st_size
+                and cached.mtime_ns == file_stat.st_mtime_ns
+            )
+            stat = OutputManifestStat(
+                size=file_stat.st_size,
+                mtime_ns=-1 if file_stat.st_mtime_ns >= racy_after_ns else file_stat.st_mtime_ns,
+                scan_key=cached.scan_key if unchanged else "",
+            )
+            entry.manifests[name] = stat
+            candidates.append(
+                _ManifestCandidate(
+                    manifest_path=manifest_path,
+                    artifact_path=artifact_path,
+                    stat=stat,
+                    cached_scan_key=stat.scan_key,
+                )
+            )
+        return candidates
+
+    def _scan_candidate(self, candidate: _ManifestCandidate) -> tuple[str, ScanRecord | None, bool]:
+        """Return (scan_key, record, parsed); parsed is False for already-indexed artifacts."""
+        scan_key = candidate.cached_scan_key or _manifest_scan_key(candidate.manifest_path)
+        if self._already_indexed(str(candidate.artifact_path), scan_key):
+            return scan_key, None, False
+        return scan_key, _record_from_manifest(candidate.manifest_path, candidate.artifact_path), True
+
     def _already_indexed(self, artifact_path: str, scan_key: str) -> bool:
         entry = self.scan_index.get(artifact_path)
         if entry is None:
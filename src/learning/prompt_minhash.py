@@ -0,0 +1,189 @@
+# Subsystem: Learning
+# Role: MinHash signatures and LSH candidate search over prompt tag sets.
+
+"""MinHash / locality-sensitive hashing for near-duplicate prompt detection.
+
+Prompts are reduced to sets of normalized comma-separated tags (LoRA and
+attention weights stripped, so ``<lora:detail:0.6>`` and ``<lora:detail:0.8>``
+are the same tag). ``PromptLSHIndex`` buckets MinHash signatures band by band
+and verifies every colliding pair with the exact Jaccard similarity of the tag
+sets, so results never include pairs below the threshold. All hashing is
+seeded by constants, so the same prompts always produce the same clusters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Hashable, Iterable
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_JACCARD_THRESHOLD = 0.6
+
+_MASK64 = (1 << 64) - 1
+_LORA_WEIGHT_RE = re.compile(r"<(lora|lyco|hypernet):([^:>]+)(?::[^>]*)?>")
+_ATTENTION_WEIGHT_RE = re.compile(r"\(([^():]+):\s*-?[\d.]+\)")
+
+
+def _mix64(value: int) -> int:
+    """SplitMix64 finalizer; a cheap, well-distributed 64-bit permutation."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def prompt_tokens(positive: str, negative: str = "") -> frozenset[str]:
+    """Return the normalized tag set used for prompt similarity."""
+    tokens: set[str] = set()
+    for prefix, text in (("", positive), ("neg:", negative)):
+        text = _LORA_WEIGHT_RE.sub(r"<\1:\2>", str(text or "").lower())
+        text = _ATTENTION_WEIGHT_RE.sub(r"\1", text)
+        for part in text.replace("\n", " ").split(","):
+            tag = " ".join(part.split())
+            if tag:
+                tokens.add(prefix + tag)
+    return frozenset(tokens)
+
+
+def jaccard(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def lsh_band_layout(num_perm: int, threshold: float, recall: float = 0.95) -> tuple[int, int]:
+    """Pick ``(bands, rows)`` with ``bands * rows <= num_perm``.
+
+    A pair at exactly *threshold* similarity becomes a candidate with
+    probability ``1 - (1 - threshold ** rows) ** bands``; the layout with the
+    most rows per band (fewest dissimilar candidates) that still reaches
+    *recall* is used, falling back to the highest-recall layout.
+    """
+    best: tuple[float, int, int] | None = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        probability = 1.0 - (1.0 - threshold**rows) ** bands
+        if probability >= recall:
+            best = (probability, bands, rows)
+        elif best is None or (best[0] < recall and probability > best[0]):
+            best = (probability, bands, rows)
+    assert best is not None
+    return best[1], best[2]
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures for token sets."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM) -> None:
+        if num_perm < 1:
+            raise ValueError("num_perm must be >= 1")
+        self.num_perm = num_perm
+        self._salts = [_mix64(index + 1) for index in range(num_perm)]
+        self._np_salts = np.array(self._salts, dtype=np.uint64) if np is not None else None
+
+    def signature(self, tokens: Iterable[str]) -> tuple[int, ...]:
+        hashes = sorted({_token_hash(token) for token in tokens})
+        if not hashes:
+            return (_MASK64,) * self.num_perm
+        if self._np_salts is not None:
+            return self._numpy_signature(hashes)
+        return tuple(min(_mix64(value ^ salt) for value in hashes) for salt in self._salts)
+
+    def _numpy_signature(self, hashes: list[int]) -> tuple[int, ...]:
+        # Same arithmetic as _mix64; uint64 multiplication wraps modulo 2**64.
+        with np.errstate(over="ignore"):
+            values = np.array(hashes, dtype=np.uint64)[:, None] ^ self._np_salts[None, :]
+            values = values + np.uint64(0x9E3779B97F4A7C15)
+            values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            values = values ^ (values >> np.uint64(31))
+        return tuple(int(value) for value in values.min(axis=0))
+
+
+class PromptLSHIndex:
+    """Clusters keys whose prompt tag sets reach a Jaccard threshold.
+
+    Keys are added with their tag sets; ``clusters()`` returns connected
+    components of the verified similarity graph (single linkage), each sorted,
+    in sorted order of their smallest key.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_JACCARD_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        hasher: MinHasher | None = None,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self._hasher = hasher if hasher is not None and hasher.num_perm == num_perm else MinHasher(num_perm)
+        self.bands, self.rows = lsh_band_layout(num_perm, threshold)
+        self._tokens: dict[Hashable, frozenset[str]] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[Hashable]] = {}
+        self.compared_pairs = 0
+
+    def add(self, key: Hashable, tokens: frozenset[str]) -> None:
+        if key in self._tokens:
+            return
+        self._tokens[key] = tokens
+        signature = self._hasher.signature(tokens)
+        rows = self.rows
+        for band in range(self.bands):
+            self._buckets.setdefault((band, signature[band * rows : (band + 1) * rows]), []).append(key)
+
+    def clusters(self) -> list[list[Hashable]]:
+        parent: dict[Hashable, Hashable] = {key: key for key in self._tokens}
+
+        def _find(key: Hashable) -> Hashable:
+            root = key
+            while parent[root] != root:
+                root = parent[root]
+            while parent[key] != root:
+                parent[key], key = root, parent[key]
+            return root
+
+        verified: set[tuple[Hashable, Hashable]] = set()
+        for members in self._buckets.values():
+            if len(members) < 2:
+                continue
+            for index, key in enumerate(members):
+                for other in members[:index]:
+                    key_root, other_root = _find(key), _find(other)
+                    if key_root == other_root:
+                        continue
+                    pair = (other, key)
+                    if pair in verified:
+                        continue
+                    verified.add(pair)
+                    self.compared_pairs += 1
+                    if jaccard(self._tokens[key], self._tokens[other]) >= self.threshold:
+                        parent[key_root] = other_root
+
+        grouped: dict[Hashable, list[Hashable]] = {}
+        for key in self._tokens:
+            grouped.setdefault(_find(key), []).append(key)
+        clusters = [sorted(members, key=repr) for members in grouped.values()]
+        clusters.sort(key=lambda members: repr(members[0]))
+        return clusters
+
+
+__all__ = [
+    "DEFAULT_JACCARD_THRESHOLD",
+    "DEFAULT_NUM_PERM",
+    "MinHasher",
+    "PromptLSHIndex",
+    "jaccard",
+    "lsh_band_layout",
+    "prompt_tokens",
+]
@@ -11,16 +11,94 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import os
 import statistics
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
+from fractions import Fraction
 from pathlib import Path
 from typing import Any
 
+from src.learning.learning_record_columns import (
+    KIND_EXPERIMENT,
+    KIND_REVIEW,
+    PEOPLE_MISMATCH_PENALTY,
+    PRIMARY_PARAMETERS,
+    SUBSCORE_WEIGHT_PER_POINT,
+    LearningRecordColumns,
+    numpy_available,
+)
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
 logger = logging.getLogger(__name__)
 
+_PROMPT_BUCKET_WEIGHTS = {"high": 0.45, "medium": 0.2, "low": -0.2}
+
+# Context-weight terms shared by ``_compute_context_weight`` and its columnar
+# twin: rationale tag prefix -> (adjustment on match, adjustment on mismatch).
+# "refinement-intent" only ever rewards a match.
+_CONTEXT_TERM_WEIGHTS: dict[str, tuple[float, float]] = {
+    "stage": (0.6, -0.35),
+    "model": (0.3, -0.1),
+    "refinement-policy": (0.35, -0.12),
+    "refinement-scale": (0.20, -0.08),
+    "refinement-intent": (0.05, 0.0),
+    "secondary-motion-policy": (0.22, -0.08),
+    "secondary-motion-path": (0.12, -0.05),
+    "secondary-motion-backend": (0.18, -0.08),
+    "secondary-motion-status": (0.08, -0.12),
+}
+
+# Secondary-motion terms in application order:
+# (query context key, normalized record field, store column, term).
+_MOTION_CONTEXT_TERMS = (
+    ("secondary_motion_policy_id", "policy_id", "motion_policy", "secondary-motion-policy"),
+    ("secondary_motion_application_path", "application_path", "motion_path", "secondary-motion-path"),
+    ("secondary_motion_backend_id", "backend_id", "motion_backend", "secondary-motion-backend"),
+    ("secondary_motion_status", "status", "motion_status", "secondary-motion-status"),
+)
+
+# Floor for any context weight.
+_MIN_CONTEXT_WEIGHT = 0.05
+
+
+def _context_term(term: str, matched: bool) -> tuple[float, str]:
+    """Return the weight adjustment and rationale tag for one context term."""
+    match, mismatch = _CONTEXT_TERM_WEIGHTS[term]
+    if matched:
+        return match, f"{term}-match"
+    return mismatch, f"{term}-mismatch"
+
+
+def _grouped_exact_sums(groups: Any, values: Any) -> dict[int, tuple[int, Fraction, Fraction]]:
+    """Exact (count, sum, sum of squares) of *values* per group code.
+
+    Runs of equal (group, value) pairs are collapsed first, so the Fraction
+    arithmetic scales with distinct values rather than with rows.
+    """
+    order = np.lexsort((values, groups))
+    sorted_groups = groups[order]
+    sorted_values = values[order]
+    breaks = np.flatnonzero(
+        (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_values[1:] != sorted_values[:-1])
+    ) + 1
+    starts = np.concatenate(([0], breaks))
+    run_lengths = np.diff(np.append(starts, len(sorted_groups)))
+    sums: dict[int, tuple[int, Fraction, Fraction]] = {}
+    for group, value, run_length in zip(
+        sorted_groups[starts].tolist(), sorted_values[starts].tolist(), run_lengths.tolist()
+    ):
+        exact = Fraction(value)
+        count, total, total_sq = sums.get(group, (0, Fraction(0), Fraction(0)))
+        sums[group] = (count + run_length, total + exact * run_length, total_sq + exact * exact * run_length)
+    return sums
+
 # PR-046: keywords used to infer people-presence from a prompt text
 _PEOPLE_KEYWORDS: frozenset[str] = frozenset(
     {
@@ -94,12 +172,24 @@ class RecommendationEngine:
     for different prompts and pipeline stages.
     """
 
-    def __init__(self, records_path: str | os.PathLike[str]) -> None:
-        """Initialize with path to learning records JSONL file."""
+    def __init__(
+        self,
+        records_path: str | os.PathLike[str],
+        *,
+        columnar: bool | None = None,
+    ) -> None:
+        """Initialize with path to learning records JSONL file.
+
+        ``columnar`` (default: whenever numpy is installed) keeps scored records
+        in a tail-ingested ``LearningRecordColumns`` store and answers
+        ``recommend()`` with vectorized reductions instead of reparsing the file.
+        """
         self.records_path = Path(records_path)
         self._cache: dict[str, Any] | None = None
         self._cache_timestamp: float = 0.0
         self._cache_mtime: float = 0.0
+        use_columns = numpy_available() if columnar is None else bool(columnar and numpy_available())
+        self._columns = LearningRecordColumns(self.records_path, self._score_records) if use_columns else None
 
     def _should_reload_cache(self) -> bool:
         """Check if cache needs to be reloaded based on file modification time."""
@@ -379,99 +469,61 @@ class RecommendationEngine:
     ) -> tuple[float, str]:
         weight = 1.0
         rationale_bits = []
-        if str(record.get("stage", "")) == str(query_context.get("stage", "")):
-            weight += 0.6
-            rationale_bits.append("stage-match")
-        else:
-            weight -= 0.35
-            rationale_bits.append("stage-mismatch")
+        delta, tag = _context_term(
+            "stage", str(record.get("stage", "")) == str(query_context.get("stage", ""))
+        )
+        weight += delta
+        rationale_bits.append(tag)
 
         query_model = str(query_context.get("model", "")).strip().lower()
         record_model = str(record.get("model", "")).strip().lower()
         if query_model and record_model:
-            if query_model == record_model:
-                weight += 0.3
-                rationale_bits.append("model-match")
-            else:
-                weight -= 0.1
-                rationale_bits.append("model-mismatch")
+            delta, tag = _context_term("model", query_model == record_model)
+            weight += delta
+            rationale_bits.append(tag)
 
         prompt_bucket = self._prompt_similarity_bucket(
             query_prompt,
             str(record.get("base_prompt", "")),
         )
-        if prompt_bucket == "high":
-            weight += 0.45
-        elif prompt_bucket == "medium":
-            weight += 0.2
-        elif prompt_bucket == "low":
-            weight -= 0.2
+        if prompt_bucket in _PROMPT_BUCKET_WEIGHTS:
+            weight += _PROMPT_BUCKET_WEIGHTS[prompt_bucket]
         rationale_bits.append(f"prompt-{prompt_bucket}")
 
         refinement = self._normalize_refinement_context(record.get("adaptive_refinement"))
         query_policy_id = str(query_context.get("refinement_policy_id", "") or "")
         record_policy_id = str(refinement.get("policy_id") or "")
         if query_policy_id and record_policy_id:
-            if query_policy_id == record_policy_id or query_policy_id in refinement.get("policy_ids", []):
-                weight += 0.35
-                rationale_bits.append("refinement-policy-match")
-            else:
-                weight -= 0.12
-                rationale_bits.append("refinement-policy-mismatch")
+            delta, tag = _context_term(
+                "refinement-policy",
+                query_policy_id == record_policy_id
+                or query_policy_id in refinement.get("policy_ids", []),
+            )
+            weight += delta
+            rationale_bits.append(tag)
 
         query_scale_band = str(query_context.get("refinement_scale_band", "") or "")
         record_scale_band = str(refinement.get("scale_band") or "")
         if query_scale_band and record_scale_band:
-            if query_scale_band == record_scale_band:
-                weight += 0.20
-                rationale_bits.append("refinement-scale-match")
-            else:
-                weight -= 0.08
-                rationale_bits.append("refinement-scale-mismatch")
+            delta, tag = _context_term("refinement-scale", query_scale_band == record_scale_band)
+            weight += delta
+            rationale_bits.append(tag)
 
         query_intent_band = str(query_context.get("refinement_prompt_intent_band", "") or "")
         record_intent_band = str(refinement.get("prompt_intent_band") or "")
         if query_intent_band and record_intent_band and query_intent_band == record_intent_band:
-            weight += 0.05
-            rationale_bits.append("refinement-intent-match")
+            delta, tag = _context_term("refinement-intent", True)
+            weight += delta
+            rationale_bits.append(tag)
 
         secondary_motion = self._normalize_secondary_motion_context(record.get("secondary_motion"))
-        query_motion_policy = str(query_context.get("secondary_motion_policy_id", "") or "")
-        if query_motion_policy and secondary_motion.get("policy_id"):
-            if query_motion_policy == secondary_motion.get("policy_id"):
-                weight += 0.22
-                rationale_bits.append("secondary-motion-policy-match")
-            else:
-                weight -= 0.08
-                rationale_bits.append("secondary-motion-policy-mismatch")
-
-        query_motion_path = str(query_context.get("secondary_motion_application_path", "") or "")
-        if query_motion_path and secondary_motion.get("application_path"):
-            if query_motion_path == secondary_motion.get("application_path"):
-                weight += 0.12
-                rationale_bits.append("secondary-motion-path-match")
-            else:
-                weight -= 0.05
-                rationale_bits.append("secondary-motion-path-mismatch")
-
-        query_motion_backend = str(query_context.get("secondary_motion_backend_id", "") or "")
-        if query_motion_backend and secondary_motion.get("backend_id"):
-            if query_motion_backend == secondary_motion.get("backend_id"):
-                weight += 0.18
-                rationale_bits.append("secondary-motion-backend-match")
-            else:
-                weight -= 0.08
-                rationale_bits.append("secondary-motion-backend-mismatch")
-
-        query_motion_status = str(query_context.get("secondary_motion_status", "") or "")
-        record_motion_status = str(secondary_motion.get("status") or "")
-        if query_motion_status and record_motion_status:
-            if query_motion_status == record_motion_status:
-                weight += 0.08
-                rationale_bits.append("secondary-motion-status-match")
-            else:
-                weight -= 0.12
-                rationale_bits.append("secondary-motion-status-mismatch")
+        for query_key, record_field, _column, term in _MOTION_CONTEXT_TERMS:
+            query_value = str(query_context.get(query_key, "") or "")
+            record_value = secondary_motion.get(record_field)
+            if query_value and record_value:
+                delta, tag = _context_term(term, query_value == record_value)
+                weight += delta
+                rationale_bits.append(tag)
 
         # PR-046: conservative rating-detail adjustment (bounded ±0.15)
         query_has_people = str(query_context.get("has_people", "")).lower() == "true"
@@ -479,7 +531,7 @@ class RecommendationEngine:
         if detail_tag:
             rationale_bits.append(detail_tag)
 
-        return max(0.05, weight), ",".join(rationale_bits)
+        return max(_MIN_CONTEXT_WEIGHT, weight), ",".join(rationale_bits)
 
     @staticmethod
     def _normalize_metadata_detail(metadata: dict[str, Any]) -> dict[str, Any]:
@@ -540,7 +592,7 @@ class RecommendationEngine:
         tag_parts: list[str] = []
         if valid:
             avg_sub = sum(valid) / len(valid)
-            quality_adj = (avg_sub - 3.0) * 0.025
+            quality_adj = (avg_sub - 3.0) * SUBSCORE_WEIGHT_PER_POINT
             adjustment += quality_adj
             if quality_adj != 0.0:
                 tag_parts.append(f"subscore-adj:{quality_adj:+.3f}")
@@ -554,12 +606,12 @@ class RecommendationEngine:
                 if anatomy_score is not None:
                     try:
                         if float(anatomy_score) < 3.0:
-                            adjustment -= 0.10
-                            tag_parts.append("ctx-mismatch:-0.10")
+                            adjustment -= PEOPLE_MISMATCH_PENALTY
+                            tag_parts.append(f"ctx-mismatch:{-PEOPLE_MISMATCH_PENALTY:+.2f}")
                     except (TypeError, ValueError):
                         pass
 
-        new_weight = max(0.05, weight + adjustment)
+        new_weight = max(_MIN_CONTEXT_WEIGHT, weight + adjustment)
         return new_weight, ",".join(tag_parts)
 
     def _compute_optimal_settings(
@@ -636,28 +688,9 @@ class RecommendationEngine:
                     stddev = 0.0
 
                 count = len(ratings)
-
-                # Confidence with explicit sample-volume + variance terms.
-                sample_confidence = min(1.0, count / 6.0)
-                variance_penalty = min(1.0, stddev / 2.5)
-                consistency_confidence = 1.0 - variance_penalty
                 context_weights = param_context_weights[param_name][value]
-                context_confidence = 0.0
-                if context_weights:
-                    context_mean = statistics.mean(context_weights)
-                    context_confidence = max(
-                        0.0,
-                        min(1.0, (context_mean - 1.0) / 1.5),
-                    )
-                confidence = max(
-                    0.0,
-                    min(
-                        1.0,
-                        (sample_confidence * 0.45)
-                        + (consistency_confidence * 0.25)
-                        + (context_confidence * 0.30),
-                    ),
-                )
+                context_mean = statistics.mean(context_weights) if context_weights else None
+                confidence = self._value_confidence(count, stddev, context_mean)
 
                 # Select based on confidence, break ties by highest rating
                 if confidence > best_confidence or (
@@ -671,33 +704,382 @@ class RecommendationEngine:
 
             if best_value is not None:
                 reasons = param_reasons[param_name][best_value]
-                reason = reasons[-1] if reasons else ""
-                recommendations[param_name] = ParameterRecommendation(
-                    parameter_name=param_name,
-                    recommended_value=best_value,
-                    confidence_score=round(best_confidence, 3),
-                    sample_count=best_count,
-                    mean_rating=round(best_mean, 2),
-                    rating_stddev=round(best_stddev, 2),
-                    confidence_rationale=(
-                        f"samples={best_count}; stddev={round(best_stddev, 3)}; "
-                        f"context={reason or 'mixed'}"
-                    ),
-                    context_key=(
-                        f"{query_context.get('stage','')}|"
-                        f"{query_context.get('model','')}|"
-                        f"{query_context.get('style_bucket','default')}|"
-                        f"{query_context.get('resolution_bucket','unknown')}|"
-                        f"{query_context.get('refinement_policy_id','')}|"
-                        f"{query_context.get('refinement_scale_band','')}|"
-                        f"{query_context.get('secondary_motion_backend_id','')}|"
-                        f"{query_context.get('secondary_motion_policy_id','')}|"
-                        f"{query_context.get('secondary_motion_application_path','')}"
-                    ),
+                recommendations[param_name] = self._build_parameter_recommendation(
+                    param_name,
+                    best_value,
+                    confidence=best_confidence,
+                    count=best_count,
+                    mean_rating=best_mean,
+                    stddev=best_stddev,
+                    reason=reasons[-1] if reasons else "",
+                    query_context=query_context,
+                )
+
+        return recommendations
+
+    @staticmethod
+    def _value_confidence(count: int, stddev: float, context_mean: float | None) -> float:
+        """Confidence with explicit sample-volume, variance and context terms."""
+        sample_confidence = min(1.0, count / 6.0)
+        variance_penalty = min(1.0, stddev / 2.5)
+        consistency_confidence = 1.0 - variance_penalty
+        context_confidence = 0.0
+        if context_mean is not None:
+            context_confidence = max(
+                0.0,
+                min(1.0, (context_mean - 1.0) / 1.5),
+            )
+        return max(
+            0.0,
+            min(
+                1.0,
+                (sample_confidence * 0.45)
+                + (consistency_confidence * 0.25)
+                + (context_confidence * 0.30),
+            ),
+        )
+
+    @staticmethod
+    def _build_parameter_recommendation(
+        param_name: str,
+        value: Any,
+        *,
+        confidence: float,
+        count: int,
+        mean_rating: float,
+        stddev: float,
+        reason: str,
+        query_context: dict[str, str],
+    ) -> ParameterRecommendation:
+        return ParameterRecommendation(
+            parameter_name=param_name,
+            recommended_value=value,
+            confidence_score=round(confidence, 3),
+            sample_count=count,
+            mean_rating=round(mean_rating, 2),
+            rating_stddev=round(stddev, 2),
+            confidence_rationale=(
+                f"samples={count}; stddev={round(stddev, 3)}; "
+                f"context={reason or 'mixed'}"
+            ),
+            context_key=(
+                f"{query_context.get('stage','')}|"
+                f"{query_context.get('model','')}|"
+                f"{query_context.get('style_bucket','default')}|"
+                f"{query_context.get('resolution_bucket','unknown')}|"
+                f"{query_context.get('refinement_policy_id','')}|"
+                f"{query_context.get('refinement_scale_band','')}|"
+                f"{query_context.get('secondary_motion_backend_id','')}|"
+                f"{query_context.get('secondary_motion_policy_id','')}|"
+                f"{query_context.get('secondary_motion_application_path','')}"
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Columnar path (LearningRecordColumns + numpy)
+    # ------------------------------------------------------------------
+
+    def _columnar_motion_keep_mask(
+        self,
+        arrays: dict[str, Any],
+        rows: Any,
+        query_context: dict[str, str],
+    ) -> Any:
+        """Vectorized inverse of ``_exclude_diagnostic_only_motion_record``."""
+        keep = np.ones(len(rows), dtype=bool)
+        query_has_motion_context = any(
+            str(query_context.get(key, "") or "").strip()
+            for key in (
+                "secondary_motion_backend_id",
+                "secondary_motion_policy_id",
+                "secondary_motion_application_path",
+                "secondary_motion_status",
+            )
+        )
+        if not query_has_motion_context:
+            return keep
+        columns = self._columns
+        keep &= arrays["motion_status"][rows] == columns.string_code("applied")
+        for query_key, column in (
+            ("secondary_motion_backend_id", "motion_backend"),
+            ("secondary_motion_policy_id", "motion_policy"),
+            ("secondary_motion_application_path", "motion_path"),
+        ):
+            query_value = str(query_context.get(query_key, "") or "")
+            if query_value:
+                codes = arrays[column][rows]
+                keep &= (codes == 0) | (codes == columns.string_code(query_value))
+        return keep
+
+    @staticmethod
+    def _columnar_match_adjustment(codes: Any, query_code: int, match: float, mismatch: float) -> Any:
+        """+match / +mismatch where the row has a value, 0.0 where it is empty."""
+        return np.where(codes == 0, 0.0, np.where(codes == query_code, match, mismatch))
+
+    def _columnar_context_weights(
+        self,
+        arrays: dict[str, Any],
+        rows: Any,
+        query_context: dict[str, str],
+        query_prompt: str,
+    ) -> Any:
+        """Vectorized ``_compute_context_weight``; terms are added in the same order."""
+        columns = self._columns
+        code = columns.string_code
+        weights = np.ones(len(rows))
+        weights += np.where(
+            arrays["stage"][rows] == code(str(query_context.get("stage", ""))),
+            *_CONTEXT_TERM_WEIGHTS["stage"],
+        )
+
+        query_model = str(query_context.get("model", "")).strip().lower()
+        if query_model:
+            weights += self._columnar_match_adjustment(
+                arrays["model"][rows], code(query_model), *_CONTEXT_TERM_WEIGHTS["model"]
+            )
+
+        prompt_codes, prompt_index = np.unique(arrays["prompt"][rows], return_inverse=True)
+        prompt_weights = np.array(
+            [
+                _PROMPT_BUCKET_WEIGHTS.get(
+                    self._prompt_similarity_bucket(query_prompt, columns.string_values[prompt_code]),
+                    0.0,
+                )
+                for prompt_code in prompt_codes.tolist()
+            ]
+        )
+        weights += prompt_weights[prompt_index]
+
+        query_policy_id = str(query_context.get("refinement_policy_id", "") or "")
+        if query_policy_id:
+            policy_codes = arrays["refinement_policy"][rows]
+            in_policy_ids = np.array(
+                [query_policy_id in policy_ids for policy_ids in columns.policy_id_set_values]
+            )
+            matched = (policy_codes == code(query_policy_id)) | in_policy_ids[
+                arrays["refinement_policy_ids"][rows]
+            ]
+            weights += np.where(
+                policy_codes == 0,
+                0.0,
+                np.where(matched, *_CONTEXT_TERM_WEIGHTS["refinement-policy"]),
+            )
+
+        query_scale_band = str(query_context.get("refinement_scale_band", "") or "")
+        if query_scale_band:
+            weights += self._columnar_match_adjustment(
+                arrays["refinement_scale_band"][rows],
+                code(query_scale_band),
+                *_CONTEXT_TERM_WEIGHTS["refinement-scale"],
+            )
+
+        query_intent_band = str(query_context.get("refinement_prompt_intent_band", "") or "")
+        if query_intent_band:
+            intent_codes = arrays["refinement_intent_band"][rows]
+            weights += np.where(
+                (intent_codes != 0) & (intent_codes == code(query_intent_band)),
+                _CONTEXT_TERM_WEIGHTS["refinement-intent"][0],
+                0.0,
+            )
+
+        for query_key, _record_field, column, term in _MOTION_CONTEXT_TERMS:
+            query_value = str(query_context.get(query_key, "") or "")
+            if query_value:
+                weights += self._columnar_match_adjustment(
+                    arrays[column][rows], code(query_value), *_CONTEXT_TERM_WEIGHTS[term]
+                )
+
+        # PR-046: rating-detail adjustment, applied only to rows with subscores
+        adjustment = arrays["subscore_adjustment"][rows]
+        if str(query_context.get("has_people", "")).lower() == "true":
+            adjustment = adjustment - np.where(
+                arrays["people_penalty"][rows] != 0, PEOPLE_MISMATCH_PENALTY, 0.0
+            )
+        weights = np.where(
+            arrays["has_subscores"][rows] != 0,
+            np.maximum(_MIN_CONTEXT_WEIGHT, weights + adjustment),
+            weights,
+        )
+        return np.maximum(_MIN_CONTEXT_WEIGHT, weights)
+
+    def _compute_optimal_settings_columnar(
+        self,
+        rows: Any,
+        query_context: dict[str, str],
+        query_prompt: str,
+    ) -> dict[str, ParameterRecommendation]:
+        """Vectorized ``_compute_optimal_settings`` over store rows in evidence order.
+
+        Values are visited in first-appearance order and per-value means and
+        variances come from exact sums, so the result matches the record-dict
+        path up to float rounding of the standard deviation.
+        """
+        columns = self._columns
+        arrays = columns.numpy_columns()
+        rows = rows[self._columnar_motion_keep_mask(arrays, rows, query_context)]
+        if not len(rows):
+            return {}
+        weights = self._columnar_context_weights(arrays, rows, query_context, query_prompt)
+        ratings = arrays["rating"][rows]
+        variable_parameters = arrays["variable_parameter"][rows]
+        variable_values = arrays["variable_value"][rows]
+
+        primary_count = len(PRIMARY_PARAMETERS)
+        tested_codes, first_tested = np.unique(
+            variable_parameters[variable_parameters >= primary_count], return_index=True
+        )
+        parameter_order = list(range(primary_count))
+        parameter_order.extend(tested_codes[np.argsort(first_tested)].tolist())
+
+        row_index = np.arange(len(rows))
+        recommendations: dict[str, ParameterRecommendation] = {}
+        for parameter in parameter_order:
+            param_name = columns.parameter_names[parameter]
+            # Contribution order mirrors the dict path: each row's primary value,
+            # then its tested variant value.
+            raw_parts: list[Any] = []
+            position_parts: list[Any] = []
+            index_parts: list[Any] = []
+            if parameter < primary_count:
+                raw_parts.append(arrays[param_name][rows])
+                position_parts.append(row_index * 2)
+                index_parts.append(row_index)
+            tested = np.flatnonzero(variable_parameters == parameter)
+            if len(tested):
+                raw_parts.append(variable_values[tested])
+                position_parts.append(tested * 2 + 1)
+                index_parts.append(tested)
+            raw = np.concatenate(raw_parts)
+            order = np.argsort(np.concatenate(position_parts), kind="stable")
+            raw = raw[order]
+            index = np.concatenate(index_parts)[order]
+            hashable = raw >= 0
+            raw, index = raw[hashable], index[hashable]
+            if not len(raw):
+                continue
+
+            groups = arrays["group_lookup"][parameter][raw]
+            unique_groups, first = np.unique(groups, return_index=True)
+            last = len(groups) - 1 - np.unique(groups[::-1], return_index=True)[1]
+            rating_sums = _grouped_exact_sums(groups, ratings[index])
+            weight_sums = _grouped_exact_sums(groups, weights[index])
+
+            best_slot = None
+            best_confidence = 0.0
+            best_mean = 0.0
+            best_stddev = 0.0
+            best_count = 0
+            for slot in np.argsort(first).tolist():
+                group = int(unique_groups[slot])
+                count, total, total_sq = rating_sums[group]
+                raw_mean = float(total / count)
+                # Square root of the exact sample variance; may differ from
+                # statistics.stdev in the last bit, which never survives the
+                # rounding applied to the published figures.
+                stddev = (
+                    math.sqrt((count * total_sq - total * total) / count / (count - 1))
+                    if count >= 2
+                    else 0.0
                 )
+                weight_count, weight_total, _weight_sq = weight_sums[group]
+                confidence = self._value_confidence(count, stddev, float(weight_total / weight_count))
+                if confidence > best_confidence or (
+                    confidence == best_confidence and raw_mean > best_mean
+                ):
+                    best_slot = slot
+                    best_confidence = confidence
+                    best_mean = raw_mean
+                    best_stddev = stddev
+                    best_count = count
 
+            if best_slot is None:
+                continue
+            value = columns.parameter_values[parameter].raw_values[int(raw[first[best_slot]])]
+            last_record = columns.read_scored_row(int(rows[index[last[best_slot]]]))
+            reason = (
+                self._compute_context_weight(last_record, query_context, query_prompt)[1]
+                if last_record is not None
+                else ""
+            )
+            recommendations[param_name] = self._build_parameter_recommendation(
+                param_name,
+                value,
+                confidence=best_confidence,
+                count=best_count,
+                mean_rating=best_mean,
+                stddev=best_stddev,
+                reason=reason,
+                query_context=query_context,
+            )
         return recommendations
 
+    def _recommend_columnar(
+        self,
+        prompt_text: str,
+        stage: str,
+        query_context: dict[str, str],
+    ) -> RecommendationSet:
+        columns = self._columns
+        if columns.refresh():
+            self._cache_timestamp = time.time()
+        arrays = columns.numpy_columns()
+        stage_rows = arrays["stage"] == columns.string_code(str(stage or "txt2img"))
+        experiment_rows = np.flatnonzero(stage_rows & (arrays["kind"] == KIND_EXPERIMENT))
+        review_rows = np.flatnonzero(stage_rows & (arrays["kind"] == KIND_REVIEW))
+        evidence_tier, automation_eligible = self._select_evidence_tier(
+            len(experiment_rows), len(review_rows)
+        )
+        if evidence_tier == EVIDENCE_TIER_NO_EVIDENCE:
+            return self._build_recommendation_set(prompt_text, stage, {}, evidence_tier, False)
+        if evidence_tier == EVIDENCE_TIER_EXPERIMENT_STRONG:
+            evidence_rows = experiment_rows
+        elif evidence_tier == EVIDENCE_TIER_SPARSE_PLUS_REVIEW:
+            evidence_rows = np.concatenate((experiment_rows, review_rows))
+        else:
+            evidence_rows = review_rows
+        optimal_settings = self._compute_optimal_settings_columnar(evidence_rows, query_context, prompt_text)
+        return self._build_recommendation_set(
+            prompt_text, stage, optimal_settings, evidence_tier, automation_eligible
+        )
+
+    @staticmethod
+    def _select_evidence_tier(experiment_count: int, review_count: int) -> tuple[str, bool]:
+        """PR-044: deterministic evidence-tier policy — never suppress usable evidence.
+
+        Returns (evidence_tier, automation_eligible).
+        """
+        if experiment_count >= 3:
+            return EVIDENCE_TIER_EXPERIMENT_STRONG, True
+        if experiment_count:
+            # Sparse experiment data: merge with any review feedback; flag manual-only
+            return EVIDENCE_TIER_SPARSE_PLUS_REVIEW, False
+        if review_count:
+            return EVIDENCE_TIER_REVIEW_ONLY, False
+        return EVIDENCE_TIER_NO_EVIDENCE, False
+
+    @staticmethod
+    def _build_recommendation_set(
+        prompt_text: str,
+        stage: str,
+        optimal_settings: dict[str, ParameterRecommendation],
+        evidence_tier: str,
+        automation_eligible: bool,
+    ) -> RecommendationSet:
+        # Create recommendation set with PR-044 tier provenance
+        rec_set = RecommendationSet(
+            prompt_text=prompt_text,
+            stage=stage,
+            timestamp=time.time(),
+            recommendations=list(optimal_settings.values()),
+            evidence_tier=evidence_tier,
+            automation_eligible=automation_eligible,
+        )
+
+        # Sort by confidence score (highest first)
+        rec_set.recommendations.sort(key=lambda r: r.confidence_score, reverse=True)
+
+        return rec_set
+
     def _find_trends_across_variables(self, records: list[dict[str, Any]]) -> dict[str, Any]:
         """Find trends and correlations across different variables."""
         # This is a placeholder for future trend analysis
@@ -718,6 +1100,8 @@ class RecommendationEngine:
             refinement_context,
             secondary_motion_context,
         )
+        if self._columns is not None:
+            return self._recommend_columnar(prompt_text, stage, query_context)
         if self._should_reload_cache():
             records = self._load_records()
             scored_records = self._score_records(records)
@@ -748,54 +1132,38 @@ class RecommendationEngine:
                 "legacy",
             }
         ]
-        # PR-044: deterministic evidence-tier policy — never suppress usable evidence
-        if len(experiment_records) >= 3:
+        evidence_tier, automation_eligible = self._select_evidence_tier(
+            len(experiment_records), len(review_records)
+        )
+        if evidence_tier == EVIDENCE_TIER_EXPERIMENT_STRONG:
             evidence_records = experiment_records
-            evidence_tier = EVIDENCE_TIER_EXPERIMENT_STRONG
-            automation_eligible = True
-        elif experiment_records:
-            # Sparse experiment data: merge with any review feedback; flag manual-only
+        elif evidence_tier == EVIDENCE_TIER_SPARSE_PLUS_REVIEW:
             evidence_records = experiment_records + review_records
-            evidence_tier = EVIDENCE_TIER_SPARSE_PLUS_REVIEW
-            automation_eligible = False
-        elif review_records:
-            evidence_records = review_records
-            evidence_tier = EVIDENCE_TIER_REVIEW_ONLY
-            automation_eligible = False
         else:
-            evidence_records = []
-            evidence_tier = EVIDENCE_TIER_NO_EVIDENCE
-            automation_eligible = False
+            evidence_records = review_records
 
         if not evidence_records:
-            return RecommendationSet(
-                prompt_text=prompt_text,
-                stage=stage,
-                timestamp=time.time(),
-                recommendations=[],
-                evidence_tier=EVIDENCE_TIER_NO_EVIDENCE,
-                automation_eligible=False,
+            return self._build_recommendation_set(
+                prompt_text, stage, {}, EVIDENCE_TIER_NO_EVIDENCE, False
             )
 
         optimal_settings = self._compute_optimal_settings(evidence_records, query_context, prompt_text)
-
-        # Create recommendation set with PR-044 tier provenance
-        rec_set = RecommendationSet(
-            prompt_text=prompt_text,
-            stage=stage,
-            timestamp=time.time(),
-            recommendations=list(optimal_settings.values()),
-            evidence_tier=evidence_tier,
-            automation_eligible=automation_eligible,
+        return self._build_recommendation_set(
+            prompt_text, stage, optimal_settings, evidence_tier, automation_eligible
         )
 
-        # Sort by confidence score (highest first)
-        rec_set.recommendations.sort(key=lambda r: r.confidence_score, reverse=True)
-
-        return rec_set
-
     def get_statistics(self) -> dict[str, Any]:
         """Get statistics about the recommendation engine's data."""
+        if self._columns is not None:
+            if self._columns.refresh():
+                self._cache_timestamp = time.time()
+            return {
+                "total_records": self._columns.raw_record_count,
+                "rated_records": len(self._columns),
+                "cache_timestamp": self._cache_timestamp,
+                "records_path": str(self.records_path),
+                "columnar": True,
+            }
         if self._cache is None or self._should_reload_cache():
             records = self._load_records()
             scored_records = self._score_records(records)
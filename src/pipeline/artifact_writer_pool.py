@@ -0,0 +1,95 @@
+# Subsystem: Pipeline
+# Role: Bounded worker pool that writes stage image artifacts off the pipeline thread.
+
+"""ArtifactWriterPool: parallel, back-pressured image saves for pipeline stages.
+
+WebUI responses can carry several base64 images (batch_size/n_iter). Decoding
+and writing them one after another on the pipeline thread serializes host work
+with the next WebUI request. Stages hand each image to this pool instead and
+collect the results in submission order, so outputs keep their deterministic
+ordering while the writes overlap.
+
+Back-pressure: at most ``max_pending`` writes may be queued or running; further
+``submit`` calls block until a slot frees up, which bounds the number of
+decoded payloads held in memory.
+
+The process-wide pool is flushed (pending writes finish) and shut down with the
+persistence worker at app exit.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_DEFAULT_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+
+class ArtifactWriterPool:
+    """Thread pool with a bounded number of in-flight artifact writes."""
+
+    def __init__(self, max_workers: int = _DEFAULT_MAX_WORKERS, max_pending: int | None = None) -> None:
+        self._max_workers = max(1, int(max_workers))
+        self._max_pending = max(1, int(max_pending or self._max_workers * 2))
+        self._slots = threading.BoundedSemaphore(self._max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="artifact_writer",
+        )
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def max_pending(self) -> int:
+        return self._max_pending
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> Future[T]:
+        """Queue ``fn(*args, **kwargs)``; blocks while ``max_pending`` writes are in flight."""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_POOL: ArtifactWriterPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_artifact_writer_pool() -> ArtifactWriterPool:
+    """Return the process-wide artifact writer pool (created on first use)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            from src.config import app_config
+
+            _POOL = ArtifactWriterPool(max_workers=app_config.get_artifact_writer_workers())
+            from src.services.persistence_worker import register_shutdown_flush
+
+            register_shutdown_flush(shutdown_artifact_writer_pool)
+        return _POOL
+
+
+def shutdown_artifact_writer_pool() -> None:
+    """Wait for queued artifact writes, then stop the process-wide pool."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+__all__ = ["ArtifactWriterPool", "get_artifact_writer_pool", "shutdown_artifact_writer_pool"]
@@ -202,7 +202,8 @@ def extract_execution_config(value: Any) -> dict[str, Any]:
 
 
 def derive_backend_options(execution_config: Mapping[str, Any] | None) -> dict[str, Any]:
-    config = _mapping_dict(execution_config)
+    # Read the execution config in place; only the video sections are copied.
+    config = execution_config if isinstance(execution_config, Mapping) else {}
     video_options: dict[str, Any] = {}
     for stage_name in _KNOWN_VIDEO_BACKEND_STAGES:
         stage_config = config.get(stage_name)
@@ -9,7 +9,10 @@ This module provides the canonical merging logic for combining:
 - Override flags (the "config override" checkbox semantics)
 
 The merger is pure and pipeline-local: no Tk, no AppState, no queue types.
-It always returns new instances (deep copies) and never mutates inputs.
+It always returns new instances and never mutates inputs. ``merge_pipeline``
+layers overrides onto a ``FrozenConfig`` so untouched sections are shared
+rather than deep-copied; a plain-dict base gets a plain-dict result, a
+``FrozenConfig`` base gets a ``FrozenConfig`` back.
 
 Merging Rules:
 - Override flag OFF: ignore stage overrides, use base config
@@ -22,10 +25,12 @@ Merging Rules:
 
 from __future__ import annotations
 
-from copy import deepcopy
+from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Any, Protocol, runtime_checkable
 
+from src.pipeline.frozen_config import FrozenConfig, freeze, thaw
+
 # ---------------------------------------------------------------------------
 # Protocols for type safety without importing concrete types
 # ---------------------------------------------------------------------------
@@ -242,10 +247,10 @@ class ConfigMergerV2:
 
     @staticmethod
     def merge_pipeline(
-        base_config: dict[str, Any],
+        base_config: Mapping[str, Any],
         stage_overrides: StageOverridesBundle | None,
         override_flags: StageOverrideFlags,
-    ) -> dict[str, Any]:
+    ) -> dict[str, Any] | FrozenConfig:
         """Merge base pipeline config with stage overrides.
 
         Args:
@@ -254,13 +259,14 @@ class ConfigMergerV2:
             override_flags: Flags indicating which overrides to apply.
 
         Returns:
-            A NEW merged config dict; base_config is not mutated.
+            A NEW merged config (a ``FrozenConfig`` when ``base_config`` is one,
+            otherwise a plain dict); base_config is not mutated.
         """
-        # Start with a deep copy of base config
-        merged = deepcopy(base_config)
-
+        frozen_input = isinstance(base_config, FrozenConfig)
         if stage_overrides is None:
-            return merged
+            return base_config if frozen_input else thaw(base_config)
+
+        merged: FrozenConfig = freeze(base_config)
 
         # Merge txt2img stage
         if override_flags.txt2img_override_enabled and stage_overrides.txt2img is not None:
@@ -288,11 +294,11 @@ class ConfigMergerV2:
         if override_flags.adetailer_override_enabled and stage_overrides.adetailer is not None:
             merged = ConfigMergerV2._merge_adetailer_into_config(merged, stage_overrides.adetailer)
 
-        return merged
+        return merged if frozen_input else merged.thaw()
 
     @staticmethod
     def merge_stage(
-        base_stage_config: dict[str, Any],
+        base_stage_config: Mapping[str, Any],
         override_stage_config: dict[str, Any] | None,
         override_enabled: bool,
     ) -> dict[str, Any]:
@@ -308,10 +314,10 @@ class ConfigMergerV2:
         """
         # If override disabled or no overrides, return deep copy of base
         if not override_enabled or override_stage_config is None:
-            return deepcopy(base_stage_config)
+            return thaw(base_stage_config)
 
         # Start with deep copy of base
-        merged = deepcopy(base_stage_config)
+        merged = thaw(base_stage_config)
 
         # Apply overrides: override field wins if not None
         for key, value in override_stage_config.items():
@@ -326,7 +332,7 @@ class ConfigMergerV2:
 
     @staticmethod
     def merge_refiner_config(
-        base_refiner: dict[str, Any],
+        base_refiner: Mapping[str, Any],
         override_refiner: RefinerOverrides | None,
         override_enabled: bool,
     ) -> dict[str, Any]:
@@ -336,9 +342,9 @@ class ConfigMergerV2:
         If override.enabled is True, individual fields are merged.
         """
         if not override_enabled or override_refiner is None:
-            return deepcopy(base_refiner)
+            return thaw(base_refiner)
 
-        merged = deepcopy(base_refiner)
+        merged = thaw(base_refiner)
 
         # Check enable flag first - if override explicitly disables, disable entirely
         if override_refiner.enabled is not None:
@@ -357,7 +363,7 @@ class ConfigMergerV2:
 
     @staticmethod
     def merge_hires_config(
-        base_hires: dict[str, Any],
+        base_hires: Mapping[str, Any],
         override_hires: HiresOverrides | None,
         override_enabled: bool,
     ) -> dict[str, Any]:
@@ -367,9 +373,9 @@ class ConfigMergerV2:
         If override.enabled is True, individual fields are merged.
         """
         if not override_enabled or override_hires is None:
-            return deepcopy(base_hires)
+            return thaw(base_hires)
 
-        merged = deepcopy(base_hires)
+        merged = thaw(base_hires)
 
         # Check enable flag first
         if override_hires.enabled is not None:
@@ -391,19 +397,19 @@ class ConfigMergerV2:
 
     @staticmethod
     def merge_adetailer_config(
-        base_adetailer: dict[str, Any],
+        base_adetailer: Mapping[str, Any],
         override_adetailer: ADetailerOverrides | None,
         override_enabled: bool,
     ) -> dict[str, Any]:
         """Merge ADetailer sub-config with precedence rules."""
         if not override_enabled or override_adetailer is None:
-            merged = deepcopy(base_adetailer)
+            merged = thaw(base_adetailer)
             legacy_detector_model = merged.pop("model", None)
             if legacy_detector_model is not None and "adetailer_model" not in merged:
                 merged["adetailer_model"] = legacy_detector_model
             return merged
 
-        merged = deepcopy(base_adetailer)
+        merged = thaw(base_adetailer)
         legacy_detector_model = merged.pop("model", None)
         if legacy_detector_model is not None and "adetailer_model" not in merged:
             merged["adetailer_model"] = legacy_detector_model
@@ -559,11 +565,11 @@ class ConfigMergerV2:
 
     @staticmethod
     def _merge_nested_dict(
-        base: dict[str, Any],
+        base: Mapping[str, Any],
         override: dict[str, Any],
     ) -> dict[str, Any]:
         """Recursively merge nested dicts (override wins for non-None values)."""
-        merged = deepcopy(base)
+        merged = thaw(base)
         for key, value in override.items():
             if value is not None:
                 if isinstance(value, dict) and isinstance(merged.get(key), dict):
@@ -574,78 +580,77 @@ class ConfigMergerV2:
 
     @staticmethod
     def _merge_txt2img_into_config(
-        config: dict[str, Any],
+        config: FrozenConfig,
         overrides: Txt2ImgOverrides,
         flags: StageOverrideFlags,
-    ) -> dict[str, Any]:
+    ) -> FrozenConfig:
         """Apply txt2img overrides to the merged config."""
-        txt2img = config.get("txt2img", {}) or {}
+        top: dict[str, Any] = {}
+        txt2img: dict[str, Any] = {}
 
         # Apply top-level txt2img fields
         if overrides.model is not None:
-            config["model"] = overrides.model
+            top["model"] = overrides.model
             txt2img["model"] = overrides.model
             txt2img["model_name"] = overrides.model
         if overrides.vae is not None:
-            config["vae"] = overrides.vae
+            top["vae"] = overrides.vae
             txt2img["vae"] = overrides.vae
         if overrides.sampler is not None:
-            config["sampler"] = overrides.sampler
+            top["sampler"] = overrides.sampler
             txt2img["sampler_name"] = overrides.sampler
         if overrides.scheduler is not None:
-            config["scheduler"] = overrides.scheduler
+            top["scheduler"] = overrides.scheduler
             txt2img["scheduler"] = overrides.scheduler
         if overrides.steps is not None:
-            config["steps"] = overrides.steps
+            top["steps"] = overrides.steps
             txt2img["steps"] = overrides.steps
         if overrides.cfg_scale is not None:
-            config["cfg_scale"] = overrides.cfg_scale
+            top["cfg_scale"] = overrides.cfg_scale
             txt2img["cfg_scale"] = overrides.cfg_scale
         if overrides.width is not None:
-            config["width"] = overrides.width
+            top["width"] = overrides.width
             txt2img["width"] = overrides.width
         if overrides.height is not None:
-            config["height"] = overrides.height
+            top["height"] = overrides.height
             txt2img["height"] = overrides.height
         if overrides.prompt is not None:
-            config["prompt"] = overrides.prompt
+            top["prompt"] = overrides.prompt
             txt2img["prompt"] = overrides.prompt
         if overrides.negative_prompt is not None:
-            config["negative_prompt"] = overrides.negative_prompt
+            top["negative_prompt"] = overrides.negative_prompt
             txt2img["negative_prompt"] = overrides.negative_prompt
         if overrides.seed is not None:
-            config["seed"] = overrides.seed
+            top["seed"] = overrides.seed
             txt2img["seed"] = overrides.seed
 
         # Handle nested refiner config within txt2img overrides
         if overrides.refiner is not None:
-            base_refiner = config.get("refiner", {}) or {}
-            merged_refiner = ConfigMergerV2.merge_refiner_config(
-                base_refiner, overrides.refiner, True
+            top["refiner"] = ConfigMergerV2.merge_refiner_config(
+                config.get("refiner") or {}, overrides.refiner, True
             )
-            config["refiner"] = merged_refiner
             # Also set top-level refiner_enabled flag
             if overrides.refiner.enabled is not None:
-                config["refiner_enabled"] = overrides.refiner.enabled
+                top["refiner_enabled"] = overrides.refiner.enabled
 
         # Handle nested hires config within txt2img overrides
         if overrides.hires is not None:
-            base_hires = config.get("hires_fix", {}) or {}
-            merged_hires = ConfigMergerV2.merge_hires_config(base_hires, overrides.hires, True)
-            config["hires_fix"] = merged_hires
+            top["hires_fix"] = ConfigMergerV2.merge_hires_config(
+                config.get("hires_fix") or {}, overrides.hires, True
+            )
 
         if txt2img:
-            config["txt2img"] = txt2img
+            top["txt2img"] = ConfigMergerV2._frozen_section(config, "txt2img").set_many(txt2img)
 
-        return config
+        return config.set_many(top)
 
     @staticmethod
     def _merge_img2img_into_config(
-        config: dict[str, Any],
+        config: FrozenConfig,
         overrides: Img2ImgOverrides,
-    ) -> dict[str, Any]:
+    ) -> FrozenConfig:
         """Apply img2img overrides to the merged config."""
-        img2img = config.get("img2img", {}) or {}
+        img2img: dict[str, Any] = {}
 
         if overrides.enabled is not None:
             img2img["enabled"] = overrides.enabled
@@ -674,16 +679,16 @@ class ConfigMergerV2:
         if overrides.seed is not None:
             img2img["seed"] = overrides.seed
 
-        config["img2img"] = img2img
-        return config
+        section = ConfigMergerV2._frozen_section(config, "img2img").set_many(img2img)
+        return config.set("img2img", section)
 
     @staticmethod
     def _merge_upscale_into_config(
-        config: dict[str, Any],
+        config: FrozenConfig,
         overrides: UpscaleOverrides,
-    ) -> dict[str, Any]:
+    ) -> FrozenConfig:
         """Apply upscale overrides to the merged config."""
-        upscale = config.get("upscale", {}) or {}
+        upscale: dict[str, Any] = {}
 
         if overrides.enabled is not None:
             upscale["enabled"] = overrides.enabled
@@ -696,46 +701,53 @@ class ConfigMergerV2:
         if overrides.tile_size is not None:
             upscale["tile_size"] = overrides.tile_size
 
-        config["upscale"] = upscale
-        return config
+        section = ConfigMergerV2._frozen_section(config, "upscale").set_many(upscale)
+        return config.set("upscale", section)
 
     @staticmethod
     def _merge_refiner_into_config(
-        config: dict[str, Any],
+        config: FrozenConfig,
         overrides: RefinerOverrides,
-    ) -> dict[str, Any]:
+    ) -> FrozenConfig:
         """Apply refiner overrides at the top level of config."""
-        base_refiner = config.get("refiner", {}) or {}
-        merged = ConfigMergerV2.merge_refiner_config(base_refiner, overrides, True)
-        config["refiner"] = merged
+        changes: dict[str, Any] = {
+            "refiner": ConfigMergerV2.merge_refiner_config(
+                config.get("refiner") or {}, overrides, True
+            )
+        }
 
         # Also update top-level refiner_enabled flag
         if overrides.enabled is not None:
-            config["refiner_enabled"] = overrides.enabled
+            changes["refiner_enabled"] = overrides.enabled
 
-        return config
+        return config.set_many(changes)
 
     @staticmethod
     def _merge_hires_into_config(
-        config: dict[str, Any],
+        config: FrozenConfig,
         overrides: HiresOverrides,
-    ) -> dict[str, Any]:
+    ) -> FrozenConfig:
         """Apply hires fix overrides at the top level of config."""
-        base_hires = config.get("hires_fix", {}) or {}
-        merged = ConfigMergerV2.merge_hires_config(base_hires, overrides, True)
-        config["hires_fix"] = merged
-        return config
+        merged = ConfigMergerV2.merge_hires_config(config.get("hires_fix") or {}, overrides, True)
+        return config.set("hires_fix", merged)
 
     @staticmethod
     def _merge_adetailer_into_config(
-        config: dict[str, Any],
+        config: FrozenConfig,
         overrides: ADetailerOverrides,
-    ) -> dict[str, Any]:
+    ) -> FrozenConfig:
         """Apply ADetailer overrides to the merged config."""
-        base_ad = config.get("adetailer", {}) or {}
-        merged = ConfigMergerV2.merge_adetailer_config(base_ad, overrides, True)
-        config["adetailer"] = merged
-        return config
+        merged = ConfigMergerV2.merge_adetailer_config(
+            config.get("adetailer") or {}, overrides, True
+        )
+        return config.set("adetailer", merged)
+
+    @staticmethod
+    def _frozen_section(config: FrozenConfig, key: str) -> FrozenConfig:
+        section = config.get(key)
+        if isinstance(section, FrozenConfig):
+            return section
+        return FrozenConfig(section if isinstance(section, Mapping) else None)
 
 
 # ---------------------------------------------------------------------------
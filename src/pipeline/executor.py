@@ -10,20 +10,26 @@ import math
 import re
 import threading
 import time
-from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime
-from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from collections.abc import Callable
-from typing import TYPE_CHECKING, Any, Mapping
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Mapping, TypeVar
 
 from PIL import Image
 
-from src.api.client import WebUIPayloadValidationError, PROGRESS_STALL_THRESHOLD_SEC, STALL_INTERRUPT_THRESHOLD_SEC
+from src.api.client import (
+    PROGRESS_STALL_THRESHOLD_SEC,
+    STALL_INTERRUPT_THRESHOLD_SEC,
+    ProgressInfo,
+    WebUIPayloadValidationError,
+)
+from src.api.progress_source import ProgressSource, shared_progress_poller
 from src.api.types import GenerateError, GenerateErrorCode
 from src.api.webui_process_manager import get_global_webui_process_manager
+from src.cluster.resident_models import ResidentModelTracker
 from src.config import app_config
 from src.prompting.prompt_optimizer_config import PromptOptimizerConfig
 from src.prompting.prompt_optimizer_registry import (
@@ -41,6 +47,7 @@ from src.prompting.prompt_splitter import split_prompt_chunks
 from src.prompting.prompt_types import PromptOptimizationPairResult
 from src.prompting.contracts import PromptOptimizerAnalysisBundle
 from src.pipeline.artifact_contract import artifact_manifest_payload
+from src.pipeline.artifact_writer_pool import get_artifact_writer_pool
 from src.pipeline.animatediff_models import (
     AnimateDiffConfig,
     attach_animatediff_to_payload,
@@ -69,16 +76,23 @@ from ..utils import (
     merge_global_negative,
     save_image_from_base64,
 )
+from ..utils.file_io import ImageBase64Cache, get_unique_output_path, release_output_path
 from ..utils.negative_helpers_v2 import merge_global_positive
 
 if TYPE_CHECKING:
     from src.services.diagnostics_service_v2 import DiagnosticsServiceV2
 
 
-@lru_cache(maxsize=128)
+_IMAGE_BASE64_CACHE = ImageBase64Cache(0)
+
+
 def _cached_image_base64(path_str: str) -> str | None:
-    """LRU cache for recently loaded images to cut down disk reads."""
-    return load_image_to_base64(Path(path_str))
+    """Byte-budgeted cache of recently loaded images to cut down disk reads.
+
+    Entries are invalidated when the file's size or mtime changes.
+    """
+    _IMAGE_BASE64_CACHE.max_bytes = app_config.get_image_upload_cache_max_mb() * 1024 * 1024
+    return _IMAGE_BASE64_CACHE.get(Path(path_str), load_image_to_base64)
 
 
 def _apply_secondary_motion_frame_directory(
@@ -106,6 +120,7 @@ def _apply_secondary_motion_frame_directory(
 
 
 logger = logging.getLogger(__name__)
+T = TypeVar("T")
 
 _RECOVERY_TIMEOUT_KEYWORDS = ("read timed out", "readtimeout", "timeout", "timed out")
 _NONRECOVERABLE_HTTP_500_MARKERS = (
@@ -254,6 +269,190 @@ def _get_diagnostics_service() -> DiagnosticsServiceV2:
     return _DIAGNOSTICS_SERVICE_INSTANCE
 
 
+class _StageProgressMonitor:
+    """Turns progress samples for one generation request into callbacks and stall handling.
+
+    PR-HARDEN-004: if no progress update arrives for PROGRESS_STALL_THRESHOLD_SEC
+    the stall event is set and a warning logged (throttled to once per 30s).
+    After STALL_INTERRUPT_THRESHOLD_SEC with no progress a single interrupt is
+    sent to WebUI so the blocking HTTP call can return.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        progress_callback: Any | None,
+        stage_label: str,
+        stall_detected_event: threading.Event | None = None,
+    ) -> None:
+        self._pipeline = pipeline
+        self._progress_callback = progress_callback
+        self._stage_label = stage_label
+        self._stall_detected_event = stall_detected_event
+        self._lock = threading.Lock()
+        self._highest_progress = 0.0
+        self._last_progress_time = time.monotonic()
+        self._stall_first_detected_at: float | None = None
+        self._last_stall_log_time = 0.0
+        self._interrupt_sent = False
+
+    def handle(self, info: ProgressInfo | None) -> None:
+        """Process one sample; ``None`` means WebUI reported idle."""
+        with self._lock:
+            if info is None:
+                self._handle_idle()
+            else:
+                self._handle_progress(info)
+
+    def _handle_idle(self) -> None:
+        # WebUI is idle — either between jobs or restarted mid-call.
+        # Reset stall tracking so a fresh generation starting from 0%
+        # is not pre-judged as stalled by stale counters.
+        if self._stall_first_detected_at is not None or self._interrupt_sent:
+            logger.debug(
+                "Poll loop: WebUI idle signal received for %s — resetting stall state",
+                self._stage_label,
+            )
+            self._stall_first_detected_at = None
+            self._interrupt_sent = False
+            self._highest_progress = 0.0
+            self._last_progress_time = time.monotonic()
+
+    def _handle_progress(self, info: ProgressInfo) -> None:
+        pipeline = self._pipeline
+        stage_label = self._stage_label
+        current_progress = max(
+            self._highest_progress,
+            max(0.0, min(1.0, float(getattr(info, "progress", 0.0) or 0.0))),
+        )
+        eta_relative = getattr(info, "eta_relative", None)
+        eta_seconds = (
+            float(eta_relative)
+            if eta_relative is not None and eta_relative > 0
+            else None
+        )
+        if info.progress > self._highest_progress:
+            self._highest_progress = info.progress
+            self._last_progress_time = time.monotonic()
+            self._stall_first_detected_at = None  # Reset stall tracking on any progress
+            self._interrupt_sent = False
+
+            with pipeline._progress_lock:
+                pipeline._current_generation_progress = self._highest_progress
+
+            # Extract actual seed if available
+            if hasattr(info, "seed") and info.seed is not None:
+                pipeline._current_actual_seed = info.seed
+
+            if self._progress_callback:
+                # Convert 0-1 to percentage; pass step info if available
+                percent = self._highest_progress * 100.0
+                current_step = getattr(info, "current_step", 0)
+                total_steps = getattr(info, "total_steps", 0)
+                self._progress_callback(percent, eta_seconds, current_step, total_steps)
+
+        # Keep runtime activity alive on every healthy progress sample,
+        # not only when the percent advances.
+        if pipeline._status_callback and pipeline._current_job_id:
+            stage_start = pipeline._current_stage_start_time
+            if isinstance(stage_start, datetime):
+                elapsed = max(
+                    (datetime.utcnow() - stage_start).total_seconds(),
+                    0.0,
+                )
+            else:
+                elapsed = 0.0
+
+            # If no ETA from WebUI, estimate from observed progress.
+            if eta_seconds is None and current_progress > 0.01:
+                total_estimated = elapsed / current_progress
+                eta_seconds = max(total_estimated - elapsed, 0.0)
+
+            status_data = {
+                "job_id": pipeline._current_job_id,
+                "current_stage": stage_label,
+                "stage_detail": None,
+                "stage_index": pipeline._current_stage_index,
+                "total_stages": len(pipeline._current_stage_chain) if pipeline._current_stage_chain else 1,
+                "progress": current_progress,
+                "eta_seconds": eta_seconds,
+                "started_at": pipeline._current_stage_start_time,
+                "actual_seed": pipeline._current_actual_seed,
+                "current_step": getattr(info, "current_step", 0),
+                "total_steps": getattr(info, "total_steps", 0),
+            }
+            pipeline._emit_status_update(status_data)
+
+        self._check_stall()
+
+    def _check_stall(self) -> None:
+        # PR-HARDEN-004: Check for stall (no progress for too long)
+        stage_label = self._stage_label
+        highest_progress = self._highest_progress
+        elapsed_since_progress = time.monotonic() - self._last_progress_time
+        progress_stalled = (
+            elapsed_since_progress > PROGRESS_STALL_THRESHOLD_SEC
+            and highest_progress > 0
+            and highest_progress < 0.99
+        )
+        completion_stalled = (
+            elapsed_since_progress > POST_PROGRESS_RESPONSE_STALL_THRESHOLD_SEC
+            and highest_progress >= 0.99
+        )
+        if not (progress_stalled or completion_stalled):
+            return
+        now = time.monotonic()
+        if self._stall_first_detected_at is None:
+            self._stall_first_detected_at = now
+
+        # Throttle log to once per 30s instead of every sample
+        if now - self._last_stall_log_time >= 30.0:
+            if completion_stalled:
+                logger.warning(
+                    "PR-HARDEN-004: Completion stall detected for %s - waiting %.1fs after %.1f%% progress",
+                    stage_label,
+                    elapsed_since_progress,
+                    highest_progress * 100,
+                )
+            else:
+                logger.warning(
+                    "PR-HARDEN-004: Generation stall detected for %s - no progress for %.1fs (stuck at %.1f%%)",
+                    stage_label,
+                    elapsed_since_progress,
+                    highest_progress * 100,
+                )
+            self._last_stall_log_time = now
+
+        if self._stall_detected_event:
+            self._stall_detected_event.set()
+
+        # After hard threshold, interrupt WebUI to unblock the HTTP call.
+        # Completion stalls already consumed their threshold, so interrupt
+        # immediately once we declare the request hung after 100%.
+        if completion_stalled:
+            interrupt_threshold = 0.0
+        else:
+            interrupt_threshold = STALL_INTERRUPT_THRESHOLD_BY_STAGE.get(
+                stage_label, STALL_INTERRUPT_THRESHOLD_SEC
+            )
+        stall_duration = now - self._stall_first_detected_at
+        if stall_duration >= interrupt_threshold and not self._interrupt_sent:
+            if completion_stalled:
+                logger.error(
+                    "PR-HARDEN-004: Completion stall for %s exceeded %.0fs — sending interrupt to WebUI",
+                    stage_label,
+                    POST_PROGRESS_RESPONSE_STALL_THRESHOLD_SEC,
+                )
+            else:
+                logger.error(
+                    "PR-HARDEN-004: Stall for %s exceeded %.0fs — sending interrupt to WebUI",
+                    stage_label,
+                    interrupt_threshold,
+                )
+            self._pipeline.client.interrupt()
+            self._interrupt_sent = True
+
+
 class PipelineStageError(Exception):
     def __init__(self, error: GenerateError):
         stage = error.stage or "pipeline"
@@ -283,6 +482,11 @@ class Pipeline:
         self._current_hypernetwork: str | None = None
         self._current_hn_strength: float | None = None
         self._model_discovery_attempted = False
+        # Multi-worker runs share what this worker has loaded with the scheduler.
+        tracker = getattr(client, "resident_model_tracker", None)
+        self._resident_tracker = tracker if isinstance(tracker, ResidentModelTracker) else None
+        # Stage progress comes from the WebUI's shared poller unless a push source is set.
+        self._progress_source: ProgressSource | None = None
         self._webui_defaults_applied = False
         self._true_ready_gated = False  # Track if we've already waited for true-readiness
         self._last_img2img_result: dict[str, Any] | None = None
@@ -304,18 +508,45 @@ class Pipeline:
         self._progress_lock = threading.Lock()
         self._run_started_at_monotonic: float | None = None
         self._run_model_switch_count: int = 0
+        self._run_model_already_loaded_count: int = 0
         self._run_vae_switch_count: int = 0
+        # Per-stage "GPU busy vs. host save" seconds for the current run.
+        self._run_stage_timing: dict[str, dict[str, float]] = {}
+        self._stage_timing_lock = threading.Lock()
+        # Saves left running by single-image stages, keyed by resolved output path,
+        # with the commit to run once the image is on disk; None outside a
+        # begin/end_deferred_stage_saves window.
+        self._deferred_stage_saves: (
+            dict[str, tuple[str, Future[Any], Callable[[Path], None] | None]] | None
+        ) = None
         self._stage_policy_engine = StagePolicyEngine()
 
     def _begin_run_metrics(self) -> None:
         """Reset per-run efficiency counters."""
         self._run_started_at_monotonic = time.monotonic()
         self._run_model_switch_count = 0
+        self._run_model_already_loaded_count = 0
         self._run_vae_switch_count = 0
+        with self._stage_timing_lock:
+            self._run_stage_timing = {}
+
+    def _record_stage_timing(self, stage: str, **increments: float) -> None:
+        with self._stage_timing_lock:
+            timing = self._run_stage_timing.setdefault(stage, {})
+            for key, value in increments.items():
+                timing[key] = timing.get(key, 0.0) + value
 
     def _record_model_switch(self) -> None:
         self._run_model_switch_count += 1
 
+    def _record_model_already_loaded(self) -> None:
+        """Count a requested checkpoint that was already resident (no load needed).
+
+        This includes runs that never needed a switch; reorders that avoided a
+        switch are counted by ``JobQueue.get_scheduling_stats()["switches_avoided"]``.
+        """
+        self._run_model_already_loaded_count += 1
+
     def _record_vae_switch(self) -> None:
         self._run_vae_switch_count += 1
 
@@ -333,9 +564,149 @@ class Pipeline:
             "images_processed": int(images_processed),
             "images_per_minute": round(images_per_minute, 3),
             "model_switches": int(self._run_model_switch_count),
+            "model_already_loaded": int(self._run_model_already_loaded_count),
             "vae_switches": int(self._run_vae_switch_count),
+            **self._stage_timing_metrics(),
+        }
+
+    def _stage_timing_metrics(self) -> dict[str, Any]:
+        """Summarize time spent waiting on WebUI vs. saving outputs on the host."""
+        with self._stage_timing_lock:
+            timing = {stage: dict(values) for stage, values in self._run_stage_timing.items()}
+        stage_timing = {
+            stage: {
+                "gpu_busy_seconds": round(values.get("gpu_busy_seconds", 0.0), 3),
+                "host_save_seconds": round(values.get("host_save_seconds", 0.0), 3),
+                "host_save_wait_seconds": round(values.get("host_save_wait_seconds", 0.0), 3),
+                "images_saved": int(values.get("images_saved", 0)),
+            }
+            for stage, values in timing.items()
+        }
+        return {
+            "gpu_busy_seconds": round(sum(t.get("gpu_busy_seconds", 0.0) for t in timing.values()), 3),
+            "host_save_seconds": round(sum(t.get("host_save_seconds", 0.0) for t in timing.values()), 3),
+            "host_save_wait_seconds": round(
+                sum(t.get("host_save_wait_seconds", 0.0) for t in timing.values()), 3
+            ),
+            "stage_timing": stage_timing,
         }
 
+    def _save_stage_image(
+        self,
+        stage: str,
+        image_b64: Any,
+        image_path: Path,
+        metadata_builder: Callable[[Image.Image], dict[str, str] | None] | None = None,
+    ) -> Future[Any]:
+        """Queue one stage output on the artifact writer pool and return its future.
+
+        A name reserved with ``get_unique_output_path(reserve=True)`` is released
+        once the write has finished, successfully or not.
+        """
+
+        def _save() -> Any:
+            started = time.monotonic()
+            try:
+                return save_image_from_base64(image_b64, image_path, metadata_builder=metadata_builder)
+            finally:
+                release_output_path(image_path)
+                self._record_stage_timing(
+                    stage,
+                    host_save_seconds=time.monotonic() - started,
+                    images_saved=1,
+                )
+
+        return get_artifact_writer_pool().submit(_save)
+
+    def _save_stage_images(
+        self,
+        stage: str,
+        items: list[tuple[Any, Path, Callable[[Image.Image], dict[str, str] | None] | None]],
+    ) -> list[Future[Any]]:
+        """Queue several stage outputs; the futures are in submission order."""
+        return [self._save_stage_image(stage, *item) for item in items]
+
+    def _await_stage_saves(self, stage: str, saves: list[Future[Any]]) -> list[Any]:
+        """Wait for ``saves`` in order, recording only the time actually spent blocked."""
+        started = time.monotonic()
+        try:
+            return [save.result() for save in saves]
+        finally:
+            self._record_stage_timing(stage, host_save_wait_seconds=time.monotonic() - started)
+
+    def _complete_stage_save(
+        self,
+        stage: str,
+        save: Future[Any],
+        image_path: Path,
+        finalize: Callable[[Path | None], T],
+        commit: Callable[[Path, T], None] | None = None,
+    ) -> T:
+        """Build a single-image stage result and commit it once the image is saved.
+
+        ``finalize`` turns the output path (None if the save failed) into the
+        stage result without touching disk; ``commit`` writes manifests and other
+        side effects for a result and runs only after the image exists.
+
+        Outside a deferred-save window the save is awaited first. Inside one the
+        save keeps running, ``finalize`` gets the (reserved) path it is being
+        written to, and ``commit`` runs when ``settle_deferred_stage_saves`` sees
+        the save succeed; a failed save is never committed.
+        """
+        pending = self._deferred_stage_saves
+        if pending is None:
+            actual_path = self._await_stage_saves(stage, [save])[0]
+            saved_path = self._coerce_saved_path(actual_path, fallback=image_path)
+            result = finalize(saved_path)
+            if saved_path and result and commit is not None:
+                commit(saved_path, result)
+            return result
+        expected_path = Path(image_path).resolve()
+        result = finalize(expected_path)
+        on_saved = None
+        if result and commit is not None:
+            on_saved = lambda saved_path: commit(saved_path, result)  # noqa: E731
+        pending[str(expected_path)] = (stage, save, on_saved)
+        return result
+
+    def begin_deferred_stage_saves(self) -> None:
+        """Let single-image stages return while their output is still being written."""
+        if self._deferred_stage_saves is None:
+            self._deferred_stage_saves = {}
+
+    def settle_deferred_stage_saves(self) -> set[str]:
+        """Wait for every deferred save; returns the resolved paths that failed to save."""
+        pending = self._deferred_stage_saves
+        if not pending:
+            return set()
+        saves = list(pending.items())
+        pending.clear()
+        failed: set[str] = set()
+        for path_key, (stage, save, on_saved) in saves:
+            try:
+                saved = self._await_stage_saves(stage, [save])[0]
+            except Exception as exc:
+                logger.error("Failed to save %s image %s: %s", stage, path_key, exc)
+                saved = None
+            saved_path = self._coerce_saved_path(saved, fallback=Path(path_key))
+            if not saved_path:
+                logger.error("Failed to save %s image: %s", stage, path_key)
+                failed.add(path_key)
+                continue
+            if on_saved is not None:
+                try:
+                    on_saved(saved_path)
+                except Exception as exc:
+                    logger.error("Failed to record %s output %s: %s", stage, path_key, exc)
+        return failed
+
+    def end_deferred_stage_saves(self) -> set[str]:
+        """Settle outstanding deferred saves and go back to saving synchronously."""
+        try:
+            return self.settle_deferred_stage_saves()
+        finally:
+            self._deferred_stage_saves = None
+
     def _log_run_efficiency_metrics(
         self,
         *,
@@ -345,13 +716,17 @@ class Pipeline:
         """Log per-run timing and switch counts for throughput diagnostics."""
         metrics = self.get_run_efficiency_metrics(images_processed)
         logger.info(
-            "Run efficiency (%s): elapsed=%.2fs, images=%d, img_per_min=%.2f, model_switches=%d, vae_switches=%d",
+            "Run efficiency (%s): elapsed=%.2fs, images=%d, img_per_min=%.2f, model_switches=%d, model_already_loaded=%d, vae_switches=%d, gpu_busy=%.2fs, host_save=%.2fs, host_save_wait=%.2fs",
             run_type,
             metrics["elapsed_seconds"],
             metrics["images_processed"],
             metrics["images_per_minute"],
             metrics["model_switches"],
+            metrics["model_already_loaded"],
             metrics["vae_switches"],
+            metrics["gpu_busy_seconds"],
+            metrics["host_save_seconds"],
+            metrics["host_save_wait_seconds"],
         )
 
     def _run_prompt_optimizer(
@@ -938,6 +1313,11 @@ class Pipeline:
         if self._model_discovery_attempted or self._current_model is not None:
             return
         self._model_discovery_attempted = True
+        if self._resident_tracker is not None:
+            model = self._resident_tracker.current_model()
+            if model:
+                self._current_model = model
+                return
         try:
             model = self.client.get_current_model()
             if model:
@@ -960,6 +1340,9 @@ class Pipeline:
             if desired_normalized == current_normalized:
                 # Model already loaded - no switch needed, but continue to VAE logic
                 logger.debug(f"Model already loaded: {model_name}")
+                self._record_model_already_loaded()
+                if self._resident_tracker is not None:
+                    self._resident_tracker.model_loaded(self._current_model, switched=False)
             elif not self.client.options_write_enabled:
                 # Only warn if models are actually different (avoids false warnings when normalized names match)
                 if current_normalized != desired_normalized:
@@ -976,8 +1359,12 @@ class Pipeline:
                     self._current_model = model_name
                     model_switched = True
                     self._record_model_switch()
+                    if self._resident_tracker is not None:
+                        self._resident_tracker.model_loaded(model_name, switched=True)
                 except Exception:
                     self._current_model = None
+                    if self._resident_tracker is not None:
+                        self._resident_tracker.invalidate()
                     raise
 
         # Handle VAE switching (independent of model - always execute if vae_name provided)
@@ -990,6 +1377,8 @@ class Pipeline:
                     self.client.set_vae(vae_name)
                     self._current_vae = vae_name
                     self._record_vae_switch()
+                    if self._resident_tracker is not None:
+                        self._resident_tracker.vae_loaded(vae_name)
             elif model_switched:
                 # If a new model is loaded and no explicit VAE is requested, clear any
                 # stale VAE override so WebUI can use the model's preferred default.
@@ -997,6 +1386,8 @@ class Pipeline:
                 self.client.set_vae("Automatic")
                 self._current_vae = "Automatic"
                 self._record_vae_switch()
+                if self._resident_tracker is not None:
+                    self._resident_tracker.vae_loaded("Automatic")
         except Exception:
             self._current_vae = None
             raise
@@ -2142,7 +2533,11 @@ class Pipeline:
 
     def _generate_images(self, stage: str, payload: dict[str, Any]) -> dict[str, Any] | None:
         """Call the shared generate_images API for the requested stage."""
-        return self._generate_images_with_recovery(stage, payload, recovery_attempted=False)
+        started = time.monotonic()
+        try:
+            return self._generate_images_with_recovery(stage, payload, recovery_attempted=False)
+        finally:
+            self._record_stage_timing(stage, gpu_busy_seconds=time.monotonic() - started)
 
     def _generate_images_with_recovery(
         self,
@@ -2289,6 +2684,16 @@ class Pipeline:
             "timings": result.timings,
         }
 
+    def set_progress_source(self, source: ProgressSource | None) -> None:
+        """Use ``source`` for stage progress instead of the shared /progress poller."""
+
+        self._progress_source = source
+
+    def _stage_progress_source(self) -> ProgressSource:
+        if self._progress_source is not None:
+            return self._progress_source
+        return shared_progress_poller(self.client)
+
     def _poll_progress_loop(
         self,
         stop_event: threading.Event,
@@ -2298,171 +2703,22 @@ class Pipeline:
         stall_detected_event: threading.Event | None = None,
     ) -> None:
         """
-        Background thread that polls WebUI for progress.
-        
-        PR-HARDEN-004: Enhanced with stall detection - if no progress update
-        for PROGRESS_STALL_THRESHOLD_SEC, sets stall_detected_event and logs
-        a warning (throttled to once per 30s). After STALL_INTERRUPT_THRESHOLD_SEC
-        with no progress, sends a single interrupt to WebUI to cancel the hung
-        generation so the blocking HTTP call can return.
+        Poll WebUI for progress at a fixed interval until ``stop_event`` is set.
+
+        Stage execution subscribes to the shared progress source instead; this
+        loop feeds the same ``_StageProgressMonitor`` for callers that want a
+        dedicated poller.
         """
-        highest_progress = 0.0
-        last_progress_time = time.monotonic()
-        stall_first_detected_at: float | None = None
-        last_stall_log_time: float = 0.0
-        interrupt_sent: bool = False
-        
+        monitor = _StageProgressMonitor(self, progress_callback, stage_label, stall_detected_event)
         while not stop_event.is_set():
             try:
-                info = self.client.get_progress(skip_current_image=True)
-
-                if info is None:
-                    # WebUI is idle — either between jobs or restarted mid-call.
-                    # Reset stall tracking so a fresh generation starting from 0%
-                    # is not pre-judged as stalled by stale counters.
-                    if stall_first_detected_at is not None or interrupt_sent:
-                        logger.debug(
-                            "Poll loop: WebUI idle signal received for %s — resetting stall state",
-                            stage_label,
-                        )
-                        stall_first_detected_at = None
-                        interrupt_sent = False
-                        highest_progress = 0.0
-                        last_progress_time = time.monotonic()
-                else:
-                    current_progress = max(
-                        highest_progress,
-                        max(0.0, min(1.0, float(getattr(info, "progress", 0.0) or 0.0))),
-                    )
-                    eta_relative = getattr(info, "eta_relative", None)
-                    eta_seconds = (
-                        float(eta_relative)
-                        if eta_relative is not None and eta_relative > 0
-                        else None
-                    )
-                    if info.progress > highest_progress:
-                        highest_progress = info.progress
-                        last_progress_time = time.monotonic()
-                        stall_first_detected_at = None  # Reset stall tracking on any progress
-                        interrupt_sent = False
-                        
-                        with self._progress_lock:
-                            self._current_generation_progress = highest_progress
-                        
-                        # Extract actual seed if available
-                        if hasattr(info, 'seed') and info.seed is not None:
-                            self._current_actual_seed = info.seed
-
-                        if progress_callback:
-                            # Convert 0-1 to percentage
-                            percent = highest_progress * 100.0
-                            eta = eta_seconds
-                            # Pass step info if available
-                            current_step = getattr(info, 'current_step', 0)
-                            total_steps = getattr(info, 'total_steps', 0)
-                            progress_callback(percent, eta, current_step, total_steps)
-                            
-                    # Keep runtime activity alive on every healthy progress poll,
-                    # not only when the percent advances.
-                    if self._status_callback and self._current_job_id:
-                        stage_start = self._current_stage_start_time
-                        if isinstance(stage_start, datetime):
-                            elapsed = max(
-                                (datetime.utcnow() - stage_start).total_seconds(),
-                                0.0,
-                            )
-                        else:
-                            elapsed = 0.0
-
-                        # If no ETA from WebUI, estimate from observed progress.
-                        if eta_seconds is None and current_progress > 0.01:
-                            total_estimated = elapsed / current_progress
-                            eta_seconds = max(total_estimated - elapsed, 0.0)
-
-                        status_data = {
-                            "job_id": self._current_job_id,
-                            "current_stage": stage_label,
-                            "stage_detail": None,
-                            "stage_index": self._current_stage_index,
-                            "total_stages": len(self._current_stage_chain) if self._current_stage_chain else 1,
-                            "progress": current_progress,
-                            "eta_seconds": eta_seconds,
-                            "started_at": self._current_stage_start_time,
-                            "actual_seed": self._current_actual_seed,
-                            "current_step": getattr(info, "current_step", 0),
-                            "total_steps": getattr(info, "total_steps", 0),
-                        }
-                        self._emit_status_update(status_data)
-
-                    # PR-HARDEN-004: Check for stall (no progress for too long)
-                    elapsed_since_progress = time.monotonic() - last_progress_time
-                    progress_stalled = (
-                        elapsed_since_progress > PROGRESS_STALL_THRESHOLD_SEC
-                        and highest_progress > 0
-                        and highest_progress < 0.99
-                    )
-                    completion_stalled = (
-                        elapsed_since_progress > POST_PROGRESS_RESPONSE_STALL_THRESHOLD_SEC
-                        and highest_progress >= 0.99
-                    )
-                    if progress_stalled or completion_stalled:
-                        now = time.monotonic()
-                        if stall_first_detected_at is None:
-                            stall_first_detected_at = now
-
-                        # Throttle log to once per 30s instead of every poll interval
-                        if now - last_stall_log_time >= 30.0:
-                            if completion_stalled:
-                                logger.warning(
-                                    "PR-HARDEN-004: Completion stall detected for %s - waiting %.1fs after %.1f%% progress",
-                                    stage_label,
-                                    elapsed_since_progress,
-                                    highest_progress * 100,
-                                )
-                            else:
-                                logger.warning(
-                                    "PR-HARDEN-004: Generation stall detected for %s - no progress for %.1fs (stuck at %.1f%%)",
-                                    stage_label,
-                                    elapsed_since_progress,
-                                    highest_progress * 100,
-                                )
-                            last_stall_log_time = now
-
-                        if stall_detected_event:
-                            stall_detected_event.set()
-
-                        # After hard threshold, interrupt WebUI to unblock the HTTP call.
-                        # Completion stalls already consumed their threshold, so interrupt
-                        # immediately once we declare the request hung after 100%.
-                        if completion_stalled:
-                            _interrupt_threshold = 0.0
-                        else:
-                            _interrupt_threshold = STALL_INTERRUPT_THRESHOLD_BY_STAGE.get(
-                                stage_label, STALL_INTERRUPT_THRESHOLD_SEC
-                            )
-                        stall_duration = now - stall_first_detected_at
-                        if stall_duration >= _interrupt_threshold and not interrupt_sent:
-                            if completion_stalled:
-                                logger.error(
-                                    "PR-HARDEN-004: Completion stall for %s exceeded %.0fs — sending interrupt to WebUI",
-                                    stage_label,
-                                    POST_PROGRESS_RESPONSE_STALL_THRESHOLD_SEC,
-                                )
-                            else:
-                                logger.error(
-                                    "PR-HARDEN-004: Stall for %s exceeded %.0fs — sending interrupt to WebUI",
-                                    stage_label,
-                                    _interrupt_threshold,
-                                )
-                            self.client.interrupt()
-                            interrupt_sent = True
-                        
+                monitor.handle(self.client.get_progress(skip_current_image=True))
             except Exception:
                 pass  # Ignore polling errors
-            
+
             # Wait for next poll or stop signal
             stop_event.wait(poll_interval)
-    
+
     def _generate_images_with_progress(
         self,
         stage: str,
@@ -2473,54 +2729,34 @@ class Pipeline:
         stage_label: str | None = None,
     ) -> dict[str, Any] | None:
         """
-        Call generation endpoint with concurrent progress polling.
-        
-        PR-HARDEN-004: Always starts progress polling for stall detection,
-        even when no progress_callback is provided.
+        Call generation endpoint while following progress from the WebUI's progress source.
+
+        PR-HARDEN-004: Always subscribes for stall detection, even when no
+        progress_callback is provided. ``poll_interval`` is the nominal sampling
+        rate; the shared poller adapts around it.
         """
-        
+
         if stage_label is None:
             stage_label = stage
-        
-        stop_event = threading.Event()
+
         stall_detected_event = threading.Event()
-        poll_future: Future | None = None
-        poll_executor: ThreadPoolExecutor | None = None
-        
+        monitor = _StageProgressMonitor(self, progress_callback, stage_label, stall_detected_event)
+        subscription = self._stage_progress_source().subscribe(monitor.handle, interval=poll_interval)
         try:
-            # PR-HARDEN-004: ALWAYS start polling for stall detection
-            poll_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress_poll")
-            poll_future = poll_executor.submit(
-                self._poll_progress_loop,
-                stop_event,
-                poll_interval,
-                progress_callback,  # May be None - that's fine
-                stage_label,
-                stall_detected_event,
-            )
-            
             # Make the actual generation request (blocking)
             response = self._generate_images(stage, payload)
-            
+
             # Check if stall was detected during generation
             if stall_detected_event.is_set():
                 logger.warning(
                     "PR-HARDEN-004: Generation for %s completed but stall was detected during execution",
                     stage_label,
                 )
-            
+
             return response
-            
+
         finally:
-            # Stop polling
-            stop_event.set()
-            if poll_future:
-                try:
-                    poll_future.result(timeout=1.0)
-                except Exception:
-                    pass
-            if poll_executor is not None:
-                poll_executor.shutdown(wait=True, cancel_futures=True)
+            subscription.close()
 
     def _log_pipeline_cancellation(self, phase: str, exc: Exception) -> None:
         """Emit a consistent INFO-level log for pipeline cancellations."""
@@ -3021,20 +3257,21 @@ class Pipeline:
         if image_b64 is None:
             logger.error("img2img returned no image payload to save")
             return None
-        actual_path = save_image_from_base64(
-            image_b64, image_path, metadata_builder=metadata_builder
-        )
+        save = self._save_stage_image("img2img", image_b64, image_path, metadata_builder)
         if isinstance(response_images, list):
             response_images[0] = None
         if isinstance(response, dict):
             response["images"] = []
-        actual_path = self._coerce_saved_path(actual_path, fallback=image_path)
-        if actual_path:
-            self.logger.save_manifest(run_dir, actual_path.stem, metadata)
-            self._last_img2img_result = metadata
+
+        def _finalize(actual_path: Path | None) -> dict[str, Any] | None:
+            return metadata if actual_path else None
+
+        def _commit(actual_path: Path, result: dict[str, Any]) -> None:
+            self.logger.save_manifest(run_dir, actual_path.stem, result)
+            self._last_img2img_result = result
             logger.info(f"img2img completed: {actual_path.name}")
-            return metadata
-        return None
+
+        return self._complete_stage_save("img2img", save, image_path, _finalize, _commit)
 
     def run_adetailer(
         self,
@@ -3500,8 +3737,7 @@ class Pipeline:
             )
         image_path = run_dir / f"{final_image_name}.png"
         # PR-FILENAME-001: Apply collision failsafe
-        from src.utils.file_io import get_unique_output_path
-        image_path = get_unique_output_path(image_path)
+        image_path = get_unique_output_path(image_path, reserve=True)
 
         # Extract stage history from input image
         stage_history = self._extract_stage_history_from_input(input_image_path)
@@ -3585,32 +3821,41 @@ class Pipeline:
         image_b64 = response_images[0] if isinstance(response_images, list) and response_images else None
         if image_b64 is None:
             logger.error("adetailer returned no image payload to save")
+            release_output_path(image_path)
             return None
-        actual_path = save_image_from_base64(
-            image_b64, image_path, metadata_builder=metadata_builder
-        )
+        save = self._save_stage_image("adetailer", image_b64, image_path, metadata_builder)
         if isinstance(response_images, list):
             response_images[0] = None
         if isinstance(response, dict):
             response["images"] = []
-        actual_path = self._coerce_saved_path(actual_path, fallback=image_path)
-        if actual_path:
+
+        def _manifest_path(actual_path: Path) -> Path:
             # Save manifest in manifests/ subfolder (datetime/pack_name structure)
-            manifest_dir = Path(run_dir) / "manifests"
             # Use actual image stem (includes _copy suffix if collision occurred)
-            manifest_path = manifest_dir / f"{actual_path.stem}.json"
+            return Path(run_dir) / "manifests" / f"{actual_path.stem}.json"
+
+        def _finalize(actual_path: Path | None) -> dict[str, Any] | None:
+            if not actual_path:
+                return None
             try:
-                metadata = self._attach_manifest_artifact(
+                return self._attach_manifest_artifact(
                     metadata=metadata,
                     stage="adetailer",
                     primary_path=actual_path,
-                    manifest_path=manifest_path,
+                    manifest_path=_manifest_path(actual_path),
                     output_paths=[str(actual_path)],
                     input_image_path=input_image_path,
                 )
+            except Exception as e:
+                logger.error(f"Error building manifest for {actual_path}: {e}")
+                return metadata
+
+        def _commit(actual_path: Path, stage_metadata: dict[str, Any]) -> None:
+            manifest_path = _manifest_path(actual_path)
+            try:
                 self._write_manifest_file(
                     manifest_path=manifest_path,
-                    metadata=metadata,
+                    metadata=stage_metadata,
                     prompt_optimizer_result=prompt_optimizer_result,
                     prompt_optimizer_config=prompt_optimizer_config,
                     prompt_optimizer_analysis=prompt_optimizer_analysis,
@@ -3618,11 +3863,9 @@ class Pipeline:
             except Exception as e:
                 logger.error(f"Error writing manifest file {manifest_path}: {e}")
                 # Continue anyway - manifest is not critical
-            
             logger.info(f"adetailer completed: {final_image_name}")
-            return metadata
 
-        return None
+        return self._complete_stage_save("adetailer", save, image_path, _finalize, _commit)
         """
         Run upscaling.
 
@@ -3713,16 +3956,16 @@ class Pipeline:
             run_dir=run_dir,
             manifest=metadata,
         )
-        actual_path = save_image_from_base64(
-            response["image"], image_path, metadata_builder=metadata_builder
-        )
-        actual_path = self._coerce_saved_path(actual_path, fallback=image_path)
-        if actual_path:
-            self.logger.save_manifest(run_dir, actual_path.stem, metadata)
+        save = self._save_stage_image("upscale", response["image"], image_path, metadata_builder)
+
+        def _finalize(actual_path: Path | None) -> dict[str, Any] | None:
+            return metadata if actual_path else None
+
+        def _commit(actual_path: Path, result: dict[str, Any]) -> None:
+            self.logger.save_manifest(run_dir, actual_path.stem, result)
             logger.info("Upscale completed successfully")
-            return metadata
 
-        return None
+        return self._complete_stage_save("upscale", save, image_path, _finalize, _commit)
 
     def run_pack_pipeline(
         self,
@@ -4575,6 +4818,8 @@ class Pipeline:
             if not isinstance(response_images, list):
                 response_images = list(response.get("images") or [])
             
+            save_items: list[tuple[Any, Path, Any]] = []
+            pending_saves: list[tuple[Path, dict[str, Any]]] = []
             for batch_idx in range(num_images_received):
                 # Multiple images: use suffix _batch0, _batch1, etc.
                 # This applies when batch_size > 1 OR n_iter > 1
@@ -4587,8 +4832,7 @@ class Pipeline:
                     batch_image_name = image_name
                 
                 # PR-FILENAME-001: Apply collision failsafe
-                from src.utils.file_io import get_unique_output_path
-                image_path = get_unique_output_path(image_path)
+                image_path = get_unique_output_path(image_path, reserve=True)
                 
                 logger.debug(
                     "[executor/txt2img] saving image %s/%s: %s",
@@ -4606,17 +4850,21 @@ class Pipeline:
                     run_dir=run_dir,
                     manifest=image_metadata,
                 )
-                image_b64 = response_images[batch_idx]
-                actual_path = save_image_from_base64(
-                    image_b64,
-                    image_path,
-                    metadata_builder=metadata_builder,
-                )
+                save_items.append((response_images[batch_idx], image_path, metadata_builder))
+                pending_saves.append((image_path, image_metadata))
                 response_images[batch_idx] = None
+
+            # Saves run on the artifact writer pool; results keep batch order. They are
+            # awaited here because the manifests record how many images were saved.
+            saved_results = self._await_stage_saves(
+                "txt2img", self._save_stage_images("txt2img", save_items)
+            )
+            save_items.clear()
+            for (image_path, image_metadata), actual_path in zip(pending_saves, saved_results):
                 if not actual_path:
                     logger.error("Failed to save image %s", image_path)
                     continue
-                    
+
                 saved_paths.append(actual_path)
                 manifest_dir = output_dir / "manifests"
                 manifest_dir.mkdir(exist_ok=True, parents=True)
@@ -4903,8 +5151,7 @@ class Pipeline:
             # Save image
             image_path = output_dir / f"{image_name}.png"
             # PR-FILENAME-001: Apply collision failsafe
-            from src.utils.file_io import get_unique_output_path
-            image_path = get_unique_output_path(image_path)
+            image_path = get_unique_output_path(image_path, reserve=True)
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             gen_info = self._extract_generation_info(response)
@@ -4958,32 +5205,43 @@ class Pipeline:
             image_b64 = response_images[0] if isinstance(response_images, list) and response_images else None
             if image_b64 is None:
                 logger.error("img2img returned no image payload to save")
+                release_output_path(image_path)
                 return None
-            actual_path = save_image_from_base64(
-                image_b64, image_path, metadata_builder=metadata_builder
-            )
+            save = self._save_stage_image("img2img", image_b64, image_path, metadata_builder)
             if isinstance(response_images, list):
                 response_images[0] = None
             if isinstance(response, dict):
                 response["images"] = []
-            actual_path = self._coerce_saved_path(actual_path, fallback=image_path)
-            if actual_path:
+
+            def _manifest_path(actual_path: Path) -> Path:
                 # Save manifest in manifests/ subfolder (datetime/pack_name structure)
-                manifest_dir = Path(output_dir) / "manifests"
                 # Use actual stem from saved path (includes _copy suffix if collision)
-                manifest_path = manifest_dir / f"{actual_path.stem}.json"
+                return Path(output_dir) / "manifests" / f"{actual_path.stem}.json"
+
+            def _finalize(actual_path: Path | None) -> dict[str, Any] | None:
+                if not actual_path:
+                    logger.error(f"Failed to save img2img image: {image_path}")
+                    self._record_stage_event("img2img", "exit", 1, 1, False)
+                    return None
                 try:
-                    metadata = self._attach_manifest_artifact(
+                    return self._attach_manifest_artifact(
                         metadata=metadata,
                         stage="img2img",
                         primary_path=actual_path,
-                        manifest_path=manifest_path,
+                        manifest_path=_manifest_path(actual_path),
                         output_paths=[str(actual_path)],
                         input_image_path=input_image_path,
                     )
+                except Exception as e:
+                    logger.error(f"Error building manifest for {actual_path}: {e}")
+                    return metadata
+
+            def _commit(actual_path: Path, stage_metadata: dict[str, Any]) -> None:
+                manifest_path = _manifest_path(actual_path)
+                try:
                     self._write_manifest_file(
                         manifest_path=manifest_path,
-                        metadata=metadata,
+                        metadata=stage_metadata,
                         prompt_optimizer_result=prompt_optimizer_result,
                         prompt_optimizer_config=prompt_optimizer_config,
                         prompt_optimizer_analysis=prompt_optimizer_analysis,
@@ -4993,11 +5251,8 @@ class Pipeline:
 
                 logger.info(f"img2img completed: {image_path.name}")
                 self._record_stage_event("img2img", "exit", 1, 1, False)
-                return metadata
-            else:
-                logger.error(f"Failed to save img2img image: {image_path}")
-                self._record_stage_event("img2img", "exit", 1, 1, False)
-                return None
+
+            return self._complete_stage_save("img2img", save, image_path, _finalize, _commit)
 
         except CancellationError:
             self._record_stage_event("img2img", "cancelled", 1, 1, True)
@@ -5114,7 +5369,6 @@ class Pipeline:
                     "AnimateDiff payload was accepted by WebUI but did not produce an AnimateDiff response"
                 )
 
-            from src.utils.file_io import get_unique_output_path
 
             video_path = get_unique_output_path(output_dir / f"{image_name}.mp4")
             frames_dir = output_dir / f"{video_path.stem}_frames"
@@ -5707,8 +5961,7 @@ class Pipeline:
             # Save image
             image_path = output_dir / f"{image_name}.png"
             # PR-FILENAME-001: Apply collision failsafe
-            from src.utils.file_io import get_unique_output_path
-            image_path = get_unique_output_path(image_path)
+            image_path = get_unique_output_path(image_path, reserve=True)
 
             # Extract the correct image data based on upscale mode
             if image_key is None:
@@ -5716,6 +5969,7 @@ class Pipeline:
             else:
                 if not response[response_key] or len(response[response_key]) <= image_key:
                     logger.error("No image data returned from upscale")
+                    release_output_path(image_path)
                     return None
                 image_data = response[response_key][image_key]
 
@@ -5828,38 +6082,48 @@ class Pipeline:
                 run_dir=run_dir,
                 manifest=metadata,
             )
-            actual_path = save_image_from_base64(
-                image_data, image_path, metadata_builder=metadata_builder
-            )
+            save = self._save_stage_image("upscale", image_data, image_path, metadata_builder)
             if image_key is None:
                 response[response_key] = None
             elif isinstance(response.get(response_key), list):
                 response[response_key][image_key] = None
-            actual_path = self._coerce_saved_path(actual_path, fallback=image_path)
-            if actual_path:
+
+            def _manifest_path(actual_path: Path) -> Path:
                 # Save manifest in manifests/ subfolder (datetime/pack_name structure)
-                manifest_dir = Path(output_dir) / "manifests"
                 # Use actual stem from saved path (includes _copy suffix if collision)
-                manifest_path = manifest_dir / f"{actual_path.stem}.json"
+                return Path(output_dir) / "manifests" / f"{actual_path.stem}.json"
+
+            def _finalize(actual_path: Path | None) -> dict[str, Any] | None:
+                if not actual_path:
+                    logger.error(f"Failed to save upscaled image: {image_path}")
+                    self._record_stage_event("upscale", "exit", 1, 1, False)
+                    return None
                 try:
-                    metadata = self._attach_manifest_artifact(
+                    return self._attach_manifest_artifact(
                         metadata=metadata,
                         stage="upscale",
                         primary_path=actual_path,
-                        manifest_path=manifest_path,
+                        manifest_path=_manifest_path(actual_path),
                         output_paths=[str(actual_path)],
                         input_image_path=input_image_path,
                     )
+                except Exception as e:
+                    logger.error(f"Error building manifest for {actual_path}: {e}")
+                    return metadata
+
+            def _commit(actual_path: Path, stage_metadata: dict[str, Any]) -> None:
+                manifest_path = _manifest_path(actual_path)
+                try:
                     self._write_manifest_file(
                         manifest_path=manifest_path,
-                        metadata=metadata,
+                        metadata=stage_metadata,
                         prompt_optimizer_v3=prompt_optimizer_v3,
                     )
                 except Exception as e:
                     logger.error(f"Error writing manifest file {manifest_path}: {e}")
 
                 logger.info(f"Upscale completed: {image_path.name}")
-                
+
                 # Post-upscale memory check (warn if still under pressure)
                 try:
                     import psutil
@@ -5871,13 +6135,10 @@ class Pipeline:
                         )
                 except Exception:
                     pass
-                
-                self._record_stage_event("upscale", "exit", 1, 1, False)
-                return metadata
-            else:
-                logger.error(f"Failed to save upscaled image: {image_path}")
+
                 self._record_stage_event("upscale", "exit", 1, 1, False)
-                return None
+
+            return self._complete_stage_save("upscale", save, image_path, _finalize, _commit)
 
         except CancellationError:
             self._record_stage_event("upscale", "cancelled", 1, 1, True)
@@ -0,0 +1,185 @@
+# Subsystem: Pipeline
+# Role: Immutable, structurally shared config mapping for merge layering.
+
+"""FrozenConfig: a persistent mapping for merged pipeline configs.
+
+Building NJRs layers the same preset / pack / runtime config many times per
+pack. Deep-copying the whole tree at every layer (and again for every matrix
+combination) dominated job-build time. A ``FrozenConfig`` is never mutated, so
+it can be shared freely: ``set``/``set_in``/``layer`` return a new mapping that
+copies only the containers along the changed path and reuses every other
+sub-tree.
+
+Conversions:
+- ``freeze(value)`` turns dicts into ``FrozenConfig`` and lists into frozen
+  tuples; already-frozen values are returned as-is (no copy).
+- ``thaw(value)`` materializes plain, independent dicts/lists again.
+- ``copy.deepcopy`` of a frozen value is ``thaw`` so legacy "copy then
+  mutate" code keeps working and only pays for the materialization.
+
+Plain dicts should be produced only where configs leave the builder (NJR
+configs, WebUI payloads); ``FrozenConfig`` is not JSON-serializable.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+
+class _FrozenList(tuple):
+    """Tuple standing in for a frozen JSON list; thaws back to ``list``."""
+
+    __slots__ = ()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return thaw(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (thaw(self),))
+
+
+class FrozenConfig(Mapping[str, Any]):
+    """Read-only mapping whose nested dicts/lists are frozen too."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping[str, Any] | None = None) -> None:
+        self._data: dict[str, Any] = (
+            {key: freeze(value) for key, value in data.items()} if data else {}
+        )
+
+    @classmethod
+    def _adopt(cls, data: dict[str, Any]) -> FrozenConfig:
+        # ``data`` values must already be frozen; no copy is made.
+        instance = cls.__new__(cls)
+        instance._data = data
+        return instance
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenConfig):
+            return self._data == other._data
+        if isinstance(other, Mapping):
+            return thaw(self) == thaw(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"FrozenConfig({self._data!r})"
+
+    def __copy__(self) -> FrozenConfig:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return self.thaw()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenConfig, (self.thaw(),))
+
+    # ------------------------------------------------------------------
+    # Persistent updates
+    # ------------------------------------------------------------------
+
+    def set(self, key: str, value: Any) -> FrozenConfig:
+        """Return a copy with ``key`` set; all other sub-trees are shared."""
+        data = dict(self._data)
+        data[key] = freeze(value)
+        return FrozenConfig._adopt(data)
+
+    def set_many(self, changes: Mapping[str, Any]) -> FrozenConfig:
+        """Return a copy with every key in ``changes`` replaced (shallow)."""
+        if not changes:
+            return self
+        data = dict(self._data)
+        for key, value in changes.items():
+            data[key] = freeze(value)
+        return FrozenConfig._adopt(data)
+
+    def set_in(self, path: Sequence[str], value: Any) -> FrozenConfig:
+        """Return a copy with the nested ``path`` set, creating sections as needed."""
+        if not path:
+            raise ValueError("set_in requires a non-empty path")
+        head, rest = path[0], path[1:]
+        if not rest:
+            return self.set(head, value)
+        child = self._data.get(head)
+        if not isinstance(child, FrozenConfig):
+            child = FrozenConfig()
+        return self.set(head, child.set_in(rest, value))
+
+    def discard(self, key: str) -> FrozenConfig:
+        if key not in self._data:
+            return self
+        data = dict(self._data)
+        del data[key]
+        return FrozenConfig._adopt(data)
+
+    def layer(self, overrides: Mapping[str, Any] | None) -> FrozenConfig:
+        """Deep-merge ``overrides`` on top of this config.
+
+        Nested mappings merge recursively; any other override value replaces
+        the base value. Sections the override does not touch are shared.
+        """
+        if not overrides:
+            return self
+        data = dict(self._data)
+        for key, value in overrides.items():
+            current = data.get(key)
+            if isinstance(value, Mapping) and isinstance(current, FrozenConfig):
+                data[key] = current.layer(value)
+            else:
+                data[key] = freeze(value)
+        return FrozenConfig._adopt(data)
+
+    def thaw(self) -> dict[str, Any]:
+        """Materialize an independent plain ``dict`` (recursively)."""
+        return {key: thaw(value) for key, value in self._data.items()}
+
+
+def freeze(value: Any) -> Any:
+    """Return an immutable, shareable form of ``value``."""
+    if isinstance(value, (FrozenConfig, _FrozenList)):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenConfig(value)
+    if isinstance(value, list):
+        return _FrozenList(freeze(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return plain, mutable dicts/lists for ``value`` (frozen or not)."""
+    if isinstance(value, FrozenConfig):
+        return {key: thaw(item) for key, item in value._data.items()}
+    if isinstance(value, _FrozenList):
+        return [thaw(item) for item in value]
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    return value
+
+
+__all__ = ["FrozenConfig", "freeze", "thaw"]
@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import time
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from copy import deepcopy
 from typing import Any
 
@@ -32,6 +32,7 @@ from src.pipeline.config_contract_v26 import (
     validate_train_lora_execution_config,
 )
 from src.pipeline.config_variant_plan_v2 import ConfigVariantPlanV2
+from src.pipeline.frozen_config import FrozenConfig
 from src.pipeline.job_models_v2 import (
     BatchSettings,
     JobStatusV2,
@@ -372,10 +373,33 @@ class JobBuilderV2:
             overrides: Dict of dot-path keys to values.
 
         Returns:
-            Deep copy of base_config with overrides applied.
+            base_config itself when there are no overrides. Mapping configs get
+            a path copy: only the containers along each override path are copied
+            and every other section is shared with base_config (variants are
+            materialized later by _generate_variants). Object configs are
+            deep-copied.
         """
         if not overrides:
-            return deepcopy(base_config)
+            return base_config
+
+        if isinstance(base_config, FrozenConfig):
+            config_copy = base_config
+            for path, value in overrides.items():
+                config_copy = config_copy.set_in(path.split("."), value)
+            return config_copy
+
+        if isinstance(base_config, Mapping):
+            config_copy = dict(base_config)
+            for path, value in overrides.items():
+                parts = path.split(".")
+                current = config_copy
+                for part in parts[:-1]:
+                    child = current.get(part)
+                    child = dict(child) if isinstance(child, Mapping) else {}
+                    current[part] = child
+                    current = child
+                current[parts[-1]] = value
+            return config_copy
 
         # Deep copy to avoid mutating base
         config_copy = deepcopy(base_config)
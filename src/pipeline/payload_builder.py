@@ -25,6 +25,7 @@ from collections.abc import Mapping
 from typing import Any, Protocol
 
 from src.pipeline.config_normalizer import normalize_stage_payload_config
+from src.pipeline.frozen_config import thaw
 from src.prompting.prompt_optimizer_config import PromptOptimizerConfig
 from src.prompting.prompt_optimizer_orchestrator import PromptOptimizerOrchestrator
 from src.prompting.prompt_optimizer_service import PromptOptimizerService
@@ -97,13 +98,17 @@ def _normalize_stage_type(stage_type: str | StageType) -> StageType:
 
 
 def _extract_config(stage: StageExecutionLike, stage_type: StageType) -> dict[str, Any]:
-    """Extract the config dict from a stage, handling various formats."""
+    """Extract the config dict from a stage, handling various formats.
+
+    Frozen (copy-on-write) configs are thawed here: WebUI payloads are the
+    boundary where plain, mutable dicts are required.
+    """
     # Handle stage_sequencer.StageExecution which has config.payload
     if hasattr(stage, "config") and hasattr(stage.config, "payload"):
-        return normalize_stage_payload_config(dict(stage.config.payload or {}), stage_type=stage_type.value)
+        return normalize_stage_payload_config(thaw(stage.config.payload or {}), stage_type=stage_type.value)
     # Handle stage_models.StageExecution which has config as a Mapping
     if hasattr(stage, "config") and isinstance(stage.config, Mapping):
-        return normalize_stage_payload_config(dict(stage.config), stage_type=stage_type.value)
+        return normalize_stage_payload_config(thaw(stage.config), stage_type=stage_type.value)
     return normalize_stage_payload_config({}, stage_type=stage_type.value)
 
 
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import logging
 import time
+from collections import deque
 from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
@@ -91,6 +93,61 @@ def _build_secondary_motion_runtime_block(observation: Mapping[str, Any] | None)
 DEFAULT_JOB_TIMEOUT_SEC: float = 600.0
 
 
+SEQUENCE_PIPELINE_DEPTH = 2
+
+
+def _first_video_output(results: list[VideoExecutionResult | None]) -> str | None:
+    """Primary output of a segment, as ``_record_video_stage_results`` would order it."""
+    for result in results:
+        if result is None:
+            continue
+        for item in result.output_paths or []:
+            if item:
+                return str(item)
+        if result.primary_path:
+            return str(result.primary_path)
+    return None
+
+
+def _apply_backend_execution_timing(
+    timing: dict[str, Any],
+    results: list[VideoExecutionResult | None],
+) -> None:
+    """Set the segment's GPU window, preferring the backend's own execution timestamps."""
+    started = timing.get("backend_started_at")
+    finished = timing.get("backend_finished_at")
+    for result in results:
+        execution = (getattr(result, "backend_metadata", None) or {}).get("execution_timing")
+        if isinstance(execution, Mapping):
+            timing["backend_execution"] = dict(execution)
+            started = execution.get("execution_started_at") or started
+            finished = execution.get("execution_completed_at") or finished
+            break
+    timing["gpu_started_at"] = float(started or timing["submitted_at"])
+    timing["gpu_finished_at"] = float(finished or timing["gpu_started_at"])
+
+
+@dataclass
+class _PreparedVideoRequest:
+    batch_index: int
+    input_path: str
+    request: VideoExecutionRequest
+    secondary_motion_observation: dict[str, Any] | None = None
+
+
+@dataclass
+class _PreparedVideoStage:
+    """Backend requests for one video stage call, built before any backend work starts."""
+
+    stage_name: str
+    backend: Any
+    config_dict: dict[str, Any]
+    secondary_motion_intent: dict[str, Any]
+    secondary_motion_enabled: bool
+    continuity_link: dict[str, Any] | None = None
+    requests: list[_PreparedVideoRequest] = field(default_factory=list)
+
+
 class PipelineJobTimeoutError(Exception):
     """Raised when a job exceeds the per-job wall-clock ceiling."""
 
@@ -387,6 +444,37 @@ class PipelineRunner:
         variants: list[dict[str, Any]],
         metadata: dict[str, Any],
     ) -> list[str]:
+        prepared = self._prepare_video_stage(
+            stage_name=stage_name,
+            njr=njr,
+            current_stage_paths=current_stage_paths,
+            prompt=prompt,
+            negative_prompt=negative_prompt,
+            run_dir=run_dir,
+            cancel_token=cancel_token,
+            metadata=metadata,
+        )
+        results = self._run_prepared_video_stage(prepared)
+        return self._record_video_stage_results(
+            prepared,
+            results,
+            variants=variants,
+            metadata=metadata,
+        )
+
+    def _prepare_video_stage(
+        self,
+        *,
+        stage_name: str,
+        njr: NormalizedJobRecord,
+        current_stage_paths: list[str],
+        prompt: str,
+        negative_prompt: str,
+        run_dir: Path,
+        cancel_token: CancelToken | None,
+        metadata: dict[str, Any],
+    ) -> _PreparedVideoStage:
+        """Build the backend requests for one video stage call without running them."""
         backend = self._video_backends.get_for_stage(stage_name)
         config_dict = self._stage_config_dict_for_video(njr, stage_name)
         if stage_name == "animatediff":
@@ -409,10 +497,6 @@ class PipelineRunner:
                 },
             )
 
-        next_stage_paths: list[str] = []
-        manifest_paths: list[str] = []
-        artifact_records: list[dict[str, Any]] = []
-        backend_results: list[VideoExecutionResult] = []
         prompt_row = getattr(njr, "prompt_pack_row_index", 0) or 0
         continuity_link = self._resolve_continuity_link(njr, metadata=metadata)
         if continuity_link:
@@ -427,13 +511,14 @@ class PipelineRunner:
         original_inputs = getattr(njr, "input_image_paths", None)
         use_original_name = original_inputs and getattr(njr, "start_stage", None)
 
-        video_paths: list[str] = []
-        gif_paths: list[str] = []
-        collected_frame_paths: list[str] = []
-        thumbnail_path: str | None = None
-        frame_path_count = 0
-        source_image_path: str | None = None
-
+        prepared = _PreparedVideoStage(
+            stage_name=stage_name,
+            backend=backend,
+            config_dict=config_dict,
+            secondary_motion_intent=dict(secondary_motion_intent),
+            secondary_motion_enabled=secondary_motion_enabled,
+            continuity_link=dict(continuity_link) if continuity_link else None,
+        )
         for img_idx, input_path in enumerate(current_stage_paths):
             image_name = None
             if stage_name == "animatediff":
@@ -511,9 +596,60 @@ class PipelineRunner:
                 cancel_token=cancel_token,
                 context_metadata=request_context_metadata,
             )
-            execution_result = backend.execute(self._pipeline, request)
+            prepared.requests.append(
+                _PreparedVideoRequest(
+                    batch_index=img_idx,
+                    input_path=input_path,
+                    request=request,
+                    secondary_motion_observation=secondary_motion_observation,
+                )
+            )
+        return prepared
+
+    def _run_prepared_video_stage(
+        self,
+        prepared: _PreparedVideoStage,
+    ) -> list[VideoExecutionResult | None]:
+        """Run the backend for every prepared request; touches no job metadata."""
+        return [
+            prepared.backend.execute(self._pipeline, entry.request)
+            for entry in prepared.requests
+        ]
+
+    def _record_video_stage_results(
+        self,
+        prepared: _PreparedVideoStage,
+        results: list[VideoExecutionResult | None],
+        *,
+        variants: list[dict[str, Any]],
+        metadata: dict[str, Any],
+    ) -> list[str]:
+        """Fold backend results into variants and job metadata, in request order."""
+        stage_name = prepared.stage_name
+        backend = prepared.backend
+        config_dict = prepared.config_dict
+        secondary_motion_intent = prepared.secondary_motion_intent
+        secondary_motion_enabled = prepared.secondary_motion_enabled
+        continuity_link = prepared.continuity_link
+
+        next_stage_paths: list[str] = []
+        manifest_paths: list[str] = []
+        artifact_records: list[dict[str, Any]] = []
+        backend_results: list[VideoExecutionResult] = []
+        video_paths: list[str] = []
+        gif_paths: list[str] = []
+        collected_frame_paths: list[str] = []
+        thumbnail_path: str | None = None
+        frame_path_count = 0
+        source_image_path: str | None = None
+
+        for entry, execution_result in zip(prepared.requests, results):
             if execution_result is None:
                 continue
+            img_idx = entry.batch_index
+            input_path = entry.input_path
+            request = entry.request
+            secondary_motion_observation = entry.secondary_motion_observation
             if secondary_motion_enabled and secondary_motion_observation:
                 secondary_motion_payload = metadata.setdefault(
                     "secondary_motion",
@@ -717,54 +853,105 @@ class PipelineRunner:
         prior_output_path: str | None = current_stage_paths[0] if current_stage_paths else None
         all_output_paths: list[str] = []
 
-        for seg_plan in segment_plans:
-            resolved_plan = planner.apply_carry_forward(
-                seg_plan, prior_output_path=prior_output_path or ""
-            )
-            seg_input_paths = (
-                [resolved_plan.source_image_path]
-                if resolved_plan.source_image_path
-                else list(current_stage_paths)
-            )
+        # Independent segments on a backend that queues server-side are kept
+        # SEQUENCE_PIPELINE_DEPTH deep so the GPU never waits on host work.
+        # Carry-forward segments still need the prior output, so only the
+        # recording of segment N overlaps the backend run of N+1.
+        capabilities = getattr(self._video_backends.get_for_stage(stage_name), "capabilities", None)
+        independent = planner.segments_are_independent(seq_job.carry_forward_policy)
+        depth = (
+            SEQUENCE_PIPELINE_DEPTH
+            if independent and getattr(capabilities, "supports_pipelined_segments", False)
+            else 1
+        )
+        pending: deque[tuple[Any, _PreparedVideoStage, Future, dict[str, Any]]] = deque()
+        remaining_plans = deque(segment_plans)
+        previous_timing: dict[str, Any] | None = None
+        gpu_idle_seconds = 0.0
+        sequence_started = time.monotonic()
+
+        def _submit_ready(pool: ThreadPoolExecutor) -> None:
+            while remaining_plans and len(pending) < depth and (independent or not pending):
+                self._ensure_not_cancelled(cancel_token, "video sequence segment")
+                resolved = planner.apply_carry_forward(
+                    remaining_plans.popleft(), prior_output_path=prior_output_path or ""
+                )
+                seg_input_paths = (
+                    [resolved.source_image_path]
+                    if resolved.source_image_path
+                    else list(current_stage_paths)
+                )
+                prepared = self._prepare_video_stage(
+                    stage_name=stage_name,
+                    njr=njr,
+                    current_stage_paths=seg_input_paths,
+                    prompt=resolved.prompt,
+                    negative_prompt=resolved.negative_prompt,
+                    run_dir=run_dir,
+                    cancel_token=cancel_token,
+                    metadata=metadata,
+                )
+                timing: dict[str, Any] = {"submitted_at": time.time()}
+                pending.append(
+                    (resolved, prepared, pool.submit(self._run_sequence_segment, prepared, timing), timing)
+                )
 
-            seg_output_paths = self._execute_video_stage(
-                stage_name=stage_name,
-                njr=njr,
-                current_stage_paths=seg_input_paths,
-                prompt=resolved_plan.prompt,
-                negative_prompt=resolved_plan.negative_prompt,
-                run_dir=run_dir,
-                cancel_token=cancel_token,
-                variants=variants,
-                metadata=metadata,
-            )
+        with ThreadPoolExecutor(max_workers=depth, thread_name_prefix="video_segment") as pool:
+            _submit_ready(pool)
+            while pending:
+                resolved_plan, prepared, future, timing = pending.popleft()
+                results = future.result()
+                primary_output = _first_video_output(results)
+                if primary_output:
+                    prior_output_path = primary_output
+                _submit_ready(pool)
+
+                seg_output_paths = self._record_video_stage_results(
+                    prepared,
+                    results,
+                    variants=variants,
+                    metadata=metadata,
+                )
+                timing["recorded_at"] = time.time()
+                _apply_backend_execution_timing(timing, results)
+                if previous_timing is not None:
+                    gap = max(0.0, timing["gpu_started_at"] - previous_timing["gpu_finished_at"])
+                    timing["gpu_idle_gap_seconds"] = gap
+                    gpu_idle_seconds += gap
+                previous_timing = timing
+
+                primary_output = seg_output_paths[0] if seg_output_paths else None
+                provenance = SegmentProvenanceRecord(
+                    sequence_id=seq_job.sequence_id,
+                    job_id=seq_job.job_id,
+                    segment_index=resolved_plan.segment_index,
+                    segment_id=resolved_plan.segment_id,
+                    source_image_path=resolved_plan.source_image_path,
+                    primary_output_path=primary_output,
+                    manifest_path=None,
+                    output_paths=list(seg_output_paths),
+                    carry_forward_policy=resolved_plan.carry_forward_policy,
+                    timing=dict(timing),
+                )
+                seq_result.segment_provenance.append(provenance)
+                seq_result.completed_segments += 1
+                seq_result.all_output_paths.extend(seg_output_paths)
+                all_output_paths.extend(seg_output_paths)
 
-            primary_output = seg_output_paths[0] if seg_output_paths else None
-            provenance = SegmentProvenanceRecord(
-                sequence_id=seq_job.sequence_id,
-                job_id=seq_job.job_id,
-                segment_index=resolved_plan.segment_index,
-                segment_id=resolved_plan.segment_id,
-                source_image_path=resolved_plan.source_image_path,
-                primary_output_path=primary_output,
-                manifest_path=None,
-                output_paths=list(seg_output_paths),
-                carry_forward_policy=resolved_plan.carry_forward_policy,
-            )
-            seq_result.segment_provenance.append(provenance)
-            seq_result.completed_segments += 1
-            seq_result.all_output_paths.extend(seg_output_paths)
-            all_output_paths.extend(seg_output_paths)
-
-            if primary_output:
-                prior_output_path = primary_output
-
-            logger.info(
-                "[SEQUENCE] segment %d/%d complete — %d output(s)",
-                resolved_plan.segment_index + 1,
-                seq_job.total_segments,
-                len(seg_output_paths),
-            )
+                logger.info(
+                    "[SEQUENCE] segment %d/%d complete — %d output(s), gpu idle before %.2fs",
+                    resolved_plan.segment_index + 1,
+                    seq_job.total_segments,
+                    len(seg_output_paths),
+                    float(timing.get("gpu_idle_gap_seconds") or 0.0),
+                )
+
+        seq_result.timing = {
+            "mode": "pipelined" if depth > 1 else ("overlapped_host" if len(segment_plans) > 1 else "sequential"),
+            "pipeline_depth": depth,
+            "gpu_idle_seconds": gpu_idle_seconds,
+            "wall_seconds": time.monotonic() - sequence_started,
+        }
 
         manifest_path = write_sequence_manifest(
             seq_result,
@@ -834,6 +1021,17 @@ class PipelineRunner:
 
         return all_output_paths
 
+    def _run_sequence_segment(
+        self,
+        prepared: _PreparedVideoStage,
+        timing: dict[str, Any],
+    ) -> list[VideoExecutionResult | None]:
+        timing["backend_started_at"] = time.time()
+        try:
+            return self._run_prepared_video_stage(prepared)
+        finally:
+            timing["backend_finished_at"] = time.time()
+
     def _check_job_deadline(
         self,
         job_start_time: float,
@@ -1005,6 +1203,32 @@ class PipelineRunner:
         )
         return result
 
+    def _call_pipeline_save_hook(self, name: str) -> set[str]:
+        """Call a deferred-save hook when the executor defines one (test doubles may not)."""
+        if not callable(getattr(type(self._pipeline), name, None)):
+            return set()
+        return set(getattr(self._pipeline, name)() or ())
+
+    @staticmethod
+    def _drop_failed_stage_saves(
+        failed: set[str],
+        paths: list[str],
+        variants: list[Any],
+    ) -> list[str]:
+        """Remove outputs whose deferred save failed from the stage paths and variants."""
+        if not failed:
+            return paths
+
+        def _failed(path: Any) -> bool:
+            return bool(path) and str(Path(path).resolve()) in failed
+
+        variants[:] = [
+            variant
+            for variant in variants
+            if not (isinstance(variant, dict) and _failed(variant.get("path")))
+        ]
+        return [path for path in paths if not _failed(path)]
+
     def run_njr(
         self,
         njr: NormalizedJobRecord,
@@ -1159,6 +1383,9 @@ class PipelineRunner:
             except Exception:
                 logger.warning("Failed to emit stage checkpoint for %s", stage_name, exc_info=True)
 
+        # Single-image stages return while their output is still being written, so
+        # the next WebUI request overlaps the save; each stage boundary settles them.
+        self._call_pipeline_save_hook("begin_deferred_stage_saves")
         try:
             # PR-HARDEN-008: Record wall-clock start for per-job timeout ceiling
             job_start_time: float = time.monotonic()
@@ -1852,6 +2079,11 @@ class PipelineRunner:
                     logger.warning(f"Unknown stage type: {stage.stage_name}, skipping")
                     continue
 
+                current_stage_paths = self._drop_failed_stage_saves(
+                    self._call_pipeline_save_hook("settle_deferred_stage_saves"),
+                    current_stage_paths,
+                    variants,
+                )
                 _emit_stage_checkpoint(
                     stage.stage_name,
                     current_stage_paths,
@@ -1920,6 +2152,7 @@ class PipelineRunner:
             if checkpoint_callback is not None and _should_reraise_for_queue_retry(exc):
                 raise
         finally:
+            self._call_pipeline_save_hook("end_deferred_stage_saves")
             # PR-PIPE-001: Clear job ID from executor after execution
             self._pipeline._current_job_id = None
             self._pipeline._current_njr_sha256 = None
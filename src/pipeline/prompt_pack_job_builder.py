@@ -7,7 +7,7 @@ import itertools
 import json
 import logging
 import random
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Iterator, Mapping
 from pathlib import Path
 from typing import Any, cast
 
@@ -20,6 +20,7 @@ from src.pipeline.config_contract_v26 import (
     extract_actors_intent,
     extract_secondary_motion_intent,
 )
+from src.pipeline.frozen_config import FrozenConfig, freeze, thaw
 from src.pipeline.job_builder_v2 import JobBuilderV2
 from src.pipeline.job_models_v2 import (
     BatchSettings,
@@ -93,69 +94,85 @@ class PromptPackNormalizedJobBuilder:
         self._style_lora_manager = style_lora_manager
         self._pack_rows_cache: dict[tuple[Any, ...], list[PackRow]] = {}
         self._pack_metadata_cache: dict[tuple[Any, ...], dict[str, Any]] = {}
-        self._pack_config_cache: dict[tuple[Any, ...], dict[str, Any] | None] = {}
-        self._resolved_config_cache: dict[tuple[Any, ...], dict[str, Any]] = {}
+        self._pack_config_cache: dict[tuple[Any, ...], FrozenConfig | None] = {}
+        # Resolved configs are frozen and shared by every record built from them;
+        # plain dicts are only materialized per NJR inside JobBuilderV2.
+        self._resolved_config_cache: dict[tuple[Any, ...], FrozenConfig] = {}
 
     def build_jobs(self, entries: Iterable[PackJobEntry]) -> list[NormalizedJobRecord]:
         # Convert to list to avoid consuming iterator and to enable length check
         entries_list = list(entries)
         _logger.info(f"[PromptPackNormalizedJobBuilder] build_jobs() called with {len(entries_list)} entries")
-        records: list[NormalizedJobRecord] = []
+        records = list(self.iter_jobs(entries_list))
+        _logger.info(f"[PromptPackNormalizedJobBuilder] Total NJRs generated: {len(records)}")
+        return records
+
+    def iter_jobs(
+        self,
+        entries: Iterable[PackJobEntry],
+        *,
+        matrix_seed: int | None = None,
+    ) -> Iterator[NormalizedJobRecord]:
+        """Yield NJRs lazily, one matrix combination at a time.
+
+        Produces the same records, in the same order, as ``build_jobs``; only the
+        jobs for the combination currently being expanded are held in memory.
+        ``matrix_seed`` fixes the sample drawn for random-mode matrices, so the
+        same stream can be rebuilt (e.g. to resume it after a restart).
+        """
+        rng = random.Random(matrix_seed) if matrix_seed is not None else None
         entry_count = 0
-        for entry in entries_list:
+        for entry in entries:
             entry_count += 1
             if not entry.pack_id:
                 _logger.warning("Pack entry missing pack_id, skipping")
                 continue
-            
+
             # Expand entry by matrix combinations from pack JSON
-            expanded_entries = self._expand_entry_by_matrix(entry)
-            _logger.info(f"[PromptPackNormalizedJobBuilder] Entry {entry_count} ({entry.pack_id}) expanded to {len(expanded_entries)} variant(s)")
-            
-            # Track jobs per prompt to renumber variant indices correctly
-            jobs_for_this_prompt: list[NormalizedJobRecord] = []
-            
-            for expanded_entry in expanded_entries:
+            combination_count, expanded_entries = self._iter_matrix_entries(entry, rng)
+            _logger.info(f"[PromptPackNormalizedJobBuilder] Entry {entry_count} ({entry.pack_id}) expanded to {combination_count} variant(s)")
+
+            for combination_index, expanded_entry in enumerate(expanded_entries):
                 jobs = self._build_jobs_for_entry(expanded_entry)
-                if jobs:
-                    _logger.info(f"[PromptPackNormalizedJobBuilder] Expanded entry produced {len(jobs)} NJR(s)")
-                    jobs_for_this_prompt.extend(jobs)
-            
-            # Renumber variant indices sequentially across all matrix combinations
-            if jobs_for_this_prompt:
-                self._renumber_variant_indices(jobs_for_this_prompt, len(expanded_entries))
-                records.extend(jobs_for_this_prompt)
-        
-        _logger.info(f"[PromptPackNormalizedJobBuilder] Total NJRs generated: {len(records)}")
-        return records
+                if not jobs:
+                    continue
+                _logger.debug(f"[PromptPackNormalizedJobBuilder] Expanded entry produced {len(jobs)} NJR(s)")
+                # Renumber variant indices sequentially across all matrix combinations
+                if combination_count > 1:
+                    for job in jobs:
+                        job.variant_index = combination_index
+                        job.variant_total = combination_count
+                yield from jobs
+
+    def count_jobs(
+        self,
+        entries: Iterable[PackJobEntry],
+        *,
+        matrix_seed: int | None = None,
+    ) -> int:
+        """Return how many NJRs ``iter_jobs`` will yield, holding one combination at a time.
 
-    def _renumber_variant_indices(
-        self, jobs: list[NormalizedJobRecord], matrix_combinations_count: int
-    ) -> None:
-        """Renumber variant indices sequentially across matrix combinations.
-        
-        When matrix expansion creates multiple combinations, each combination produces
-        jobs with variant_index starting at 0. This method renumbers them sequentially
-        so that matrix combination 1 gets v01-v0N, combination 2 gets v(N+1)-v(2N), etc.
-        
-        Args:
-            jobs: List of NJRs to renumber (modified in place)
-            matrix_combinations_count: Number of matrix combinations that were expanded
+        Without randomization every matrix combination of an entry yields the
+        same jobs (config variants x batch runs), so only the first combination
+        is built. Randomized variants depend on each combination's prompt, so
+        those entries are counted combination by combination.
         """
-        if matrix_combinations_count <= 1:
-            # No matrix expansion, variants are already numbered correctly
-            return
-        
-        # Group jobs by their original variant_index to preserve batch grouping
-        # Jobs are ordered: [matrix1_variant0_batch0, matrix1_variant0_batch1, ..., matrix2_variant0_batch0, ...]
-        jobs_per_combination = len(jobs) // matrix_combinations_count
-        
-        # Renumber: each matrix combination gets sequential variant indices
-        for i, job in enumerate(jobs):
-            matrix_combo_index = i // jobs_per_combination
-            job.variant_index = matrix_combo_index
-            job.variant_total = matrix_combinations_count
-            _logger.debug(f"[Variant Renumber] Job {i}: variant_index={job.variant_index}, variant_total={job.variant_total}")
+        rng = random.Random(matrix_seed) if matrix_seed is not None else None
+        total = 0
+        for entry in entries:
+            if not entry.pack_id:
+                continue
+            combination_count, expanded_entries = self._iter_matrix_entries(entry, rng)
+            first = next(expanded_entries, None)
+            if first is None:
+                continue
+            first_jobs = self._build_jobs_for_entry(first)
+            if not any((job.randomizer_summary or {}).get("enabled") for job in first_jobs):
+                total += combination_count * len(first_jobs)
+                continue
+            total += len(first_jobs)
+            total += sum(len(self._build_jobs_for_entry(expanded)) for expanded in expanded_entries)
+        return total
 
     def _expand_entry_by_matrix(self, entry: PackJobEntry) -> list[PackJobEntry]:
         """Expand a single entry into multiple entries based on pack JSON matrix slots.
@@ -174,23 +191,30 @@ class PromptPackNormalizedJobBuilder:
         Returns:
             List of PackJobEntry, one per matrix combination
         """
+        _count, expanded_entries = self._iter_matrix_entries(entry)
+        return list(expanded_entries)
+
+    def _iter_matrix_entries(
+        self, entry: PackJobEntry, rng: random.Random | None = None
+    ) -> tuple[int, Iterator[PackJobEntry]]:
+        """Return (combination count, lazy iterator of expanded entries) for ``entry``."""
         # Resolve pack path
         pack_path = self._resolve_pack_text_path(entry.pack_id)
         if not pack_path:
             _logger.debug(f"[Matrix Expansion] No pack path found for {entry.pack_id}, skipping expansion")
-            return [entry]
+            return 1, iter((entry,))
         
         # Load pack JSON metadata
         metadata = self._load_pack_metadata_cached(pack_path)
         if not metadata:
             _logger.debug(f"[Matrix Expansion] No JSON metadata for {entry.pack_id}, skipping expansion")
-            return [entry]
+            return 1, iter((entry,))
         
         # Extract matrix slots
         matrix_slots_dict = get_matrix_slots_dict(metadata)
         if not matrix_slots_dict:
             _logger.debug(f"[Matrix Expansion] No matrix slots in {entry.pack_id}, skipping expansion")
-            return [entry]
+            return 1, iter((entry,))
         
         # Check matrix config for mode
         pack_data = metadata.get("pack_data", {})
@@ -203,6 +227,7 @@ class PromptPackNormalizedJobBuilder:
         total_combinations = self._estimate_matrix_combinations(slot_values_lists)
 
         # Generate combinations based on mode
+        combinations: Iterable[tuple[str, ...]]
         if matrix_mode == "random":
             target_count = min(total_combinations, limit) if limit > 0 else min(
                 total_combinations,
@@ -212,7 +237,9 @@ class PromptPackNormalizedJobBuilder:
                 slot_values_lists,
                 target_count,
                 total_combinations,
+                rng,
             )
+            combination_count = len(combinations)
             _logger.info(
                 "[Matrix Expansion] Generated %s random combinations for %s with slots: %s "
                 "(total_possible=%s, effective_limit=%s)",
@@ -224,7 +251,8 @@ class PromptPackNormalizedJobBuilder:
             )
         else:
             effective_limit = min(total_combinations, limit) if limit > 0 else total_combinations
-            combinations = list(itertools.islice(itertools.product(*slot_values_lists), effective_limit))
+            combinations = itertools.islice(itertools.product(*slot_values_lists), effective_limit)
+            combination_count = effective_limit
             if total_combinations > effective_limit:
                 _logger.info(
                     "[Matrix Expansion] Limited combinations to %s (from %s total) for %s",
@@ -235,14 +263,21 @@ class PromptPackNormalizedJobBuilder:
             _logger.info(
                 "[Matrix Expansion] Generating %s sequential combinations for %s with slots: %s "
                 "(total_possible=%s)",
-                len(combinations),
+                effective_limit,
                 entry.pack_id,
                 slot_names,
                 total_combinations,
             )
         
+        return combination_count, self._entries_for_combinations(entry, slot_names, combinations)
+
+    @staticmethod
+    def _entries_for_combinations(
+        entry: PackJobEntry,
+        slot_names: list[str],
+        combinations: Iterable[tuple[str, ...]],
+    ) -> Iterator[PackJobEntry]:
         # Create one entry per combination
-        expanded_entries = []
         for combo in combinations:
             # Build matrix_slot_values dict for this combination
             matrix_values = {name: value for name, value in zip(slot_names, combo)}
@@ -259,9 +294,7 @@ class PromptPackNormalizedJobBuilder:
                 matrix_slot_values=matrix_values,  # Set the matrix values for this combination
                 randomizer_metadata=entry.randomizer_metadata,
             )
-            expanded_entries.append(expanded_entry)
-        
-        return expanded_entries
+            yield expanded_entry
 
     def _estimate_matrix_combinations(self, slot_values_lists: list[list[str]]) -> int:
         total = 1
@@ -317,13 +350,14 @@ class PromptPackNormalizedJobBuilder:
         slot_values_lists: list[list[str]],
         target_count: int,
         total_combinations: int,
+        rng: random.Random | None = None,
     ) -> list[tuple[str, ...]]:
         if target_count <= 0 or total_combinations <= 0:
             return []
         if target_count >= total_combinations:
             return list(itertools.product(*slot_values_lists))
 
-        sampled_indexes = random.sample(range(total_combinations), target_count)
+        sampled_indexes = (rng or random).sample(range(total_combinations), target_count)
         sampled_indexes.sort()
         return [self._decode_matrix_combination_index(index, slot_values_lists) for index in sampled_indexes]
 
@@ -349,7 +383,7 @@ class PromptPackNormalizedJobBuilder:
             # Check if this is a learning experiment with full config_snapshot
             if entry.config_snapshot and entry.pack_id.startswith("learning_"):
                 # Use config_snapshot as pack_config for learning experiments
-                pack_config = {}  # Empty pack_config, will use runtime_params from config_snapshot
+                pack_config = FrozenConfig()  # Empty pack_config, will use runtime_params from config_snapshot
             else:
                 _logger.error("Missing config for pack '%s', skipping entry", entry.pack_id)
                 return []
@@ -362,13 +396,13 @@ class PromptPackNormalizedJobBuilder:
         )
         cached_resolved = self._resolved_config_cache.get(resolved_cache_key)
         if cached_resolved is None:
-            cached_resolved = copy.deepcopy(
+            cached_resolved = freeze(
                 self._config_manager.resolve_config(
-                    pack_overrides=pack_config, runtime_params=runtime_params
+                    pack_overrides=thaw(pack_config), runtime_params=runtime_params
                 )
             )
-            self._resolved_config_cache[resolved_cache_key] = copy.deepcopy(cached_resolved)
-        merged_config = copy.deepcopy(cached_resolved)
+            self._resolved_config_cache[resolved_cache_key] = cached_resolved
+        merged_config = cached_resolved
         stage_flags = self._normalize_stage_flags(
             merged_config.get("pipeline", {}), entry.stage_flags or {}
         )
@@ -547,12 +581,14 @@ class PromptPackNormalizedJobBuilder:
             apply_global_negative=bool(apply_global),
         )
 
-    def _resolve_style_lora(self, merged_config: dict[str, Any]) -> dict[str, Any] | None:
+    def _resolve_style_lora(self, merged_config: Mapping[str, Any]) -> dict[str, Any] | None:
         raw_style_lora = merged_config.get("style_lora")
         if not isinstance(raw_style_lora, Mapping):
             return None
         try:
-            normalized = config_contract_v26.validate_style_lora_execution_config({"style_lora": raw_style_lora})
+            normalized = config_contract_v26.validate_style_lora_execution_config(
+                {"style_lora": thaw(raw_style_lora)}
+            )
             style_payload = _mapping_dict(normalized.get("style_lora"))
         except ValueError as exc:
             return {
@@ -601,12 +637,12 @@ class PromptPackNormalizedJobBuilder:
     def _resolve_entry_actors(
         self,
         entry: PackJobEntry,
-        merged_config: dict[str, Any],
+        merged_config: Mapping[str, Any],
     ) -> list[dict[str, Any]]:
         actor_items: list[Any] = []
         for payload in (entry.config_snapshot, merged_config):
             for group in self._extract_actor_groups(payload):
-                actor_items.extend(list(group or []))
+                actor_items.extend(thaw(item) for item in group or [])
         if not actor_items:
             return []
         if self._lora_manager is None:
@@ -615,7 +651,7 @@ class PromptPackNormalizedJobBuilder:
 
     def _build_record_metadata(
         self,
-        merged_config: dict[str, Any],
+        merged_config: Mapping[str, Any],
         resolved_actors: list[dict[str, Any]],
         resolved_style_lora: dict[str, Any] | None,
     ) -> dict[str, Any]:
@@ -640,7 +676,7 @@ class PromptPackNormalizedJobBuilder:
     def _build_config_payload(
         self,
         entry: PackJobEntry,
-        merged_config: dict[str, Any],
+        merged_config: Mapping[str, Any],
         prompt_resolution: Any,
         stage_chain: list[StageConfig],
         record_metadata: dict[str, Any],
@@ -723,7 +759,7 @@ class PromptPackNormalizedJobBuilder:
         return payload
 
     def _build_stage_chain(
-        self, merged_config: dict[str, Any], stage_flags: dict[str, bool]
+        self, merged_config: Mapping[str, Any], stage_flags: dict[str, bool]
     ) -> list[StageConfig]:
         stage_sections = {
             "txt2img": merged_config.get("txt2img", {}),
@@ -825,19 +861,19 @@ class PromptPackNormalizedJobBuilder:
                 scheduler=stage_scheduler,
                 model=stage_model,
                 vae=stage_vae,
-                extra={k: v for k, v in extra.items() if v not in (None, "", [])},
+                extra={k: v for k, v in thaw(extra).items() if v not in (None, "", [])},
             )
             chain.append(stage_cfg)
         return chain
 
-    def _build_batch_settings(self, merged_config: dict[str, Any]) -> BatchSettings:
+    def _build_batch_settings(self, merged_config: Mapping[str, Any]) -> BatchSettings:
         pipeline_section = merged_config.get("pipeline", {})
         batch_size = int(pipeline_section.get("images_per_prompt", 1) or 1)
         batch_runs = int(pipeline_section.get("loop_count", 1) or 1)
         return BatchSettings(batch_size=batch_size, batch_runs=batch_runs)
 
     def _build_randomizer_plan(
-        self, entry: PackJobEntry, merged_config: dict[str, Any]
+        self, entry: PackJobEntry, merged_config: Mapping[str, Any]
     ) -> RandomizationPlanV2:
         """Build a randomization plan from entry metadata and config."""
         # Check if randomization is enabled in the config
@@ -935,17 +971,17 @@ class PromptPackNormalizedJobBuilder:
         self._pack_rows_cache[cache_key] = list(rows)
         return rows
 
-    def _load_pack_config(self, pack_id: str) -> dict[str, Any] | None:
+    def _load_pack_config(self, pack_id: str) -> FrozenConfig | None:
         config_path_getter = getattr(self._config_manager, "_pack_config_path", None)
         config_path = config_path_getter(pack_id) if callable(config_path_getter) else None
         cache_key = (pack_id, self._path_fingerprint(config_path))
         if cache_key in self._pack_config_cache:
-            cached = self._pack_config_cache[cache_key]
-            return copy.deepcopy(cached) if isinstance(cached, dict) else cached
+            return self._pack_config_cache[cache_key]
         try:
             loaded = self._config_manager.load_pack_config(pack_id)
-            self._pack_config_cache[cache_key] = copy.deepcopy(loaded)
-            return loaded
+            frozen = freeze(loaded)
+            self._pack_config_cache[cache_key] = frozen
+            return frozen
         except Exception as exc:
             _logger.error("Failed to load pack config for '%s': %s", pack_id, exc)
             return None
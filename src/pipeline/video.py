@@ -4,12 +4,22 @@ import logging
 import os
 import shutil
 import subprocess
+import threading
+import time
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Any, BinaryIO
+
+from PIL import Image
 
 from src.utils import save_image_from_base64
+from src.utils.thread_registry import get_thread_registry
 
 logger = logging.getLogger(__name__)
 
+FFMPEG_PIPE_TIMEOUT_SECONDS = 300.0
+_FFMPEG_STDERR_TAIL_BYTES = 16384
+
 
 def _candidate_ffmpeg_paths() -> list[Path]:
     """Return likely FFmpeg executable candidates in preferred order."""
@@ -75,6 +85,234 @@ def _write_concat_input_file(image_paths: list[Path], list_file: Path, frame_dur
             f.write(f"file '{escaped}'\n")
 
 
+class FFmpegPipeError(RuntimeError):
+    """Raised when a streaming FFmpeg encode or decode fails, times out, or is cancelled."""
+
+
+class _FFmpegPipeProcess:
+    """FFmpeg child with drained stderr and a watchdog enforcing timeout and cancellation."""
+
+    def __init__(
+        self,
+        cmd: list[str],
+        *,
+        timeout: float,
+        cancel_token: Any = None,
+        pipe_stdin: bool = False,
+        pipe_stdout: bool = False,
+    ) -> None:
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE if pipe_stdin else subprocess.DEVNULL,
+                stdout=subprocess.PIPE if pipe_stdout else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as exc:
+            raise FFmpegPipeError(f"FFmpeg could not be started: {exc}") from exc
+        self.stop_reason: str | None = None
+        self._stderr_tail = bytearray()
+        self._done = threading.Event()
+        self._deadline = time.monotonic() + max(0.0, float(timeout))
+        self._cancel_token = cancel_token
+        self._registry = get_thread_registry()
+        self._threads = [
+            self._registry.spawn(
+                target=self._drain_stderr,
+                name="ffmpeg_pipe_stderr",
+                daemon=False,
+                purpose="Drain FFmpeg stderr",
+            ),
+            self._registry.spawn(
+                target=self._watch,
+                name="ffmpeg_pipe_watchdog",
+                daemon=False,
+                purpose="Enforce FFmpeg timeout and cancellation",
+            ),
+        ]
+
+    @property
+    def stdin(self) -> BinaryIO:
+        return self.process.stdin  # type: ignore[return-value]
+
+    @property
+    def stdout(self) -> BinaryIO:
+        return self.process.stdout  # type: ignore[return-value]
+
+    def _drain_stderr(self) -> None:
+        stream = self.process.stderr
+        if stream is None:
+            return
+        for chunk in iter(lambda: stream.read(4096), b""):
+            self._stderr_tail += chunk
+            del self._stderr_tail[:-_FFMPEG_STDERR_TAIL_BYTES]
+
+    def _watch(self) -> None:
+        while not self._done.wait(0.1):
+            if time.monotonic() >= self._deadline:
+                self.stop_reason = "timed out"
+            elif self._cancel_token is not None and self._cancel_token.is_cancelled():
+                self.stop_reason = "cancelled"
+            elif self._registry.is_shutdown_requested():
+                self.stop_reason = "stopped for shutdown"
+            else:
+                continue
+            self.process.kill()
+            return
+
+    def finish(self) -> None:
+        """Wait for FFmpeg to exit; raise FFmpegPipeError unless it succeeded."""
+        for stream in (self.process.stdin, self.process.stdout):
+            if stream is not None:
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+        returncode = self.process.wait()
+        self._done.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        if self.stop_reason is not None:
+            raise FFmpegPipeError(f"FFmpeg {self.stop_reason}")
+        if returncode != 0:
+            detail = self._stderr_tail.decode("utf-8", errors="replace").strip()
+            raise FFmpegPipeError(f"FFmpeg exited with code {returncode}: {detail}")
+
+    def abort(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        try:
+            self.finish()
+        except FFmpegPipeError:
+            pass
+
+
+def encode_frames_to_video(
+    frames: Iterable[Image.Image],
+    output_path: Path,
+    *,
+    fps: int = 24,
+    codec: str = "libx264",
+    quality: str = "medium",
+    ffmpeg_executable: Path | None = None,
+    timeout: float = FFMPEG_PIPE_TIMEOUT_SECONDS,
+    cancel_token: Any = None,
+) -> int:
+    """Stream ``frames`` to FFmpeg as rawvideo on stdin; returns the number of frames encoded.
+
+    No intermediate image files are written. All frames must share the first
+    frame's size.
+    """
+    executable = ffmpeg_executable or resolve_ffmpeg_executable()
+    if executable is None:
+        raise FFmpegPipeError("FFmpeg is not available")
+    iterator = iter(frames)
+    first = next(iterator, None)
+    if first is None:
+        raise FFmpegPipeError("No frames provided for video encode")
+    width, height = first.size
+    cmd = [
+        str(executable),
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "-s",
+        f"{width}x{height}",
+        "-r",
+        str(fps),
+        "-i",
+        "-",
+        "-c:v",
+        codec,
+        "-preset",
+        quality,
+        "-pix_fmt",
+        "yuv420p",
+        "-y",
+        str(output_path),
+    ]
+    logger.info("Streaming frames to FFmpeg: %s", " ".join(cmd))
+    pipe = _FFmpegPipeProcess(cmd, timeout=timeout, cancel_token=cancel_token, pipe_stdin=True)
+    count = 0
+    try:
+        for frame in _chain_first(first, iterator):
+            if frame.size != (width, height):
+                raise FFmpegPipeError(f"Frame {count} is {frame.size[0]}x{frame.size[1]}, expected {width}x{height}")
+            rgb = frame if frame.mode == "RGB" else frame.convert("RGB")
+            try:
+                pipe.stdin.write(rgb.tobytes())
+            except (BrokenPipeError, OSError, ValueError):
+                break  # FFmpeg exited early; finish() reports why
+            count += 1
+    except BaseException:
+        pipe.abort()
+        raise
+    pipe.finish()
+    return count
+
+
+def _chain_first(first: Image.Image, rest: Iterable[Image.Image]) -> Iterable[Image.Image]:
+    yield first
+    yield from rest
+
+
+def _read_ppm_header(stream: BinaryIO) -> tuple[int, int] | None:
+    """Read one binary PPM header as written by FFmpeg's ppm encoder."""
+    magic = stream.readline()
+    if not magic:
+        return None
+    size = stream.readline().split()
+    maxval = stream.readline().strip()
+    if magic.strip() != b"P6" or len(size) != 2 or maxval != b"255":
+        raise FFmpegPipeError(f"Unexpected frame header from FFmpeg: {magic!r} {size!r} {maxval!r}")
+    return int(size[0]), int(size[1])
+
+
+def decode_video_frames(
+    video_path: Path,
+    *,
+    ffmpeg_executable: Path | None = None,
+    timeout: float = FFMPEG_PIPE_TIMEOUT_SECONDS,
+    cancel_token: Any = None,
+) -> list[Image.Image]:
+    """Decode every frame of ``video_path`` in memory via an FFmpeg PPM pipe on stdout."""
+    executable = ffmpeg_executable or resolve_ffmpeg_executable()
+    if executable is None:
+        raise FFmpegPipeError("FFmpeg is not available")
+    cmd = [
+        str(executable),
+        "-v",
+        "error",
+        "-i",
+        str(video_path),
+        "-vsync",
+        "0",
+        "-f",
+        "image2pipe",
+        "-c:v",
+        "ppm",
+        "-",
+    ]
+    pipe = _FFmpegPipeProcess(cmd, timeout=timeout, cancel_token=cancel_token, pipe_stdout=True)
+    frames: list[Image.Image] = []
+    try:
+        while True:
+            header = _read_ppm_header(pipe.stdout)
+            if header is None:
+                break
+            width, height = header
+            data = pipe.stdout.read(width * height * 3)
+            if len(data) != width * height * 3:
+                break  # truncated by a kill or crash; finish() reports why
+            frames.append(Image.frombytes("RGB", (width, height), data))
+    except BaseException:
+        pipe.abort()
+        raise
+    pipe.finish()
+    return frames
+
+
 def write_video_frames(
     frame_images: list[str],
     frames_dir: Path,
@@ -250,6 +488,52 @@ class VideoCreator:
             logger.error(f"Video creation failed: {e}")
             return False
 
+    def create_video_from_frames(
+        self,
+        frames: Iterable[Image.Image],
+        output_path: Path,
+        fps: int = 24,
+        codec: str = "libx264",
+        quality: str = "medium",
+        *,
+        timeout: float = FFMPEG_PIPE_TIMEOUT_SECONDS,
+        cancel_token: Any = None,
+    ) -> bool:
+        """
+        Create video from in-memory frames, streamed to FFmpeg without temp files.
+
+        Args:
+            frames: Same-size PIL images in display order
+            output_path: Path for output video
+            fps: Frames per second (default: 24)
+            codec: Video codec (default: libx264)
+            quality: Quality preset (default: medium)
+            timeout: Seconds before FFmpeg is killed
+            cancel_token: Optional token whose ``is_cancelled()`` stops the encode
+
+        Returns:
+            True if video created successfully
+        """
+        if not self.ffmpeg_available:
+            logger.error("FFmpeg not available, cannot create video")
+            return False
+        try:
+            count = encode_frames_to_video(
+                frames,
+                output_path,
+                fps=fps,
+                codec=codec,
+                quality=quality,
+                ffmpeg_executable=self.ffmpeg_executable,
+                timeout=timeout,
+                cancel_token=cancel_token,
+            )
+        except FFmpegPipeError as e:
+            logger.error(f"Video creation failed: {e}")
+            return False
+        logger.info(f"Video created successfully: {output_path.name} ({count} frames)")
+        return True
+
     def create_slideshow_video(
         self,
         image_paths: list[Path],
@@ -1,10 +1,11 @@
 # Subsystem: Queue
-# Role: Exposes queue models and the single-node runner for local execution.
+# Role: Exposes queue models and the single- and multi-node job runners.
 
 """Queue models and single-node runner skeleton."""
 
 from .job_model import Job, JobPriority, JobStatus
 from .job_queue import JobQueue
+from .multi_node_runner import MultiNodeJobRunner
 from .single_node_runner import SingleNodeJobRunner
 
-__all__ = ["Job", "JobPriority", "JobStatus", "JobQueue", "SingleNodeJobRunner"]
+__all__ = ["Job", "JobPriority", "JobStatus", "JobQueue", "MultiNodeJobRunner", "SingleNodeJobRunner"]
@@ -5,29 +5,85 @@
 
 Queue history stores NJR-backed snapshots in `snapshot["normalized_job"]`.
 New runtime entries are NJR-only.
+
+The JSONL file gets one line per status transition. Once it averages
+``HISTORY_COMPACT_LINES_PER_JOB`` lines per job it is rewritten down to the
+latest line per job, and the shared config blob directory is garbage-collected
+afterwards.
 """
 
 from __future__ import annotations
 
 import json
+import logging
+import os
 import threading
-from collections.abc import Callable
-from dataclasses import asdict, dataclass
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, replace
+from functools import partial
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from src.cluster.worker_model import WorkerId
 from src.queue.job_model import Job, JobStatus
+from src.utils.config_blob_store import (
+    ConfigBlobStore,
+    UnresolvedConfigBlobError,
+    blob_store_dir_for,
+    get_config_blob_store,
+    hydrate_snapshot,
+    referenced_blob_shas,
+)
 
 if TYPE_CHECKING:
     from src.pipeline.run_config import RunConfig
 
+logger = logging.getLogger(__name__)
+
+# A JSONL history is compacted once it has at least this many lines...
+HISTORY_COMPACT_MIN_LINES = 2000
+# ...and averages this many lines per job.
+HISTORY_COMPACT_LINES_PER_JOB = 3
+
 
 def _utcnow() -> datetime:
     return datetime.utcnow()
 
 
+class _StoredSnapshot:
+    """A snapshot as read from disk, blob refs still unresolved."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: dict[str, Any]) -> None:
+        self.raw = raw
+
+
+class _LazySnapshot:
+    """Field descriptor that resolves a loaded snapshot's blob refs on first access.
+
+    Listing history touches only summary fields, so most entries never pay for
+    hydration.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._attr = f"_{name}_value"
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return None
+        value = obj.__dict__.get(self._attr)
+        if isinstance(value, _StoredSnapshot):
+            value = _hydrate_entry_snapshot(obj.job_id, value.raw)
+            obj.__dict__[self._attr] = value
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self._attr] = value
+
+
 @dataclass
 class JobHistoryEntry:
     job_id: str
@@ -44,11 +100,17 @@ class JobHistoryEntry:
     prompt_source: str = "manual"  # "manual" | "pack"
     prompt_pack_id: str | None = None
     prompt_keys: list[str] | None = None
-    snapshot: dict[str, Any] | None = None
+    snapshot: dict[str, Any] | None = _LazySnapshot()  # type: ignore[assignment]
     duration_ms: int | None = None
 
+    def _stored_snapshot(self) -> Any:
+        """Return the snapshot without resolving blob refs that were never accessed."""
+        return self.__dict__.get("_snapshot_value")
+
     def to_json(self) -> str:
-        data = asdict(self)
+        stored = self._stored_snapshot()
+        data = asdict(replace(self, snapshot=None))
+        data["snapshot"] = stored.raw if isinstance(stored, _StoredSnapshot) else self.snapshot
         data["status"] = self.status.value
         data["run_mode"] = self.run_mode
         data["prompt_source"] = self.prompt_source
@@ -85,11 +147,97 @@ class JobHistoryEntry:
             prompt_source=raw.get("prompt_source", "manual"),
             prompt_pack_id=raw.get("prompt_pack_id"),
             prompt_keys=raw.get("prompt_keys"),
-            snapshot=raw.get("snapshot"),
+            snapshot=_lazy_snapshot(raw.get("snapshot")),
             duration_ms=int(raw["duration_ms"]) if raw.get("duration_ms") is not None else None,
         )
 
 
+def _lazy_snapshot(snapshot: Any) -> Any:
+    if isinstance(snapshot, dict) and referenced_blob_shas(snapshot):
+        return _StoredSnapshot(snapshot)
+    return snapshot
+
+
+def _hydrate_entry_snapshot(job_id: Any, snapshot: Any) -> Any:
+    """Resolve blob refs; an unresolvable snapshot keeps its refs so nothing is lost."""
+    try:
+        return hydrate_snapshot(snapshot)
+    except UnresolvedConfigBlobError as exc:
+        logger.error("History entry %s keeps an unresolved snapshot: %s", job_id, exc)
+        return snapshot
+
+
+def _entry_storage_payload(
+    entry: JobHistoryEntry, blob_store: ConfigBlobStore | None
+) -> dict[str, Any]:
+    """Return the on-disk form of ``entry``; NJR config sub-documents become blob refs when enabled."""
+    # Local import: app_config imports the queue package via watchdog_v2.
+    from src.config.app_config import is_config_blob_store_enabled
+
+    payload = json.loads(entry.to_json())
+    snapshot = payload.get("snapshot")
+    if blob_store is not None and isinstance(snapshot, dict) and is_config_blob_store_enabled():
+        payload["snapshot"] = blob_store.dehydrate_snapshot(snapshot)
+    return payload
+
+
+def _iter_history_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the parsed lines of a JSONL history file; unreadable lines are skipped."""
+    if not path.exists():
+        return
+    with path.open("rb") as handle:
+        for raw in handle:
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def compact_history_file(path: str | Path, *, collect_blobs: bool = True) -> int:
+    """Rewrite a JSONL history down to the latest line per job; return lines dropped.
+
+    Lines keep the order of their last write, so reverse scans still see the most
+    recent jobs first. The new file is fsynced and swapped in with ``os.replace``.
+    Must run on the thread that appends to the file (the persistence worker).
+    When ``collect_blobs`` is set, config blobs no longer referenced by any
+    registered file in the sibling blob directory are deleted afterwards.
+    """
+    history_path = Path(path)
+    if not history_path.exists():
+        return 0
+    latest: dict[str, bytes] = {}
+    total = 0
+    with history_path.open("rb") as handle:
+        for raw in handle:
+            if not raw.strip():
+                continue
+            try:
+                job_id = json.loads(raw)["job_id"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            total += 1
+            latest.pop(job_id, None)
+            latest[job_id] = raw if raw.endswith(b"\n") else raw + b"\n"
+    dropped = total - len(latest)
+    if dropped:
+        temp_path = history_path.with_name(f"{history_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with temp_path.open("wb") as target:
+                target.writelines(latest.values())
+                target.flush()
+                os.fsync(target.fileno())
+            os.replace(temp_path, history_path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            raise
+        logger.info("Compacted %s: dropped %s superseded history lines", history_path, dropped)
+    if collect_blobs:
+        get_config_blob_store(blob_store_dir_for(history_path)).collect_garbage()
+    return dropped
+
+
 def job_history_entry_from_run_config(
     job_id: str,
     run_config: RunConfig,
@@ -127,6 +275,63 @@ def job_history_entry_from_run_config(
     )
 
 
+def _build_status_change_entry(
+    current: JobHistoryEntry | None,
+    job_id: str,
+    status: JobStatus,
+    ts: datetime,
+    *,
+    error: str | None = None,
+    result: dict[str, Any] | None = None,
+) -> JobHistoryEntry:
+    """Fold a status transition into the latest known entry for a job."""
+    created_at = current.created_at if current else ts
+    started_at = current.started_at if current else None
+    completed_at = current.completed_at if current else None
+    if status == JobStatus.RUNNING:
+        started_at = started_at or ts
+    if status in {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}:
+        completed_at = ts
+
+    duration_ms: int | None = None
+    if started_at and completed_at:
+        delta = completed_at - started_at
+        duration_ms = int(delta.total_seconds() * 1000)
+
+    return JobHistoryEntry(
+        job_id=job_id,
+        created_at=created_at,
+        status=status,
+        started_at=started_at,
+        completed_at=completed_at,
+        payload_summary=current.payload_summary if current else "",
+        error_message=error or (current.error_message if current else None),
+        worker_id=current.worker_id if current else None,
+        result=result if result is not None else (current.result if current else None),
+        run_mode=current.run_mode if current else "queue",
+        snapshot=current._stored_snapshot() if current else None,
+        duration_ms=duration_ms,
+    )
+
+
+def _summarize_job_for_history(job: Job) -> str:
+    result = getattr(job, "result", None) or {}
+    if isinstance(result, dict) and result.get("mode") == "prompt_pack_batch":
+        total = result.get("total_entries", len(result.get("results") or []))
+        first_prompt = ""
+        try:
+            first_entry = (result.get("results") or [])[0]
+            first_prompt = (first_entry.get("prompt") or "").strip()
+        except Exception:
+            first_prompt = ""
+        summary = f"{total} entries"
+        if first_prompt:
+            snippet = first_prompt if len(first_prompt) <= 60 else first_prompt[:60] + "?"
+            summary += f" | {snippet}"
+        return summary
+    return job.summary()
+
+
 class JobHistoryStore:
     """Abstract store interface."""
 
@@ -173,10 +378,22 @@ class JSONLJobHistoryStore(JobHistoryStore):
         self._path = Path(path)
         self._lock = threading.Lock()
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._blob_store = get_config_blob_store(blob_store_dir_for(self._path))
+        self._blob_store.register_referrer(
+            os.path.abspath(self._path), partial(_iter_history_records, self._path)
+        )
         self._callbacks: list[Callable[[JobHistoryEntry], None]] = []
         # Performance optimization: Cache loaded entries to avoid re-reading file on every list_jobs()
         self._cached_entries: dict[str, JobHistoryEntry] | None = None
         self._cache_mtime: float | None = None
+        # Byte offset of the first unread line; appended lines are tail-read from here
+        # instead of reparsing the whole file whenever the mtime moves.
+        self._cache_offset: int = 0
+        # Inode of the cached file; compaction swaps in a new one.
+        self._cache_ino: int | None = None
+        # Lines folded into the cache, for the compaction trigger.
+        self._line_count: int = 0
+        self._compaction_scheduled = False
         # Async persistence means newly appended entries may not be on disk yet.
         # Keep an in-memory overlay so reads remain consistent before the worker flushes.
         self._pending_entries: dict[str, JobHistoryEntry] = {}
@@ -201,33 +418,8 @@ class JSONLJobHistoryStore(JobHistoryStore):
         error: str | None = None,
         result: dict[str, Any] | None = None,
     ) -> None:
-        current = self.get_job(job_id)
-        created_at = current.created_at if current else ts
-        started_at = current.started_at if current else None
-        completed_at = current.completed_at if current else None
-        if status == JobStatus.RUNNING:
-            started_at = started_at or ts
-        if status in {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}:
-            completed_at = ts
-
-        duration_ms: int | None = None
-        if started_at and completed_at:
-            delta = completed_at - started_at
-            duration_ms = int(delta.total_seconds() * 1000)
-
-        entry = JobHistoryEntry(
-            job_id=job_id,
-            created_at=created_at,
-            status=status,
-            started_at=started_at,
-            completed_at=completed_at,
-            payload_summary=current.payload_summary if current else "",
-            error_message=error or (current.error_message if current else None),
-            worker_id=current.worker_id if current else None,
-            result=result if result is not None else (current.result if current else None),
-            run_mode=current.run_mode if current else "queue",
-            snapshot=current.snapshot if current else None,
-            duration_ms=duration_ms,
+        entry = _build_status_change_entry(
+            self.get_job(job_id), job_id, status, ts, error=error, result=result
         )
         self._append(entry)
 
@@ -308,6 +500,44 @@ class JSONLJobHistoryStore(JobHistoryStore):
         with self._lock:
             self._cache_mtime = None
             self._cached_entries = None
+            self._cache_offset = 0
+
+    def compact(self) -> bool:
+        """Queue a rewrite of the file down to the latest line per job.
+
+        The rewrite runs on the persistence worker, after every append queued
+        before it, and is followed by config blob garbage collection.
+        """
+        from src.services.persistence_worker import PersistenceTask, get_persistence_worker
+
+        task = PersistenceTask(
+            task_type="history_compaction",
+            data={"file_path": str(self._path)},
+            callback=self._on_compacted,
+            priority=1,
+        )
+        with self._lock:
+            self._compaction_scheduled = True
+        if get_persistence_worker().enqueue(task, critical=True):
+            return True
+        self._on_compacted()
+        return False
+
+    def _on_compacted(self) -> None:
+        with self._lock:
+            self._compaction_scheduled = False
+
+    def _schedule_compaction_if_due(self) -> None:
+        with self._lock:
+            lines = self._line_count
+            jobs = len(self._cached_entries or ())
+            if (
+                self._compaction_scheduled
+                or lines < HISTORY_COMPACT_MIN_LINES
+                or lines < jobs * HISTORY_COMPACT_LINES_PER_JOB
+            ):
+                return
+        self.compact()
 
     def get_job(self, job_id: str) -> JobHistoryEntry | None:
         with self._lock:
@@ -328,7 +558,7 @@ class JSONLJobHistoryStore(JobHistoryStore):
         where cache is cleared before file is written, causing intermittent empty history display.
         Cache now invalidates naturally when file mtime changes after async write completes.
         """
-        line = entry.to_json()
+        payload = _entry_storage_payload(entry, self._blob_store)
         
         # PR-HB-004: Enqueue write to background worker
         from src.services.persistence_worker import get_persistence_worker, PersistenceTask
@@ -336,7 +566,7 @@ class JSONLJobHistoryStore(JobHistoryStore):
         worker = get_persistence_worker()
         task = PersistenceTask(
             task_type="history",
-            data={"file_path": str(self._path), "payload": json.loads(line)},
+            data={"file_path": str(self._path), "payload": payload},
             callback=lambda entry=entry: self._mark_persisted(entry),
             priority=1,  # Critical - history always processed
         )
@@ -390,34 +620,56 @@ class JSONLJobHistoryStore(JobHistoryStore):
                 self._cache_mtime = None
 
     def _load_latest_by_job(self) -> dict[str, JobHistoryEntry]:
-        """Load history entries with file mtime-based caching for performance."""
+        latest = self._refresh_latest_by_job()
+        self._schedule_compaction_if_due()
+        return latest
+
+    def _refresh_latest_by_job(self) -> dict[str, JobHistoryEntry]:
+        """Load history entries with file mtime-based caching for performance.
+
+        Only lines appended since the previous load are parsed; the whole file is
+        reread only on first load or when it was replaced or shrank (compacted,
+        rewritten or truncated).
+        """
         with self._lock:
             if not self._path.exists():
                 self._cached_entries = dict(self._pending_entries)
                 self._cache_mtime = None
+                self._cache_offset = 0
                 return dict(self._cached_entries)
             
             try:
                 # Check if file has been modified since last cache.
                 # When we already hold newer in-memory pending entries, avoid
-                # re-reading the entire JSONL file on the hot queue/status path.
-                current_mtime = self._path.stat().st_mtime
+                # re-reading the JSONL file on the hot queue/status path.
+                stat = self._path.stat()
+                current_mtime = stat.st_mtime
                 
-                if self._cached_entries is not None and self._cache_mtime == current_mtime:
+                if (
+                    self._cached_entries is not None
+                    and self._cache_mtime == current_mtime
+                    and self._cache_offset == stat.st_size
+                ):
                     # Cache is valid, but in-memory pending updates still win until disk catches up.
                     return self._with_pending_overlay(self._cached_entries)
                 if self._cached_entries is not None and self._pending_entries:
                     return self._with_pending_overlay(self._cached_entries)
                 
-                # Cache miss or stale - reload from disk
-                lines = self._path.read_text(encoding="utf-8").splitlines()
-                latest: dict[str, JobHistoryEntry] = {}
-                for line in lines:
-                    try:
-                        entry = JobHistoryEntry.from_json(line)
-                        latest[entry.job_id] = entry
-                    except Exception:
-                        continue
+                if (
+                    self._cached_entries is not None
+                    and stat.st_size >= self._cache_offset
+                    and stat.st_ino == self._cache_ino
+                ):
+                    # Append-only growth - parse just the new tail.
+                    latest = self._cached_entries
+                    start = self._cache_offset
+                else:
+                    # Cache miss or file replaced - reload from disk
+                    latest = {}
+                    start = 0
+                    self._line_count = 0
+                self._cache_offset = start + self._read_lines_from(start, latest)
+                self._cache_ino = stat.st_ino
                 resolved_pending = [
                     job_id
                     for job_id, pending in self._pending_entries.items()
@@ -435,8 +687,30 @@ class JSONLJobHistoryStore(JobHistoryStore):
                 # On error, invalidate cache and return empty
                 self._cached_entries = dict(self._pending_entries)
                 self._cache_mtime = None
+                self._cache_offset = 0
                 return dict(self._cached_entries)
 
+    def _read_lines_from(self, offset: int, latest: dict[str, JobHistoryEntry]) -> int:
+        """Fold complete lines after ``offset`` into ``latest``; return bytes consumed.
+
+        A trailing line without its newline is still being written by the
+        persistence worker, so it is left for the next load.
+        """
+        with self._path.open("rb") as handle:
+            handle.seek(offset)
+            data = handle.read()
+        end = data.rfind(b"\n") + 1
+        for raw in data[:end].splitlines():
+            if not raw.strip():
+                continue
+            try:
+                entry = JobHistoryEntry.from_json(raw.decode("utf-8"))
+            except Exception:
+                continue
+            latest[entry.job_id] = entry
+            self._line_count += 1
+        return end
+
     def _iter_lines_reverse(self, chunk_size: int = 64 * 1024):
         """Yield JSONL lines from the end of the file backwards."""
         with self._path.open("rb") as handle:
@@ -462,18 +736,31 @@ class JSONLJobHistoryStore(JobHistoryStore):
                 yield tail.decode("utf-8", errors="ignore")
 
     def _summarize_job(self, job: Job) -> str:
-        result = getattr(job, "result", None) or {}
-        if isinstance(result, dict) and result.get("mode") == "prompt_pack_batch":
-            total = result.get("total_entries", len(result.get("results") or []))
-            first_prompt = ""
-            try:
-                first_entry = (result.get("results") or [])[0]
-                first_prompt = (first_entry.get("prompt") or "").strip()
-            except Exception:
-                first_prompt = ""
-            summary = f"{total} entries"
-            if first_prompt:
-                snippet = first_prompt if len(first_prompt) <= 60 else first_prompt[:60] + "?"
-                summary += f" | {snippet}"
-            return summary
-        return job.summary()
+        return _summarize_job_for_history(job)
+
+
+_SQLITE_HISTORY_SUFFIXES = frozenset({".sqlite", ".sqlite3", ".db"})
+
+
+def create_job_history_store(path: str | Path, *, backend: str | None = None) -> JobHistoryStore:
+    """Build the configured history backend for ``path``.
+
+    ``backend`` is ``"jsonl"`` or ``"sqlite"``; when omitted it is inferred from the
+    file suffix. Selecting SQLite for a ``.jsonl`` path stores the index next to it
+    (``<name>.sqlite3``) and imports the existing JSONL history once.
+    """
+    history_path = Path(path)
+    kind = (backend or "").strip().lower()
+    if not kind:
+        kind = "sqlite" if history_path.suffix.lower() in _SQLITE_HISTORY_SUFFIXES else "jsonl"
+    if kind != "sqlite":
+        return JSONLJobHistoryStore(history_path)
+
+    from src.queue.sqlite_job_history_store import SQLiteJobHistoryStore, import_jsonl_history
+
+    if history_path.suffix.lower() in _SQLITE_HISTORY_SUFFIXES:
+        return SQLiteJobHistoryStore(history_path)
+    store = SQLiteJobHistoryStore(history_path.with_suffix(".sqlite3"))
+    if history_path.exists():
+        import_jsonl_history(history_path, store)
+    return store
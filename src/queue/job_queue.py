@@ -10,14 +10,22 @@ PR-CORE1-060: queue runtime is NJR-only for active jobs. Queue items rely on
 from __future__ import annotations
 
 import heapq
+import time
 from collections import deque
 from collections.abc import Callable, Iterable
 from datetime import datetime
-from threading import Lock
+from threading import Condition, Event, Lock
 from typing import TYPE_CHECKING, Any
 
 from src.queue.job_history_store import JobHistoryStore
 from src.queue.job_model import Job, JobStatus
+from src.queue.model_affinity import (
+    ModelAffinityKey,
+    ModelAffinityPolicy,
+    is_band_head_starving,
+    iter_affinity_order,
+    model_affinity_key_for_job,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     from datetime import datetime
@@ -28,11 +36,20 @@ class JobQueue:
 
     _FINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
 
-    def __init__(self, *, history_store: JobHistoryStore | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        history_store: JobHistoryStore | None = None,
+        model_affinity: ModelAffinityPolicy | None = None,
+    ) -> None:
         self._queue: list[tuple[int, int, str]] = []
         self._jobs: dict[str, Job] = {}
         self._counter = 0
         self._lock = Lock()
+        # Signalled whenever a job may have become dispatchable (submit, resume,
+        # restore, return-to-queue) so runners can block instead of polling.
+        self._job_available = Condition(self._lock)
+        self._wakeup_generation = 0
         self._paused = False
         self._history_store = history_store
         # PR-MEMORY-001: Bounded finalized jobs (max 100) using deque for FIFO eviction
@@ -42,25 +59,146 @@ class JobQueue:
         self._state_listeners: list[Callable[[], None]] = []
         self._state_notifications_suppressed = 0
         self._state_notifications_pending = False
+        # Model-affinity scheduling (opt-in): reorder within a priority band to
+        # keep the loaded checkpoint/VAE/hypernetwork resident across jobs.
+        self._model_affinity = model_affinity or ModelAffinityPolicy()
+        self._affinity_keys: dict[str, ModelAffinityKey | None] = {}
+        self._affinity_bypass_counts: dict[str, int] = {}
+        self._enqueued_at: dict[str, float] = {}
+        self._last_dispatched_key: ModelAffinityKey | None = None
+        # Per-key heaps over self._queue so an affinity pick is O(log n). They are
+        # rebuilt whenever self._queue is replaced by a reordering/removal. A job
+        # picked from behind the band head is tombstoned in self._queue instead
+        # of being cut out, and tombstones are purged in place in bulk.
+        self._affinity_buckets: dict[ModelAffinityKey, list[tuple[int, int, str]]] = {}
+        self._affinity_index_for: list[tuple[int, int, str]] | None = None
+        self._dispatched_entries: set[tuple[int, int, str]] = set()
+        self._scheduling_stats = {
+            "dispatched": 0,
+            "affinity_picks": 0,
+            "switches_avoided": 0,
+            "starvation_overrides": 0,
+        }
+        # Submit -> RUNNING latency, measured from the last time a job entered the queue.
+        self._dequeue_latency_recent: deque[float] = deque(maxlen=256)
+        self._dequeue_latency_count = 0
+        self._dequeue_latency_total = 0.0
+        self._dequeue_latency_max = 0.0
 
     def submit(self, job: Job) -> None:
         with self._lock:
             self._counter += 1
             self._jobs[job.job_id] = job
-            heapq.heappush(self._queue, (-int(job.priority), self._counter, job.job_id))
+            self._mark_enqueued(job)
+            entry = (-int(job.priority), self._counter, job.job_id)
+            heapq.heappush(self._queue, entry)
+            self._index_affinity_entry(entry)
+            self._job_available.notify_all()
         self._record_submission(job)
         self._notify_state_listeners()
 
     def get_next_job(self) -> Job | None:
         with self._lock:
-            if self._paused:
-                return None
-            while self._queue:
-                _, _, job_id = heapq.heappop(self._queue)
-                job = self._jobs.get(job_id)
-                if job and job.status == JobStatus.QUEUED:
+            return self._pop_next_job()
+
+    def wait_for_next_job(
+        self,
+        timeout: float | None = None,
+        *,
+        stop_event: Event | None = None,
+        accept: Callable[[Job], bool] | None = None,
+        select: Callable[[list[Job]], Job | None] | None = None,
+    ) -> Job | None:
+        """Block until a job can be dispatched and return it.
+
+        Returns None when ``timeout`` elapses, when ``stop_event`` is set, or early
+        when ``wake_waiters`` is called (e.g. on runner shutdown). A paused queue
+        never yields a job; waiters are woken again on ``resume``.
+
+        ``accept`` restricts the pick to jobs the caller can run (e.g. a worker's
+        model families); the first accepted job in execution order is returned.
+        ``select`` (requires ``accept``) receives every accepted job in execution
+        order and returns the one to dispatch, or None to leave them all queued.
+        Both are called with the queue lock held and must not call back into the queue.
+        """
+        deadline = None if timeout is None else time.monotonic() + max(0.0, float(timeout))
+        with self._job_available:
+            generation = self._wakeup_generation
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                job = self._pop_next_job(accept, select)
+                if job is not None:
                     return job
+                if self._wakeup_generation != generation:
+                    return None
+                if deadline is None:
+                    self._job_available.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._job_available.wait(remaining)
+
+    def wake_waiters(self) -> None:
+        """Release every thread blocked in ``wait_for_next_job``."""
+        with self._job_available:
+            self._wakeup_generation += 1
+            self._job_available.notify_all()
+
+    def _pop_next_job(
+        self,
+        accept: Callable[[Job], bool] | None = None,
+        select: Callable[[list[Job]], Job | None] | None = None,
+    ) -> Job | None:
+        """Dequeue the next dispatchable job (internal, must hold lock)."""
+        if self._paused:
+            return None
+        if accept is not None:
+            return self._pop_next_accepted_job(accept, select)
+        if self._model_affinity.enabled:
+            return self._pop_next_affinity_job()
+        self._affinity_index_for = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            if entry in self._dispatched_entries:
+                self._dispatched_entries.discard(entry)
+                continue
+            job_id = entry[2]
+            job = self._jobs.get(job_id)
+            if job and job.status == JobStatus.QUEUED:
+                self._scheduling_stats["dispatched"] += 1
+                self._last_dispatched_key = self._affinity_key(job_id) or self._last_dispatched_key
+                return job
+        return None
+
+    def _pop_next_accepted_job(
+        self,
+        accept: Callable[[Job], bool],
+        select: Callable[[list[Job]], Job | None] | None = None,
+    ) -> Job | None:
+        """Dequeue the first accepted job in execution order, or ``select``'s pick (must hold lock)."""
+        candidates: list[Job] = []
+        for _, _, job_id in self._get_execution_ordered_queued_jobs():
+            job = self._jobs.get(job_id)
+            if job is None or not accept(job):
+                continue
+            if select is None:
+                return self._take_queued_job(job)
+            candidates.append(job)
+        if not candidates:
             return None
+        chosen = select(candidates)
+        return self._take_queued_job(chosen) if chosen is not None else None
+
+    def _take_queued_job(self, job: Job) -> Job:
+        job_id = job.job_id
+        self._queue = [entry for entry in self._queue if entry[2] != job_id]
+        heapq.heapify(self._queue)
+        self._scheduling_stats["dispatched"] += 1
+        self._last_dispatched_key = self._affinity_key(job_id) or self._last_dispatched_key
+        self._affinity_bypass_counts.pop(job_id, None)
+        return job
 
     def pause(self) -> None:
         with self._lock:
@@ -70,6 +208,7 @@ class JobQueue:
     def resume(self) -> None:
         with self._lock:
             self._paused = False
+            self._job_available.notify_all()
         self._notify_state_listeners()
 
     def is_paused(self) -> bool:
@@ -92,20 +231,7 @@ class JobQueue:
             if running is None:
                 return None
             if return_to_queue:
-                self._counter += 1
-                running.status = JobStatus.QUEUED
-                running.updated_at = datetime.utcnow()
-                running.completed_at = None
-                running.started_at = None
-                running.error_message = None
-                running.result = None
-                running.progress = 0.0
-                running.eta_seconds = None
-                running.execution_metadata.last_control_action = "return_to_queue"
-                running.execution_metadata.return_to_queue_count += 1
-                self._queue = [(p, c, jid) for (p, c, jid) in self._queue if jid != running.job_id]
-                heapq.heappush(self._queue, (-int(running.priority), self._counter, running.job_id))
-                heapq.heapify(self._queue)
+                self._return_to_queue(running, "return_to_queue")
         if return_to_queue:
             self._notify_status(running, JobStatus.QUEUED)
             self._notify_state_listeners()
@@ -115,7 +241,44 @@ class JobQueue:
                 cancelled.execution_metadata.last_control_action = "cancelled"
         return running
 
+    def requeue_job(self, job_id: str, *, reason: str = "return_to_queue") -> Job | None:
+        """Put a dequeued or RUNNING job back into the queue.
+
+        Used when the worker executing the job is lost; the job keeps its
+        priority and is dispatched again like any other queued job. Finished
+        jobs are left alone and None is returned.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in self._FINAL_STATUSES:
+                return None
+            self._return_to_queue(job, reason)
+        self._notify_status(job, JobStatus.QUEUED)
+        self._notify_state_listeners()
+        return job
+
+    def _return_to_queue(self, job: Job, action: str) -> None:
+        """Reset ``job`` to QUEUED and push it back onto the heap (must hold lock)."""
+        self._counter += 1
+        job.status = JobStatus.QUEUED
+        job.updated_at = datetime.utcnow()
+        job.completed_at = None
+        job.started_at = None
+        job.error_message = None
+        job.result = None
+        job.progress = 0.0
+        job.eta_seconds = None
+        job.execution_metadata.last_control_action = action
+        job.execution_metadata.return_to_queue_count += 1
+        self._mark_enqueued(job)
+        self._queue = [(p, c, jid) for (p, c, jid) in self._queue if jid != job.job_id]
+        heapq.heappush(self._queue, (-int(job.priority), self._counter, job.job_id))
+        heapq.heapify(self._queue)
+        self._job_available.notify_all()
+
     def mark_running(self, job_id: str) -> None:
+        with self._lock:
+            self._record_dequeue_latency(job_id)
         self._update_status(job_id, JobStatus.RUNNING)
 
     def mark_completed(self, job_id: str, result: dict | None = None) -> None:
@@ -138,13 +301,14 @@ class JobQueue:
     def list_active_jobs_ordered(self) -> list[Job]:
         """Return running + queued jobs in display order.
 
-        Running jobs appear first, followed by queued jobs in actual queue order.
+        Running jobs appear first, followed by queued jobs in actual queue order
+        (the effective execution order when model-affinity scheduling is enabled).
         """
         with self._lock:
             running_jobs = [job for job in self._jobs.values() if job.status == JobStatus.RUNNING]
             queued_jobs = [
                 self._jobs[jid]
-                for _, _, jid in self._get_ordered_queued_jobs()
+                for _, _, jid in self._get_execution_ordered_queued_jobs()
                 if jid in self._jobs
             ]
             return running_jobs + queued_jobs
@@ -424,6 +588,7 @@ class JobQueue:
                 removed = self._finalized_jobs.pop(job_id, None)
 
             if removed is not None:
+                self._forget_affinity_state(job_id)
                 if removed.status == JobStatus.QUEUED:
                     removed.status = JobStatus.CANCELLED
                 self._queue = [(p, c, jid) for (p, c, jid) in self._queue if jid != job_id]
@@ -446,6 +611,7 @@ class JobQueue:
             for jid in queued_ids:
                 self._jobs.pop(jid, None)
                 self._finalized_jobs.pop(jid, None)
+                self._forget_affinity_state(jid)
             # Rebuild queue without queued jobs
             self._queue = [(p, c, jid) for (p, c, jid) in self._queue if jid not in queued_ids]
             heapq.heapify(self._queue)
@@ -453,8 +619,226 @@ class JobQueue:
             self._notify_state_listeners()
         return count
 
+    # ------------------------------------------------------------------
+    # Model-affinity scheduling
+    # ------------------------------------------------------------------
+
+    def set_model_affinity_policy(self, policy: ModelAffinityPolicy) -> None:
+        """Enable/disable or retune model-affinity ordering at runtime."""
+        with self._lock:
+            self._model_affinity = policy
+            self._affinity_bypass_counts.clear()
+        self._notify_state_listeners()
+
+    def get_model_affinity_policy(self) -> ModelAffinityPolicy:
+        with self._lock:
+            return self._model_affinity
+
+    def get_scheduling_stats(self) -> dict[str, Any]:
+        """Return dispatch counters for diagnostics.
+
+        ``switches_avoided`` counts dispatches where the picked job shared the
+        previous job's model key while strict FIFO would have loaded another one.
+        """
+        with self._lock:
+            stats: dict[str, Any] = dict(self._scheduling_stats)
+            stats["model_affinity_enabled"] = bool(self._model_affinity.enabled)
+            stats["max_bypass_count"] = int(self._model_affinity.max_bypass_count)
+            stats["max_wait_seconds"] = self._model_affinity.max_wait_seconds
+            stats["last_dispatched_key"] = (
+                list(self._last_dispatched_key) if self._last_dispatched_key else None
+            )
+            return stats
+
+    def get_dequeue_latency_stats(self) -> dict[str, Any]:
+        """Return submit -> RUNNING latency stats (milliseconds) for diagnostics.
+
+        Percentiles cover the most recent 256 dispatches; count/avg/max are lifetime.
+        """
+        with self._lock:
+            recent = sorted(self._dequeue_latency_recent)
+            count = self._dequeue_latency_count
+            stats: dict[str, Any] = {
+                "count": count,
+                "last_ms": None,
+                "avg_ms": None,
+                "p50_ms": None,
+                "p95_ms": None,
+                "max_ms": None,
+            }
+            if count:
+                stats["last_ms"] = round(self._dequeue_latency_recent[-1] * 1000.0, 3)
+                stats["avg_ms"] = round(self._dequeue_latency_total / count * 1000.0, 3)
+                stats["max_ms"] = round(self._dequeue_latency_max * 1000.0, 3)
+                stats["p50_ms"] = round(recent[(len(recent) - 1) // 2] * 1000.0, 3)
+                stats["p95_ms"] = round(recent[int((len(recent) - 1) * 0.95)] * 1000.0, 3)
+            return stats
+
+    def _record_dequeue_latency(self, job_id: str) -> None:
+        """Record how long a job sat queued before RUNNING (must hold lock)."""
+        enqueued_at = self._enqueued_at.pop(job_id, None)
+        if enqueued_at is None:
+            return
+        latency = max(0.0, time.monotonic() - enqueued_at)
+        self._dequeue_latency_recent.append(latency)
+        self._dequeue_latency_count += 1
+        self._dequeue_latency_total += latency
+        self._dequeue_latency_max = max(self._dequeue_latency_max, latency)
+
+    def _mark_enqueued(self, job: Job) -> None:
+        """Record queue entry time and drop stale affinity state (must hold lock)."""
+        self._enqueued_at[job.job_id] = time.monotonic()
+        self._affinity_keys.pop(job.job_id, None)
+        self._affinity_bypass_counts.pop(job.job_id, None)
+
+    def _forget_affinity_state(self, job_id: str) -> None:
+        self._enqueued_at.pop(job_id, None)
+        self._affinity_keys.pop(job_id, None)
+        self._affinity_bypass_counts.pop(job_id, None)
+
+    def _affinity_key(self, job_id: str) -> ModelAffinityKey | None:
+        if job_id not in self._affinity_keys:
+            job = self._jobs.get(job_id)
+            self._affinity_keys[job_id] = model_affinity_key_for_job(job) if job else None
+        return self._affinity_keys[job_id]
+
+    def _iter_affinity_order(self, bypass_counts: dict[str, int]):
+        now = time.monotonic()
+        return iter_affinity_order(
+            self._get_ordered_queued_jobs(),
+            key_for=self._affinity_key,
+            current_key=self._last_dispatched_key,
+            bypass_counts=bypass_counts,
+            waited_seconds=lambda jid: now - self._enqueued_at.get(jid, now),
+            policy=self._model_affinity,
+        )
+
+    def _pop_next_affinity_job(self) -> Job | None:
+        """Select and dequeue the next job under the affinity policy (must hold lock).
+
+        Makes the same choice as the first step of ``iter_affinity_order`` in
+        O(log n) amortized: the band head comes off the main heap and the
+        same-model candidate off that model's bucket heap.
+        """
+        head = self._peek_queued_entry(self._queue)
+        if head is None:
+            return None
+        self._ensure_affinity_index()
+        head_id = head[2]
+        head_key = self._affinity_key(head_id)
+        current_key = self._last_dispatched_key
+        pick, pick_key = head, head_key
+        bypassed = forced = False
+        if head_key is not None and current_key is not None and head_key != current_key:
+            candidate = self._peek_queued_entry(self._affinity_buckets.get(current_key))
+            if candidate is not None and candidate[0] == head[0]:
+                now = time.monotonic()
+                if is_band_head_starving(
+                    self._model_affinity,
+                    self._affinity_bypass_counts.get(head_id, 0),
+                    now - self._enqueued_at.get(head_id, now),
+                ):
+                    forced = True
+                else:
+                    pick, pick_key = candidate, current_key
+                    bypassed = True
+                    self._affinity_bypass_counts[head_id] = (
+                        self._affinity_bypass_counts.get(head_id, 0) + 1
+                    )
+
+        if pick_key is not None:
+            bucket = self._affinity_buckets.get(pick_key)
+            if self._peek_queued_entry(bucket) == pick:
+                heapq.heappop(bucket)
+            if not bucket:
+                self._affinity_buckets.pop(pick_key, None)
+        if pick == head:
+            heapq.heappop(self._queue)
+        else:
+            self._dispatched_entries.add(pick)
+            if len(self._dispatched_entries) * 2 > len(self._queue):
+                self._purge_dispatched_entries()
+
+        job_id = pick[2]
+        stats = self._scheduling_stats
+        stats["dispatched"] += 1
+        if bypassed:
+            stats["affinity_picks"] += 1
+        if forced:
+            stats["starvation_overrides"] += 1
+        if (
+            pick_key is not None
+            and pick_key == current_key
+            and head_key is not None
+            and head_key != pick_key
+        ):
+            stats["switches_avoided"] += 1
+        if pick_key is not None:
+            self._last_dispatched_key = pick_key
+        self._affinity_bypass_counts.pop(job_id, None)
+        return self._jobs.get(job_id)
+
+    def _is_queued_entry(self, entry: tuple[int, int, str]) -> bool:
+        if entry in self._dispatched_entries:
+            return False
+        job = self._jobs.get(entry[2])
+        return job is not None and job.status == JobStatus.QUEUED
+
+    def _peek_queued_entry(
+        self, heap: list[tuple[int, int, str]] | None
+    ) -> tuple[int, int, str] | None:
+        """Drop dead entries off the top of ``heap`` and return its live head (must hold lock)."""
+        while heap:
+            entry = heap[0]
+            if self._is_queued_entry(entry):
+                return entry
+            heapq.heappop(heap)
+            if heap is self._queue:
+                self._dispatched_entries.discard(entry)
+        return None
+
+    def _ensure_affinity_index(self) -> None:
+        """Rebuild the per-key heaps if ``self._queue`` was replaced (must hold lock)."""
+        if self._affinity_index_for is self._queue:
+            return
+        buckets: dict[ModelAffinityKey, list[tuple[int, int, str]]] = {}
+        for entry in self._queue:
+            if not self._is_queued_entry(entry):
+                continue
+            key = self._affinity_key(entry[2])
+            if key is not None:
+                buckets.setdefault(key, []).append(entry)
+        for bucket in buckets.values():
+            heapq.heapify(bucket)
+        self._affinity_buckets = buckets
+        self._affinity_index_for = self._queue
+
+    def _index_affinity_entry(self, entry: tuple[int, int, str]) -> None:
+        """Add a freshly pushed entry to its key's heap if the index is live (must hold lock)."""
+        if self._affinity_index_for is not self._queue:
+            return
+        key = self._affinity_key(entry[2])
+        if key is not None:
+            heapq.heappush(self._affinity_buckets.setdefault(key, []), entry)
+
+    def _purge_dispatched_entries(self) -> None:
+        """Remove tombstoned entries from ``self._queue`` in place (must hold lock)."""
+        if not self._dispatched_entries:
+            return
+        self._queue[:] = [entry for entry in self._queue if entry not in self._dispatched_entries]
+        heapq.heapify(self._queue)
+        self._dispatched_entries.clear()
+
+    def _get_execution_ordered_queued_jobs(self) -> list[tuple[int, int, str]]:
+        """Queued jobs in the order they will be dispatched (internal, must hold lock)."""
+        if not self._model_affinity.enabled:
+            return self._get_ordered_queued_jobs()
+        preview_counts = dict(self._affinity_bypass_counts)
+        return [pick.entry for pick in self._iter_affinity_order(preview_counts)]
+
     def _get_ordered_queued_jobs(self) -> list[tuple[int, int, str]]:
         """Get queued jobs in priority order (internal, must hold lock)."""
+        self._purge_dispatched_entries()
         queued = []
         for priority, counter, jid in self._queue:
             job = self._jobs.get(jid)
@@ -483,6 +867,7 @@ class JobQueue:
     def _prune_job(self, job_id: str) -> None:
         """Remove a terminal job from the queue heap."""
         self._jobs.pop(job_id, None)
+        self._forget_affinity_state(job_id)
         self._queue = [(p, c, jid) for (p, c, jid) in self._queue if jid != job_id]
         heapq.heapify(self._queue)
 
@@ -514,7 +899,11 @@ class JobQueue:
                 self._counter += 1
                 job.status = JobStatus.QUEUED
                 self._jobs[job.job_id] = job
-                heapq.heappush(self._queue, (-int(job.priority), self._counter, job.job_id))
+                self._mark_enqueued(job)
+                entry = (-int(job.priority), self._counter, job.job_id)
+                heapq.heappush(self._queue, entry)
+                self._index_affinity_entry(entry)
+            self._job_available.notify_all()
         self._notify_state_listeners()
 
 
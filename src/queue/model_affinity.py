@@ -0,0 +1,175 @@
+# Subsystem: Queue
+# Role: Model-affinity ordering policy for queued jobs.
+
+"""Model-affinity scheduling for JobQueue.
+
+Within a priority band the queue is FIFO, so an interleaved SDXL / SD1.5 queue
+forces a checkpoint switch on nearly every job. With a ``ModelAffinityPolicy``
+enabled, the queue prefers the next job whose (model, VAE, hypernetwork) key
+matches the last dispatched job, as long as the oldest job in the band has not
+been passed over more than ``max_bypass_count`` times or waited longer than
+``max_wait_seconds``. Priority bands are never reordered.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.queue.job_model import Job
+from src.utils.webui_resource_names import canonicalize_vae_lookup_key, strip_webui_resource_suffix
+
+ModelAffinityKey = tuple[str, str, str]
+
+_MODEL_EXTENSIONS = (".safetensors", ".ckpt", ".pt", ".pth")
+
+
+@dataclass(frozen=True)
+class ModelAffinityPolicy:
+    """Opt-in affinity ordering with a starvation bound on the band head."""
+
+    enabled: bool = False
+    max_bypass_count: int = 8
+    max_wait_seconds: float | None = 600.0
+
+
+def normalize_model_key(raw: object) -> str:
+    """Checkpoint name without WebUI hash suffix, file extension or case."""
+    text = strip_webui_resource_suffix(raw).lower()
+    for extension in _MODEL_EXTENSIONS:
+        if text.endswith(extension):
+            return text[: -len(extension)]
+    return text
+
+
+def _stage_config(config: Any, stage: str) -> Mapping[str, Any]:
+    if isinstance(config, Mapping):
+        section = config.get(stage)
+        if isinstance(section, Mapping):
+            return section
+    return {}
+
+
+def model_affinity_key_for_job(job: Job) -> ModelAffinityKey | None:
+    """Return the (model, vae, hypernetwork) a job will load, or None if unknown.
+
+    Reads the attached NJR first (``base_model``/``vae`` are authoritative for the
+    runner) and falls back to the queue snapshots for restored jobs.
+    """
+    record = getattr(job, "_normalized_record", None)
+    config: Any = getattr(record, "config", None) if record is not None else None
+    txt2img = _stage_config(config, "txt2img")
+    snapshot = job.snapshot or {}
+    njr_snapshot = snapshot.get("normalized_job") if isinstance(snapshot, Mapping) else None
+    if not isinstance(njr_snapshot, Mapping):
+        njr_snapshot = {}
+    config_snapshot = job.config_snapshot or {}
+
+    model = (
+        getattr(record, "base_model", "")
+        or txt2img.get("model")
+        or (config.get("model") if isinstance(config, Mapping) else "")
+        or njr_snapshot.get("base_model")
+        or snapshot.get("base_model")
+        or config_snapshot.get("model")
+    )
+    model_key = normalize_model_key(model)
+    if not model_key:
+        return None
+    vae = (
+        getattr(record, "vae", None)
+        or txt2img.get("vae")
+        or njr_snapshot.get("vae")
+        or config_snapshot.get("vae")
+    )
+    hypernetwork = txt2img.get("hypernetwork") or (
+        config.get("hypernetwork") if isinstance(config, Mapping) else None
+    )
+    hypernetwork_key = str(hypernetwork or "").strip().lower()
+    if hypernetwork_key == "none":
+        hypernetwork_key = ""
+    return (model_key, canonicalize_vae_lookup_key(vae), hypernetwork_key)
+
+
+def is_band_head_starving(
+    policy: ModelAffinityPolicy, bypass_count: int, waited_seconds: float
+) -> bool:
+    """True once a band head may no longer be passed over."""
+    if bypass_count >= max(0, policy.max_bypass_count):
+        return True
+    return policy.max_wait_seconds is not None and waited_seconds >= policy.max_wait_seconds
+
+
+@dataclass
+class AffinityPick:
+    """One scheduling decision produced by ``iter_affinity_order``."""
+
+    entry: tuple[int, int, str]
+    key: ModelAffinityKey | None
+    bypassed_job_id: str | None = None
+    forced_by_starvation: bool = False
+
+
+def iter_affinity_order(
+    queued: list[tuple[int, int, str]],
+    *,
+    key_for: Callable[[str], ModelAffinityKey | None],
+    current_key: ModelAffinityKey | None,
+    bypass_counts: dict[str, int],
+    waited_seconds: Callable[[str], float],
+    policy: ModelAffinityPolicy,
+) -> Iterator[AffinityPick]:
+    """Yield queue entries in affinity execution order.
+
+    ``queued`` must be sorted by (negated priority, counter). ``bypass_counts`` is
+    updated in place each time a band head is passed over; pass a copy when only
+    previewing the order. Runs in O(n) over the queued entries.
+    """
+    index = 0
+    while index < len(queued):
+        band_priority = queued[index][0]
+        end = index
+        while end < len(queued) and queued[end][0] == band_priority:
+            end += 1
+        band = queued[index:end]
+        index = end
+
+        keys = [key_for(entry[2]) for entry in band]
+        by_key: dict[ModelAffinityKey, deque[int]] = {}
+        for position, key in enumerate(keys):
+            if key is not None:
+                by_key.setdefault(key, deque()).append(position)
+        taken = [False] * len(band)
+        head = 0
+        for _ in range(len(band)):
+            while taken[head]:
+                head += 1
+            head_entry = band[head]
+            head_key = keys[head]
+            pick = head
+            bypassed: str | None = None
+            forced = False
+            candidates = by_key.get(current_key) if current_key is not None else None
+            if head_key is not None and head_key != current_key and candidates:
+                head_id = head_entry[2]
+                if is_band_head_starving(
+                    policy, bypass_counts.get(head_id, 0), waited_seconds(head_id)
+                ):
+                    forced = True
+                else:
+                    pick = candidates[0]
+                    bypassed = head_id
+                    bypass_counts[head_id] = bypass_counts.get(head_id, 0) + 1
+            taken[pick] = True
+            pick_key = keys[pick]
+            if pick_key is not None:
+                by_key[pick_key].popleft()
+                current_key = pick_key
+            yield AffinityPick(
+                entry=band[pick],
+                key=pick_key,
+                bypassed_job_id=bypassed,
+                forced_by_starvation=forced,
+            )
@@ -0,0 +1,663 @@
+# Subsystem: Queue
+# Role: Executes one job queue across several WebUI workers with leases and health checks.
+
+"""Multi-worker job runner: one JobQueue, N WebUI instances.
+
+Every registered ``WorkerDescriptor`` (see ``src/cluster``) gets its own worker
+thread, its own ``SDWebUIClient`` (and therefore HTTP session) and its own
+``run_callable`` built by ``run_callable_factory(descriptor, client)``. A worker
+only dequeues jobs it can run (``worker_matching.worker_accepts``).
+
+Each dispatched job is held under a lease (job id -> worker id + token). When a
+worker is lost - its health probe fails, or its run_callable fails with a
+connection-level error - the worker is marked OFFLINE in the registry, its
+leases are revoked and the jobs are returned to the queue for another worker.
+A revoked lease makes the late result of the original worker a no-op, so a job
+is finalized exactly once. Workers come back ONLINE when their probe succeeds.
+A queued job that no registered worker accepts (offline ones included) would
+wait forever, so the health loop fails it with a message naming what it needs.
+
+Placement: ``resident_models`` tracks the checkpoint/VAE loaded on each worker
+(refreshed when it comes online, updated by its Pipeline on every switch) and
+a free worker picks its next job with ``worker_placement.choose_placement``, so
+jobs go where their model is already resident unless the queue depth says a
+load is cheaper than waiting.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import requests
+
+from src.api.client import SDWebUIClient, WebUIUnavailableError
+from src.cluster.resident_models import ResidentModelCache
+from src.cluster.worker_model import WorkerDescriptor, WorkerId, WorkerStatus
+from src.cluster.worker_registry import WorkerRegistry
+from src.pipeline.pipeline_runner import normalize_run_result
+from src.queue.job_model import Job, JobStatus
+from src.queue.job_queue import JobQueue
+from src.queue.single_node_runner import (
+    IDLE_WAIT_TIMEOUT_SECONDS,
+    _ensure_job_envelope,
+    _extract_stage_checkpoints,
+    _is_webui_crash_exception,
+    _merge_stage_checkpoints,
+    _QueueWakingStopEvent,
+)
+from src.queue.worker_matching import JobWorkerRequirements, requirements_for_job, worker_accepts
+from src.queue.worker_placement import (
+    ModelPlacementPolicy,
+    choose_placement,
+    resident_key,
+    switch_cost,
+)
+from src.utils import LogContext, log_with_ctx
+
+logger = logging.getLogger(__name__)
+
+WORKER_LOST_ACTION = "worker_lost"
+UNPLACEABLE_JOB_PREFIX = "No registered worker can run this job"
+DEFAULT_HEALTH_INTERVAL_SECONDS = 5.0
+DEFAULT_PROBE_TIMEOUT_SECONDS = 2.0
+_JOB_SECONDS_SMOOTHING = 0.2
+
+ClientFactory = Callable[[WorkerDescriptor], Any]
+RunCallableFactory = Callable[[WorkerDescriptor, Any], Callable[[Job], dict]]
+
+
+def worker_base_url(descriptor: WorkerDescriptor) -> str | None:
+    """Return the WebUI base URL a descriptor advertises in its metadata."""
+    url = (descriptor.metadata or {}).get("base_url")
+    return str(url) if url else None
+
+
+def default_client_factory(descriptor: WorkerDescriptor) -> SDWebUIClient:
+    base_url = worker_base_url(descriptor)
+    return SDWebUIClient(base_url=base_url) if base_url else SDWebUIClient()
+
+
+def _is_worker_unreachable(exc: Exception) -> bool:
+    if isinstance(exc, (WebUIUnavailableError, requests.ConnectionError, ConnectionError)):
+        return True
+    crash_eligible, _stage = _is_webui_crash_exception(exc)
+    return crash_eligible
+
+
+@dataclass
+class _Lease:
+    job_id: str
+    worker_id: WorkerId
+    token: int
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class _WorkerSlot:
+    """Runtime state for one worker: client, thread, health and counters."""
+
+    def __init__(
+        self,
+        descriptor: WorkerDescriptor,
+        client: Any,
+        run_callable: Callable[[Job], dict] | None,
+    ) -> None:
+        self.descriptor = descriptor
+        self.client = client
+        self.run_callable = run_callable
+        self.thread: threading.Thread | None = None
+        self.online = threading.Event()
+        if descriptor.status == WorkerStatus.ONLINE:
+            self.online.set()
+        self.current_job: Job | None = None
+        self.consecutive_probe_failures = 0
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.jobs_lost = 0
+        self.resident_dispatches = 0
+        self.last_error: str | None = None
+        self.created_at = time.monotonic()
+        self.busy_seconds = 0.0
+
+    @property
+    def worker_id(self) -> WorkerId:
+        return self.descriptor.id
+
+
+class MultiNodeJobRunner:
+    """Background runner that leases jobs from one JobQueue to several workers."""
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        registry: WorkerRegistry,
+        run_callable_factory: RunCallableFactory | None,
+        *,
+        client_factory: ClientFactory | None = None,
+        probe: Callable[[WorkerDescriptor, Any], bool] | None = None,
+        health_interval: float = DEFAULT_HEALTH_INTERVAL_SECONDS,
+        probe_timeout: float = DEFAULT_PROBE_TIMEOUT_SECONDS,
+        probe_failure_threshold: int = 2,
+        max_reassignments: int = 3,
+        poll_interval: float = 0.1,
+        on_status_change: Callable[[Job, JobStatus], None] | None = None,
+        placement: ModelPlacementPolicy | None = None,
+    ) -> None:
+        self.job_queue = job_queue
+        self.registry = registry
+        self._run_callable_factory = run_callable_factory
+        self._client_factory = client_factory or default_client_factory
+        self._probe = probe or self._default_probe
+        self.health_interval = max(0.01, float(health_interval))
+        self.probe_timeout = max(0.01, float(probe_timeout))
+        self.probe_failure_threshold = max(1, int(probe_failure_threshold))
+        self.max_reassignments = max(0, int(max_reassignments))
+        self.poll_interval = poll_interval
+        self._on_status_change = on_status_change
+        self._stop_event = _QueueWakingStopEvent(job_queue)
+        self._lock = threading.RLock()
+        self._slots: dict[WorkerId, _WorkerSlot] = {}
+        # Immutable snapshot of the slots, read without the runner lock from
+        # inside the queue lock (placement) to keep lock ordering one-way.
+        self._slot_list: tuple[_WorkerSlot, ...] = ()
+        self._leases: dict[str, _Lease] = {}
+        self._lease_tokens = itertools.count(1)
+        self._requirements: dict[str, JobWorkerRequirements] = {}
+        self._health_thread: threading.Thread | None = None
+        self.placement = placement or _default_placement_policy()
+        self.resident_models = ResidentModelCache()
+        self._job_seconds = max(0.0, float(self.placement.expected_job_seconds))
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start one thread per registered worker plus the health monitor."""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._sync_workers()
+        self._health_thread = threading.Thread(
+            target=self._health_loop, daemon=False, name="QueueWorkerHealth"
+        )
+        self._health_thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        with self._lock:
+            slots = list(self._slots.values())
+        for slot in slots:
+            if slot.thread:
+                slot.thread.join(timeout=10.0)
+        if self._health_thread:
+            self._health_thread.join(timeout=10.0)
+        for slot in slots:
+            close = getattr(slot.client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:  # pragma: no cover - best effort
+                    pass
+
+    def is_running(self) -> bool:
+        with self._lock:
+            threads = [slot.thread for slot in self._slots.values()]
+        threads.append(self._health_thread)
+        return any(thread is not None and thread.is_alive() for thread in threads)
+
+    def _ensure_slots(self) -> list[_WorkerSlot]:
+        """Create slots for workers registered since the last call; return all slots."""
+        for descriptor in self.registry.list_workers():
+            with self._lock:
+                known = descriptor.id in self._slots
+            if known or descriptor.status == WorkerStatus.MAINTENANCE:
+                continue
+            client = self._client_factory(descriptor)
+            try:
+                client.resident_model_tracker = self.resident_models.tracker(descriptor.id)
+            except AttributeError:
+                pass
+            run_callable = (
+                self._run_callable_factory(descriptor, client)
+                if self._run_callable_factory is not None
+                else None
+            )
+            with self._lock:
+                self._slots.setdefault(descriptor.id, _WorkerSlot(descriptor, client, run_callable))
+                self._slot_list = tuple(self._slots.values())
+        with self._lock:
+            return list(self._slots.values())
+
+    def _sync_workers(self) -> None:
+        """Ensure every known worker has a running worker thread."""
+        for slot in self._ensure_slots():
+            if self._stop_event.is_set():
+                return
+            if slot.thread is not None and slot.thread.is_alive():
+                continue
+            slot.thread = threading.Thread(
+                target=self._worker_loop,
+                args=(slot,),
+                daemon=False,
+                name=f"QueueWorker-{slot.worker_id}",
+            )
+            slot.thread.start()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _accepts(self, slot: _WorkerSlot, job: Job) -> bool:
+        return worker_accepts(slot.descriptor, self._job_requirements(job))
+
+    def _job_requirements(self, job: Job) -> JobWorkerRequirements:
+        requirements = self._requirements.get(job.job_id)
+        if requirements is None:
+            requirements = requirements_for_job(job)
+            self._requirements[job.job_id] = requirements
+        return requirements
+
+    def _select(self, slot: _WorkerSlot, candidates: list[Job]) -> Job | None:
+        """Placement decision for ``slot`` (runs under the queue lock)."""
+        online = [other for other in self._slot_list if other.online.is_set()]
+        now = datetime.utcnow()
+        return choose_placement(
+            slot.worker_id,
+            candidates,
+            job_key=lambda job: self._job_requirements(job).model_key,
+            residents={
+                other.worker_id: resident_key(self.resident_models.get(other.worker_id))
+                for other in online
+            },
+            busy={other.worker_id: other.current_job is not None for other in online},
+            can_run=lambda worker_id, job: self._accepts_worker(worker_id, job),
+            waited_seconds=lambda job: (now - job.created_at).total_seconds(),
+            job_seconds=self._job_seconds,
+            policy=self.placement,
+        )
+
+    def _accepts_worker(self, worker_id: WorkerId, job: Job) -> bool:
+        slot = next((other for other in self._slot_list if other.worker_id == worker_id), None)
+        return slot is not None and self._accepts(slot, job)
+
+    def _refresh_resident_model(self, slot: _WorkerSlot) -> None:
+        self.resident_models.refresh(slot.worker_id, slot.client)
+
+    def _worker_loop(self, slot: _WorkerSlot) -> None:
+        logger.debug("MultiNodeJobRunner worker loop started for %s", slot.worker_id)
+        accept = lambda job: self._accepts(slot, job)  # noqa: E731
+        select = (lambda candidates: self._select(slot, candidates)) if self.placement.enabled else None
+        if slot.online.is_set():
+            self._refresh_resident_model(slot)
+        while not self._stop_event.is_set():
+            if not slot.online.is_set():
+                slot.online.wait(self.health_interval)
+                continue
+            job = self.job_queue.wait_for_next_job(
+                timeout=max(self.poll_interval, IDLE_WAIT_TIMEOUT_SECONDS),
+                stop_event=self._stop_event,
+                accept=accept,
+                select=select,
+            )
+            if job is None:
+                continue
+            if not slot.online.is_set():
+                # Lost between the wait and the pick: hand the job back untouched.
+                self.job_queue.requeue_job(job.job_id, reason=WORKER_LOST_ACTION)
+                continue
+            self._execute(slot, job)
+
+    def _grant_lease(self, slot: _WorkerSlot, job: Job) -> _Lease:
+        lease = _Lease(job_id=job.job_id, worker_id=slot.worker_id, token=next(self._lease_tokens))
+        job.worker_id = slot.worker_id
+        # Under the runner lock so a concurrent worker-lost sweep sees the job
+        # either not yet leased or already RUNNING, never in between.
+        with self._lock:
+            self._leases[job.job_id] = lease
+            slot.current_job = job
+            self.job_queue.mark_running(job.job_id)
+        return lease
+
+    def _end_lease(self, slot: _WorkerSlot, lease: _Lease) -> bool:
+        """Release ``lease``; False when it was already revoked."""
+        with self._lock:
+            if slot.current_job is not None and slot.current_job.job_id == lease.job_id:
+                slot.current_job = None
+            current = self._leases.get(lease.job_id)
+            if current is None or current.token != lease.token:
+                return False
+            del self._leases[lease.job_id]
+            self._requirements.pop(lease.job_id, None)
+            return True
+
+    def _execute(self, slot: _WorkerSlot, job: Job) -> dict[str, Any] | None:
+        if switch_cost(
+            resident_key(self.resident_models.get(slot.worker_id)),
+            self._job_requirements(job).model_key,
+            self.placement,
+        ) == 0.0:
+            slot.resident_dispatches += 1
+        lease = self._grant_lease(slot, job)
+        start_time = time.monotonic()
+        try:
+            return self._run_leased(slot, job, lease, start_time)
+        finally:
+            elapsed = time.monotonic() - start_time
+            slot.busy_seconds += elapsed
+            if self.placement.enabled:
+                # Resident models and backlogs changed; let idle workers re-plan.
+                self.job_queue.wake_waiters()
+
+    def _run_leased(
+        self, slot: _WorkerSlot, job: Job, lease: _Lease, start_time: float
+    ) -> dict[str, Any] | None:
+        ctx = LogContext(job_id=job.job_id, subsystem="queue_runner")
+        log_with_ctx(
+            logger,
+            logging.INFO,
+            "QUEUE_JOB_START | Starting execution on worker",
+            ctx=ctx,
+            extra_fields={"worker_id": slot.worker_id, "run_mode": getattr(job, "run_mode", None)},
+        )
+        self._notify(job, JobStatus.RUNNING)
+        try:
+            result = slot.run_callable(job) if slot.run_callable else None
+        except Exception as exc:  # noqa: BLE001
+            if not self._end_lease(slot, lease):
+                self._log_discarded(slot, job, "error")
+                return None
+            if _is_worker_unreachable(exc):
+                slot.last_error = str(exc)
+                self._mark_worker_offline(slot, reason=str(exc))
+                self._reassign(slot, job)
+                return None
+            logger.exception(
+                "QUEUE_JOB_ERROR | Unhandled exception while executing job",
+                extra={"job_id": job.job_id, "worker_id": slot.worker_id},
+            )
+            _ensure_job_envelope(job, exc)
+            slot.jobs_failed += 1
+            self.job_queue.mark_failed(job.job_id, error_message=str(exc))
+            self._notify(job, JobStatus.FAILED)
+            return None
+        if not self._end_lease(slot, lease):
+            self._log_discarded(slot, job, "result")
+            return None
+        canonical_result = normalize_run_result(result, default_run_id=job.job_id)
+        duration_ms = int((time.monotonic() - start_time) * 1000)
+        metadata = canonical_result.get("metadata") or {}
+        metadata["duration_ms"] = duration_ms
+        metadata["worker_id"] = slot.worker_id
+        canonical_result["metadata"] = metadata
+        checkpoints = _extract_stage_checkpoints(canonical_result)
+        if checkpoints:
+            job.execution_metadata.stage_checkpoints = _merge_stage_checkpoints(
+                job.execution_metadata.stage_checkpoints,
+                checkpoints,
+            )
+        error_message = canonical_result.get("error")
+        success = canonical_result.get("success")
+        if success is None:
+            success = error_message is None
+        if success:
+            slot.jobs_completed += 1
+            self._job_seconds += _JOB_SECONDS_SMOOTHING * (duration_ms / 1000.0 - self._job_seconds)
+            self.job_queue.mark_completed(job.job_id, result=canonical_result)
+            notify_status = JobStatus.COMPLETED
+        else:
+            slot.jobs_failed += 1
+            self.job_queue.mark_failed(
+                job.job_id,
+                error_message=error_message or "Job failed without error message",
+                result=canonical_result,
+            )
+            notify_status = JobStatus.FAILED
+        log_with_ctx(
+            logger,
+            logging.INFO,
+            "QUEUE_JOB_DONE | Job execution completed",
+            ctx=ctx,
+            extra_fields={
+                "worker_id": slot.worker_id,
+                "duration_ms": duration_ms,
+                "status": notify_status.value,
+            },
+        )
+        self._notify(job, notify_status)
+        return canonical_result
+
+    def _reassign(self, slot: _WorkerSlot, job: Job) -> None:
+        """Return a job lost with its worker to the queue, or fail it past the limit."""
+        slot.jobs_lost += 1
+        job.worker_id = None
+        reassignments = job.execution_metadata.return_to_queue_count
+        if reassignments >= self.max_reassignments:
+            message = f"Worker {slot.worker_id} lost; reassignment limit reached"
+            self._requirements.pop(job.job_id, None)
+            self.job_queue.mark_failed(job.job_id, error_message=message)
+            self._notify(job, JobStatus.FAILED)
+            return
+        log_with_ctx(
+            logger,
+            logging.WARNING,
+            "QUEUE_JOB_REASSIGN | Worker lost, returning job to queue",
+            ctx=LogContext(job_id=job.job_id, subsystem="queue_runner"),
+            extra_fields={"worker_id": slot.worker_id, "reassignments": reassignments + 1},
+        )
+        if self.job_queue.requeue_job(job.job_id, reason=WORKER_LOST_ACTION) is not None:
+            self._notify(job, JobStatus.QUEUED)
+
+    def _log_discarded(self, slot: _WorkerSlot, job: Job, what: str) -> None:
+        log_with_ctx(
+            logger,
+            logging.INFO,
+            f"Discarding {what} from revoked lease",
+            ctx=LogContext(job_id=job.job_id, subsystem="queue_runner"),
+            extra_fields={"worker_id": slot.worker_id},
+        )
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+
+    def _default_probe(self, descriptor: WorkerDescriptor, client: Any) -> bool:
+        check = getattr(client, "check_connection", None)
+        if not callable(check):
+            return True
+        return bool(check(timeout=self.probe_timeout))
+
+    def _health_loop(self) -> None:
+        while not self._stop_event.wait(self.health_interval):
+            self._sync_workers()
+            self.check_workers()
+            self.fail_unplaceable_jobs()
+
+    def check_workers(self) -> None:
+        """Probe every worker once and apply ONLINE/OFFLINE transitions."""
+        with self._lock:
+            slots = list(self._slots.values())
+        for slot in slots:
+            if self._stop_event.is_set():
+                return
+            try:
+                healthy = self._probe(slot.descriptor, slot.client)
+            except Exception as exc:  # noqa: BLE001
+                slot.last_error = str(exc)
+                healthy = False
+            if healthy:
+                slot.consecutive_probe_failures = 0
+                self.registry.record_heartbeat(slot.worker_id)
+                if not slot.online.is_set():
+                    self._mark_worker_online(slot)
+                continue
+            slot.consecutive_probe_failures += 1
+            if slot.online.is_set() and slot.consecutive_probe_failures >= self.probe_failure_threshold:
+                self._mark_worker_offline(slot, reason="health probe failed")
+
+    def fail_unplaceable_jobs(self) -> list[str]:
+        """Fail queued jobs that no registered worker accepts; return their ids."""
+        workers = self.registry.list_workers()
+        if not workers:
+            return []
+        failed: list[str] = []
+        for job in self.job_queue.list_jobs(JobStatus.QUEUED):
+            requirements = self._job_requirements(job)
+            if any(worker_accepts(worker, requirements) for worker in workers):
+                continue
+            message = f"{UNPLACEABLE_JOB_PREFIX} (requires {_describe_requirements(requirements)})"
+            log_with_ctx(
+                logger,
+                logging.WARNING,
+                "QUEUE_JOB_UNPLACEABLE | No registered worker accepts job",
+                ctx=LogContext(job_id=job.job_id, subsystem="queue_runner"),
+                extra_fields={"requirements": _describe_requirements(requirements)},
+            )
+            self._requirements.pop(job.job_id, None)
+            self.job_queue.mark_failed(job.job_id, error_message=message)
+            self._notify(job, JobStatus.FAILED)
+            failed.append(job.job_id)
+        return failed
+
+    def _mark_worker_online(self, slot: _WorkerSlot) -> None:
+        self.registry.update_worker_status(slot.worker_id, WorkerStatus.ONLINE)
+        self._refresh_resident_model(slot)
+        slot.online.set()
+        logger.info("Worker %s is back online", slot.worker_id)
+        # Jobs only this worker can run may be waiting; re-evaluate them.
+        self.job_queue.wake_waiters()
+
+    def _mark_worker_offline(self, slot: _WorkerSlot, *, reason: str) -> None:
+        """Mark ``slot`` OFFLINE and hand its leased jobs to other workers."""
+        slot.online.clear()
+        self.registry.update_worker_status(slot.worker_id, WorkerStatus.OFFLINE)
+        self.resident_models.invalidate(slot.worker_id)
+        logger.warning("Worker %s marked offline: %s", slot.worker_id, reason)
+        with self._lock:
+            lost = [lease for lease in self._leases.values() if lease.worker_id == slot.worker_id]
+            for lease in lost:
+                del self._leases[lease.job_id]
+        for lease in lost:
+            job = self.job_queue.get_job(lease.job_id)
+            if job is not None:
+                self._reassign(slot, job)
+        # Jobs left for this worker's resident model must be re-planned.
+        self.job_queue.wake_waiters()
+
+    # ------------------------------------------------------------------
+    # RunnerProtocol surface
+    # ------------------------------------------------------------------
+
+    def run_once(self, job: Job) -> dict | None:
+        """Synchronously execute ``job`` on the first online worker that accepts it."""
+        if job is None:
+            return None
+        for slot in self._ensure_slots():
+            if slot.online.is_set() and self._accepts(slot, job):
+                return self._execute(slot, job)
+        self.job_queue.mark_failed(job.job_id, error_message="No online worker accepts this job")
+        self._notify(job, JobStatus.FAILED)
+        return None
+
+    def cancel_current(self, *, return_to_queue: bool = False) -> None:
+        """Revoke every active lease; jobs are cancelled or returned to the queue."""
+        with self._lock:
+            leases = list(self._leases.values())
+            self._leases.clear()
+        for lease in leases:
+            if return_to_queue:
+                job = self.job_queue.requeue_job(lease.job_id)
+                if job is not None:
+                    job.worker_id = None
+                    self._notify(job, JobStatus.QUEUED)
+                continue
+            job = self.job_queue.mark_cancelled(lease.job_id)
+            if job is not None:
+                job.execution_metadata.last_control_action = "cancelled"
+                self._notify(job, JobStatus.CANCELLED)
+
+    @property
+    def current_job(self) -> Job | None:
+        with self._lock:
+            return next((slot.current_job for slot in self._slots.values() if slot.current_job), None)
+
+    def get_current_job(self) -> Job | None:
+        return self.current_job
+
+    @property
+    def current_job_id(self) -> str | None:
+        job = self.current_job
+        return job.job_id if job else None
+
+    def get_worker_states(self) -> list[dict[str, Any]]:
+        """Per-worker health, model residency and utilization for diagnostics."""
+        with self._lock:
+            slots = list(self._slots.values())
+        now = time.monotonic()
+        residents = self.resident_models.snapshot()
+        states = []
+        for slot in slots:
+            resident = residents.get(slot.worker_id, {})
+            busy_seconds = slot.busy_seconds
+            if slot.current_job is not None and slot.current_job.started_at is not None:
+                busy_seconds += (datetime.utcnow() - slot.current_job.started_at).total_seconds()
+            uptime = max(now - slot.created_at, 1e-9)
+            states.append(
+                {
+                    "worker_id": slot.worker_id,
+                    "base_url": worker_base_url(slot.descriptor),
+                    "status": slot.descriptor.status.value,
+                    "current_job_id": slot.current_job.job_id if slot.current_job else None,
+                    "jobs_completed": slot.jobs_completed,
+                    "jobs_failed": slot.jobs_failed,
+                    "jobs_lost": slot.jobs_lost,
+                    "consecutive_probe_failures": slot.consecutive_probe_failures,
+                    "last_error": slot.last_error,
+                    "resident_model": resident.get("model"),
+                    "resident_vae": resident.get("vae"),
+                    "model_switches": int(resident.get("model_switches", 0)),
+                    "vae_switches": int(resident.get("vae_switches", 0)),
+                    "resident_dispatches": slot.resident_dispatches,
+                    "busy_seconds": round(busy_seconds, 3),
+                    "utilization": round(min(1.0, busy_seconds / uptime), 4),
+                }
+            )
+        return states
+
+    def _notify(self, job: Job, status: JobStatus) -> None:
+        if self._on_status_change:
+            try:
+                self._on_status_change(job, status)
+            except Exception:
+                pass
+
+
+def _describe_requirements(requirements: JobWorkerRequirements) -> str:
+    parts = []
+    if requirements.model_family:
+        parts.append(f"model family {requirements.model_family}")
+    if requirements.tags:
+        parts.append("tags " + ", ".join(sorted(requirements.tags)))
+    if requirements.min_vram_gb:
+        parts.append(f"{requirements.min_vram_gb:g} GB VRAM")
+    return "; ".join(parts) or "no specific capabilities"
+
+
+def _default_placement_policy() -> ModelPlacementPolicy:
+    from src.config import app_config
+
+    scheduling = app_config.get_queue_scheduling_config()
+    return ModelPlacementPolicy(
+        model_switch_cost_seconds=scheduling.model_switch_cost_seconds,
+        vae_switch_cost_seconds=scheduling.vae_switch_cost_seconds,
+        max_wait_seconds=scheduling.max_wait_seconds,
+    )
+
+
+__all__ = ["MultiNodeJobRunner", "default_client_factory", "worker_base_url"]
@@ -23,6 +23,8 @@ logger = logging.getLogger(__name__)
 QUEUE_JOB_SOFT_TIMEOUT_SECONDS = 600  # seconds
 # Cooldown between reprocess jobs to let WebUI stabilize and free VRAM
 REPROCESS_JOB_COOLDOWN_SECONDS = 2.0
+# Upper bound on a single idle wait; submit/resume/stop wake the worker immediately.
+IDLE_WAIT_TIMEOUT_SECONDS = 5.0
 
 
 def _ensure_job_envelope(job: Job | None, exc: Exception) -> None:
@@ -261,6 +263,20 @@ def _log_retry_exhausted(job: Job, stage: str | None, reason: str) -> None:
     )
 
 
+class _QueueWakingStopEvent(threading.Event):
+    """Stop event that also releases the worker if it is blocked on the queue."""
+
+    def __init__(self, job_queue: JobQueue) -> None:
+        super().__init__()
+        self._job_queue = job_queue
+
+    def set(self) -> None:
+        super().set()
+        wake_waiters = getattr(self._job_queue, "wake_waiters", None)
+        if callable(wake_waiters):
+            wake_waiters()
+
+
 class SingleNodeJobRunner:
     """Background worker that executes jobs from a JobQueue."""
 
@@ -276,7 +292,7 @@ class SingleNodeJobRunner:
         self.job_queue = job_queue
         self.run_callable = run_callable
         self.poll_interval = poll_interval
-        self._stop_event = threading.Event()
+        self._stop_event = _QueueWakingStopEvent(job_queue)
         self._worker: threading.Thread | None = None
         self._on_status_change = on_status_change
         self._current_job: Job | None = None
@@ -371,12 +387,11 @@ class SingleNodeJobRunner:
         while not self._stop_event.is_set():
             # Check if queue is paused before dequeuing
             if self._is_paused and self._is_paused():
-                time.sleep(self.poll_interval)
+                self._stop_event.wait(self.poll_interval)
                 continue
-            
-            job = self.job_queue.get_next_job()
+
+            job = self._wait_for_next_job()
             if job is None:
-                time.sleep(self.poll_interval)
                 continue
             start_time = time.monotonic()
             extra = {
@@ -534,6 +549,20 @@ class SingleNodeJobRunner:
                     time.sleep(REPROCESS_JOB_COOLDOWN_SECONDS)
         return
 
+    def _wait_for_next_job(self) -> Job | None:
+        """Block until the queue hands over a job, the idle timeout elapses, or stop()."""
+        waiter = getattr(self.job_queue, "wait_for_next_job", None)
+        if callable(waiter):
+            return waiter(
+                timeout=max(self.poll_interval, IDLE_WAIT_TIMEOUT_SECONDS),
+                stop_event=self._stop_event,
+            )
+        # Queues without a wakeup primitive fall back to interval polling.
+        job = self.job_queue.get_next_job()
+        if job is None:
+            self._stop_event.wait(self.poll_interval)
+        return job
+
     def run_once(self, job: Job) -> dict | None:
         """Synchronously execute a single job (used by Run Now)."""
         # PR-CORE1-D21B: Activity after dequeue
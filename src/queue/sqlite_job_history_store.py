@@ -0,0 +1,317 @@
+# Subsystem: Queue
+# Role: Indexed SQLite job history backend for large histories.
+
+"""SQLite-backed job history store.
+
+The JSONL store keeps one line per status transition and must fold the whole
+file to answer ``get_job``/``list_jobs``. This backend keeps exactly one row per
+job, indexed by ``job_id`` (primary key), ``created_at`` and ``status``, so
+lookups are O(log n) and ``list_jobs`` pages straight out of the index.
+
+``import_jsonl_history`` copies an existing ``history.jsonl`` into the store and
+remembers how far it read, so re-running it only ingests newly appended lines.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from src.queue.job_history_store import (
+    JobHistoryEntry,
+    JobHistoryStore,
+    _build_status_change_entry,
+    _entry_storage_payload,
+    _summarize_job_for_history,
+)
+from src.queue.job_model import Job, JobStatus
+from src.utils.config_blob_store import blob_store_dir_for, get_config_blob_store
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS job_history (
+        job_id TEXT PRIMARY KEY,
+        created_ts REAL NOT NULL,
+        status TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        entry_json TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_history_created ON job_history (created_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_job_history_status_created ON job_history (status, created_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_job_history_seq ON job_history (seq)",
+    "CREATE TABLE IF NOT EXISTS history_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+
+def _sort_ts(value: datetime) -> float:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH).total_seconds()
+
+
+def _iter_history_rows(path: Path) -> Iterator[Any]:
+    """Yield the stored entry of every row; reads through its own connection."""
+    if not path.exists():
+        return
+    conn = sqlite3.connect(str(path))
+    try:
+        for (raw,) in conn.execute("SELECT entry_json FROM job_history"):
+            try:
+                yield json.loads(raw)
+            except ValueError:
+                continue
+    finally:
+        conn.close()
+
+
+class SQLiteJobHistoryStore(JobHistoryStore):
+    """One-row-per-job history backed by an indexed SQLite table."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[JobHistoryEntry], None]] = []
+        self._blob_store = get_config_blob_store(blob_store_dir_for(self._path))
+        self._blob_store.register_referrer(
+            os.path.abspath(self._path), partial(_iter_history_rows, self._path)
+        )
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._conn.commit()
+            row = self._conn.execute("SELECT MAX(seq) FROM job_history").fetchone()
+            self._seq = int(row[0] or 0)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # JobHistoryStore interface
+    # ------------------------------------------------------------------
+
+    def record_job_submission(self, job: Job) -> None:
+        entry = JobHistoryEntry(
+            job_id=job.job_id,
+            created_at=job.created_at,
+            status=job.status,
+            payload_summary=_summarize_job_for_history(job),
+            worker_id=getattr(job, "worker_id", None),
+            run_mode=getattr(job, "run_mode", "queue"),
+            snapshot=getattr(job, "snapshot", None),
+        )
+        self.save_entry(entry)
+
+    def record_status_change(
+        self,
+        job_id: str,
+        status: JobStatus,
+        ts: datetime,
+        error: str | None = None,
+        result: dict[str, Any] | None = None,
+    ) -> None:
+        entry = _build_status_change_entry(
+            self.get_job(job_id), job_id, status, ts, error=error, result=result
+        )
+        self.save_entry(entry)
+
+    def list_jobs(
+        self, status: JobStatus | None = None, limit: int = 50, offset: int = 0
+    ) -> list[JobHistoryEntry]:
+        """Return one page of jobs, newest ``created_at`` first."""
+        if limit <= 0:
+            return []
+        query = "SELECT entry_json FROM job_history"
+        params: list[object] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(JobStatus(status).value)
+        query += " ORDER BY created_ts DESC, seq DESC LIMIT ? OFFSET ?"
+        params.extend([int(limit), max(0, int(offset))])
+        return self._fetch_entries(query, params)
+
+    def list_recent_jobs(
+        self,
+        *,
+        statuses: set[JobStatus] | None = None,
+        limit: int = 50,
+    ) -> list[JobHistoryEntry]:
+        """Return the most recently written jobs (matches JSONL tail-scan order)."""
+        if limit <= 0:
+            return []
+        query = "SELECT entry_json FROM job_history"
+        params: list[object] = []
+        wanted = sorted(JobStatus(status).value for status in (statuses or ()))
+        if wanted:
+            query += f" WHERE status IN ({', '.join('?' for _ in wanted)})"
+            params.extend(wanted)
+        query += " ORDER BY seq DESC LIMIT ?"
+        params.append(int(limit))
+        return self._fetch_entries(query, params)
+
+    def get_job(self, job_id: str) -> JobHistoryEntry | None:
+        entries = self._fetch_entries(
+            "SELECT entry_json FROM job_history WHERE job_id = ?", [job_id]
+        )
+        return entries[0] if entries else None
+
+    def count_jobs(self, status: JobStatus | None = None) -> int:
+        with self._lock:
+            if status:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM job_history WHERE status = ?",
+                    (JobStatus(status).value,),
+                ).fetchone()
+            else:
+                row = self._conn.execute("SELECT COUNT(*) FROM job_history").fetchone()
+        return int(row[0] or 0)
+
+    def save_entry(self, entry: JobHistoryEntry) -> None:
+        self.save_entries([entry])
+        self._emit(entry)
+
+    def save_entries(self, entries: Iterable[JobHistoryEntry]) -> int:
+        """Upsert entries in a single transaction without emitting callbacks."""
+        with self._lock:
+            rows = []
+            for entry in entries:
+                self._seq += 1
+                rows.append(
+                    (
+                        entry.job_id,
+                        _sort_ts(entry.created_at),
+                        entry.status.value,
+                        self._seq,
+                        json.dumps(
+                            _entry_storage_payload(entry, self._blob_store), ensure_ascii=True
+                        ),
+                    )
+                )
+            if not rows:
+                return 0
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO job_history "
+                    "(job_id, created_ts, status, seq, entry_json) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            return len(rows)
+
+    def invalidate_cache(self) -> None:
+        """No-op; kept for parity with JSONLJobHistoryStore (reads always hit the index)."""
+
+    def register_callback(self, callback: Callable[[JobHistoryEntry], None]) -> None:
+        self._callbacks.append(callback)
+
+    # ------------------------------------------------------------------
+    # Import bookkeeping
+    # ------------------------------------------------------------------
+
+    def get_meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM history_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return str(row[0]) if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO history_meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _fetch_entries(self, query: str, params: list[object]) -> list[JobHistoryEntry]:
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        entries: list[JobHistoryEntry] = []
+        for (raw,) in rows:
+            try:
+                entries.append(JobHistoryEntry.from_json(raw))
+            except Exception:
+                continue
+        return entries
+
+    def _emit(self, entry: JobHistoryEntry) -> None:
+        for callback in list(self._callbacks):
+            try:
+                callback(entry)
+            except Exception:
+                continue
+
+
+def import_jsonl_history(
+    jsonl_path: str | Path,
+    store: SQLiteJobHistoryStore,
+    *,
+    batch_size: int = 1000,
+) -> int:
+    """Import a JSONL history file into ``store``; return the number of lines applied.
+
+    The byte offset reached is recorded in the store, so subsequent calls only read
+    lines appended since the previous import. A file that shrank is reimported.
+    """
+    source = Path(jsonl_path)
+    if not source.exists():
+        return 0
+    meta_key = f"jsonl_import_offset:{source.resolve()}"
+    try:
+        offset = int(store.get_meta(meta_key) or 0)
+    except ValueError:
+        offset = 0
+    size = source.stat().st_size
+    if offset > size:
+        offset = 0
+    if offset == size:
+        return 0
+
+    applied = 0
+    pending: dict[str, JobHistoryEntry] = {}
+    with source.open("rb") as handle:
+        handle.seek(offset)
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                # Partially written tail; pick it up on the next import.
+                break
+            offset += len(raw)
+            if not raw.strip():
+                continue
+            try:
+                entry = JobHistoryEntry.from_json(raw.decode("utf-8"))
+            except Exception:
+                continue
+            # Later lines supersede earlier ones; drop and reinsert to keep write order.
+            pending.pop(entry.job_id, None)
+            pending[entry.job_id] = entry
+            applied += 1
+            if len(pending) >= batch_size:
+                store.save_entries(pending.values())
+                pending.clear()
+    store.save_entries(pending.values())
+    store.set_meta(meta_key, str(offset))
+    logger.info("Imported %s history lines from %s into %s", applied, source, store.path)
+    return applied
@@ -0,0 +1,115 @@
+# Subsystem: Queue
+# Role: Matches queued jobs to cluster workers by model family, tags, and VRAM.
+
+"""Job -> worker capability matching for multi-worker execution.
+
+A worker advertises what it can run through its ``WorkerDescriptor``:
+
+- model families as plain tags (``"sdxl"``, ``"sd15"``, ``"flux"``, ``"sd3"``).
+  A worker without any family tag accepts every family.
+- ``vram_gb``; ``0`` means unknown and never rejects a job.
+- any other free-form tags (``"gpu0"``, ``"highres"``, ...).
+
+A job's requirements come from its model (family inferred from the checkpoint
+name) plus an optional ``cluster`` section in the NJR config or config
+snapshot::
+
+    {"cluster": {"worker_tags": ["highres"], "min_vram_gb": 16, "model_family": "sdxl"}}
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from src.cluster.worker_model import WorkerDescriptor
+from src.queue.job_model import Job
+from src.queue.model_affinity import ModelAffinityKey, model_affinity_key_for_job
+
+MODEL_FAMILY_TAGS = frozenset({"sd15", "sdxl", "sd3", "flux"})
+
+
+@dataclass(frozen=True)
+class JobWorkerRequirements:
+    """What a worker must offer to run a job (plus its model key for placement)."""
+
+    model_family: str | None = None
+    tags: frozenset[str] = frozenset()
+    min_vram_gb: float = 0.0
+    model_key: ModelAffinityKey | None = None
+
+
+def infer_model_family(model_name: str | None) -> str | None:
+    """Best-effort checkpoint family from its name; None when it cannot be told."""
+    text = str(model_name or "").strip().lower()
+    if not text:
+        return None
+    if "flux" in text:
+        return "flux"
+    if "sd3" in text or "stable diffusion 3" in text:
+        return "sd3"
+    if "sdxl" in text or "xl" in text or "pony" in text:
+        return "sdxl"
+    if "1.5" in text or "sd15" in text or "v1-5" in text:
+        return "sd15"
+    return None
+
+
+def _cluster_section(job: Job) -> Mapping[str, Any]:
+    record = getattr(job, "_normalized_record", None)
+    config = getattr(record, "config", None) if record is not None else None
+    for source in (config, job.config_snapshot):
+        if isinstance(source, Mapping):
+            section = source.get("cluster")
+            if isinstance(section, Mapping):
+                return section
+    return {}
+
+
+def _normalize_tags(raw: Any) -> frozenset[str]:
+    if isinstance(raw, str):
+        raw = [raw]
+    if not isinstance(raw, Iterable):
+        return frozenset()
+    return frozenset(str(tag).strip().lower() for tag in raw if str(tag).strip())
+
+
+def requirements_for_job(job: Job) -> JobWorkerRequirements:
+    section = _cluster_section(job)
+    key = model_affinity_key_for_job(job)
+    family = str(section.get("model_family") or "").strip().lower() or None
+    if family is None:
+        family = infer_model_family(key[0]) if key else None
+    try:
+        min_vram = float(section.get("min_vram_gb") or 0.0)
+    except (TypeError, ValueError):
+        min_vram = 0.0
+    return JobWorkerRequirements(
+        model_family=family,
+        tags=_normalize_tags(section.get("worker_tags")),
+        min_vram_gb=max(0.0, min_vram),
+        model_key=key,
+    )
+
+
+def worker_accepts(worker: WorkerDescriptor, requirements: JobWorkerRequirements) -> bool:
+    """Return True when ``worker`` satisfies every requirement."""
+    worker_tags = _normalize_tags(worker.tags)
+    families = worker_tags & MODEL_FAMILY_TAGS
+    if families and requirements.model_family and requirements.model_family not in families:
+        return False
+    if not requirements.tags <= worker_tags:
+        return False
+    if requirements.min_vram_gb and worker.vram_gb and worker.vram_gb < requirements.min_vram_gb:
+        return False
+    return True
+
+
+__all__ = [
+    "JobWorkerRequirements",
+    "MODEL_FAMILY_TAGS",
+    "infer_model_family",
+    "requirements_for_job",
+    "worker_accepts",
+]
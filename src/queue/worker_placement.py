@@ -0,0 +1,137 @@
+# Subsystem: Queue
+# Role: Places queued jobs on the worker that already has their checkpoint loaded.
+
+"""Model-resident placement for multi-worker execution.
+
+``src.cluster.resident_models.ResidentModelCache`` records which checkpoint and
+VAE each WebUI worker has loaded. ``choose_placement`` picks, for a free worker,
+the queued job with the lowest cost:
+
+- ``switch cost``: 0 when the job's checkpoint (and explicit VAE) is already
+  resident, otherwise the configured load time;
+- ``queue depth``: jobs further back pay ``position * job_seconds / workers``
+  so the worker does not reorder the queue for a small saving.
+
+A job whose checkpoint is resident on another worker is left for that worker
+when it would start there (behind that worker's own backlog) sooner than the
+load would take here. Jobs that waited past ``max_wait_seconds`` are taken
+regardless of cost.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+
+from src.cluster.resident_models import ResidentModel
+from src.cluster.worker_model import WorkerId
+from src.queue.job_model import Job
+from src.queue.model_affinity import ModelAffinityKey, normalize_model_key
+from src.utils.webui_resource_names import canonicalize_vae_lookup_key
+
+ResidentKey = tuple[str, str]
+"""(normalized checkpoint, canonical VAE) loaded on a worker."""
+
+_AUTOMATIC_VAE = canonicalize_vae_lookup_key(None)
+
+
+def resident_key(entry: ResidentModel | None) -> ResidentKey | None:
+    """Placement key for what a worker has loaded; None when unknown."""
+    if entry is None or not entry.model:
+        return None
+    model_key = normalize_model_key(entry.model)
+    if not model_key:
+        return None
+    return (model_key, canonicalize_vae_lookup_key(entry.vae))
+
+
+@dataclass(frozen=True)
+class ModelPlacementPolicy:
+    """Switch costs and the starvation bound used by ``choose_placement``.
+
+    ``expected_job_seconds`` seeds the runner's moving average of job time,
+    which turns queue depth into seconds.
+    """
+
+    enabled: bool = True
+    model_switch_cost_seconds: float = 20.0
+    vae_switch_cost_seconds: float = 2.0
+    expected_job_seconds: float = 30.0
+    max_wait_seconds: float | None = 600.0
+
+
+def switch_cost(
+    resident: ResidentKey | None,
+    job_key: ModelAffinityKey | None,
+    policy: ModelPlacementPolicy,
+) -> float:
+    """Expected seconds of model/VAE loading before ``job_key`` can run on ``resident``."""
+    if job_key is None or not job_key[0]:
+        return 0.0
+    if resident is None or resident[0] != job_key[0]:
+        return policy.model_switch_cost_seconds
+    if job_key[1] != _AUTOMATIC_VAE and job_key[1] != resident[1]:
+        return policy.vae_switch_cost_seconds
+    return 0.0
+
+
+def choose_placement(
+    worker_id: WorkerId,
+    candidates: Sequence[Job],
+    *,
+    job_key: Callable[[Job], ModelAffinityKey | None],
+    residents: Mapping[WorkerId, ResidentKey | None],
+    busy: Mapping[WorkerId, bool],
+    can_run: Callable[[WorkerId, Job], bool],
+    waited_seconds: Callable[[Job], float],
+    job_seconds: float,
+    policy: ModelPlacementPolicy,
+) -> Job | None:
+    """Return the job ``worker_id`` should run next, or None to stay idle.
+
+    ``candidates`` are the jobs this worker accepts, in queue execution order;
+    ``residents``/``busy`` cover every online worker (including this one).
+    """
+    if not candidates:
+        return None
+    if not policy.enabled:
+        return candidates[0]
+    others = [other for other in residents if other != worker_id]
+    depth_per_position = max(0.0, job_seconds) / max(1, len(residents))
+    backlog: dict[WorkerId, int] = dict.fromkeys(others, 0)
+    best: Job | None = None
+    best_score = 0.0
+    for position, job in enumerate(candidates):
+        if best is not None and position * depth_per_position >= best_score:
+            break
+        key = job_key(job)
+        if policy.max_wait_seconds is not None and waited_seconds(job) >= policy.max_wait_seconds:
+            return job
+        cost_here = switch_cost(residents.get(worker_id), key, policy)
+        resident_elsewhere = [
+            other
+            for other in others
+            if switch_cost(residents[other], key, policy) == 0.0 and can_run(other, job)
+        ]
+        for other in resident_elsewhere:
+            backlog[other] += 1
+        if cost_here > 0.0 and resident_elsewhere:
+            wait_elsewhere = min(
+                (backlog[other] - 1 + (1 if busy.get(other) else 0)) * job_seconds
+                for other in resident_elsewhere
+            )
+            if wait_elsewhere < cost_here:
+                continue
+        score = cost_here + position * depth_per_position
+        if best is None or score < best_score:
+            best, best_score = job, score
+    return best
+
+
+__all__ = [
+    "ModelPlacementPolicy",
+    "ResidentKey",
+    "choose_placement",
+    "resident_key",
+    "switch_cost",
+]
@@ -12,6 +12,7 @@ import logging
 import queue
 import threading
 import time
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
@@ -23,7 +24,7 @@ logger = logging.getLogger(__name__)
 class PersistenceTask:
     """A queued persistence operation."""
     
-    task_type: str  # "manifest", "history", "image_metadata", "run_metadata"
+    task_type: str  # "manifest", "history", "history_compaction", "image_metadata", "run_metadata"
     data: dict[str, Any]
     callback: Callable[[], None] | None = None
     priority: int = 0  # Higher = more important (0 = normal, 1 = critical)
@@ -188,6 +189,8 @@ class PersistenceWorker:
                 self._write_run_metadata(task.data)
             elif task.task_type == "history":
                 self._write_history(task.data)
+            elif task.task_type == "history_compaction":
+                self._compact_history(task.data)
             elif task.task_type == "image_metadata":
                 self._write_image_metadata(task.data)
             else:
@@ -260,6 +263,12 @@ class PersistenceWorker:
         with open(file_path, "a", encoding="utf-8") as f:
             f.write(json.dumps(payload, ensure_ascii=False) + "\n")
     
+    def _compact_history(self, data: dict[str, Any]) -> None:
+        """Rewrite a history JSONL file down to its latest line per job."""
+        from src.queue.job_history_store import compact_history_file
+
+        compact_history_file(Path(data["file_path"]))
+    
     def _write_image_metadata(self, data: dict[str, Any]) -> None:
         """Write image with embedded metadata."""
         # Placeholder for image metadata embedding
@@ -272,6 +281,11 @@ class PersistenceWorker:
 _global_worker: PersistenceWorker | None = None
 _worker_lock = threading.Lock()
 
+# Flush callbacks for writers that buffer durability outside the worker queue
+# (e.g. group-committed learning records). Held weakly so a discarded writer
+# is not kept alive just to be flushed.
+_shutdown_flushes: list[weakref.ref[Any]] = []
+
 
 def get_persistence_worker() -> PersistenceWorker:
     """Get or create the global persistence worker singleton."""
@@ -284,11 +298,37 @@ def get_persistence_worker() -> PersistenceWorker:
         return _global_worker
 
 
+def register_shutdown_flush(flush: Callable[[], None]) -> None:
+    """Run *flush* (usually a bound ``close``/``flush`` method) at worker shutdown."""
+    ref: weakref.ref[Any]
+    if hasattr(flush, "__self__"):
+        ref = weakref.WeakMethod(flush)  # type: ignore[arg-type]
+    else:
+        ref = weakref.ref(flush)
+    with _worker_lock:
+        _shutdown_flushes[:] = [item for item in _shutdown_flushes if item() is not None]
+        _shutdown_flushes.append(ref)
+
+
+def _run_shutdown_flushes() -> None:
+    with _worker_lock:
+        flushes = [item() for item in _shutdown_flushes]
+        _shutdown_flushes.clear()
+    for flush in flushes:
+        if flush is None:
+            continue
+        try:
+            flush()
+        except Exception as exc:
+            logger.exception(f"[PersistenceWorker] Shutdown flush failed: {exc}")
+
+
 def shutdown_persistence_worker(timeout: float = 5.0) -> None:
-    """Shutdown the global persistence worker."""
+    """Shutdown the global persistence worker and run registered shutdown flushes."""
     global _global_worker
     
     with _worker_lock:
         if _global_worker is not None:
             _global_worker.stop(timeout=timeout)
             _global_worker = None
+    _run_shutdown_flushes()
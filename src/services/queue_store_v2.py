@@ -2,19 +2,39 @@
 
 Provides load/save functionality for queue state that survives app restarts.
 Every job entry stores exactly one NormalizedJobRecord snapshot plus metadata.
+
+State is kept as a checkpoint (``queue_state_v2.json``, a single JSONL record)
+plus an append-only journal next to it (``queue_state_v2.json.journal``). Once a
+checkpoint exists, ``save_queue_snapshot`` appends only the delta records
+(add/remove/move/status/update/flags, and group/group_update/group_remove for
+the cursors of lazily streamed job groups) needed to reach the new state, and
+rewrites the checkpoint when the journal grows past the compaction threshold.
+``load_queue_snapshot`` replays checkpoint + journal.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
 import time
-from collections.abc import Mapping
+import uuid
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Any
 
+from src.config.app_config import is_config_blob_store_enabled
 from src.state.workspace_paths import workspace_paths
+from src.utils.config_blob_store import (
+    ConfigBlobStore,
+    UnresolvedConfigBlobError,
+    blob_store_dir_for,
+    get_config_blob_store,
+    hydrate_snapshot,
+)
 from src.utils.jsonl_codec import JSONLCodec
 
 logger = logging.getLogger(__name__)
@@ -34,6 +54,12 @@ REQUIRED_QUEUE_FIELDS = {
 
 OPTIONAL_QUEUE_FIELDS = {"metadata": dict}
 
+JOURNAL_SUFFIX = ".journal"
+# Compact (rewrite the checkpoint, drop the journal) once the journal holds this
+# many records, or once it is larger than both the checkpoint and the byte floor.
+JOURNAL_COMPACT_MAX_RECORDS = 512
+JOURNAL_COMPACT_MIN_BYTES = 256 * 1024
+
 
 class UnsupportedQueueSchemaError(Exception):
     """Raised when a persisted queue snapshot uses an unsupported schema."""
@@ -51,6 +77,9 @@ class QueueSnapshot:
     auto_run_enabled: bool = False
     paused: bool = False
     schema_version: str = SCHEMA_VERSION
+    # Lazily streamed job groups whose remaining jobs are not in ``jobs`` yet:
+    # each entry carries a ``group_id``, the spec to rebuild its source and a cursor.
+    virtual_groups: list[dict[str, Any]] = field(default_factory=list)
 
 
 QueueSnapshotV1 = QueueSnapshot
@@ -114,8 +143,34 @@ def load_queue_snapshot(path: Path | str | None = None) -> QueueSnapshotV1 | Non
     if schema_version != SCHEMA_VERSION:
         raise UnsupportedQueueSchemaError(schema_version)
 
+    journal_id = data.get("journal_id") if len(entries) == 1 else None
+    # Register the sibling blob directory so references in this file resolve.
+    get_config_blob_store(blob_store_dir_for(state_path))
+    raw_jobs: list[Any] = [_hydrate_queue_item(raw) for raw in data.get("jobs", [])]
+    auto_run_enabled = bool(data.get("auto_run_enabled", False))
+    paused = bool(data.get("paused", False))
+    groups_by_id = _virtual_groups_by_id(data.get("virtual_groups"))
+    replayed = 0
+    journal_bytes = 0
+    journal_path = get_queue_journal_path(state_path)
+    if isinstance(journal_id, str) and journal_id and journal_path.exists():
+        order = [str(raw.get("queue_id")) for raw in raw_jobs if isinstance(raw, Mapping)]
+        jobs_by_id = {str(raw.get("queue_id")): dict(raw) for raw in raw_jobs if isinstance(raw, Mapping)}
+        flags = {"auto_run_enabled": auto_run_enabled, "paused": paused}
+        for record in _QUEUE_CODEC.iter_jsonl(journal_path):
+            if record.get("journal_id") != journal_id:
+                continue
+            if record.get("op") == "add":
+                record["job"] = _hydrate_queue_item(record.get("job"))
+            _apply_journal_record(order, jobs_by_id, flags, record, groups_by_id)
+            replayed += 1
+        raw_jobs = [jobs_by_id[qid] for qid in order if qid in jobs_by_id]
+        auto_run_enabled = bool(flags["auto_run_enabled"])
+        paused = bool(flags["paused"])
+        journal_bytes = _file_size(journal_path)
+
     validated_jobs: list[dict[str, Any]] = []
-    for raw in data.get("jobs", []):
+    for raw in raw_jobs:
         if not isinstance(raw, Mapping):
             logger.warning("Dropping queue job with invalid shape (not a mapping)")
             continue
@@ -128,16 +183,30 @@ def load_queue_snapshot(path: Path | str | None = None) -> QueueSnapshotV1 | Non
 
     snapshot = QueueSnapshotV1(
         jobs=validated_jobs,
-        auto_run_enabled=bool(data.get("auto_run_enabled", False)),
-        paused=bool(data.get("paused", False)),
+        auto_run_enabled=auto_run_enabled,
+        paused=paused,
         schema_version=SCHEMA_VERSION,
+        virtual_groups=list(groups_by_id.values()),
     )
 
+    journal = _journal_for(state_path)
+    if isinstance(journal_id, str) and journal_id:
+        journal.adopt(
+            journal_id,
+            snapshot,
+            journal_records=replayed,
+            journal_bytes=journal_bytes,
+            checkpoint_bytes=_file_size(state_path),
+        )
+    else:
+        journal.reset()
+
     logger.debug(
-        "Loaded queue state: %d jobs, auto_run=%s, paused=%s",
+        "Loaded queue state: %d jobs, auto_run=%s, paused=%s, journal_records=%d",
         len(snapshot.jobs),
         snapshot.auto_run_enabled,
         snapshot.paused,
+        replayed,
     )
     return snapshot
 
@@ -168,73 +237,521 @@ def _load_whole_json_snapshot(state_path: Path) -> dict[str, Any] | None:
 
 
 def save_queue_snapshot(snapshot: QueueSnapshotV1, path: Path | str | None = None) -> bool:
-    """Save queue state to disk using the strict v2.6 schema."""
+    """Save queue state to disk using the strict v2.6 schema.
+
+    The first save for a path (or any save after the files changed underneath
+    us) writes a full checkpoint; later saves append journal deltas only.
+    """
+    state_path = Path(path) if path else get_queue_state_path()
+    try:
+        return _journal_for(state_path).save(snapshot)
+    except Exception as e:  # pragma: no cover - defensive
+        logger.error("Failed to save queue state: %s", e)
+        return False
+
+
+def get_queue_journal_path(state_path: Path | str | None = None) -> Path:
+    """Return the journal file paired with a queue state checkpoint."""
+    base = Path(state_path) if state_path else get_queue_state_path()
+    return base.with_suffix(base.suffix + JOURNAL_SUFFIX)
+
+
+def get_queue_store_stats(path: Path | str | None = None) -> dict[str, Any]:
+    """Return write-cost counters for the queue store at ``path`` (diagnostics)."""
     state_path = Path(path) if path else get_queue_state_path()
+    return _journal_for(state_path).get_stats()
 
+
+def _iter_queue_state_records(state_path: Path) -> Iterator[Any]:
+    """Yield the checkpoint and journal records of ``state_path``; bad lines are skipped."""
+    for path in (state_path, get_queue_journal_path(state_path)):
+        if not path.exists():
+            continue
+        with path.open("rb") as handle:
+            for raw in handle:
+                try:
+                    yield json.loads(raw)
+                except ValueError:
+                    continue
+
+
+def _hydrate_queue_item(raw: Any) -> Any:
+    """Return ``raw`` with its NJR snapshot resolved; unresolvable refs are kept as is."""
+    if not isinstance(raw, Mapping) or not isinstance(raw.get("njr_snapshot"), dict):
+        return raw
     try:
-        state_path.parent.mkdir(parents=True, exist_ok=True)
+        return {**raw, "njr_snapshot": hydrate_snapshot(raw["njr_snapshot"])}
+    except UnresolvedConfigBlobError as exc:
+        logger.error("Queue job %s keeps an unresolved snapshot: %s", raw.get("queue_id"), exc)
+        return raw
 
-        validated_jobs: list[dict[str, Any]] = []
-        for raw in snapshot.jobs:
-            if not isinstance(raw, Mapping):
-                logger.warning("Skipping non-mapping queue job during save")
-                continue
-            job = dict(raw)
-            valid, errs = validate_queue_item(job)
-            if not valid:
-                logger.warning("Skipping invalid queue job during save: %s", errs)
-                continue
-            validated_jobs.append(job)
 
-        data = {
-            "jobs": validated_jobs,
-            "auto_run_enabled": bool(snapshot.auto_run_enabled),
-            "paused": bool(snapshot.paused),
-            "schema_version": SCHEMA_VERSION,
+def _dehydrate_queue_item(job: dict[str, Any], blob_store: ConfigBlobStore | None) -> dict[str, Any]:
+    snapshot = job.get("njr_snapshot")
+    if blob_store is None or not isinstance(snapshot, Mapping):
+        return job
+    return {**job, "njr_snapshot": blob_store.dehydrate_snapshot(snapshot)}
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _ends_with_newline(path: Path) -> bool:
+    """True when *path* is missing, empty, or its last byte is a newline."""
+    try:
+        with path.open("rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            if handle.tell() == 0:
+                return True
+            handle.seek(-1, os.SEEK_END)
+            return handle.read(1) == b"\n"
+    except OSError:
+        return True
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _validated_jobs(
+    jobs: list[Any], known: Mapping[str, dict[str, Any]] | None = None
+) -> list[dict[str, Any]]:
+    """Validate queue entries, skipping entries identical to an already-validated one."""
+    validated: list[dict[str, Any]] = []
+    for raw in jobs:
+        if not isinstance(raw, Mapping):
+            logger.warning("Skipping non-mapping queue job during save")
+            continue
+        job = dict(raw)
+        if known is not None and known.get(str(job.get("queue_id"))) == job:
+            validated.append(job)
+            continue
+        valid, errs = validate_queue_item(job)
+        if not valid:
+            logger.warning("Skipping invalid queue job during save: %s", errs)
+            continue
+        validated.append(job)
+    return validated
+
+
+def _virtual_groups_by_id(groups: Any) -> dict[str, dict[str, Any]]:
+    """Index virtual group entries by ``group_id``, dropping malformed ones."""
+    by_id: dict[str, dict[str, Any]] = {}
+    for group in groups or ():
+        if isinstance(group, Mapping) and group.get("group_id"):
+            by_id[str(group["group_id"])] = dict(group)
+    return by_id
+
+
+def _write_checkpoint_file(state_path: Path, data: dict[str, Any]) -> None:
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = state_path.with_suffix(state_path.suffix + ".tmp")
+    _QUEUE_CODEC.write_jsonl(temp_path, [data])
+
+    # Windows-safe atomic replace with retry
+    # On Windows, file locks can persist briefly after closing
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            if state_path.exists():
+                state_path.unlink()
+            temp_path.rename(state_path)
+            break  # Success
+        except (OSError, PermissionError) as e:
+            if attempt < max_retries - 1:
+                # Brief delay to allow file system to release lock
+                time.sleep(0.05)
+            else:
+                # Final attempt failed - use direct write fallback
+                logger.warning(f"Failed atomic rename after {max_retries} attempts, using direct write: {e}")
+                _QUEUE_CODEC.write_jsonl(state_path, [data])
+                if temp_path.exists():
+                    try:
+                        temp_path.unlink()
+                    except Exception:
+                        pass
+
+
+def _apply_journal_record(
+    order: list[str],
+    jobs: dict[str, dict[str, Any]],
+    flags: dict[str, bool],
+    record: Mapping[str, Any],
+    groups: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    """Apply one journal delta to an in-memory (order, jobs, flags, groups) view."""
+    op = record.get("op")
+    if op == "add":
+        job = record.get("job")
+        if not isinstance(job, Mapping):
+            return
+        queue_id = str(job.get("queue_id"))
+        if queue_id not in jobs:
+            order.append(queue_id)
+        jobs[queue_id] = dict(job)
+    elif op == "remove":
+        queue_id = str(record.get("queue_id"))
+        if jobs.pop(queue_id, None) is not None:
+            order.remove(queue_id)
+    elif op == "status":
+        job = jobs.get(str(record.get("queue_id")))
+        if job is not None:
+            job["status"] = record.get("status")
+    elif op == "update":
+        job = jobs.get(str(record.get("queue_id")))
+        if job is not None:
+            job.update(record.get("fields") or {})
+            for key in record.get("unset") or ():
+                job.pop(key, None)
+    elif op == "move":
+        queue_id = str(record.get("queue_id"))
+        if queue_id in jobs:
+            order.remove(queue_id)
+            order.insert(int(record.get("index") or 0), queue_id)
+    elif op == "order":
+        queue_ids = [str(qid) for qid in record.get("queue_ids") or [] if str(qid) in jobs]
+        seen = set(queue_ids)
+        order[:] = queue_ids + [qid for qid in order if qid not in seen]
+    elif op == "flags":
+        flags["auto_run_enabled"] = bool(record.get("auto_run_enabled", flags["auto_run_enabled"]))
+        flags["paused"] = bool(record.get("paused", flags["paused"]))
+    elif groups is None:
+        return
+    elif op == "group":
+        groups.update(_virtual_groups_by_id([record.get("group")]))
+    elif op == "group_update":
+        group = groups.get(str(record.get("group_id")))
+        if group is not None:
+            group.update(record.get("fields") or {})
+    elif op == "group_remove":
+        groups.pop(str(record.get("group_id")), None)
+
+
+def _single_move(current: list[str], target: list[str]) -> tuple[str, int] | None:
+    """Return (queue_id, index) if ``target`` is ``current`` with one entry moved."""
+    start = 0
+    while start < len(current) and current[start] == target[start]:
+        start += 1
+    end = len(current) - 1
+    while end > start and current[end] == target[end]:
+        end -= 1
+    if start >= end:
+        return None
+    if current[start + 1 : end + 1] == target[start:end] and current[start] == target[end]:
+        return current[start], end
+    if current[start:end] == target[start + 1 : end + 1] and current[end] == target[start]:
+        return current[end], start
+    return None
+
+
+_MISSING = object()
+
+
+class _QueueJournal:
+    """Checkpoint + journal writer for one queue state path.
+
+    Holds the last persisted state in memory so each save can be diffed into a
+    handful of journal records instead of rewriting every NJR snapshot.
+    """
+
+    def __init__(self, state_path: Path) -> None:
+        self.state_path = state_path
+        self.journal_path = get_queue_journal_path(state_path)
+        self.blob_store = get_config_blob_store(blob_store_dir_for(state_path))
+        self.blob_store.register_referrer(
+            os.path.abspath(state_path), partial(_iter_queue_state_records, state_path)
+        )
+        self._lock = threading.Lock()
+        self._journal_id: str | None = None
+        self._order: list[str] = []
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._flags = {"auto_run_enabled": False, "paused": False}
+        self._groups: dict[str, dict[str, Any]] = {}
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._checkpoint_bytes = 0
+        self._signature: tuple[Any, Any] | None = None
+        self._stats: dict[str, Any] = {
+            "saves": 0,
+            "noop_saves": 0,
+            "journal_appends": 0,
+            "journal_records_written": 0,
+            "journal_bytes_written": 0,
+            "checkpoint_writes": 0,
+            "checkpoint_bytes_written": 0,
+            "compactions": 0,
+            "write_seconds_total": 0.0,
+            "last_write_kind": None,
+            "last_write_bytes": 0,
+            "last_write_ms": None,
         }
 
-        temp_path = state_path.with_suffix(state_path.suffix + ".tmp")
-        _QUEUE_CODEC.write_jsonl(temp_path, [data])
-        
-        # Windows-safe atomic replace with retry
-        # On Windows, file locks can persist briefly after closing
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                if state_path.exists():
-                    state_path.unlink()
-                temp_path.rename(state_path)
-                break  # Success
-            except (OSError, PermissionError) as e:
-                if attempt < max_retries - 1:
-                    # Brief delay to allow file system to release lock
-                    time.sleep(0.05)
+    def reset(self) -> None:
+        with self._lock:
+            self._journal_id = None
+            self._signature = None
+
+    def adopt(
+        self,
+        journal_id: str,
+        snapshot: QueueSnapshotV1,
+        *,
+        journal_records: int,
+        journal_bytes: int,
+        checkpoint_bytes: int,
+    ) -> None:
+        """Take a freshly loaded state as the base for subsequent deltas."""
+        with self._lock:
+            self._set_state(
+                snapshot.jobs, snapshot.auto_run_enabled, snapshot.paused, snapshot.virtual_groups
+            )
+            self._journal_id = journal_id
+            self._journal_records = journal_records
+            self._journal_bytes = journal_bytes
+            self._checkpoint_bytes = checkpoint_bytes
+            self._signature = self._current_signature()
+
+    def save(self, snapshot: QueueSnapshotV1) -> bool:
+        with self._lock:
+            started = time.perf_counter()
+            known = self._jobs if self._journal_id is not None else None
+            jobs = _validated_jobs(list(snapshot.jobs), known)
+            auto_run_enabled = bool(snapshot.auto_run_enabled)
+            paused = bool(snapshot.paused)
+            groups = list(_virtual_groups_by_id(snapshot.virtual_groups).values())
+            self._stats["saves"] += 1
+
+            if self._journal_id is None or self._signature != self._current_signature():
+                written = self._write_checkpoint(jobs, auto_run_enabled, paused, groups)
+                kind = "checkpoint"
+            else:
+                records = self._diff(jobs, auto_run_enabled, paused, groups)
+                if not records:
+                    self._stats["noop_saves"] += 1
+                    return True
+                if self._should_compact(len(records)):
+                    written = self._write_checkpoint(jobs, auto_run_enabled, paused, groups)
+                    self._stats["compactions"] += 1
+                    kind = "compaction"
                 else:
-                    # Final attempt failed - use direct write fallback
-                    logger.warning(f"Failed atomic rename after {max_retries} attempts, using direct write: {e}")
-                    _QUEUE_CODEC.write_jsonl(state_path, [data])
-                    if temp_path.exists():
-                        try:
-                            temp_path.unlink()
-                        except Exception:
-                            pass
-
-        logger.debug("Saved queue state: %d jobs", len(validated_jobs))
+                    written = self._append(records)
+                    self._set_state(jobs, auto_run_enabled, paused, groups)
+                    kind = "journal"
+
+            elapsed = time.perf_counter() - started
+            self._stats["write_seconds_total"] += elapsed
+            self._stats["last_write_kind"] = kind
+            self._stats["last_write_bytes"] = written
+            self._stats["last_write_ms"] = round(elapsed * 1000.0, 3)
         logger.debug(
             "QUEUE_STATE_SAVED | Persisted queue state",
             extra={
-                "job_count": len(validated_jobs),
-                "auto_run": snapshot.auto_run_enabled,
-                "paused": snapshot.paused,
-                "path": str(state_path),
+                "job_count": len(jobs),
+                "auto_run": auto_run_enabled,
+                "paused": paused,
+                "path": str(self.state_path),
+                "write_kind": kind,
+                "bytes_written": written,
                 "subsystem": "queue_store_v2",
             },
         )
         return True
 
-    except Exception as e:  # pragma: no cover - defensive
-        logger.error("Failed to save queue state: %s", e)
-        return False
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            mutations = stats["saves"] - stats["noop_saves"]
+            bytes_written = stats["journal_bytes_written"] + stats["checkpoint_bytes_written"]
+            stats["avg_write_ms"] = (
+                round(stats["write_seconds_total"] / mutations * 1000.0, 3) if mutations else None
+            )
+            stats["avg_bytes_per_mutation"] = (
+                round(bytes_written / mutations, 1) if mutations else None
+            )
+            stats["write_seconds_total"] = round(stats["write_seconds_total"], 6)
+            stats["journal_records_pending"] = self._journal_records
+            stats["journal_bytes_pending"] = self._journal_bytes
+            stats["checkpoint_bytes"] = self._checkpoint_bytes
+            stats["job_count"] = len(self._order)
+            stats["path"] = str(self.state_path)
+            return stats
+
+    # ------------------------------------------------------------------
+    # Internals (must hold lock)
+    # ------------------------------------------------------------------
+
+    def _set_state(
+        self,
+        jobs: list[dict[str, Any]],
+        auto_run_enabled: bool,
+        paused: bool,
+        groups: list[dict[str, Any]],
+    ) -> None:
+        self._jobs = {str(job.get("queue_id")): job for job in jobs}
+        self._order = list(self._jobs)
+        self._flags = {"auto_run_enabled": bool(auto_run_enabled), "paused": bool(paused)}
+        self._groups = _virtual_groups_by_id(groups)
+
+    def _current_signature(self) -> tuple[Any, Any]:
+        return (_file_signature(self.state_path), _file_signature(self.journal_path))
+
+    def _should_compact(self, incoming: int) -> bool:
+        if self._journal_records + incoming > JOURNAL_COMPACT_MAX_RECORDS:
+            return True
+        return self._journal_bytes > max(JOURNAL_COMPACT_MIN_BYTES, self._checkpoint_bytes)
+
+    def _write_checkpoint(
+        self,
+        jobs: list[dict[str, Any]],
+        auto_run_enabled: bool,
+        paused: bool,
+        groups: list[dict[str, Any]],
+    ) -> int:
+        journal_id = uuid.uuid4().hex
+        blob_store = self._active_blob_store()
+        data = {
+            "jobs": [_dehydrate_queue_item(job, blob_store) for job in jobs],
+            "auto_run_enabled": auto_run_enabled,
+            "paused": paused,
+            "schema_version": SCHEMA_VERSION,
+            "journal_id": journal_id,
+            "virtual_groups": groups,
+        }
+        _write_checkpoint_file(self.state_path, data)
+        # Records tagged with the previous journal_id are ignored on replay, so a
+        # crash before this unlink cannot replay stale deltas onto the new checkpoint.
+        try:
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+        except OSError as exc:
+            logger.warning("Failed to truncate queue journal %s: %s", self.journal_path, exc)
+        self._set_state(jobs, auto_run_enabled, paused, groups)
+        self._journal_id = journal_id
+        self._journal_records = 0
+        self._journal_bytes = _file_size(self.journal_path)
+        self._checkpoint_bytes = _file_size(self.state_path)
+        self._signature = self._current_signature()
+        self._stats["checkpoint_writes"] += 1
+        self._stats["checkpoint_bytes_written"] += self._checkpoint_bytes
+        return self._checkpoint_bytes
+
+    def _active_blob_store(self) -> ConfigBlobStore | None:
+        return self.blob_store if is_config_blob_store_enabled() else None
+
+    def _append(self, records: list[dict[str, Any]]) -> int:
+        blob_store = self._active_blob_store()
+        if blob_store is not None:
+            records = [
+                {**record, "job": _dehydrate_queue_item(record["job"], blob_store)}
+                if record.get("op") == "add"
+                else record
+                for record in records
+            ]
+        payload = "".join(
+            json.dumps({"journal_id": self._journal_id, **record}, sort_keys=True, separators=(",", ":"))
+            + "\n"
+            for record in records
+        ).encode("utf-8")
+        if not _ends_with_newline(self.journal_path):
+            # A crash mid-append can leave a torn last line; start on a fresh one
+            # so the first new record is not glued to it and lost on replay.
+            payload = b"\n" + payload
+        with self.journal_path.open("ab") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._journal_records += len(records)
+        self._journal_bytes += len(payload)
+        self._signature = self._current_signature()
+        self._stats["journal_appends"] += 1
+        self._stats["journal_records_written"] += len(records)
+        self._stats["journal_bytes_written"] += len(payload)
+        return len(payload)
+
+    def _diff(
+        self,
+        jobs: list[dict[str, Any]],
+        auto_run_enabled: bool,
+        paused: bool,
+        groups: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        target_order = [str(job.get("queue_id")) for job in jobs]
+        target_ids = set(target_order)
+        for queue_id in self._order:
+            if queue_id not in target_ids:
+                records.append({"op": "remove", "queue_id": queue_id})
+        expected_order = [qid for qid in self._order if qid in target_ids]
+        for job in jobs:
+            queue_id = str(job.get("queue_id"))
+            previous = self._jobs.get(queue_id)
+            if previous is None:
+                records.append({"op": "add", "job": job})
+                expected_order.append(queue_id)
+                continue
+            if previous == job:
+                continue
+            if previous.get("njr_snapshot") != job.get("njr_snapshot"):
+                records.append({"op": "add", "job": job})
+                continue
+            fields = {
+                key: value
+                for key, value in job.items()
+                if previous.get(key, _MISSING) != value
+            }
+            unset = [key for key in previous if key not in job]
+            if set(fields) == {"status"} and not unset:
+                records.append({"op": "status", "queue_id": queue_id, "status": fields["status"]})
+            else:
+                records.append({"op": "update", "queue_id": queue_id, "fields": fields, "unset": unset})
+        if expected_order != target_order:
+            moved = _single_move(expected_order, target_order)
+            if moved is not None:
+                records.append({"op": "move", "queue_id": moved[0], "index": moved[1]})
+            else:
+                records.append({"op": "order", "queue_ids": target_order})
+        if (
+            auto_run_enabled != self._flags["auto_run_enabled"]
+            or paused != self._flags["paused"]
+        ):
+            records.append({"op": "flags", "auto_run_enabled": auto_run_enabled, "paused": paused})
+        target_groups = _virtual_groups_by_id(groups)
+        for group_id in self._groups:
+            if group_id not in target_groups:
+                records.append({"op": "group_remove", "group_id": group_id})
+        for group_id, group in target_groups.items():
+            previous = self._groups.get(group_id)
+            if previous == group:
+                continue
+            # The source spec is the bulky part; cursor moves only send counters.
+            if previous is None or set(previous) != set(group) or previous.get("source") != group.get("source"):
+                records.append({"op": "group", "group": group})
+            else:
+                fields = {key: value for key, value in group.items() if previous.get(key) != value}
+                records.append({"op": "group_update", "group_id": group_id, "fields": fields})
+        return records
+
+
+_JOURNALS: dict[str, _QueueJournal] = {}
+_JOURNALS_LOCK = threading.Lock()
+
+
+def _journal_for(state_path: Path) -> _QueueJournal:
+    key = os.path.abspath(state_path)
+    with _JOURNALS_LOCK:
+        journal = _JOURNALS.get(key)
+        if journal is None:
+            journal = _QueueJournal(Path(state_path))
+            _JOURNALS[key] = journal
+        return journal
 
 
 def delete_queue_snapshot(path: Path | str | None = None) -> bool:
@@ -242,9 +759,13 @@ def delete_queue_snapshot(path: Path | str | None = None) -> bool:
     state_path = Path(path) if path else get_queue_state_path()
 
     try:
+        _journal_for(state_path).reset()
         if state_path.exists():
             state_path.unlink()
             logger.info("Deleted queue state file: %s", state_path)
+        journal_path = get_queue_journal_path(state_path)
+        if journal_path.exists():
+            journal_path.unlink()
         return True
     except Exception as e:  # pragma: no cover - defensive
         logger.error("Failed to delete queue state: %s", e)
@@ -281,6 +802,8 @@ __all__ = [
     "save_queue_snapshot",
     "delete_queue_snapshot",
     "get_queue_state_path",
+    "get_queue_journal_path",
+    "get_queue_store_stats",
     "move_job_up",
     "move_job_down",
 ]
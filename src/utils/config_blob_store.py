@@ -0,0 +1,505 @@
+"""Content-addressed store for NJR config sub-documents.
+
+Queue snapshots and history lines each embed a full serialized
+NormalizedJobRecord. Across the variants of a prompt pack the ``config``,
+``stage_chain`` and ``config_layers`` sub-documents (and most of the NJR
+itself) are nearly identical, so writers can replace them with references
+into a blob store keyed by the SHA-256 of their canonical JSON (``canonical_json_bytes``/``sha256_hex`` from
+``src.utils.image_metadata``).
+
+A reference is a single-key, versioned envelope
+``{"$stablenew_blob": {"v": 1, "sha": <sha>}}``. A document that differs from
+a recently stored one by a few keys is written as that base plus a patch:
+``{"$stablenew_blob": {"v": 1, "sha": <sha>, "set": [[path, value], ...], "unset": [path, ...]}}``.
+Only that exact shape is treated as a reference, so user config that happens
+to contain a ``$``-prefixed key is left alone.
+
+Writers call ``ConfigBlobStore.dehydrate_snapshot`` right before serializing.
+Readers call ``hydrate_snapshot`` (``normalized_job_from_snapshot`` and the
+queue/history loaders already do), which returns a resolved copy using every
+store opened in this process and raises ``UnresolvedConfigBlobError`` rather
+than guessing when a blob is gone.
+
+Blobs are reclaimed by mark-and-sweep. Every file that stores refs into a
+directory registers a referrer (``ConfigBlobStore.register_referrer``) that
+yields its records; ``collect_garbage`` marks everything reachable from them,
+including refs nested inside other blobs, and deletes the rest. History
+compaction runs it after dropping superseded lines. Blobs written or referenced
+within ``BLOB_GC_GRACE_S`` are always kept, which covers records still queued
+for writing and files in the directory that this process never opened.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from src.utils.image_metadata import canonical_json_bytes, sha256_hex
+
+logger = logging.getLogger(__name__)
+
+BLOB_REF_KEY = "$stablenew_blob"
+BLOB_REF_VERSION = 1
+BLOB_DIR_NAME = "config_blobs"
+
+# Sub-documents smaller than this stay inline; a reference would not pay off.
+MIN_BLOB_BYTES = 256
+# Number of decoded blobs kept in memory for hydration.
+BLOB_CACHE_SIZE = 256
+# Blobs written or referenced more recently than this survive garbage collection.
+BLOB_GC_GRACE_S = 3600.0
+
+# Paths inside a snapshot whose sub-documents may be externalized, innermost
+# first: ``config``/``stage_chain`` become refs before the enclosing NJR is
+# itself stored, so a per-job NJR patch stays a few hundred bytes. Hydration
+# walks this list in reverse.
+_BLOB_FIELDS: tuple[tuple[str, ...], ...] = (
+    ("normalized_job", "config"),
+    ("normalized_job", "stage_chain"),
+    ("normalized_job",),
+    ("config_layers",),
+)
+
+
+class UnresolvedConfigBlobError(LookupError):
+    """A snapshot references a config blob that is missing or in an unknown format."""
+
+    def __init__(self, sha: str | None, field: str, reason: str) -> None:
+        super().__init__(f"Config blob {sha or '?'} for snapshot field {field} {reason}")
+        self.sha = sha
+        self.field = field
+
+
+def is_blob_ref(value: Any) -> bool:
+    """True for a ``{"$stablenew_blob": {...}}`` envelope (any version)."""
+    return (
+        isinstance(value, Mapping)
+        and len(value) == 1
+        and isinstance(value.get(BLOB_REF_KEY), Mapping)
+    )
+
+
+def blob_ref_sha(ref: Mapping[str, Any]) -> str | None:
+    """Return the base blob hash of a current-version reference, else None."""
+    envelope = ref.get(BLOB_REF_KEY) if isinstance(ref, Mapping) else None
+    if not isinstance(envelope, Mapping) or envelope.get("v") != BLOB_REF_VERSION:
+        return None
+    sha = envelope.get("sha")
+    return sha if isinstance(sha, str) else None
+
+
+def referenced_blob_shas(value: Any) -> set[str]:
+    """Return the base hashes of every current-version ref inside ``value``.
+
+    Refs carried in patch values are included; refs inside the blobs themselves
+    are not, since that needs the store (see ``ConfigBlobStore.collect_garbage``).
+    """
+    found: set[str] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if is_blob_ref(item):
+            sha = blob_ref_sha(item)
+            if sha is not None:
+                found.add(sha)
+            stack.extend(patched for _path, patched in item[BLOB_REF_KEY].get("set") or ())
+        elif isinstance(item, Mapping):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return found
+
+
+def _make_ref(
+    sha: str, sets: list[list[Any]] | None = None, unsets: list[list[str]] | None = None
+) -> dict[str, Any]:
+    envelope: dict[str, Any] = {"v": BLOB_REF_VERSION, "sha": sha}
+    if sets:
+        envelope["set"] = sets
+    if unsets:
+        envelope["unset"] = unsets
+    return {BLOB_REF_KEY: envelope}
+
+
+def blob_store_dir_for(path: str | Path) -> Path:
+    """Return the blob directory shared by files living next to ``path``."""
+    return Path(path).parent / BLOB_DIR_NAME
+
+
+def _clone(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+def _diff_paths(
+    base: Mapping[str, Any],
+    doc: Mapping[str, Any],
+    path: list[str],
+    sets: list[list[Any]],
+    unsets: list[list[str]],
+) -> None:
+    for key, value in doc.items():
+        if key not in base:
+            sets.append([path + [key], value])
+            continue
+        previous = base[key]
+        if isinstance(previous, dict) and isinstance(value, dict):
+            _diff_paths(previous, value, path + [key], sets, unsets)
+        elif previous != value:
+            sets.append([path + [key], value])
+    for key in base:
+        if key not in doc:
+            unsets.append(path + [key])
+
+
+def _apply_patch(doc: Any, sets: Any, unsets: Any) -> Any:
+    for path in unsets or ():
+        target = doc
+        for key in path[:-1]:
+            target = target.get(key) if isinstance(target, dict) else None
+        if isinstance(target, dict) and path:
+            target.pop(path[-1], None)
+    for path, value in sets or ():
+        target = doc
+        for key in path[:-1]:
+            child = target.get(key)
+            if not isinstance(child, dict):
+                child = {}
+                target[key] = child
+            target = child
+        if path:
+            target[path[-1]] = _clone(value)
+    return doc
+
+
+class ConfigBlobStore:
+    """Directory of canonical-JSON blobs named by their SHA-256."""
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root)
+        self._lock = threading.Lock()
+        self._gc_lock = threading.Lock()
+        self._known: set[str] = set()
+        # Last stored document per snapshot field, used as the base for patches.
+        self._bases: dict[tuple[str, ...], tuple[str, dict[str, Any]]] = {}
+        # Monotonic time each blob was last written or referenced by this process.
+        self._last_used: dict[str, float] = {}
+        self._referrers: dict[str, Callable[[], Iterable[Any]]] = {}
+        self._stats = {
+            "blobs_written": 0,
+            "blob_bytes_written": 0,
+            "refs_emitted": 0,
+            "patched_refs": 0,
+            "inline_bytes_replaced": 0,
+            "gc_runs": 0,
+            "blobs_collected": 0,
+            "blob_bytes_collected": 0,
+        }
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def blob_path(self, sha: str) -> Path:
+        return self._root / sha[:2] / f"{sha}.json"
+
+    def put(self, doc: Any) -> str:
+        """Store ``doc`` (if new) and return its content hash."""
+        raw = canonical_json_bytes(doc)
+        sha = sha256_hex(raw)
+        self._write_blob(sha, raw)
+        return sha
+
+    def load(self, sha: str) -> Any | None:
+        """Return the decoded blob, or None if it is missing or corrupt."""
+        path = self.blob_path(sha)
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+        if sha256_hex(raw) != sha:
+            logger.warning("Config blob %s failed its hash check; ignoring", path)
+            return None
+        with self._lock:
+            self._known.add(sha)
+        return json.loads(raw.decode("utf-8"))
+
+    def register_referrer(self, name: str, iter_records: Callable[[], Iterable[Any]]) -> None:
+        """Register a source of refs into this store, keyed by ``name`` (usually a path).
+
+        ``iter_records`` is called on every garbage collection and yields the
+        parsed records of one file; registering the same name again replaces it.
+        """
+        with self._lock:
+            self._referrers[name] = iter_records
+
+    def collect_garbage(self, *, grace_s: float | None = None) -> dict[str, int]:
+        """Delete blobs that no registered referrer can reach; return the counts.
+
+        ``grace_s`` defaults to ``BLOB_GC_GRACE_S``. Nothing is deleted if a
+        referrer fails, since its refs are then unknown.
+        """
+        if grace_s is None:
+            grace_s = BLOB_GC_GRACE_S
+        with self._gc_lock:
+            with self._lock:
+                referrers = list(self._referrers.items())
+                live = {base[0] for base in self._bases.values()}
+            pending: set[str] = set()
+            for name, iter_records in referrers:
+                try:
+                    for record in iter_records():
+                        pending |= referenced_blob_shas(record)
+                except Exception as exc:
+                    logger.warning("Skipping config blob GC: referrer %s failed: %s", name, exc)
+                    return {"blobs_collected": 0, "blob_bytes_collected": 0}
+            while pending:
+                sha = pending.pop()
+                if sha in live:
+                    continue
+                live.add(sha)
+                doc = self.load(sha)
+                if doc is not None:
+                    pending |= referenced_blob_shas(doc) - live
+            collected = 0
+            collected_bytes = 0
+            now = time.monotonic()
+            cutoff = time.time() - grace_s
+            for path in self._root.glob("*/*.json"):
+                sha = path.stem
+                if sha in live:
+                    continue
+                try:
+                    stat = path.stat()
+                    with self._lock:
+                        if now - self._last_used.get(sha, float("-inf")) < grace_s:
+                            continue
+                        if stat.st_mtime > cutoff:
+                            continue
+                        path.unlink()
+                        self._known.discard(sha)
+                        self._last_used.pop(sha, None)
+                except OSError:
+                    continue
+                collected += 1
+                collected_bytes += stat.st_size
+            with self._lock:
+                self._stats["gc_runs"] += 1
+                self._stats["blobs_collected"] += collected
+                self._stats["blob_bytes_collected"] += collected_bytes
+        if collected:
+            logger.info(
+                "Collected %s unreferenced config blobs (%s bytes) from %s",
+                collected,
+                collected_bytes,
+                self._root,
+            )
+        return {"blobs_collected": collected, "blob_bytes_collected": collected_bytes}
+
+    def dehydrate_snapshot(self, snapshot: Mapping[str, Any]) -> dict[str, Any]:
+        """Return a copy of ``snapshot`` with large sub-documents replaced by refs.
+
+        Only the containers along the replaced paths are copied; the caller's
+        snapshot is left untouched.
+        """
+        result = dict(snapshot)
+        for field_path in _BLOB_FIELDS:
+            parent = result
+            for key in field_path[:-1]:
+                child = parent.get(key)
+                if not isinstance(child, Mapping):
+                    parent = None
+                    break
+                if child is snapshot.get(key):
+                    child = dict(child)
+                    parent[key] = child
+                parent = child
+            if parent is None:
+                continue
+            name = field_path[-1]
+            value = parent.get(name)
+            if value is None or is_blob_ref(value) or not isinstance(value, (dict, list)):
+                continue
+            try:
+                parent[name] = self._ref_for(field_path, value)
+            except (TypeError, ValueError):
+                # Not JSON-serializable as-is; keep it inline.
+                continue
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["root"] = str(self._root)
+        return stats
+
+    def _ref_for(self, field_path: tuple[str, ...], doc: Any) -> Any:
+        raw = canonical_json_bytes(doc)
+        if len(raw) < MIN_BLOB_BYTES:
+            return doc
+        sha = sha256_hex(raw)
+        with self._lock:
+            base = self._bases.get(field_path)
+        ref = _make_ref(sha)
+        if base is not None and base[0] != sha and isinstance(doc, dict):
+            sets: list[list[Any]] = []
+            unsets: list[list[str]] = []
+            _diff_paths(base[1], doc, [], sets, unsets)
+            patch = _make_ref(base[0], sets, unsets)
+            if len(canonical_json_bytes(patch)) * 2 < len(raw):
+                with self._lock:
+                    self._last_used[base[0]] = time.monotonic()
+                    self._stats["refs_emitted"] += 1
+                    self._stats["patched_refs"] += 1
+                    self._stats["inline_bytes_replaced"] += len(raw)
+                return patch
+        self._write_blob(sha, raw)
+        with self._lock:
+            if isinstance(doc, dict):
+                self._bases[field_path] = (sha, _clone(doc))
+            self._stats["refs_emitted"] += 1
+            self._stats["inline_bytes_replaced"] += len(raw)
+        return ref
+
+    def _write_blob(self, sha: str, raw: bytes) -> None:
+        with self._lock:
+            self._last_used[sha] = time.monotonic()
+            if sha in self._known:
+                return
+        path = self.blob_path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            temp_path.write_bytes(raw)
+            os.replace(temp_path, path)
+            with self._lock:
+                self._stats["blobs_written"] += 1
+                self._stats["blob_bytes_written"] += len(raw)
+        with self._lock:
+            self._known.add(sha)
+
+
+_STORES: dict[str, ConfigBlobStore] = {}
+_STORES_LOCK = threading.Lock()
+_BLOB_CACHE: OrderedDict[str, Any] = OrderedDict()
+_BLOB_CACHE_LOCK = threading.Lock()
+
+
+def get_config_blob_store(root: str | Path) -> ConfigBlobStore:
+    """Return the process-wide store for ``root`` and register it for hydration."""
+    key = os.path.abspath(root)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = ConfigBlobStore(root)
+            _STORES[key] = store
+        return store
+
+
+def get_config_blob_stats() -> list[dict[str, Any]]:
+    """Return write counters for every store opened in this process (diagnostics)."""
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+    return [store.get_stats() for store in stores]
+
+
+def _resolve_blob(sha: str) -> Any | None:
+    with _BLOB_CACHE_LOCK:
+        if sha in _BLOB_CACHE:
+            _BLOB_CACHE.move_to_end(sha)
+            return _BLOB_CACHE[sha]
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+    for store in stores:
+        doc = store.load(sha)
+        if doc is not None:
+            with _BLOB_CACHE_LOCK:
+                _BLOB_CACHE[sha] = doc
+                while len(_BLOB_CACHE) > BLOB_CACHE_SIZE:
+                    _BLOB_CACHE.popitem(last=False)
+            return doc
+    return None
+
+
+def resolve_blob_ref(ref: Mapping[str, Any]) -> Any | None:
+    """Materialize one reference (base blob plus optional patch) as a fresh object.
+
+    Returns None when the blob is missing or the reference version is unknown.
+    """
+    sha = blob_ref_sha(ref)
+    base = _resolve_blob(sha) if sha is not None else None
+    if base is None:
+        return None
+    doc = _clone(base)
+    envelope = ref[BLOB_REF_KEY]
+    if isinstance(doc, dict) and (envelope.get("set") or envelope.get("unset")):
+        _apply_patch(doc, envelope.get("set"), envelope.get("unset"))
+    return doc
+
+
+def hydrate_snapshot(snapshot: Any) -> Any:
+    """Return a copy of ``snapshot`` with its blob references resolved.
+
+    Only the containers along resolved paths are copied; the caller's snapshot
+    is left untouched, and one without references is returned as is. Raises
+    ``UnresolvedConfigBlobError`` when a referenced blob is missing or the
+    reference uses an unknown version.
+    """
+    if not isinstance(snapshot, Mapping):
+        return snapshot
+    result: Any = snapshot
+    for field_path in reversed(_BLOB_FIELDS):
+        parent: Any = result
+        for key in field_path[:-1]:
+            parent = parent.get(key) if isinstance(parent, Mapping) else None
+        if not isinstance(parent, Mapping):
+            continue
+        name = field_path[-1]
+        value = parent.get(name)
+        if not is_blob_ref(value):
+            continue
+        field = ".".join(field_path)
+        sha = blob_ref_sha(value)
+        if sha is None:
+            raise UnresolvedConfigBlobError(
+                None, field, f"uses unsupported reference version {value[BLOB_REF_KEY].get('v')!r}"
+            )
+        doc = resolve_blob_ref(value)
+        if doc is None:
+            raise UnresolvedConfigBlobError(sha, field, "is missing or corrupt")
+        if result is snapshot:
+            result = dict(snapshot)
+        parent = result
+        for key in field_path[:-1]:
+            parent[key] = dict(parent[key])
+            parent = parent[key]
+        parent[name] = doc
+    return result
+
+
+__all__ = [
+    "BLOB_GC_GRACE_S",
+    "BLOB_REF_KEY",
+    "BLOB_REF_VERSION",
+    "ConfigBlobStore",
+    "UnresolvedConfigBlobError",
+    "blob_ref_sha",
+    "blob_store_dir_for",
+    "get_config_blob_stats",
+    "get_config_blob_store",
+    "hydrate_snapshot",
+    "is_blob_ref",
+    "referenced_blob_shas",
+    "resolve_blob_ref",
+]
@@ -16,7 +16,7 @@ from typing import Any
 
 from src.api.webui_process_manager import get_global_webui_process_manager
 from src.config.app_config import get_jsonl_log_config
-from src.services.queue_store_v2 import get_queue_state_path
+from src.services.queue_store_v2 import get_queue_journal_path, get_queue_state_path
 from src.utils.logger import InMemoryLogHandler
 from src.utils.process_inspector_v2 import (
     collect_gpu_snapshot,
@@ -393,6 +393,21 @@ def _include_queue_state(zf: zipfile.ZipFile) -> None:
         logger.debug("Failed to include queue state in diagnostics bundle", exc_info=True)
         return
     zf.writestr("runtime/queue_state.json", json.dumps(_anonymize(payload), indent=2))
+    journal_path = get_queue_journal_path(queue_state_path)
+    if not journal_path.exists():
+        return
+    records: list[Any] = []
+    try:
+        lines = journal_path.read_text(encoding="utf-8").splitlines()
+    except Exception:
+        logger.debug("Failed to include queue journal in diagnostics bundle", exc_info=True)
+        return
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    zf.writestr("runtime/queue_state_journal.json", json.dumps(_anonymize(records), indent=2))
 
 
 def _select_bundle_job_summary(job_snapshot: Mapping[str, Any] | None) -> dict[str, Any]:
@@ -6,6 +6,8 @@ import json
 import logging
 import os
 import re
+import threading
+from collections import OrderedDict
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Callable
@@ -21,6 +23,19 @@ from src.utils.prompt_templates import compose_prompt_text
 logger = logging.getLogger(__name__)
 
 
+def _build_image_metadata_kv(
+    image: Image.Image,
+    metadata_builder: Callable[[Image.Image], dict[str, str] | None] | None,
+) -> dict[str, str] | None:
+    if metadata_builder is None:
+        return None
+    try:
+        return metadata_builder(image) or None
+    except Exception as exc:
+        logger.debug("Failed to build inline image metadata: %s", exc)
+        return None
+
+
 def _build_inline_image_save_kwargs(
     image: Image.Image,
     output_path: Path,
@@ -28,25 +43,29 @@ def _build_inline_image_save_kwargs(
 ) -> tuple[dict[str, Any], dict[str, str] | None]:
     """Build save kwargs that embed metadata during the initial image write.
 
-    PNG is the dominant generation output path. Embedding its metadata inline
-    avoids a second open/save pass per image, which reduces same-process image
-    post-processing pressure while queue work is active.
+    Embedding metadata inline (PNG iTXt chunks, JPEG EXIF) avoids a second
+    open/save pass per image, which reduces same-process image post-processing
+    pressure while queue work is active.
     """
 
-    if metadata_builder is None:
-        return {}, None
-    try:
-        metadata_kv = metadata_builder(image)
-    except Exception as exc:
-        logger.debug("Failed to build inline image metadata: %s", exc)
-        return {}, None
+    metadata_kv = _build_image_metadata_kv(image, metadata_builder)
     if not metadata_kv:
         return {}, None
-    if output_path.suffix.lower() == ".png":
+    suffix = output_path.suffix.lower()
+    if suffix == ".png":
         info = PngImagePlugin.PngInfo()
         for key, value in metadata_kv.items():
             info.add_itxt(str(key), str(value), zip=False)
         return {"pnginfo": info}, metadata_kv
+    if suffix in {".jpg", ".jpeg"}:
+        from src.utils.image_metadata import apply_jpg_metadata_exif
+
+        try:
+            exif_kwargs = {"exif": apply_jpg_metadata_exif(Image.Exif(), metadata_kv)}
+        except Exception as exc:
+            logger.debug("Failed to build inline EXIF metadata: %s", exc)
+            return {}, metadata_kv
+        return exif_kwargs, metadata_kv
     return {}, metadata_kv
 
 
@@ -91,6 +110,17 @@ def save_image_from_base64(
         image_data = base64.b64decode(base64_str)
         with BytesIO(image_data) as image_buffer:
             with Image.open(image_buffer) as image:
+                if image.format == "PNG" and output_path.suffix.lower() == ".png":
+                    # PNG in, PNG out: keep the encoded bytes and splice the
+                    # metadata chunks in instead of decoding and re-compressing.
+                    from src.utils.image_metadata import splice_png_text_chunks
+
+                    metadata_kv = _build_image_metadata_kv(image, metadata_builder) or {}
+                    output_path.write_bytes(
+                        splice_png_text_chunks(image_data, metadata_kv, replace_existing_text=True)
+                    )
+                    logger.info(f"Saved image: {output_path.name}")
+                    return output_path
                 inline_save_kwargs, metadata_kv = _build_inline_image_save_kwargs(
                     image,
                     output_path,
@@ -111,10 +141,18 @@ def save_image_from_base64(
         return None
 
 
+# Formats WebUI decodes directly; their on-disk bytes are uploaded as-is.
+_WEBUI_PASSTHROUGH_FORMATS = frozenset({"PNG", "JPEG", "WEBP"})
+
+
 def load_image_to_base64(image_path: Path) -> str | None:
     """
     Load image and convert to base64.
 
+    WebUI-compatible files (PNG/JPEG/WebP) are encoded straight from their
+    on-disk bytes; only the header is parsed to validate the dimensions, so
+    there is no pixel decode or re-compression. Other formats are re-encoded.
+
     Args:
         image_path: Path to the image
 
@@ -122,34 +160,99 @@ def load_image_to_base64(image_path: Path) -> str | None:
         Base64 encoded image string
     """
     try:
-        with Image.open(image_path) as img:
-            # Log image dimensions and file size for diagnostics
+        image_path = Path(image_path)
+        image_bytes = image_path.read_bytes()
+        # Image.open only parses the header; pixels are decoded lazily.
+        with Image.open(BytesIO(image_bytes)) as img:
             img_width, img_height = img.size
-            file_size_mb = image_path.stat().st_size / (1024 * 1024)
-            
-            buffered = BytesIO()
-            img.save(buffered, format=img.format or "PNG")
-            base64_bytes = buffered.getvalue()
-            base64_size_mb = len(base64_bytes) / (1024 * 1024)
-            img_str = base64.b64encode(base64_bytes).decode("utf-8")
-            
-            # Warn if base64 payload is large (may cause timeouts)
-            if base64_size_mb > 10.0:
-                logger.warning(
-                    f"Large image loaded: {image_path.name} {img_width}×{img_height} "
-                    f"file={file_size_mb:.1f}MB base64={base64_size_mb:.1f}MB"
-                )
-            else:
-                logger.info(
-                    f"Loaded image: {image_path.name} {img_width}×{img_height} "
-                    f"base64={base64_size_mb:.1f}MB"
-                )
+            if img_width <= 0 or img_height <= 0:
+                raise ValueError(f"invalid image dimensions {img_width}x{img_height}")
+            if img.format not in _WEBUI_PASSTHROUGH_FORMATS:
+                buffered = BytesIO()
+                img.save(buffered, format=img.format or "PNG")
+                image_bytes = buffered.getvalue()
+        file_size_mb = len(image_bytes) / (1024 * 1024)
+        img_str = base64.b64encode(image_bytes).decode("utf-8")
+        base64_size_mb = len(img_str) / (1024 * 1024)
+
+        # Warn if base64 payload is large (may cause timeouts)
+        if base64_size_mb > 10.0:
+            logger.warning(
+                f"Large image loaded: {image_path.name} {img_width}×{img_height} "
+                f"file={file_size_mb:.1f}MB base64={base64_size_mb:.1f}MB"
+            )
+        else:
+            logger.info(
+                f"Loaded image: {image_path.name} {img_width}×{img_height} "
+                f"base64={base64_size_mb:.1f}MB"
+            )
         return img_str
     except Exception as e:
         logger.error(f"Failed to load image: {e}")
         return None
 
 
+class ImageBase64Cache:
+    """LRU of base64 image payloads bounded by total payload bytes.
+
+    Entries are keyed by path and stamped with the file's (size, mtime_ns), so a
+    rewritten file is reloaded instead of served stale.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: OrderedDict[str, tuple[tuple[int, int], str]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        image_path: Path,
+        loader: Callable[[Path], str | None] = load_image_to_base64,
+    ) -> str | None:
+        image_path = Path(image_path)
+        try:
+            stat = image_path.stat()
+        except OSError:
+            return loader(image_path)
+        key = str(image_path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                return entry[1]
+        encoded = loader(image_path)
+        if encoded is not None:
+            self._store(key, stamp, encoded)
+        return encoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _store(self, key: str, stamp: tuple[int, int], encoded: str) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous[1])
+            if len(encoded) > self.max_bytes:
+                return
+            self._entries[key] = (stamp, encoded)
+            self._total_bytes += len(encoded)
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+
 def read_text_file(file_path: Path) -> str | None:
     """
     Read text file with UTF-8 encoding.
@@ -488,9 +591,25 @@ def build_safe_image_name(
     return final_name
 
 
+# Output paths handed out by get_unique_output_path(reserve=True) whose image is
+# still queued on the artifact writer pool and therefore not on disk yet.
+_PENDING_OUTPUT_PATHS: set[str] = set()
+_PENDING_OUTPUT_LOCK = threading.Lock()
+
+
+def _output_path_key(path: Path | str) -> str:
+    return os.path.normcase(os.path.abspath(str(path)))
+
+
+def _output_path_taken(path: Path) -> bool:
+    return path.exists() or _output_path_key(path) in _PENDING_OUTPUT_PATHS
+
+
 def get_unique_output_path(
     base_path: Path,
-    max_attempts: int = 100
+    max_attempts: int = 100,
+    *,
+    reserve: bool = False,
 ) -> Path:
     """
     Ensure output path is unique by appending _copy1, _copy2, etc. if needed.
@@ -498,9 +617,14 @@ def get_unique_output_path(
     This failsafe prevents silent overwrites if filename generation somehow
     produces duplicates. Normal operation should never trigger this.
     
+    Paths reserved by an earlier ``reserve=True`` call count as taken until
+    ``release_output_path`` is called, so writes still queued on the artifact
+    writer pool cannot be given the same name.
+    
     Args:
         base_path: Desired output path
         max_attempts: Maximum collision resolution attempts
+        reserve: Reserve the returned path until ``release_output_path``
     
     Returns:
         Unique path that doesn't exist
@@ -513,7 +637,21 @@ def get_unique_output_path(
         unique = get_unique_output_path(path)
         # → Path("output/image_copy1.png")
     """
-    if not base_path.exists():
+    with _PENDING_OUTPUT_LOCK:
+        unique = _find_unique_output_path(base_path, max_attempts)
+        if reserve:
+            _PENDING_OUTPUT_PATHS.add(_output_path_key(unique))
+    return unique
+
+
+def release_output_path(path: Path | str) -> None:
+    """Drop a reservation made by ``get_unique_output_path(reserve=True)``."""
+    with _PENDING_OUTPUT_LOCK:
+        _PENDING_OUTPUT_PATHS.discard(_output_path_key(path))
+
+
+def _find_unique_output_path(base_path: Path, max_attempts: int) -> Path:
+    if not _output_path_taken(base_path):
         return base_path
     
     logger = logging.getLogger(__name__)
@@ -528,7 +666,7 @@ def get_unique_output_path(
     
     for i in range(1, max_attempts + 1):
         candidate = parent / f"{stem}_copy{i}{suffix}"
-        if not candidate.exists():
+        if not _output_path_taken(candidate):
             logger.warning("[COLLISION] Using unique filename: %s", candidate.name)
             return candidate
     
@@ -7,12 +7,18 @@ import gzip
 import json
 import logging
 import hashlib
+import os
+import shutil
+import struct
+import uuid
+import zlib
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
-from PIL import Image, PngImagePlugin
+from PIL import Image
 from src.pipeline.artifact_contract import artifact_manifest_payload
 
 logger = logging.getLogger(__name__)
@@ -186,27 +192,199 @@ def read_image_metadata(path: Path) -> dict[str, str]:
     return {}
 
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_TEXT_CHUNK_TYPES = frozenset({b"tEXt", b"iTXt", b"zTXt"})
+_PNG_IEND_CHUNK = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+
+
+@dataclass(frozen=True)
+class _PngChunk:
+    offset: int
+    length: int
+    chunk_type: bytes
+    keyword: str | None = None
+
+    @property
+    def end(self) -> int:
+        # 4-byte length + 4-byte type + data + 4-byte CRC
+        return self.offset + 12 + self.length
+
+
+def _png_text_keyword(data: bytes) -> str:
+    return data.split(b"\x00", 1)[0].decode("latin-1", errors="replace")
+
+
+def _scan_png_chunks(handle: BinaryIO) -> list[_PngChunk]:
+    """Return the chunk layout of a PNG, reading only headers and text keywords."""
+    handle.seek(0)
+    if handle.read(8) != PNG_SIGNATURE:
+        raise ValueError("not a PNG file")
+    chunks: list[_PngChunk] = []
+    offset = 8
+    while True:
+        header = handle.read(8)
+        if len(header) < 8:
+            raise ValueError("truncated PNG: missing IEND")
+        length, chunk_type = struct.unpack(">I4s", header)
+        keyword = None
+        if chunk_type in _PNG_TEXT_CHUNK_TYPES:
+            keyword = _png_text_keyword(handle.read(min(length, 80)))
+        chunks.append(_PngChunk(offset, length, chunk_type, keyword))
+        if chunk_type == b"IEND":
+            return chunks
+        offset += 12 + length
+        handle.seek(offset)
+
+
+def _build_png_itxt_chunk(key: str, value: str) -> bytes:
+    # keyword, NUL, compression flag/method (uncompressed), empty language tag and
+    # translated keyword, then UTF-8 text -- the layout PngInfo.add_itxt(zip=False) writes.
+    data = str(key).encode("latin-1") + b"\x00\x00\x00\x00\x00" + str(value).encode("utf-8")
+    body = b"iTXt" + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+
+def splice_png_text_chunks(
+    data: bytes,
+    kv: dict[str, str],
+    *,
+    replace_existing_text: bool = False,
+) -> bytes:
+    """Return PNG ``data`` with ``kv`` inserted as iTXt chunks before the first IDAT.
+
+    Existing text chunks for the same keys (or all text chunks when
+    ``replace_existing_text``) are dropped. Image data chunks are copied verbatim.
+    """
+    with BytesIO(data) as handle:
+        chunks = _scan_png_chunks(handle)
+    new_chunks = b"".join(_build_png_itxt_chunk(key, value) for key, value in kv.items())
+    parts = [PNG_SIGNATURE]
+    inserted = False
+    for chunk in chunks:
+        if chunk.keyword is not None and (replace_existing_text or chunk.keyword in kv):
+            continue
+        if not inserted and chunk.chunk_type in (b"IDAT", b"IEND"):
+            parts.append(new_chunks)
+            inserted = True
+        parts.append(data[chunk.offset : chunk.end])
+    return b"".join(parts)
+
+
+def _copy_png_prefix(source: BinaryIO, target: BinaryIO, length: int) -> None:
+    source.seek(0)
+    while length > 0:
+        block = source.read(min(length, 1 << 20))
+        if not block:
+            raise ValueError("truncated PNG while copying image data")
+        target.write(block)
+        length -= len(block)
+
+
 def write_png_metadata(path: Path, kv: dict[str, str]) -> bool:
+    """Set iTXt metadata on a PNG without decoding or re-encoding it.
+
+    Every call rewrites the whole file, so the cost is O(file size) in I/O.
+    A complete copy is built beside ``path``, fsynced and swapped in with
+    ``os.replace``, so a crash leaves either the old or the new image, never a
+    half-written tail; splicing in place would need a journal to get the same
+    guarantee. When every chunk being replaced lies after the image data (the
+    common case for repeated metadata updates), the bytes before the old text
+    chunks are copied to the new file in blocks and only the tail is rebuilt, so
+    memory stays bounded. Otherwise the whole file is read and spliced in memory.
+    """
+    temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
     try:
-        with Image.open(path) as img:
-            existing = read_png_metadata(path)
-            info = PngImagePlugin.PngInfo()
-            for key, value in existing.items():
-                if key in kv:
-                    continue
-                info.add_itxt(key, value, zip=False)
-            for key, value in kv.items():
-                info.add_itxt(key, value, zip=False)
-            temp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
-            img.save(temp_path, pnginfo=info)
-        temp_path.replace(path)
+        with open(path, "rb") as source, open(temp_path, "wb") as target:
+            chunks = _scan_png_chunks(source)
+            idat_ends = [chunk.end for chunk in chunks if chunk.chunk_type == b"IDAT"]
+            replaced = [chunk for chunk in chunks if chunk.keyword is not None and chunk.keyword in kv]
+            if idat_ends and all(chunk.offset >= idat_ends[-1] for chunk in replaced):
+                iend = chunks[-1]
+                tail_start = min((chunk.offset for chunk in replaced), default=iend.offset)
+                _copy_png_prefix(source, target, tail_start)
+                for chunk in chunks[:-1]:
+                    if chunk.offset < tail_start or chunk in replaced:
+                        continue
+                    source.seek(chunk.offset)
+                    target.write(source.read(chunk.end - chunk.offset))
+                target.write(b"".join(_build_png_itxt_chunk(key, value) for key, value in kv.items()))
+                target.write(_PNG_IEND_CHUNK)
+            else:
+                source.seek(0)
+                target.write(splice_png_text_chunks(source.read(), kv))
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temp_path, path)
         return True
     except Exception as exc:
         logger.debug("Failed to write PNG metadata for %s: %s", path, exc)
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
         return False
 
 
+def _decode_png_text_chunk(chunk_type: bytes, data: bytes) -> tuple[str, str] | None:
+    keyword, sep, rest = data.partition(b"\x00")
+    if not sep:
+        return None
+    key = keyword.decode("latin-1", errors="replace")
+    if chunk_type == b"tEXt":
+        return key, rest.decode("latin-1", errors="replace")
+    if chunk_type == b"zTXt":
+        # compression method byte (0 = zlib), then the compressed text
+        return key, zlib.decompress(rest[1:]).decode("latin-1", errors="replace")
+    # iTXt: compression flag, compression method, language tag NUL, translated keyword NUL, text
+    if len(rest) < 2:
+        return None
+    compressed = rest[0] == 1
+    _language, _, rest = rest[2:].partition(b"\x00")
+    _translated, _, text = rest.partition(b"\x00")
+    if compressed:
+        text = zlib.decompress(text)
+    return key, text.decode("utf-8", errors="replace")
+
+
+def read_png_text_chunks(path: Path) -> dict[str, str]:
+    """Read tEXt/zTXt/iTXt chunks without constructing a PIL image.
+
+    Only chunk headers are read for non-text chunks (image data is skipped
+    with seeks). Raises ``ValueError`` for files that are not PNGs and
+    ``OSError`` if the file cannot be read.
+    """
+    info: dict[str, str] = {}
+    with open(path, "rb") as handle:
+        if handle.read(8) != PNG_SIGNATURE:
+            raise ValueError("not a PNG file")
+        offset = 8
+        while True:
+            header = handle.read(8)
+            if len(header) < 8:
+                # Truncated file: keep what was read, as PIL does for text before IDAT.
+                return info
+            length, chunk_type = struct.unpack(">I4s", header)
+            if chunk_type == b"IEND":
+                return info
+            if chunk_type in _PNG_TEXT_CHUNK_TYPES:
+                data = handle.read(length)
+                try:
+                    decoded = _decode_png_text_chunk(chunk_type, data)
+                except zlib.error:
+                    decoded = None
+                if decoded is not None:
+                    info[decoded[0]] = decoded[1]
+            offset += 12 + length
+            handle.seek(offset)
+
+
 def read_png_metadata(path: Path) -> dict[str, str]:
+    try:
+        return read_png_text_chunks(path)
+    except ValueError:
+        pass  # e.g. a JPEG saved with a .png name; let PIL sniff the format
+    except Exception:
+        return {}
     try:
         with Image.open(path) as img:
             info: dict[str, str] = {}
@@ -228,30 +406,81 @@ def read_png_metadata(path: Path) -> dict[str, str]:
         return {}
 
 
+def apply_jpg_metadata_exif(exif: Image.Exif, kv: dict[str, str]) -> Image.Exif:
+    """Store ``kv`` in ``exif`` (UserComment payload plus public description tags)."""
+    payload = canonical_json_bytes(kv)
+    encoded = base64.b64encode(payload).decode("ascii")
+    exif[37510] = f"SNMETA:{encoded}".encode("ascii")
+    description = str(
+        kv.get(ImageMetadataContractV26.PUBLIC_KEY_PARAMETERS)
+        or kv.get(ImageMetadataContractV26.PUBLIC_KEY_DESCRIPTION)
+        or ""
+    ).strip()
+    software = str(kv.get(ImageMetadataContractV26.PUBLIC_KEY_SOFTWARE) or "StableNew").strip()
+    if description:
+        exif[270] = description
+    if software:
+        exif[305] = software
+    return exif
+
+
+def _jpg_header_segments(handle: BinaryIO) -> tuple[list[tuple[int, bytes]], int]:
+    """Return ``(marker, segment bytes)`` for the segments before SOS and the SOS offset."""
+    handle.seek(0)
+    if handle.read(2) != b"\xff\xd8":
+        raise ValueError("not a JPEG file")
+    segments: list[tuple[int, bytes]] = []
+    while True:
+        offset = handle.tell()
+        header = handle.read(4)
+        if len(header) < 4 or header[0] != 0xFF:
+            raise ValueError("malformed JPEG header")
+        marker = header[1]
+        if marker == 0xDA:
+            return segments, offset
+        (length,) = struct.unpack(">H", header[2:])
+        segments.append((marker, header + handle.read(length - 2)))
+
+
 def write_jpg_metadata(path: Path, kv: dict[str, str]) -> bool:
+    """Set EXIF metadata on a JPEG by replacing its APP1 segment.
+
+    The entropy-coded image data is copied byte-for-byte; the image is never
+    decoded or re-compressed. As with ``write_png_metadata`` the file is
+    rewritten to a temporary copy, fsynced and swapped in with ``os.replace``.
+    """
+    temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
     try:
-        payload = canonical_json_bytes(kv)
-        encoded = base64.b64encode(payload).decode("ascii")
-        comment = f"SNMETA:{encoded}".encode("ascii")
         with Image.open(path) as img:
-            exif = img.getexif()
-            exif[37510] = comment
-            description = str(
-                kv.get(ImageMetadataContractV26.PUBLIC_KEY_PARAMETERS)
-                or kv.get(ImageMetadataContractV26.PUBLIC_KEY_DESCRIPTION)
-                or ""
-            ).strip()
-            software = str(kv.get(ImageMetadataContractV26.PUBLIC_KEY_SOFTWARE) or "StableNew").strip()
-            if description:
-                exif[270] = description
-            if software:
-                exif[305] = software
-            temp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
-            img.save(temp_path, exif=exif)
-        temp_path.replace(path)
+            exif = apply_jpg_metadata_exif(img.getexif(), kv)
+        exif_bytes = exif.tobytes()
+        if len(exif_bytes) + 2 > 0xFFFF:
+            raise ValueError("EXIF data is too long")
+        app1 = b"\xff\xe1" + struct.pack(">H", len(exif_bytes) + 2) + exif_bytes
+        with open(path, "rb") as source:
+            segments, sos_offset = _jpg_header_segments(source)
+            kept = [
+                segment
+                for marker, segment in segments
+                if not (marker == 0xE1 and segment[4:10] == b"Exif\x00\x00")
+            ]
+            # JFIF requires APP0 to directly follow SOI.
+            insert_at = 1 if segments and segments[0][0] == 0xE0 else 0
+            kept.insert(insert_at, app1)
+            source.seek(sos_offset)
+            with open(temp_path, "wb") as target:
+                target.write(b"\xff\xd8" + b"".join(kept))
+                shutil.copyfileobj(source, target)
+                target.flush()
+                os.fsync(target.fileno())
+        os.replace(temp_path, path)
         return True
     except Exception as exc:
         logger.debug("Failed to write JPG metadata for %s: %s", path, exc)
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
         return False
 
 
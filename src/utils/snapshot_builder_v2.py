@@ -19,6 +19,7 @@ from src.pipeline.job_models_v2 import (
 from src.pipeline.config_contract_v26 import build_config_layers
 from src.pipeline.intent_artifact_contract import build_intent_artifact_contract
 from src.queue.job_model import Job
+from src.utils.config_blob_store import UnresolvedConfigBlobError, hydrate_snapshot
 
 SCHEMA_VERSION = "1.0"
 
@@ -378,6 +379,16 @@ def build_job_snapshot(
 
 
 def normalized_job_from_snapshot(snapshot: Mapping[str, Any]) -> NormalizedJobRecord | None:
+    """Rebuild an NJR from a snapshot, resolving any config blob references first.
+
+    Returns None when a referenced config blob cannot be resolved, rather than
+    rebuilding the job with default settings.
+    """
+    try:
+        snapshot = hydrate_snapshot(snapshot)
+    except UnresolvedConfigBlobError as exc:
+        logger.error("Cannot rebuild NJR from snapshot: %s", exc)
+        return None
     normalized = snapshot.get("normalized_job")
     legacy_snapshot_mode = False
     if isinstance(normalized, Mapping):
@@ -3,6 +3,7 @@
 from src.video.animatediff_backend import AnimateDiffVideoBackend
 from src.video.comfy_api_client import ComfyApiClient
 from src.video.comfy_dependency_probe import ComfyDependencyProbe, DependencyProbeResult
+from src.video.comfy_execution_stream import ComfyExecutionFailed, ComfyExecutionStream
 from src.video.comfy_healthcheck import ComfyHealthCheckTimeout, validate_comfy_health, wait_for_comfy_ready
 from src.video.comfy_process_manager import (
     ComfyProcessConfig,
@@ -51,6 +52,8 @@ __all__ = [
     "AnimateDiffVideoBackend",
     "ComfyApiClient",
     "ComfyDependencyProbe",
+    "ComfyExecutionFailed",
+    "ComfyExecutionStream",
     "ComfyHealthCheckTimeout",
     "ComfyProcessConfig",
     "ComfyProcessManager",
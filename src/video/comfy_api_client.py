@@ -5,6 +5,8 @@ from typing import Any
 
 import requests
 
+from src.video.comfy_execution_stream import ComfyExecutionStream
+
 
 class ComfyApiClient:
     def __init__(
@@ -45,6 +47,10 @@ class ComfyApiClient:
         path = f"/history/{normalized_prompt_id}" if normalized_prompt_id else "/history"
         return self._get_json(path, timeout=timeout)
 
+    def open_execution_stream(self, client_id: str, *, timeout: float = 5.0) -> ComfyExecutionStream:
+        """Connect to ``/ws`` for ``client_id``; open it before queueing the prompt."""
+        return ComfyExecutionStream.connect(self.base_url, client_id, timeout=timeout)
+
     def queue_prompt(self, payload: dict[str, Any], *, timeout: float = 30.0) -> dict[str, Any]:
         response = self._session.post(
             f"{self.base_url}/prompt",
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import ssl
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OP_CONTINUATION = 0x0
+_OP_TEXT = 0x1
+_OP_BINARY = 0x2
+_OP_CLOSE = 0x8
+_OP_PING = 0x9
+_OP_PONG = 0xA
+_MAX_HANDSHAKE_BYTES = 65536
+DEFAULT_IDLE_CHECK_SECONDS = 10.0
+
+
+class ComfyExecutionStreamError(RuntimeError):
+    """The /ws execution stream could not be opened or was lost."""
+
+
+class ComfyExecutionFailed(RuntimeError):
+    """Comfy reported an execution error or interruption for the tracked prompt."""
+
+
+@dataclass(frozen=True, slots=True)
+class ComfyExecutionEvent:
+    type: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def prompt_id(self) -> str:
+        return str(self.data.get("prompt_id") or "").strip()
+
+
+def websocket_url(base_url: str, client_id: str) -> str:
+    parts = urlsplit(str(base_url or "").rstrip("/"))
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    return f"{scheme}://{parts.netloc}{parts.path}/ws?clientId={client_id}"
+
+
+def _parse_frame(buffer: bytes | bytearray) -> tuple[bool, int, bytes, int] | None:
+    """Return (fin, opcode, payload, consumed) for the first complete frame in ``buffer``."""
+    if len(buffer) < 2:
+        return None
+    first, second = buffer[0], buffer[1]
+    length = second & 0x7F
+    offset = 2
+    if length == 126:
+        if len(buffer) < offset + 2:
+            return None
+        (length,) = struct.unpack("!H", bytes(buffer[offset : offset + 2]))
+        offset += 2
+    elif length == 127:
+        if len(buffer) < offset + 8:
+            return None
+        (length,) = struct.unpack("!Q", bytes(buffer[offset : offset + 8]))
+        offset += 8
+    mask = b""
+    if second & 0x80:
+        if len(buffer) < offset + 4:
+            return None
+        mask = bytes(buffer[offset : offset + 4])
+        offset += 4
+    if len(buffer) < offset + length:
+        return None
+    payload = bytes(buffer[offset : offset + length])
+    if mask:
+        payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+    return bool(first & 0x80), first & 0x0F, payload, offset + length
+
+
+def _encode_client_frame(opcode: int, payload: bytes) -> bytes:
+    mask = os.urandom(4)
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header.append(0x80 | length)
+    elif length < 65536:
+        header.append(0x80 | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(0x80 | 127)
+        header += struct.pack("!Q", length)
+    masked = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+    return bytes(header) + mask + masked
+
+
+class ComfyExecutionStream:
+    """Comfy ``/ws`` connection for one ``client_id`` yielding JSON execution events.
+
+    Only the subset of RFC 6455 Comfy uses is implemented: text and binary
+    messages (binary preview frames are skipped), ping/pong, and close.
+    """
+
+    def __init__(self, sock: socket.socket, *, initial: bytes = b"") -> None:
+        self._sock = sock
+        self._buffer = bytearray(initial)
+        self._fragments: list[bytes] = []
+        self._fragment_opcode = _OP_TEXT
+        self._closed = False
+
+    @classmethod
+    def connect(cls, base_url: str, client_id: str, *, timeout: float = 5.0) -> ComfyExecutionStream:
+        url = websocket_url(base_url, client_id)
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        host = parts.hostname or "127.0.0.1"
+        port = parts.port or (443 if secure else 80)
+        try:
+            sock = socket.create_connection((host, port), timeout=timeout)
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+            key = base64.b64encode(os.urandom(16)).decode("ascii")
+            request = (
+                f"GET {parts.path}?{parts.query} HTTP/1.1\r\n"
+                f"Host: {parts.netloc}\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n"
+            )
+            sock.sendall(request.encode("ascii"))
+            response = b""
+            while b"\r\n\r\n" not in response:
+                chunk = sock.recv(4096)
+                if not chunk or len(response) > _MAX_HANDSHAKE_BYTES:
+                    raise ComfyExecutionStreamError("Comfy /ws handshake closed early")
+                response += chunk
+        except OSError as exc:
+            raise ComfyExecutionStreamError(f"Comfy /ws unavailable: {exc}") from exc
+        head, _, rest = response.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = lines[0].split(" ")
+        headers = {
+            name.strip().lower(): value.strip()
+            for name, _, value in (line.partition(":") for line in lines[1:])
+        }
+        expected = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+        if len(status) < 2 or status[1] != "101" or headers.get("sec-websocket-accept") != expected:
+            sock.close()
+            raise ComfyExecutionStreamError(f"Comfy /ws handshake rejected: {lines[0]}")
+        return cls(sock, initial=rest)
+
+    def next_event(self, timeout: float) -> ComfyExecutionEvent | None:
+        """Return the next JSON event, or None when ``timeout`` passes without one."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            frame = _parse_frame(self._buffer)
+            if frame is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._recv(remaining)
+                continue
+            fin, opcode, payload, consumed = frame
+            del self._buffer[:consumed]
+            event = self._handle_frame(fin, opcode, payload)
+            if event is not None:
+                return event
+
+    def _recv(self, timeout: float) -> None:
+        if self._closed:
+            raise ComfyExecutionStreamError("Comfy /ws stream is closed")
+        try:
+            self._sock.settimeout(timeout)
+            chunk = self._sock.recv(65536)
+        except (socket.timeout, TimeoutError):
+            return
+        except OSError as exc:
+            self.close()
+            raise ComfyExecutionStreamError(f"Comfy /ws connection lost: {exc}") from exc
+        if not chunk:
+            self.close()
+            raise ComfyExecutionStreamError("Comfy /ws connection closed")
+        self._buffer += chunk
+
+    def _handle_frame(self, fin: bool, opcode: int, payload: bytes) -> ComfyExecutionEvent | None:
+        if opcode == _OP_PING:
+            self._send(_OP_PONG, payload)
+            return None
+        if opcode == _OP_PONG:
+            return None
+        if opcode == _OP_CLOSE:
+            self.close()
+            raise ComfyExecutionStreamError("Comfy /ws closed by server")
+        if opcode in (_OP_TEXT, _OP_BINARY):
+            self._fragment_opcode = opcode
+            self._fragments = [payload]
+        elif opcode == _OP_CONTINUATION:
+            self._fragments.append(payload)
+        else:
+            return None
+        if not fin:
+            return None
+        message = b"".join(self._fragments)
+        self._fragments = []
+        if self._fragment_opcode != _OP_TEXT:
+            return None  # latent preview images
+        try:
+            decoded = json.loads(message.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            return None
+        if not isinstance(decoded, dict):
+            return None
+        data = decoded.get("data")
+        return ComfyExecutionEvent(
+            type=str(decoded.get("type") or ""),
+            data=dict(data) if isinstance(data, dict) else {},
+        )
+
+    def _send(self, opcode: int, payload: bytes) -> None:
+        try:
+            self._sock.sendall(_encode_client_frame(opcode, payload))
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._send(_OP_CLOSE, struct.pack("!H", 1000))
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def __enter__(self) -> ComfyExecutionStream:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+@dataclass(slots=True)
+class ComfyPromptCompletion:
+    """What the stream reported for one prompt."""
+
+    prompt_id: str
+    outputs: dict[str, Any] = field(default_factory=dict)
+    cached_nodes: list[str] = field(default_factory=list)
+    started_at: float | None = None
+    # True when an idle check found the prompt finished without its completion event.
+    finished_off_stream: bool = False
+
+    def history_entry(self) -> dict[str, Any]:
+        return {
+            "outputs": dict(self.outputs),
+            "status": {"completed": True, "status_str": "success"},
+        }
+
+
+def wait_for_prompt_completion(
+    stream: ComfyExecutionStream,
+    prompt_id: str,
+    *,
+    timeout: float,
+    on_progress: Callable[[str, int, int], None] | None = None,
+    idle_check: Callable[[], bool] | None = None,
+    idle_interval: float = DEFAULT_IDLE_CHECK_SECONDS,
+) -> ComfyPromptCompletion:
+    """Follow ``stream`` until ``prompt_id`` finishes executing.
+
+    Completion is ``execution_success`` or the final ``executing`` event with
+    ``node: null``. ``on_progress(node, value, max)`` receives per-node
+    sampler progress.
+
+    An open socket can go quiet without ever delivering the completion event
+    (e.g. the server dropped this client id). After ``idle_interval`` seconds
+    without an event for the prompt, ``idle_check()`` is asked whether it has
+    finished anyway; if so the completion is returned with
+    ``finished_off_stream`` set and its outputs must be read from history.
+    """
+    completion = ComfyPromptCompletion(prompt_id=prompt_id)
+    deadline = time.monotonic() + timeout
+    idle_interval = max(0.1, idle_interval)
+    idle_deadline = time.monotonic() + idle_interval
+    while True:
+        now = time.monotonic()
+        remaining = deadline - now
+        if remaining <= 0:
+            raise TimeoutError(f"Timed out waiting for Comfy execution of prompt_id '{prompt_id}'")
+        if idle_check is not None and now >= idle_deadline:
+            if idle_check():
+                completion.finished_off_stream = True
+                return completion
+            idle_deadline = time.monotonic() + idle_interval
+            continue
+        wait = remaining if idle_check is None else min(remaining, idle_deadline - now)
+        event = stream.next_event(wait)
+        if event is None:
+            continue
+        if event.prompt_id and event.prompt_id != prompt_id:
+            continue
+        if event.prompt_id:
+            idle_deadline = time.monotonic() + idle_interval
+        if event.type == "progress" and event.prompt_id:
+            if on_progress is not None:
+                on_progress(
+                    str(event.data.get("node") or ""),
+                    int(event.data.get("value") or 0),
+                    int(event.data.get("max") or 0),
+                )
+        elif event.type == "execution_start" and event.prompt_id:
+            completion.started_at = time.time()
+        elif event.type == "execution_cached":
+            completion.cached_nodes.extend(str(node) for node in event.data.get("nodes") or [])
+        elif event.type == "executed" and event.prompt_id:
+            output = event.data.get("output")
+            if isinstance(output, dict):
+                completion.outputs[str(event.data.get("node"))] = output
+        elif event.type == "executing" and event.prompt_id and event.data.get("node") is None:
+            return completion
+        elif event.type == "execution_success" and event.prompt_id:
+            return completion
+        elif event.type in {"execution_error", "execution_interrupted"} and event.prompt_id:
+            message = str(event.data.get("exception_message") or event.type).strip()
+            raise ComfyExecutionFailed(f"Comfy prompt '{prompt_id}' failed: {message}")
+
+
+__all__ = [
+    "DEFAULT_IDLE_CHECK_SECONDS",
+    "ComfyExecutionEvent",
+    "ComfyExecutionFailed",
+    "ComfyExecutionStream",
+    "ComfyExecutionStreamError",
+    "ComfyPromptCompletion",
+    "wait_for_prompt_completion",
+    "websocket_url",
+]
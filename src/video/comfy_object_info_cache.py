@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from src.video.comfy_dependency_probe import ComfyDependencyProbe, DependencyProbeResult
+from src.video.workflow_contracts import WorkflowSpec
+
+DEFAULT_OBJECT_INFO_MAX_AGE_SECONDS = 900.0
+
+# system_stats fields that identify an install; free RAM/VRAM change per call.
+_SYSTEM_IDENTITY_FIELDS = ("os", "comfyui_version", "python_version", "pytorch_version", "embedded_python", "argv")
+_DEVICE_IDENTITY_FIELDS = ("name", "type", "index", "vram_total")
+
+
+def system_stats_fingerprint(system_stats: Mapping[str, Any]) -> str:
+    """Stable digest of the parts of ``/system_stats`` that identify a Comfy install."""
+    system = system_stats.get("system") if isinstance(system_stats.get("system"), Mapping) else {}
+    devices = system_stats.get("devices") if isinstance(system_stats.get("devices"), list) else []
+    identity = {
+        "system": {name: system.get(name) for name in _SYSTEM_IDENTITY_FIELDS},
+        "devices": [
+            {name: device.get(name) for name in _DEVICE_IDENTITY_FIELDS}
+            for device in devices
+            if isinstance(device, Mapping)
+        ],
+    }
+    encoded = json.dumps(identity, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+@dataclass(slots=True)
+class _InstanceEntry:
+    fingerprint: str
+    object_info: dict[str, Any]
+    fetched_at: float
+    verdicts: dict[tuple[str, str], DependencyProbeResult] = field(default_factory=dict)
+
+
+class ComfyObjectInfoCache:
+    """``/object_info`` payloads and workflow dependency verdicts per Comfy instance.
+
+    An instance is its base URL plus a ``/system_stats`` fingerprint, so a
+    different install answering on the same port is not served stale data.
+    ``ComfyProcessManager`` invalidates the base URL whenever it (re)starts or
+    stops the process; entries also expire after ``max_age_seconds`` for
+    externally managed instances. Clients without a string ``base_url`` bypass
+    the cache.
+    """
+
+    def __init__(self, *, max_age_seconds: float = DEFAULT_OBJECT_INFO_MAX_AGE_SECONDS) -> None:
+        self._max_age_seconds = max(0.0, float(max_age_seconds))
+        self._lock = threading.Lock()
+        self._entries: dict[str, _InstanceEntry] = {}
+        self._object_info_hits = 0
+        self._object_info_misses = 0
+        self._verdict_hits = 0
+        self._verdict_misses = 0
+        self._invalidations = 0
+        self._generation = 0
+
+    @staticmethod
+    def _base_url(client: Any) -> str | None:
+        base_url = getattr(client, "base_url", None)
+        if not isinstance(base_url, str) or not base_url.strip():
+            return None
+        return base_url.strip().rstrip("/")
+
+    @staticmethod
+    def _fingerprint(client: Any) -> str | None:
+        try:
+            stats = client.get_system_stats()
+        except Exception:
+            return None
+        if not isinstance(stats, Mapping):
+            return None
+        return system_stats_fingerprint(stats)
+
+    def _current_entry(self, base_url: str, fingerprint: str) -> _InstanceEntry | None:
+        entry = self._entries.get(base_url)
+        if entry is None or entry.fingerprint != fingerprint:
+            return None
+        if self._max_age_seconds and time.monotonic() - entry.fetched_at > self._max_age_seconds:
+            return None
+        return entry
+
+    def _entry_for(self, client: Any, *, refresh: bool = False) -> tuple[_InstanceEntry | None, bool]:
+        """Return (entry, fetched_now); (None, False) when the client cannot be cached."""
+        base_url = self._base_url(client)
+        if base_url is None:
+            return None, False
+        fingerprint = self._fingerprint(client)
+        if fingerprint is None:
+            return None, False
+        with self._lock:
+            entry = None if refresh else self._current_entry(base_url, fingerprint)
+            if entry is not None:
+                self._object_info_hits += 1
+                return entry, False
+            self._object_info_misses += 1
+            generation = self._generation
+        object_info = client.get_object_info()
+        entry = _InstanceEntry(
+            fingerprint=fingerprint,
+            object_info=dict(object_info or {}),
+            fetched_at=time.monotonic(),
+        )
+        with self._lock:
+            # A restart while fetching makes this payload suspect; use it once, do not keep it.
+            if generation == self._generation:
+                self._entries[base_url] = entry
+        return entry, True
+
+    def get_object_info(self, client: Any) -> dict[str, Any]:
+        entry, _ = self._entry_for(client)
+        if entry is None:
+            return client.get_object_info()
+        return entry.object_info
+
+    def probe_workflow(
+        self,
+        client: Any,
+        spec: WorkflowSpec,
+        *,
+        probe: ComfyDependencyProbe | None = None,
+    ) -> tuple[DependencyProbeResult, dict[str, Any]]:
+        """Return the dependency verdict for ``spec`` and the object info it was made from.
+
+        Ready verdicts are reused until the instance is invalidated. A missing
+        dependency is only reported from a freshly fetched payload, so nodes
+        installed since the last fetch are picked up without a manual refresh.
+        """
+        probe = probe or ComfyDependencyProbe(client)
+        entry, fetched = self._entry_for(client)
+        if entry is None:
+            object_info = client.get_object_info()
+            return probe.probe_workflow(spec, object_info=object_info), object_info
+        key = (spec.workflow_id, spec.workflow_version)
+        with self._lock:
+            verdict = entry.verdicts.get(key)
+            if verdict is not None and verdict.ready:
+                self._verdict_hits += 1
+                return verdict, entry.object_info
+            self._verdict_misses += 1
+        verdict = probe.probe_workflow(spec, object_info=entry.object_info)
+        if not verdict.ready and not fetched:
+            entry, _ = self._entry_for(client, refresh=True)
+            if entry is None:
+                object_info = client.get_object_info()
+                return probe.probe_workflow(spec, object_info=object_info), object_info
+            verdict = probe.probe_workflow(spec, object_info=entry.object_info)
+        with self._lock:
+            entry.verdicts[key] = verdict
+        return verdict, entry.object_info
+
+    def invalidate(self, base_url: str | None = None) -> None:
+        """Drop one instance (or everything when ``base_url`` is None)."""
+        with self._lock:
+            if base_url is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                dropped = 1 if self._entries.pop(str(base_url).strip().rstrip("/"), None) else 0
+            self._invalidations += dropped
+            self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._object_info_hits + self._object_info_misses
+            probes = self._verdict_hits + self._verdict_misses
+            return {
+                "instances": len(self._entries),
+                "object_info_hits": self._object_info_hits,
+                "object_info_misses": self._object_info_misses,
+                "object_info_hit_rate": (self._object_info_hits / lookups) if lookups else 0.0,
+                "verdict_hits": self._verdict_hits,
+                "verdict_misses": self._verdict_misses,
+                "verdict_hit_rate": (self._verdict_hits / probes) if probes else 0.0,
+                "invalidations": self._invalidations,
+            }
+
+
+_GLOBAL_OBJECT_INFO_CACHE = ComfyObjectInfoCache()
+
+
+def get_comfy_object_info_cache() -> ComfyObjectInfoCache:
+    return _GLOBAL_OBJECT_INFO_CACHE
+
+
+def invalidate_comfy_object_info(base_url: str | None = None) -> None:
+    _GLOBAL_OBJECT_INFO_CACHE.invalidate(base_url)
+
+
+__all__ = [
+    "ComfyObjectInfoCache",
+    "get_comfy_object_info_cache",
+    "invalidate_comfy_object_info",
+    "system_stats_fingerprint",
+]
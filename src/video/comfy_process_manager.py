@@ -11,6 +11,7 @@ from typing import Any
 
 from src.utils.config import ConfigManager
 from src.video.comfy_healthcheck import wait_for_comfy_ready
+from src.video.comfy_object_info_cache import invalidate_comfy_object_info
 
 
 @dataclass
@@ -88,6 +89,8 @@ class ComfyProcessManager:
 
         self._process = process
         self._stopped = False
+        # A fresh process may have a different set of custom nodes and models.
+        invalidate_comfy_object_info(self._configured_base_url())
         self._stdout_thread = self._start_output_thread(process.stdout, self._stdout_tail)
         self._stderr_thread = self._start_output_thread(process.stderr, self._stderr_tail)
         return process
@@ -109,6 +112,7 @@ class ComfyProcessManager:
                     pass
         self._process = None
         self._join_output_threads()
+        invalidate_comfy_object_info(self._configured_base_url())
         if _GLOBAL_COMFY_PROCESS_MANAGER is self:
             _GLOBAL_COMFY_PROCESS_MANAGER = None
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import logging
+import threading
 import time
 import uuid
 from copy import deepcopy
@@ -12,7 +14,14 @@ from src.video.video_artifact_helpers import build_video_artifact_bundle
 from src.video.container_metadata import write_video_container_metadata
 from src.video.comfy_api_client import ComfyApiClient
 from src.video.comfy_dependency_probe import ComfyDependencyProbe
+from src.video.comfy_execution_stream import (
+    DEFAULT_IDLE_CHECK_SECONDS,
+    ComfyExecutionStream,
+    ComfyExecutionStreamError,
+    wait_for_prompt_completion,
+)
 from src.video.comfy_healthcheck import wait_for_comfy_ready
+from src.video.comfy_object_info_cache import ComfyObjectInfoCache, get_comfy_object_info_cache
 from src.video.comfy_process_manager import (
     ComfyProcessManager,
     build_default_comfy_process_config,
@@ -29,6 +38,8 @@ from src.video.video_backend_types import (
 from src.video.workflow_compiler import WorkflowCompiler
 from src.video.workflow_registry import WorkflowRegistry, build_default_workflow_registry
 
+logger = logging.getLogger(__name__)
+
 
 def _format_missing_dependency_message(spec: Any, dependency_result: Any) -> str:
     missing_entries: list[str] = []
@@ -140,6 +151,7 @@ class ComfyWorkflowVideoBackend:
         supports_prompt_text=True,
         supports_negative_prompt=True,
         supports_multiple_anchors=True,
+        supports_pipelined_segments=True,
     )
 
     def __init__(
@@ -151,9 +163,11 @@ class ComfyWorkflowVideoBackend:
         dependency_probe: ComfyDependencyProbe | None = None,
         depth_map_resolver: DepthMapResolver | None = None,
         process_manager: ComfyProcessManager | None = None,
+        object_info_cache: ComfyObjectInfoCache | None = None,
         base_url: str = "http://127.0.0.1:8188",
         history_poll_interval: float = 0.5,
         history_timeout: float = 120.0,
+        stream_idle_check_interval: float = DEFAULT_IDLE_CHECK_SECONDS,
     ) -> None:
         self._workflow_registry = workflow_registry or build_default_workflow_registry()
         self._compiler = compiler or WorkflowCompiler()
@@ -161,10 +175,15 @@ class ComfyWorkflowVideoBackend:
         self._dependency_probe = dependency_probe
         self._depth_map_resolver = depth_map_resolver or DepthMapResolver()
         self._process_manager = process_manager
+        self._object_info_cache = object_info_cache or get_comfy_object_info_cache()
         self._managed_process_manager: ComfyProcessManager | None = None
         self._base_url = str(base_url or "http://127.0.0.1:8188").rstrip("/")
         self._history_poll_interval = max(history_poll_interval, 0.1)
         self._history_timeout = max(history_timeout, 5.0)
+        self._stream_idle_check_interval = max(stream_idle_check_interval, self._history_poll_interval)
+        # Pipelined sequence segments run execute() concurrently on one backend.
+        self._runtime_lock = threading.Lock()
+        self._progress_lock = threading.Lock()
 
     def execute(self, pipeline: Any, request: VideoExecutionRequest) -> VideoExecutionResult | None:
         stage_config = deepcopy(dict(request.stage_config or {}))
@@ -193,9 +212,11 @@ class ComfyWorkflowVideoBackend:
                 f"not '{self.backend_id}'"
             )
 
-        object_info = client.get_object_info()
-        probe = self._dependency_probe or ComfyDependencyProbe(client)
-        dependency_result = probe.probe_workflow(spec, object_info=object_info)
+        dependency_result, object_info = self._object_info_cache.probe_workflow(
+            client,
+            spec,
+            probe=self._dependency_probe,
+        )
         if not dependency_result.ready:
             raise RuntimeError(_format_missing_dependency_message(spec, dependency_result))
 
@@ -212,12 +233,27 @@ class ComfyWorkflowVideoBackend:
             client=client,
             object_info=object_info,
         )
-        queue_response = client.queue_prompt(queue_payload)
-        prompt_id = str(queue_response.get("prompt_id") or "").strip()
-        if not prompt_id:
-            raise RuntimeError("Comfy queue response did not include prompt_id")
-
-        history_entry = self._wait_for_history_entry(client, prompt_id=prompt_id)
+        # Subscribe before queueing so no execution event is missed.
+        stream = self._open_execution_stream(client, str(queue_payload.get("client_id") or ""))
+        execution_timing: dict[str, float | None] = {"queued_at": time.time(), "execution_started_at": None}
+        try:
+            queue_response = client.queue_prompt(queue_payload)
+            prompt_id = str(queue_response.get("prompt_id") or "").strip()
+            if not prompt_id:
+                raise RuntimeError("Comfy queue response did not include prompt_id")
+
+            history_entry = self._wait_for_prompt_result(
+                client,
+                stream,
+                prompt_id=prompt_id,
+                pipeline=pipeline,
+                request=request,
+                timing=execution_timing,
+            )
+            execution_timing["execution_completed_at"] = time.time()
+        finally:
+            if stream is not None:
+                stream.close()
         resolved_outputs = self._resolve_output_paths(
             history_entry=history_entry,
             compiled_outputs=compiled.compiled_outputs,
@@ -229,6 +265,7 @@ class ComfyWorkflowVideoBackend:
                 output_dir=request.output_dir,
                 runtime_block=secondary_motion_block,
                 fps=int(stage_config.get("fps") or stage_config.get("video_fps") or 8),
+                cancel_token=request.cancel_token,
             )
             motion_summary = motion_result.get("secondary_motion_summary") or extract_secondary_motion_summary(motion_result)
             resolved_outputs.update(
@@ -375,6 +412,7 @@ class ComfyWorkflowVideoBackend:
                 "compiled_inputs": dict(compiled.compiled_inputs),
                 "compiled_outputs": dict(compiled.compiled_outputs),
                 "conditioning": dict(conditioning),
+                "execution_timing": {**execution_timing, "finished_at": time.time()},
             },
             diagnostic_payload={
                 "queue_response": dict(queue_response),
@@ -491,6 +529,10 @@ class ComfyWorkflowVideoBackend:
         return result
 
     def _ensure_runtime_ready(self) -> str:
+        with self._runtime_lock:
+            return self._ensure_runtime_ready_locked()
+
+    def _ensure_runtime_ready_locked(self) -> str:
         manager = (
             self._process_manager
             or self._managed_process_manager
@@ -547,10 +589,17 @@ class ComfyWorkflowVideoBackend:
         }
         return {
             "prompt": dict(prompt_payload),
-            "client_id": str(request.job_id or f"stablenew-{uuid.uuid4().hex}"),
+            "client_id": self._execution_client_id(request),
             "extra_data": extra_data,
         }
 
+    @staticmethod
+    def _execution_client_id(request: VideoExecutionRequest) -> str:
+        # Comfy keeps one /ws socket per clientId and drops the older one, so
+        # every execute() call (e.g. concurrent segments of one job) needs its own.
+        suffix = uuid.uuid4().hex[:12]
+        return f"{request.job_id}-{suffix}" if request.job_id else f"stablenew-{suffix}"
+
     def _normalize_prompt_payload_for_comfy(
         self,
         prompt_payload: Mapping[str, Any],
@@ -656,13 +705,109 @@ class ComfyWorkflowVideoBackend:
         uploaded_cache[cache_key] = relative_name
         return relative_name
 
+    @staticmethod
+    def _open_execution_stream(client: ComfyApiClient, client_id: str) -> ComfyExecutionStream | None:
+        opener = getattr(client, "open_execution_stream", None)
+        if not client_id or not callable(opener):
+            return None
+        try:
+            stream = opener(client_id)
+        except Exception as exc:
+            logger.info("Comfy /ws unavailable (%s); falling back to /history polling", exc)
+            return None
+        return stream if isinstance(stream, ComfyExecutionStream) else None
+
+    def _wait_for_prompt_result(
+        self,
+        client: ComfyApiClient,
+        stream: ComfyExecutionStream | None,
+        *,
+        prompt_id: str,
+        pipeline: Any,
+        request: VideoExecutionRequest,
+        timing: dict[str, float | None] | None = None,
+    ) -> dict[str, Any]:
+        if stream is None:
+            return self._wait_for_history_entry(client, prompt_id=prompt_id)
+        started = time.monotonic()
+
+        def _on_progress(node: str, value: int, maximum: int) -> None:
+            self._forward_node_progress(pipeline, request, node, value, maximum)
+
+        try:
+            completion = wait_for_prompt_completion(
+                stream,
+                prompt_id,
+                timeout=self._history_timeout,
+                on_progress=_on_progress,
+                idle_check=lambda: self._history_entry_ready(client, prompt_id),
+                idle_interval=self._stream_idle_check_interval,
+            )
+        except ComfyExecutionStreamError as exc:
+            logger.warning(
+                "Comfy /ws lost while waiting for prompt %s (%s); falling back to /history polling",
+                prompt_id,
+                exc,
+            )
+            remaining = self._history_timeout - (time.monotonic() - started)
+            return self._wait_for_history_entry(client, prompt_id=prompt_id, timeout=remaining)
+        if timing is not None:
+            timing["execution_started_at"] = completion.started_at
+        if completion.finished_off_stream:
+            logger.warning(
+                "Comfy /ws went quiet for prompt %s but /history shows it finished; using /history",
+                prompt_id,
+            )
+        # Cached output nodes are not re-announced with ``executed``; read their
+        # outputs from history, which is written right after completion.
+        elif completion.outputs and not completion.cached_nodes:
+            return completion.history_entry()
+        return self._wait_for_history_entry(client, prompt_id=prompt_id)
+
+    @staticmethod
+    def _history_entry_ready(client: ComfyApiClient, prompt_id: str) -> bool:
+        """One /history probe used while the /ws stream is idle."""
+        try:
+            payload = client.get_history(prompt_id)
+        except Exception:
+            logger.debug("Comfy /history probe failed for prompt %s", prompt_id, exc_info=True)
+            return False
+        entry = _history_entry_from_payload(dict(payload or {}), prompt_id)
+        return bool(entry and _history_ready(entry))
+
+    def _forward_node_progress(
+        self,
+        pipeline: Any,
+        request: VideoExecutionRequest,
+        node: str,
+        value: int,
+        maximum: int,
+    ) -> None:
+        emit = getattr(pipeline, "_emit_stage_detail_update", None)
+        if not callable(emit) or maximum <= 0:
+            return
+        try:
+            with self._progress_lock:
+                emit(
+                    stage_name=request.stage_name,
+                    stage_detail=f"comfy node {node}" if node else "comfy",
+                    progress=min(1.0, value / maximum),
+                    current_step=value,
+                    total_steps=maximum,
+                )
+        except Exception:
+            logger.debug("Comfy progress forwarding failed", exc_info=True)
+
     def _wait_for_history_entry(
         self,
         client: ComfyApiClient,
         *,
         prompt_id: str,
+        timeout: float | None = None,
     ) -> dict[str, Any]:
-        deadline = time.time() + self._history_timeout
+        deadline = time.time() + (
+            self._history_timeout if timeout is None else max(timeout, self._history_poll_interval)
+        )
         last_payload: dict[str, Any] | None = None
         while time.time() < deadline:
             payload = client.get_history(prompt_id)
@@ -9,8 +9,16 @@ from PIL import Image
 
 from .secondary_motion_models import SecondaryMotionIntent, SecondaryMotionPolicy
 
+try:  # pragma: no cover - import availability is environment-dependent
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
 
 SECONDARY_MOTION_APPLY_SCHEMA_V1 = "stablenew.secondary-motion-apply.v1"
+# Frames stacked per (T, H, W, C) block; bounds the batched engine's scratch memory.
+DEFAULT_SECONDARY_MOTION_CHUNK_FRAMES = 32
+_BATCHED_MODES = frozenset({"RGB", "RGBA", "L"})
 
 
 @dataclass(frozen=True, slots=True)
@@ -73,6 +81,75 @@ def _compute_offsets(
     return max(-cap, min(cap, dx)), max(-cap, min(cap, dy))
 
 
+def _compute_offsets_batch(
+    *,
+    count: int,
+    seed: int,
+    policy: SecondaryMotionPolicy,
+) -> tuple[Any, Any]:
+    """``_compute_offsets`` for frames ``0..count-1`` as two int arrays (dx, dy)."""
+    cap = max(0, int(policy.cap_pixels))
+    if cap <= 0:
+        zeros = np.zeros(count, dtype=np.int64)
+        return zeros, zeros.copy()
+    indices = np.arange(count, dtype=np.float64)
+    amplitude = min(float(cap), max(0.0, float(cap) * float(policy.intensity)))
+    amplitudes = amplitude * max(0.0, min(1.0, float(policy.damping))) ** indices
+    phases = ((seed % 360) + indices + 1) * max(0.05, float(policy.frequency_hz) or 0.05)
+    dx = np.rint(np.sin(phases) * amplitudes)
+    dy = np.rint(np.cos(phases * 0.5) * np.minimum(amplitudes * 0.35, cap))
+    return np.clip(dx, -cap, cap).astype(np.int64), np.clip(dy, -cap, cap).astype(np.int64)
+
+
+def _translate_clip(clip: Any, dx: Any, dy: Any) -> Any:
+    """Shift each frame of a (T, H, W[, C]) uint8 clip by whole pixels, filling with zeros.
+
+    Frames that share an offset are copied together with one slice assignment.
+    """
+    shifted = np.zeros_like(clip)
+    height, width = clip.shape[1], clip.shape[2]
+    for shift_x, shift_y in np.unique(np.stack([dx, dy], axis=1), axis=0):
+        shift_x, shift_y = int(shift_x), int(shift_y)
+        if abs(shift_x) >= width or abs(shift_y) >= height:
+            continue
+        selected = np.flatnonzero((dx == shift_x) & (dy == shift_y))
+        shifted[
+            selected,
+            max(0, shift_y) : height + min(0, shift_y),
+            max(0, shift_x) : width + min(0, shift_x),
+        ] = clip[
+            selected,
+            max(0, -shift_y) : height - max(0, shift_y),
+            max(0, -shift_x) : width - max(0, shift_x),
+        ]
+    return shifted
+
+
+def _can_translate_batched(frames: list[Image.Image]) -> bool:
+    if np is None:
+        return False
+    first = frames[0]
+    return first.mode in _BATCHED_MODES and all(
+        frame.mode == first.mode and frame.size == first.size for frame in frames
+    )
+
+
+def _translate_frames_batched(
+    frames: list[Image.Image],
+    dx: Any,
+    dy: Any,
+    *,
+    chunk_frames: int,
+) -> list[Image.Image]:
+    chunk = max(1, int(chunk_frames))
+    output_frames: list[Image.Image] = []
+    for start in range(0, len(frames), chunk):
+        clip = np.stack([np.asarray(frame) for frame in frames[start : start + chunk]])
+        shifted = _translate_clip(clip, dx[start : start + chunk], dy[start : start + chunk])
+        output_frames.extend(Image.fromarray(frame) for frame in shifted)
+    return output_frames
+
+
 def _translate_frame(frame: Image.Image, dx: int, dy: int) -> Image.Image:
     rgba = frame.convert("RGBA")
     shifted = rgba.transform(
@@ -91,7 +168,16 @@ def apply_secondary_motion_to_frames(
     policy: SecondaryMotionPolicy,
     intent: SecondaryMotionIntent | None = None,
     seed: int | None = None,
+    chunk_frames: int = DEFAULT_SECONDARY_MOTION_CHUNK_FRAMES,
 ) -> tuple[list[Image.Image], SecondaryMotionApplyResult]:
+    """Translate ``frames`` by the policy's damped sway offsets.
+
+    Same-size RGB, RGBA and L clips are shifted as stacked uint8 arrays,
+    ``chunk_frames`` at a time. Offsets are whole pixels, so this matches the
+    per-frame PIL path exactly except for translucent RGBA pixels, whose
+    colour the PIL path rounds through premultiplied alpha (alpha is
+    identical). Other modes, mixed sizes, or a missing numpy use the PIL path.
+    """
     motion_intent = intent or SecondaryMotionIntent()
     frames_in = len(frames)
     resolved_seed = _derive_seed(seed if seed is not None else motion_intent.seed, policy)
@@ -157,11 +243,17 @@ def apply_secondary_motion_to_frames(
     output_frames: list[Image.Image] = []
     dx_values: list[int] = []
     dy_values: list[int] = []
-    for index, frame in enumerate(frames):
-        dx, dy = _compute_offsets(index=index, seed=resolved_seed, policy=policy)
-        dx_values.append(dx)
-        dy_values.append(dy)
-        output_frames.append(_translate_frame(frame, dx, dy))
+    if _can_translate_batched(frames):
+        dx_array, dy_array = _compute_offsets_batch(count=frames_in, seed=resolved_seed, policy=policy)
+        output_frames = _translate_frames_batched(frames, dx_array, dy_array, chunk_frames=chunk_frames)
+        dx_values = [int(value) for value in dx_array]
+        dy_values = [int(value) for value in dy_array]
+    else:
+        for index, frame in enumerate(frames):
+            dx, dy = _compute_offsets(index=index, seed=resolved_seed, policy=policy)
+            dx_values.append(dx)
+            dy_values.append(dy)
+            output_frames.append(_translate_frame(frame, dx, dy))
 
     applied_count = sum(1 for dx, dy in zip(dx_values, dy_values) if dx or dy)
     metrics = {
@@ -190,6 +282,7 @@ def apply_secondary_motion_to_frames(
 
 
 __all__ = [
+    "DEFAULT_SECONDARY_MOTION_CHUNK_FRAMES",
     "SECONDARY_MOTION_APPLY_SCHEMA_V1",
     "SecondaryMotionApplyResult",
     "apply_secondary_motion_to_frames",
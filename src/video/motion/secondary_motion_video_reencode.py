@@ -1,39 +1,34 @@
 from __future__ import annotations
 
-import subprocess
 from pathlib import Path
 from typing import Any, Mapping
 
-from src.pipeline.video import resolve_ffmpeg_executable
+from PIL import Image
+
+from src.pipeline.video import FFmpegPipeError, decode_video_frames, resolve_ffmpeg_executable
 from src.video.motion.secondary_motion_engine import SECONDARY_MOTION_APPLY_SCHEMA_V1
 from src.video.motion.secondary_motion_provenance import (
     build_secondary_motion_manifest_block,
     extract_secondary_motion_summary,
 )
-from src.video.motion.secondary_motion_worker import run_secondary_motion_worker
+from src.video.motion.secondary_motion_worker import run_secondary_motion_on_frames
 from src.video.svd_errors import SVDExportError
-from src.video.video_export import export_image_sequence_video
+from src.video.video_export import export_video_mp4
+
+# Frames travel decode -> sway -> encode through FFmpeg pipes in this process,
+# so this path gets its own label rather than the on-disk worker's
+# ``frame_directory_worker``; learning stratifies on it.
+VIDEO_REENCODE_APPLICATION_PATH = "video_reencode_pipe"
 
 
-def _extract_video_frames(*, video_path: Path, output_dir: Path) -> list[Path]:
+def _extract_video_frames(*, video_path: Path, cancel_token: Any = None) -> list[Image.Image]:
     ffmpeg_executable = resolve_ffmpeg_executable()
     if ffmpeg_executable is None:
         raise SVDExportError("FFmpeg is not available for secondary motion re-encode")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_pattern = output_dir / "frame_%06d.png"
-    cmd = [
-        str(ffmpeg_executable),
-        "-i",
-        str(video_path),
-        "-vsync",
-        "0",
-        "-y",
-        str(output_pattern),
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-    if result.returncode != 0:
-        raise SVDExportError(f"FFmpeg failed to extract video frames: {result.stderr}")
-    return sorted(output_dir.glob("frame_*.png"))
+    try:
+        return decode_video_frames(video_path, ffmpeg_executable=ffmpeg_executable, cancel_token=cancel_token)
+    except FFmpegPipeError as exc:
+        raise SVDExportError(f"FFmpeg failed to extract video frames: {exc}") from exc
 
 
 def _build_unavailable_result(
@@ -50,7 +45,7 @@ def _build_unavailable_result(
         "schema": SECONDARY_MOTION_APPLY_SCHEMA_V1,
         "status": "unavailable",
         "policy_id": str(payload.get("policy_id") or ""),
-        "application_path": "video_reencode_worker",
+        "application_path": VIDEO_REENCODE_APPLICATION_PATH,
         "backend_mode": str(payload.get("backend_mode") or ""),
         "frames_in": frames_in,
         "frames_out": frames_out,
@@ -87,16 +82,22 @@ def apply_secondary_motion_to_video(
     output_dir: str | Path,
     runtime_block: Mapping[str, Any],
     fps: int,
+    cancel_token: Any = None,
 ) -> dict[str, Any]:
+    """Decode, sway, and re-encode ``video_path`` entirely in memory.
+
+    Frames are piped through FFmpeg as raw pixels; the only image written to
+    disk is the promoted clip's thumbnail. ``frame_paths`` is therefore always
+    empty, and consumers should read ``video_path`` (or ``thumbnail_path`` for
+    a still) instead.
+    """
     payload = dict(runtime_block or {}) if isinstance(runtime_block, Mapping) else {}
     source_video_path = Path(video_path)
     root = Path(output_dir)
-    work_dir = root / f"{source_video_path.stem}_secondary_motion"
-    extracted_dir = work_dir / "extracted_frames"
-    motion_dir = work_dir / "motion_frames"
     promoted_video_path = root / f"{source_video_path.stem}_secondary_motion.mp4"
+    thumbnail_path = root / f"{source_video_path.stem}_secondary_motion_thumbnail.png"
     try:
-        extracted_frames = _extract_video_frames(video_path=source_video_path, output_dir=extracted_dir)
+        extracted_frames = _extract_video_frames(video_path=source_video_path, cancel_token=cancel_token)
     except Exception as exc:
         skip_reason = "ffmpeg_unavailable"
         if not isinstance(exc, SVDExportError) or "ffmpeg is not available" not in str(exc).lower():
@@ -117,14 +118,13 @@ def apply_secondary_motion_to_video(
             error=SVDExportError("Secondary motion re-encode could not extract any frames"),
         )
     try:
-        apply_result = run_secondary_motion_worker(
+        motion_frames, apply_result = run_secondary_motion_on_frames(
+            extracted_frames,
             {
-                "input_dir": str(extracted_dir),
-                "output_dir": str(motion_dir),
                 "intent": dict(payload.get("intent") or {}),
                 "policy": dict(payload.get("policy") or {}),
                 "seed": payload.get("seed"),
-            }
+            },
         )
     except Exception as exc:
         return _build_unavailable_result(
@@ -135,8 +135,7 @@ def apply_secondary_motion_to_video(
             error=exc,
             frames_in=len(extracted_frames),
         )
-    output_frame_paths = [Path(path) for path in apply_result.get("output_paths") or []]
-    if not output_frame_paths:
+    if not motion_frames:
         return _build_unavailable_result(
             payload=payload,
             source_video_path=source_video_path,
@@ -146,11 +145,13 @@ def apply_secondary_motion_to_video(
             frames_in=len(extracted_frames),
         )
     try:
-        export_image_sequence_video(
-            image_paths=output_frame_paths,
+        export_video_mp4(
+            frames=motion_frames,
             output_path=promoted_video_path,
             fps=max(1, int(fps or 8)),
+            cancel_token=cancel_token,
         )
+        motion_frames[0].save(thumbnail_path, format="PNG")
     except Exception as exc:
         return _build_unavailable_result(
             payload=payload,
@@ -159,19 +160,19 @@ def apply_secondary_motion_to_video(
             skip_reason="reencode_failed",
             error=exc,
             frames_in=len(extracted_frames),
-            frames_out=len(output_frame_paths),
+            frames_out=len(motion_frames),
         )
     apply_result = dict(apply_result)
     apply_result.setdefault("schema", SECONDARY_MOTION_APPLY_SCHEMA_V1)
     apply_result.setdefault("status", "applied")
     apply_result.setdefault("policy_id", str(payload.get("policy_id") or ""))
-    apply_result.setdefault("application_path", "video_reencode_worker")
+    apply_result["application_path"] = VIDEO_REENCODE_APPLICATION_PATH
     apply_result.setdefault("backend_mode", str(payload.get("backend_mode") or ""))
     apply_result.setdefault("frames_in", len(extracted_frames))
-    apply_result.setdefault("frames_out", len(output_frame_paths))
+    apply_result.setdefault("frames_out", len(motion_frames))
     apply_result.setdefault("seed", payload.get("seed"))
     apply_result.setdefault("regions_applied", list(payload.get("regions") or []))
-    apply_result.setdefault("metrics", {"applied_frame_count": len(output_frame_paths)})
+    apply_result.setdefault("metrics", {"applied_frame_count": len(motion_frames)})
     apply_result["source_video_path"] = str(source_video_path)
     apply_result["reencoded_video_path"] = str(promoted_video_path)
     manifest_block = build_secondary_motion_manifest_block(
@@ -185,12 +186,13 @@ def apply_secondary_motion_to_video(
         "output_paths": [str(promoted_video_path)],
         "video_path": str(promoted_video_path),
         "video_paths": [str(promoted_video_path)],
-        "frame_paths": [str(path) for path in output_frame_paths],
-        "thumbnail_path": str(output_frame_paths[0]) if output_frame_paths else None,
+        # No per-frame PNGs exist on this path; see the docstring.
+        "frame_paths": [],
+        "thumbnail_path": str(thumbnail_path),
         "secondary_motion": manifest_block,
         "secondary_motion_summary": summary,
         "source_video_path": str(source_video_path),
     }
 
 
-__all__ = ["apply_secondary_motion_to_video"]
\ No newline at end of file
+__all__ = ["VIDEO_REENCODE_APPLICATION_PATH", "apply_secondary_motion_to_video"]
\ No newline at end of file
@@ -22,6 +22,22 @@ def _list_frame_paths(input_dir: Path) -> list[Path]:
     )
 
 
+def run_secondary_motion_on_frames(
+    frames: list[Image.Image],
+    payload: Mapping[str, Any],
+) -> tuple[list[Image.Image], dict[str, Any]]:
+    """Apply the payload's intent/policy to in-memory frames; returns (frames, apply result)."""
+    intent = SecondaryMotionIntent.from_dict(payload.get("intent"))
+    policy = SecondaryMotionPolicy.from_dict(payload.get("policy"))
+    output_frames, apply_result = apply_secondary_motion_to_frames(
+        frames,
+        policy=policy,
+        intent=intent,
+        seed=int(payload["seed"]) if payload.get("seed") not in (None, "") else None,
+    )
+    return output_frames, apply_result.to_dict()
+
+
 def run_secondary_motion_worker(payload: Mapping[str, Any]) -> dict[str, Any]:
     input_dir = Path(str(payload.get("input_dir") or "")).resolve()
     output_dir = Path(str(payload.get("output_dir") or "")).resolve()
@@ -32,14 +48,7 @@ def run_secondary_motion_worker(payload: Mapping[str, Any]) -> dict[str, Any]:
     for image in frames:
         image.load()
 
-    intent = SecondaryMotionIntent.from_dict(payload.get("intent"))
-    policy = SecondaryMotionPolicy.from_dict(payload.get("policy"))
-    output_frames, apply_result = apply_secondary_motion_to_frames(
-        frames,
-        policy=policy,
-        intent=intent,
-        seed=int(payload["seed"]) if payload.get("seed") not in (None, "") else None,
-    )
+    output_frames, result = run_secondary_motion_on_frames(frames, payload)
 
     output_paths: list[str] = []
     for index, image in enumerate(output_frames):
@@ -51,7 +60,6 @@ def run_secondary_motion_worker(payload: Mapping[str, Any]) -> dict[str, Any]:
         image.save(output_path)
         output_paths.append(str(output_path))
 
-    result = apply_result.to_dict()
     result["application_path"] = "frame_directory_worker"
     result["input_dir"] = str(input_dir)
     result["output_dir"] = str(output_dir)
@@ -60,4 +68,4 @@ def run_secondary_motion_worker(payload: Mapping[str, Any]) -> dict[str, Any]:
     return result
 
 
-__all__ = ["run_secondary_motion_worker"]
+__all__ = ["run_secondary_motion_on_frames", "run_secondary_motion_worker"]
@@ -42,6 +42,7 @@ def build_sequence_manifest(
         "all_output_paths": list(result.all_output_paths),
         "all_frame_paths": list(result.all_frame_paths),
         "sequence_manifest_path": result.sequence_manifest_path,
+        "timing": dict(result.timing),
     }
 
 
@@ -111,6 +111,8 @@ class SegmentProvenanceRecord:
     output_paths: list[str] = field(default_factory=list)
     frame_paths: list[str] = field(default_factory=list)
     carry_forward_policy: CarryForwardPolicy = "none"
+    # Wall-clock submit/backend/record times and the GPU-idle gap before this segment.
+    timing: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -133,6 +135,8 @@ class VideoSequenceResult:
     all_frame_paths: list[str] = field(default_factory=list)
     continuity_link: dict[str, Any] | None = None
     plan_origin: dict[str, Any] | None = None
+    # Execution mode, pipeline depth, and total GPU-idle seconds between segments.
+    timing: dict[str, Any] = field(default_factory=dict)
 
     @property
     def is_complete(self) -> bool:
@@ -150,5 +154,6 @@ class VideoSequenceResult:
             "all_frame_paths": list(self.all_frame_paths),
             "continuity_link": dict(self.continuity_link or {}) or None,
             "plan_origin": dict(self.plan_origin or {}) or None,
+            "timing": dict(self.timing),
             "is_complete": self.is_complete,
         }
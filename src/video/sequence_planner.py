@@ -36,6 +36,10 @@ class VideoSequencePlanner:
         {"first_frame", "provided", "none"}
     )
 
+    def segments_are_independent(self, policy: CarryForwardPolicy) -> bool:
+        """True when no segment's anchor depends on a prior segment's output."""
+        return policy in self._STATIC_SOURCE_POLICIES
+
     def plan(self, seq_job: VideoSequenceJob) -> list[VideoSegmentPlan]:
         """Return deterministic per-segment plans for *seq_job*.
 
@@ -29,3 +29,7 @@ class SVDExportError(SVDError):
 
 class SVDPostprocessError(SVDError):
     """Raised when optional SVD frame postprocessing fails."""
+
+
+class SVDWorkerUnavailableError(SVDPostprocessError):
+    """Raised when the persistent postprocess worker cannot serve a request."""
@@ -0,0 +1,58 @@
+"""Raw RGB frame files exchanged with the persistent SVD postprocess worker."""
+
+from __future__ import annotations
+
+import mmap
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+FRAME_BUFFER_SCHEMA = "stablenew.svd_frame_buffer.v1"
+
+
+def write_frame_buffer(frames: Iterable[Image.Image], path: str | Path) -> dict[str, Any]:
+    """Write ``frames`` back to back as packed RGB and return the buffer descriptor.
+
+    Frames may differ in size; the descriptor records each frame's dimensions so
+    the reader can slice the buffer without any image decoding.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    sizes: list[list[int]] = []
+    with target.open("wb") as handle:
+        for frame in frames:
+            rgb = frame if frame.mode == "RGB" else frame.convert("RGB")
+            try:
+                handle.write(rgb.tobytes())
+                sizes.append([rgb.width, rgb.height])
+            finally:
+                if rgb is not frame:
+                    rgb.close()
+    return {"schema": FRAME_BUFFER_SCHEMA, "path": str(target.resolve()), "sizes": sizes}
+
+
+def read_frame_buffer(descriptor: dict[str, Any]) -> list[Image.Image]:
+    """Load every frame described by ``descriptor`` from its memory-mapped buffer."""
+    if descriptor.get("schema") != FRAME_BUFFER_SCHEMA:
+        raise ValueError(f"Unsupported frame buffer schema: {descriptor.get('schema')!r}")
+    sizes = [(int(width), int(height)) for width, height in descriptor.get("sizes") or []]
+    if not sizes:
+        return []
+    expected = sum(width * height * 3 for width, height in sizes)
+    path = Path(str(descriptor.get("path") or ""))
+    with path.open("rb") as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if len(view) != expected:
+                raise ValueError(f"Frame buffer {path} holds {len(view)} bytes, expected {expected}")
+            frames: list[Image.Image] = []
+            offset = 0
+            for width, height in sizes:
+                length = width * height * 3
+                frames.append(Image.frombytes("RGB", (width, height), view[offset : offset + length]))
+                offset += length
+    return frames
+
+
+__all__ = ["FRAME_BUFFER_SCHEMA", "read_frame_buffer", "write_frame_buffer"]
@@ -0,0 +1,300 @@
+"""Long-lived SVD postprocess worker process with warm model runtimes."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from src.video.svd_errors import SVDPostprocessError, SVDWorkerUnavailableError
+from src.utils.thread_registry import get_thread_registry
+from src.video.svd_frame_buffer import read_frame_buffer, write_frame_buffer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_SHUTDOWN_SECONDS = 300.0
+_STDERR_TAIL_LINES = 40
+_IDLE_POLL_SECONDS = 0.5
+
+
+def persistent_svd_worker_enabled() -> bool:
+    """Env override ``STABLENEW_SVD_PERSISTENT_WORKER``; enabled by default."""
+    env_flag = os.environ.get("STABLENEW_SVD_PERSISTENT_WORKER")
+    if env_flag is None:
+        return True
+    return env_flag.lower() in {"1", "true", "yes", "on"}
+
+
+class PersistentSVDPostprocessWorker:
+    """Drives ``python -m src.video.svd_postprocess_worker --serve`` over JSON lines.
+
+    The process is started on first use and keeps CodeFormer/GFPGAN/RealESRGAN
+    runtimes loaded between stages and runs. Frames are exchanged as raw RGB
+    buffers in the stage work directory. Anything that breaks the process or
+    the protocol raises ``SVDWorkerUnavailableError`` so callers can fall back
+    to the one-shot worker; errors reported by the worker for a well-formed
+    request raise ``SVDPostprocessError``. The process exits after
+    ``idle_shutdown_seconds`` without requests so its VRAM is returned.
+    """
+
+    def __init__(
+        self,
+        *,
+        repo_root: str | Path | None = None,
+        command: list[str] | None = None,
+        idle_shutdown_seconds: float = DEFAULT_IDLE_SHUTDOWN_SECONDS,
+    ) -> None:
+        self._repo_root = Path(repo_root) if repo_root else Path(__file__).resolve().parents[2]
+        self._command = list(command or [sys.executable, "-m", "src.video.svd_postprocess_worker", "--serve"])
+        self._idle_shutdown_seconds = max(0.0, float(idle_shutdown_seconds))
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen[str] | None = None
+        self._stderr_tail: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+        self._stderr_thread: threading.Thread | None = None
+        self._idle_thread: threading.Thread | None = None
+        self._idle_cancel: threading.Event | None = None
+        self._idle_token = 0
+        self._next_request_id = 0
+        self._spawns = 0
+        self._requests = 0
+        self._failures = 0
+
+    def run(
+        self,
+        *,
+        stage_name: str,
+        action: str,
+        frames: list[Image.Image],
+        payload: dict[str, Any],
+        work_dir: Path,
+    ) -> tuple[list[Image.Image], dict[str, Any]]:
+        """Run one postprocess stage; returns (output frames, worker result payload)."""
+        input_path = work_dir / f"{stage_name}_input.rgb"
+        output_path = work_dir / f"{stage_name}_output.rgb"
+        with self._lock:
+            self._cancel_idle_timer()
+            try:
+                process = self._ensure_started()
+                self._next_request_id += 1
+                request = {
+                    "id": self._next_request_id,
+                    "action": action,
+                    "payload": payload,
+                    "input": write_frame_buffer(frames, input_path),
+                    "output_path": str(output_path.resolve()),
+                }
+                response = self._exchange(process, request)
+                self._requests += 1
+                if not response.get("ok"):
+                    message = str(response.get("error") or "unknown worker error")
+                    raise SVDPostprocessError(f"{stage_name} worker failed: {message}")
+                try:
+                    processed = read_frame_buffer(dict(response.get("frames") or {}))
+                except (OSError, ValueError) as exc:
+                    raise SVDWorkerUnavailableError(f"{stage_name} worker returned an unreadable frame buffer: {exc}") from exc
+                result = response.get("result")
+                return processed, dict(result) if isinstance(result, dict) else {}
+            finally:
+                for path in (input_path, output_path):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                self._schedule_idle_shutdown()
+
+    def _ensure_started(self) -> subprocess.Popen[str]:
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+        self._process = None
+        self._stderr_tail.clear()
+        try:
+            process = subprocess.Popen(
+                self._command,
+                cwd=str(self._repo_root),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as exc:
+            self._failures += 1
+            raise SVDWorkerUnavailableError(f"could not start persistent postprocess worker: {exc}") from exc
+        self._stderr_thread = get_thread_registry().spawn(
+            target=self._drain_stderr,
+            args=(process,),
+            name="svd_postprocess_worker_stderr",
+            daemon=False,
+            purpose="Drain persistent SVD postprocess worker stderr",
+        )
+        self._spawns += 1
+        ready = self._read_message(process)
+        if not ready.get("ready"):
+            self._terminate(process)
+            raise SVDWorkerUnavailableError(f"persistent postprocess worker did not report ready: {ready}")
+        self._process = process
+        logger.info("[SVD][postprocess] persistent worker started pid=%s", ready.get("pid"))
+        return process
+
+    def _exchange(self, process: subprocess.Popen[str], request: dict[str, Any]) -> dict[str, Any]:
+        try:
+            process.stdin.write(json.dumps(request) + "\n")
+            process.stdin.flush()
+        except (OSError, ValueError) as exc:
+            self._terminate(process)
+            raise SVDWorkerUnavailableError(f"persistent postprocess worker is gone: {exc}") from exc
+        response = self._read_message(process)
+        if response.get("id") != request["id"]:
+            self._terminate(process)
+            raise SVDWorkerUnavailableError(f"persistent postprocess worker answered out of turn: {response}")
+        return response
+
+    def _read_message(self, process: subprocess.Popen[str]) -> dict[str, Any]:
+        try:
+            line = process.stdout.readline()
+        except (OSError, ValueError) as exc:
+            line = ""
+            logger.debug("[SVD][postprocess] persistent worker read failed: %s", exc)
+        if not line:
+            self._terminate(process)
+            if self._stderr_thread is not None:
+                self._stderr_thread.join(timeout=1.0)
+            detail = "\n".join(self._stderr_tail).strip() or f"exit code {process.returncode}"
+            raise SVDWorkerUnavailableError(f"persistent postprocess worker exited: {detail}")
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as exc:
+            self._terminate(process)
+            raise SVDWorkerUnavailableError(f"persistent postprocess worker sent invalid JSON: {line.strip()}") from exc
+        if not isinstance(message, dict):
+            self._terminate(process)
+            raise SVDWorkerUnavailableError(f"persistent postprocess worker sent {type(message).__name__}")
+        return message
+
+    def _drain_stderr(self, process: subprocess.Popen[str]) -> None:
+        stream = process.stderr
+        if stream is None:
+            return
+        try:
+            for line in stream:
+                self._stderr_tail.append(line.rstrip())
+        except (OSError, ValueError):
+            pass
+
+    def _terminate(self, process: subprocess.Popen[str]) -> None:
+        self._failures += 1
+        if process is self._process:
+            self._process = None
+        if process.poll() is None:
+            process.kill()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+
+    def _cancel_idle_timer(self) -> threading.Thread | None:
+        """Cancel the pending idle shutdown; returns its thread for joining outside the lock."""
+        self._idle_token += 1
+        thread, self._idle_thread = self._idle_thread, None
+        if self._idle_cancel is not None:
+            self._idle_cancel.set()
+            self._idle_cancel = None
+        return thread
+
+    def _schedule_idle_shutdown(self) -> None:
+        if not self._idle_shutdown_seconds or self._process is None:
+            return
+        cancelled = threading.Event()
+        self._idle_cancel = cancelled
+        self._idle_thread = get_thread_registry().spawn(
+            target=self._wait_for_idle,
+            args=(self._idle_token, cancelled),
+            name="svd_postprocess_worker_idle",
+            daemon=False,
+            purpose="Stop the persistent SVD postprocess worker when idle",
+        )
+
+    def _wait_for_idle(self, token: int, cancelled: threading.Event) -> None:
+        registry = get_thread_registry()
+        deadline = time.monotonic() + self._idle_shutdown_seconds
+        while not cancelled.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or registry.is_shutdown_requested():
+                self._shutdown_if_idle(token)
+                return
+            cancelled.wait(min(remaining, _IDLE_POLL_SECONDS))
+
+    def _shutdown_if_idle(self, token: int) -> None:
+        with self._lock:
+            if token != self._idle_token:
+                return
+            self._idle_thread = None
+            self._idle_cancel = None
+            self._stop_locked()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle_thread = self._cancel_idle_timer()
+            self._stop_locked()
+            stderr_thread, self._stderr_thread = self._stderr_thread, None
+        for thread in (idle_thread, stderr_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=5.0)
+
+    def _stop_locked(self) -> None:
+        process, self._process = self._process, None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.stdin.write(json.dumps({"action": "shutdown"}) + "\n")
+            process.stdin.flush()
+            process.wait(timeout=10)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+        logger.info("[SVD][postprocess] persistent worker stopped")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            process = self._process
+            return {
+                "running": process is not None and process.poll() is None,
+                "pid": process.pid if process is not None else None,
+                "spawns": self._spawns,
+                "requests": self._requests,
+                "failures": self._failures,
+            }
+
+
+_GLOBAL_SVD_WORKER: PersistentSVDPostprocessWorker | None = None
+_GLOBAL_SVD_WORKER_LOCK = threading.Lock()
+
+
+def get_svd_postprocess_worker() -> PersistentSVDPostprocessWorker:
+    global _GLOBAL_SVD_WORKER
+    with _GLOBAL_SVD_WORKER_LOCK:
+        if _GLOBAL_SVD_WORKER is None:
+            _GLOBAL_SVD_WORKER = PersistentSVDPostprocessWorker()
+            from src.services.persistence_worker import register_shutdown_flush
+
+            # The worker's threads are non-daemon, so stop it before the
+            # interpreter joins them: on app shutdown and ahead of atexit.
+            register_shutdown_flush(_GLOBAL_SVD_WORKER.shutdown)
+            getattr(threading, "_register_atexit", atexit.register)(_GLOBAL_SVD_WORKER.shutdown)
+        return _GLOBAL_SVD_WORKER
+
+
+__all__ = [
+    "PersistentSVDPostprocessWorker",
+    "get_svd_postprocess_worker",
+    "persistent_svd_worker_enabled",
+]
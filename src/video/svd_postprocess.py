@@ -20,7 +20,8 @@ from PIL import Image
 from src.video.motion.secondary_motion_provenance import build_secondary_motion_manifest_block
 from src.video.motion.secondary_motion_engine import SECONDARY_MOTION_APPLY_SCHEMA_V1
 from src.video.svd_config import SVDConfig, SVDPostprocessConfig
-from src.video.svd_errors import SVDPostprocessError
+from src.video.svd_errors import SVDPostprocessError, SVDWorkerUnavailableError
+from src.video.svd_persistent_worker import PersistentSVDPostprocessWorker
 from src.video.video_export import save_video_frames
 
 logger = logging.getLogger(__name__)
@@ -134,9 +135,11 @@ class SVDPostprocessRunner:
         *,
         repo_root: str | Path | None = None,
         status_callback: Callable[[dict[str, Any]], None] | None = None,
+        worker: PersistentSVDPostprocessWorker | None = None,
     ) -> None:
         self._repo_root = Path(repo_root) if repo_root else Path(__file__).resolve().parents[2]
         self._status_callback = status_callback
+        self._worker = worker
 
     def process_frames(
         self,
@@ -372,6 +375,17 @@ class SVDPostprocessRunner:
         work_dir: Path,
         expect_result: bool = False,
     ) -> list[Image.Image] | tuple[list[Image.Image], dict[str, Any]]:
+        if self._worker is not None:
+            persistent = self._run_persistent_worker_stage(
+                self._worker,
+                stage_name=stage_name,
+                action=action,
+                frames=frames,
+                payload=payload,
+                work_dir=work_dir,
+            )
+            if persistent is not None:
+                return persistent if expect_result else persistent[0]
         input_dir = work_dir / f"{stage_name}_input"
         output_dir = work_dir / f"{stage_name}_output"
         self._reset_dir(input_dir)
@@ -432,6 +446,54 @@ class SVDPostprocessRunner:
             return processed, result_payload
         return processed
 
+    def _run_persistent_worker_stage(
+        self,
+        worker: PersistentSVDPostprocessWorker,
+        *,
+        stage_name: str,
+        action: str,
+        frames: list[Image.Image],
+        payload: dict[str, Any],
+        work_dir: Path,
+    ) -> tuple[list[Image.Image], dict[str, Any]] | None:
+        """Run a stage on the persistent worker; None means use the one-shot worker instead."""
+        logger.info(
+            "[SVD][postprocess] stage=%s start input_frames=%s worker=persistent",
+            stage_name,
+            len(frames),
+        )
+        try:
+            processed, result_payload = worker.run(
+                stage_name=stage_name,
+                action=action,
+                frames=frames,
+                payload=payload,
+                work_dir=work_dir,
+            )
+        except SVDWorkerUnavailableError as exc:
+            logger.warning(
+                "[SVD][postprocess] stage=%s persistent worker unavailable; using one-shot worker: %s",
+                stage_name,
+                exc,
+            )
+            return None
+        except SVDPostprocessError:
+            self._close_images(frames)
+            frames.clear()
+            self._release_runtime_memory()
+            raise
+        self._close_images(frames)
+        frames.clear()
+        self._release_runtime_memory()
+        if not processed:
+            raise SVDPostprocessError(f"{stage_name} worker produced no output frames")
+        logger.info(
+            "[SVD][postprocess] stage=%s complete output_frames=%s worker=persistent",
+            stage_name,
+            len(processed),
+        )
+        return processed, result_payload
+
     def _run_rife_stage(
         self,
         *,
@@ -10,15 +10,26 @@ import shutil
 import site
 import sys
 import types
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 import cv2
 import numpy as np
 import torch
 from PIL import Image
 
-from src.video.motion.secondary_motion_worker import run_secondary_motion_worker
+from src.video.motion.secondary_motion_worker import run_secondary_motion_on_frames, run_secondary_motion_worker
+from src.video.svd_frame_buffer import read_frame_buffer, write_frame_buffer
+
+# Payload fields that determine which weights a runtime was built from.
+_RUNTIME_KEY_FIELDS: dict[str, tuple[str, ...]] = {
+    "codeformer": ("codeformer_weight_path", "facelib_model_root"),
+    "gfpgan": ("gfpgan_weight_path", "facelib_model_root"),
+    "realesrgan": ("model_path", "tile"),
+}
+_MAX_WARM_RUNTIMES = 2
 
 
 def _find_site_package_dir(name: str) -> Path | None:
@@ -86,10 +97,46 @@ def _import_codeformer_runtime():
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--config-json", required=True)
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--config-json")
+    mode.add_argument("--serve", action="store_true", help="answer JSON-line requests on stdin until shutdown")
     return parser.parse_args()
 
 
+class _RuntimeCache:
+    """Built model runtimes kept warm across serve requests, keyed by the config that built them."""
+
+    def __init__(self, max_entries: int = _MAX_WARM_RUNTIMES) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self.builds = 0
+
+    def get(self, kind: str, payload: dict[str, Any], build: Callable[[dict[str, Any]], Any]) -> Any:
+        identity = {name: payload.get(name) for name in _RUNTIME_KEY_FIELDS[kind]}
+        key = (kind, json.dumps(identity, sort_keys=True, default=str))
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        runtime = build(payload)
+        self.builds += 1
+        self._entries[key] = runtime
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            _release_worker_memory()
+        return runtime
+
+
+def _warm_runtime(
+    runtimes: _RuntimeCache | None,
+    kind: str,
+    payload: dict[str, Any],
+    build: Callable[[dict[str, Any]], Any],
+) -> Any:
+    if runtimes is None:
+        return build(payload)
+    return runtimes.get(kind, payload, build)
+
+
 def _load_payload(raw: str) -> dict[str, Any]:
     payload = json.loads(raw)
     if not isinstance(payload, dict):
@@ -281,35 +328,41 @@ def _apply_realesrgan(image: Image.Image, *, upsampler, scale: float) -> Image.I
     return Image.fromarray(cv2.cvtColor(enhanced, cv2.COLOR_BGR2RGB)).convert("RGB")
 
 
-def _run_face_restore(input_dir: Path, output_dir: Path, payload: dict[str, Any]) -> None:
+def _face_restore_runtime(payload: dict[str, Any], runtimes: _RuntimeCache | None = None) -> tuple[str, Any]:
     method = str(payload.get("method") or "CodeFormer")
-    fidelity = float(payload.get("fidelity_weight", 0.7))
     if method == "CodeFormer":
-        runtime = _build_codeformer(payload)
-    elif method == "GFPGAN":
-        runtime = _build_gfpgan(payload)
-    else:
-        raise RuntimeError(f"Face restore method '{method}' is not available in this environment")
+        return method, _warm_runtime(runtimes, "codeformer", payload, _build_codeformer)
+    if method == "GFPGAN":
+        return method, _warm_runtime(runtimes, "gfpgan", payload, _build_gfpgan)
+    raise RuntimeError(f"Face restore method '{method}' is not available in this environment")
+
+
+def _restore_frame(source: Image.Image, *, method: str, runtime: Any, fidelity: float) -> Image.Image:
+    if method == "CodeFormer":
+        return _apply_codeformer(
+            source,
+            model=runtime[0],
+            helper=runtime[1],
+            device=runtime[2],
+            fidelity_weight=fidelity,
+            img2tensor=runtime[3],
+            tensor2img=runtime[4],
+            normalize=runtime[5],
+        )
+    return _apply_gfpgan(
+        source,
+        restorer=runtime,
+        fidelity_weight=fidelity,
+    )
+
+
+def _run_face_restore(input_dir: Path, output_dir: Path, payload: dict[str, Any]) -> None:
+    fidelity = float(payload.get("fidelity_weight", 0.7))
+    method, runtime = _face_restore_runtime(payload)
 
     for input_path in _iter_frame_paths(input_dir):
         source = _load_rgb_image(input_path)
-        if method == "CodeFormer":
-            restored = _apply_codeformer(
-                source,
-                model=runtime[0],
-                helper=runtime[1],
-                device=runtime[2],
-                fidelity_weight=fidelity,
-                img2tensor=runtime[3],
-                tensor2img=runtime[4],
-                normalize=runtime[5],
-            )
-        else:
-            restored = _apply_gfpgan(
-                source,
-                restorer=runtime,
-                fidelity_weight=fidelity,
-            )
+        restored = _restore_frame(source, method=method, runtime=runtime, fidelity=fidelity)
         try:
             _save_rgb_image(restored, output_dir / input_path.name)
         finally:
@@ -347,6 +400,91 @@ def _run_secondary_motion(input_dir: Path, output_dir: Path, payload: dict[str,
     return run_secondary_motion_worker(worker_payload)
 
 
+def _transform_frames(
+    frames: Iterable[Image.Image],
+    transform: Callable[[Image.Image], Image.Image],
+) -> Iterator[Image.Image]:
+    """Yield ``transform(frame)`` one frame at a time, closing both once consumed."""
+    for source in frames:
+        output = transform(source)
+        try:
+            yield output
+        finally:
+            source.close()
+            if output is not source:
+                output.close()
+            _release_worker_memory()
+
+
+def _handle_serve_request(request: dict[str, Any], runtimes: _RuntimeCache) -> dict[str, Any]:
+    action = str(request.get("action") or "")
+    payload = request.get("payload")
+    if not isinstance(payload, dict):
+        raise RuntimeError("worker payload is missing")
+    input_descriptor = request.get("input")
+    if not isinstance(input_descriptor, dict):
+        raise RuntimeError("worker input frame buffer is missing")
+    output_path = Path(str(request.get("output_path") or "")).expanduser()
+    frames = read_frame_buffer(input_descriptor)
+
+    result: dict[str, Any] | None = None
+    if action == "face_restore":
+        fidelity = float(payload.get("fidelity_weight", 0.7))
+        method, runtime = _face_restore_runtime(payload, runtimes)
+        descriptor = write_frame_buffer(
+            _transform_frames(
+                frames,
+                lambda frame: _restore_frame(frame, method=method, runtime=runtime, fidelity=fidelity),
+            ),
+            output_path,
+        )
+    elif action == "upscale":
+        scale = float(payload.get("scale", 2.0))
+        upsampler = _warm_runtime(runtimes, "realesrgan", payload, _build_realesrgan)
+        descriptor = write_frame_buffer(
+            _transform_frames(frames, lambda frame: _apply_realesrgan(frame, upsampler=upsampler, scale=scale)),
+            output_path,
+        )
+    elif action == "secondary_motion":
+        output_frames, result = run_secondary_motion_on_frames(frames, payload)
+        descriptor = write_frame_buffer(output_frames, output_path)
+        result["application_path"] = "frame_buffer_worker"
+    else:
+        raise RuntimeError(f"Unsupported worker action: {action}")
+    return {"frames": descriptor, "result": result}
+
+
+def serve(requests: TextIO, responses: TextIO) -> int:
+    """Answer one JSON request per line until ``shutdown`` or end of input.
+
+    Model runtimes stay loaded between requests, and frames travel as raw RGB
+    buffers (see ``svd_frame_buffer``) rather than PNG directories.
+    """
+    runtimes = _RuntimeCache()
+
+    def _respond(message: dict[str, Any]) -> None:
+        responses.write(json.dumps(message) + "\n")
+        responses.flush()
+
+    _respond({"ready": True, "pid": os.getpid()})
+    for line in requests:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = _load_payload(line)
+            request_id = request.get("id")
+            if request.get("action") == "shutdown":
+                _respond({"id": request_id, "ok": True})
+                break
+            response = {"id": request_id, "ok": True, **_handle_serve_request(request, runtimes)}
+            response["runtime_builds"] = runtimes.builds
+        except Exception as exc:
+            response = {"id": request_id, "ok": False, "error": str(exc) or type(exc).__name__}
+        _respond(response)
+    return 0
+
+
 def _release_worker_memory() -> None:
     gc.collect()
     if not torch.cuda.is_available():
@@ -363,6 +501,11 @@ def _release_worker_memory() -> None:
 
 def main() -> int:
     args = _parse_args()
+    if args.serve:
+        # Library chatter must not corrupt the JSON-line protocol on stdout.
+        protocol = sys.stdout
+        sys.stdout = sys.stderr
+        return serve(sys.stdin, protocol)
     config = _load_payload(args.config_json)
     action = str(config.get("action") or "")
     input_dir = Path(str(config.get("input_dir") or "")).expanduser()
@@ -11,6 +11,7 @@ from src.video.svd_config import SVDConfig
 from src.video.svd_errors import SVDModelLoadError, SVDPostprocessError
 from src.video.svd_models import SVDResult
 from src.video.motion.secondary_motion_provenance import extract_secondary_motion_summary
+from src.video.svd_persistent_worker import get_svd_postprocess_worker, persistent_svd_worker_enabled
 from src.video.svd_postprocess import SVDPostprocessRunner, validate_svd_postprocess_config
 from src.video.svd_preprocess import prepare_svd_input, validate_svd_source_image
 from src.video.svd_registry import write_svd_run_manifest
@@ -120,6 +121,7 @@ class SVDRunner:
                 )
             frames, postprocess_metadata = SVDPostprocessRunner(
                 status_callback=self._map_postprocess_status,
+                worker=get_svd_postprocess_worker() if persistent_svd_worker_enabled() else None,
             ).process_frames(
                 frames=frames,
                 config=config,
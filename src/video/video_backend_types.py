@@ -21,6 +21,8 @@ class VideoBackendCapabilities:
     supports_negative_prompt: bool = False
     supports_multiple_anchors: bool = False
     artifact_type: str = "video"
+    # Backend queues work server-side, so overlapping execute() calls keep it busy.
+    supports_pipelined_segments: bool = False
 
 
 @dataclass(slots=True)
@@ -4,12 +4,18 @@ from __future__ import annotations
 
 import shutil
 import subprocess
-import tempfile
 from pathlib import Path
+from typing import Any
 
 from PIL import Image
 
-from src.pipeline.video import VideoCreator, resolve_ffmpeg_executable
+from src.pipeline.video import (
+    FFMPEG_PIPE_TIMEOUT_SECONDS,
+    FFmpegPipeError,
+    VideoCreator,
+    encode_frames_to_video,
+    resolve_ffmpeg_executable,
+)
 from src.video.svd_errors import SVDExportError
 
 
@@ -64,28 +70,29 @@ def export_video_mp4(
     frames: list[Image.Image],
     output_path: str | Path,
     fps: int,
+    timeout: float = FFMPEG_PIPE_TIMEOUT_SECONDS,
+    cancel_token: Any = None,
 ) -> Path:
+    """Encode in-memory frames to MP4 by streaming raw RGB to FFmpeg (no PNG round trip)."""
     if not frames:
         raise SVDExportError("No frames provided for MP4 export")
     output = Path(output_path)
     output.parent.mkdir(parents=True, exist_ok=True)
 
-    creator = VideoCreator()
-    if not creator.ffmpeg_available:
+    ffmpeg_executable = resolve_ffmpeg_executable()
+    if ffmpeg_executable is None:
         raise SVDExportError("FFmpeg is not available for MP4 export")
-
-    with tempfile.TemporaryDirectory(prefix="svd_export_", dir=str(output.parent)) as temp_dir:
-        frame_paths = save_video_frames(
-            frames=frames,
-            output_dir=temp_dir,
-            prefix="frame",
-        )
-        export_image_sequence_video(
-            image_paths=frame_paths,
-            output_path=output,
+    try:
+        encode_frames_to_video(
+            frames,
+            output,
             fps=fps,
-            creator=creator,
+            ffmpeg_executable=ffmpeg_executable,
+            timeout=timeout,
+            cancel_token=cancel_token,
         )
+    except FFmpegPipeError as exc:
+        raise SVDExportError(f"MP4 export failed: {exc}") from exc
     return output
 
 
@@ -0,0 +1,182 @@
+"""Tests for the shared WebUI progress sources."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.client import ProgressInfo, SDWebUIClient
+from src.api.progress_source import (
+    AdaptiveProgressPoller,
+    PushProgressSource,
+    next_poll_interval,
+    shared_progress_poller,
+)
+from src.pipeline.executor import Pipeline
+
+
+class _FakeProgressWebUI:
+    """Local /sdapi/v1/progress endpoint replaying a scripted generation."""
+
+    def __init__(self, payloads: list[dict]) -> None:
+        self.payloads = list(payloads)
+        self.requests = 0
+        self.lock = threading.Lock()
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                with fake.lock:
+                    fake.requests += 1
+                    payload = fake.payloads.pop(0) if len(fake.payloads) > 1 else fake.payloads[0]
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _progress(value: float, eta: float, step: int = 0) -> dict:
+    return {
+        "progress": value,
+        "eta_relative": eta,
+        "state": {"job": "txt2img", "sampling_step": step, "sampling_steps": 20},
+    }
+
+
+def _info(value: float, eta: float) -> ProgressInfo:
+    return ProgressInfo(value, eta, None, None, None, {"job": "txt2img"})
+
+
+def _wait_until(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_next_poll_interval_backs_off_when_steady_and_tightens_near_completion() -> None:
+    idle = next_poll_interval(None, None, 2.0, nominal=0.5)
+    steady = next_poll_interval(_info(0.2, 40.0), _info(0.3, 35.0), 0.5, nominal=0.5)
+    capped = next_poll_interval(_info(0.3, 35.0), _info(0.4, 30.0), 2.0, nominal=0.5)
+    near_done = next_poll_interval(_info(0.8, 4.0), _info(0.95, 0.4), 2.0, nominal=0.5)
+
+    assert idle == 0.5
+    assert steady == pytest.approx(0.75)
+    assert capped == 2.0
+    assert near_done == pytest.approx(0.2)
+
+
+def test_shared_poller_serves_concurrent_stages_from_one_request_stream() -> None:
+    fake = _FakeProgressWebUI([_progress(0.4, 20.0, 8)])
+    client = SDWebUIClient(base_url=fake.base_url)
+    try:
+        poller = shared_progress_poller(client)
+        assert shared_progress_poller(client) is poller
+        first: list[ProgressInfo | None] = []
+        second: list[ProgressInfo | None] = []
+
+        sub_a = poller.subscribe(first.append, interval=0.05)
+        sub_b = poller.subscribe(second.append, interval=0.05)
+        assert _wait_until(lambda: len(first) >= 3 and len(second) >= 3)
+        sub_a.close()
+        sub_b.close()
+
+        pollers = [t for t in threading.enumerate() if t.name.startswith("progress_poll")]
+        assert _wait_until(lambda: not poller.stats()["running"])
+        assert len(pollers) <= 1
+        assert fake.requests == poller.stats()["requests"]
+        assert first[0].current_step == 8
+    finally:
+        client.close()
+        fake.close()
+
+
+def test_adaptive_poller_makes_fewer_requests_than_fixed_polling_when_steady() -> None:
+    fake = _FakeProgressWebUI([_progress(min(0.8, 0.01 * i), 60.0, i) for i in range(1, 200)])
+    client = SDWebUIClient(base_url=fake.base_url)
+    try:
+        poller = AdaptiveProgressPoller(
+            lambda: client.get_progress(skip_current_image=True),
+            min_interval=0.02,
+            max_interval=0.2,
+        )
+        with poller.subscribe(lambda _info: None, interval=0.02):
+            time.sleep(0.6)
+        # Fixed 20ms polling would issue ~30 requests in 600ms.
+        assert 3 <= fake.requests < 15
+    finally:
+        client.close()
+        fake.close()
+
+
+def test_push_source_heartbeat_drives_stage_stall_interrupt(monkeypatch) -> None:
+    monkeypatch.setattr("src.pipeline.executor.PROGRESS_STALL_THRESHOLD_SEC", 0.05)
+    monkeypatch.setattr("src.pipeline.executor.STALL_INTERRUPT_THRESHOLD_BY_STAGE", {"txt2img": 0.05})
+    client = Mock(spec=SDWebUIClient)
+    source = PushProgressSource(heartbeat_interval=0.02)
+    pipeline = Pipeline(client, Mock())
+    pipeline.set_progress_source(source)
+    percents: list[float] = []
+
+    def _generate(stage: str, payload: dict) -> dict:
+        source.publish(_info(0.25, 10.0))
+        # No more pushes: only the heartbeat re-delivers the stale sample.
+        assert _wait_until(lambda: client.interrupt.called)
+        return {"images": ["b64"], "info": {}}
+
+    pipeline._generate_images = _generate
+    result = pipeline._generate_images_with_progress(
+        "txt2img",
+        {"prompt": "test"},
+        progress_callback=lambda percent, *_args: percents.append(percent),
+    )
+
+    assert result == {"images": ["b64"], "info": {}}
+    assert percents == [25.0]
+    client.interrupt.assert_called_once()
+    client.get_progress.assert_not_called()
+    assert source.subscriber_count == 0
+
+
+def test_progress_threads_are_joined_when_last_listener_leaves_and_on_shutdown() -> None:
+    poller = AdaptiveProgressPoller(lambda: None, min_interval=0.02, max_interval=0.05)
+    source = PushProgressSource(heartbeat_interval=0.02)
+
+    for owner in (poller, source):
+        subscription = owner.subscribe(lambda _info: None)
+        worker = owner._thread
+        assert worker is not None and not worker.daemon
+        subscription.close()
+        assert not worker.is_alive()
+
+    source.subscribe(lambda _info: None)
+    worker = source._thread
+    source.shutdown()
+    assert worker is not None and not worker.is_alive()
+    source.subscribe(lambda _info: None)
+    assert source._thread is None
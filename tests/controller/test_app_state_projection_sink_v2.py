@@ -27,6 +27,17 @@ def test_app_state_projection_sink_applies_latest_revision_only() -> None:
     assert metrics["skipped_counts"]["queue"] == 1
 
 
+def test_app_state_projection_sink_applies_pending_job_count() -> None:
+    app_state = AppStateV2()
+    sink = AppStateProjectionSink(app_state)
+
+    sink.apply_queue_projection(
+        QueueProjection(revision=1, queue_items=("job-1",), queue_jobs=(), pending_job_count=40)
+    )
+
+    assert app_state.queue_pending_count == 40
+
+
 def test_app_state_projection_sink_updates_runtime_surface_fields() -> None:
     app_state = AppStateV2()
     sink = AppStateProjectionSink(app_state)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import time
 import uuid
 from collections.abc import Mapping
@@ -87,3 +88,151 @@ class TestJobServiceNormalizedEnforcement:
         queued = queue.list_jobs()
         assert any(queued_job.job_id == job.job_id for queued_job in queued)
         assert getattr(job, "unified_summary", None) is not None
+
+
+class TestJobServiceVirtualGroups:
+    @staticmethod
+    def _run_request(max_njr_count: int = 256):
+        from src.pipeline.job_requests_v2 import PipelineRunRequest
+
+        return PipelineRunRequest(
+            prompt_pack_id="core-pack",
+            selected_row_ids=["row-0"],
+            config_snapshot_id="snapshot-1",
+            max_njr_count=max_njr_count,
+        )
+
+    def test_lazy_source_is_materialized_in_chunks(self) -> None:
+        queue = JobQueue()
+        service = JobService(queue, StubRunner(queue))
+        service.NJR_ENQUEUE_CHUNK_SIZE = 4
+        service.NJR_REFILL_LOW_WATER = 2
+        pulled: list[int] = []
+
+        def _records():
+            for index in range(10):
+                pulled.append(index)
+                yield _make_normalized_record()
+
+        job_ids = service.enqueue_njrs(_records(), self._run_request(), total=10)
+
+        assert len(job_ids) == 4
+        assert len(pulled) == 4
+        assert service.get_virtual_job_groups()[0]["total"] == 10
+
+        for _ in range(3):
+            job = queue.get_next_job()
+            assert job is not None
+            queue.mark_running(job.job_id)
+        assert service.wait_for_virtual_group_refills()
+        assert len(pulled) == 8
+
+        while (job := queue.get_next_job()) is not None:
+            queue.mark_running(job.job_id)
+            queue.mark_completed(job.job_id)
+            assert service.wait_for_virtual_group_refills()
+        assert len(pulled) == 10
+        assert service.get_virtual_job_groups() == []
+        assert len(queue.list_jobs()) == 10
+
+    def test_lazy_source_respects_max_njr_count_and_discard(self) -> None:
+        queue = JobQueue()
+        service = JobService(queue, StubRunner(queue))
+        service.NJR_ENQUEUE_CHUNK_SIZE = 2
+        service.NJR_REFILL_LOW_WATER = 1
+        records = (_make_normalized_record() for _ in range(50))
+
+        service.enqueue_njrs(records, self._run_request(max_njr_count=5))
+
+        assert service.discard_virtual_job_groups() == 1
+        while (job := queue.get_next_job()) is not None:
+            queue.mark_running(job.job_id)
+        assert len(queue.list_jobs()) == 2
+
+        queue = JobQueue()
+        service = JobService(queue, StubRunner(queue))
+        service.NJR_ENQUEUE_CHUNK_SIZE = 2
+        service.NJR_REFILL_LOW_WATER = 1
+        service.enqueue_njrs(
+            (_make_normalized_record() for _ in range(50)), self._run_request(max_njr_count=5)
+        )
+        while (job := queue.get_next_job()) is not None:
+            queue.mark_running(job.job_id)
+            assert service.wait_for_virtual_group_refills()
+        assert len(queue.list_jobs()) == 5
+
+    def test_job_stream_is_pulled_without_holding_the_group_lock(self) -> None:
+        queue = JobQueue()
+        service = JobService(queue, StubRunner(queue))
+        service.NJR_ENQUEUE_CHUNK_SIZE = 3
+        service.NJR_REFILL_LOW_WATER = 1
+        lock_free: list[bool] = []
+
+        def _jobs():
+            for _ in range(5):
+                acquired = service._virtual_group_lock.acquire(blocking=False)
+                if acquired:
+                    service._virtual_group_lock.release()
+                lock_free.append(acquired)
+                yield _build_job_with_snapshot(_make_normalized_record())
+
+        job_ids = service.enqueue_job_stream(_jobs(), total=5)
+
+        assert len(job_ids) == 3
+        assert lock_free == [True, True, True]
+        assert service.get_pending_virtual_job_count() == 2
+        assert service.discard_virtual_job_groups() == 1
+        assert service.get_pending_virtual_job_count() == 0
+
+    def test_refill_runs_off_the_status_callback_thread(self) -> None:
+        queue = JobQueue()
+        service = JobService(queue, StubRunner(queue))
+        service.NJR_ENQUEUE_CHUNK_SIZE = 2
+        service.NJR_REFILL_LOW_WATER = 2
+        pulled_on: list[str] = []
+
+        def _jobs():
+            for _ in range(4):
+                pulled_on.append(threading.current_thread().name)
+                yield _build_job_with_snapshot(_make_normalized_record())
+
+        service.enqueue_job_stream(_jobs(), total=4)
+        job = queue.get_next_job()
+        queue.mark_running(job.job_id)
+        assert service.wait_for_virtual_group_refills()
+
+        caller = threading.current_thread().name
+        assert pulled_on[:2] == [caller, caller]
+        assert len(pulled_on) == 4
+        assert all(name != caller for name in pulled_on[2:])
+
+    def test_chunks_are_ordered_and_cursor_is_resumable(self) -> None:
+        queue = JobQueue()
+        service = JobService(queue, StubRunner(queue))
+        service.NJR_ENQUEUE_CHUNK_SIZE = 3
+        service.NJR_REFILL_LOW_WATER = 1
+        jobs = [_build_job_with_snapshot(_make_normalized_record()) for _ in range(5)]
+
+        queued = service.enqueue_job_stream(
+            iter(jobs),
+            total=5,
+            order=lambda chunk: list(reversed(chunk)),
+            source={"kind": "test"},
+        )
+
+        assert queued == [job.job_id for job in reversed(jobs[:3])]
+        (entry,) = service.get_persistable_virtual_job_groups()
+        assert entry["source"] == {"kind": "test"}
+        assert entry["materialized"] == 3
+        assert entry["total"] == 5
+
+        # After a restart the caller rebuilds the source past the cursor.
+        restarted_queue = JobQueue()
+        restarted = JobService(restarted_queue, StubRunner(restarted_queue))
+        resumed = restarted.enqueue_job_stream(
+            iter(jobs[entry["materialized"]:]), source=entry["source"], resume=entry
+        )
+        assert resumed == [jobs[3].job_id, jobs[4].job_id]
+        assert restarted.get_persistable_virtual_job_groups() == []
+        assert restarted.get_pending_virtual_job_count() == 0
+
@@ -138,3 +138,103 @@ def test_submit_preview_jobs_to_queue_rebuilds_stale_cached_records_from_pack_dr
     assert submitted == 1
     assert captured == [rebuilt_record]
     assert preview_updates[-1] == [rebuilt_record]
+
+
+def test_submit_preview_jobs_to_queue_streams_draft_pack_jobs():
+    controller = object.__new__(DummyPipelineController)
+    streamed: dict[str, object] = {}
+
+    class StreamingJobService(DummyJobService):
+        def enqueue_job_stream(self, jobs, *, total=None, limit=None, order=None, source=None, resume=None):
+            streamed["total"] = total
+            streamed["source"] = source
+            first = next(iter(jobs))
+            self.submitted.append(first)
+            return [first.job_id]
+
+        def get_virtual_group_id(self, job_id):
+            return "group-1"
+
+        def get_pending_virtual_job_count(self, group_id=None):
+            return 2 if group_id == "group-1" else 0
+
+    pulled: list[str] = []
+
+    def _iter_jobs(entries, **kwargs):
+        for index in range(3):
+            pulled.append(f"job-{index}")
+            yield NormalizedJobRecord(
+                job_id=f"job-{index}",
+                config={"model": "md", "prompt": "p", "prompt_pack_id": "pack-1"},
+                path_output_dir="out",
+                filename_template="{seed}",
+                seed=index,
+                prompt_pack_id="pack-1",
+            )
+
+    builder = SimpleNamespace(iter_jobs=_iter_jobs, count_jobs=lambda entries, **kwargs: 3)
+    controller._job_service = StreamingJobService()
+    controller._app_state = SimpleNamespace(
+        job_draft=SimpleNamespace(packs=[SimpleNamespace(pack_id="pack-1", pack_name="Pack 1")])
+    )
+    controller._get_prompt_pack_builder = lambda: builder  # type: ignore[assignment]
+    controller.get_preview_jobs = lambda: (_ for _ in ()).throw(  # type: ignore[assignment]
+        AssertionError("should not build the full preview")
+    )
+    controller._to_queue_job = lambda rec, **kwargs: Job(
+        job_id=rec.job_id,
+        run_mode=kwargs["run_mode"],
+        prompt_pack_id=kwargs.get("prompt_pack_id"),
+        config_snapshot=rec.to_queue_snapshot(),
+    )
+    controller._run_job = lambda job: {}  # type: ignore[assignment]
+
+    submitted = controller.submit_preview_jobs_to_queue()
+
+    assert submitted == 3
+    assert streamed["total"] == 3
+    assert streamed["source"] is None  # the stand-in pack entries are not persistable
+    assert pulled == ["job-0"]
+    assert [job.job_id for job in controller._job_service.submitted] == ["job-0"]
+
+
+def test_resume_pack_stream_skips_jobs_queued_before_restart():
+    controller = object.__new__(DummyPipelineController)
+    iter_calls: list[dict] = []
+
+    def _iter_jobs(entries, **kwargs):
+        iter_calls.append({"entries": entries, **kwargs})
+        for index in range(5):
+            yield NormalizedJobRecord(
+                job_id=f"job-{index}",
+                config={"prompt_pack_id": "pack-1"},
+                path_output_dir="out",
+                filename_template="{seed}",
+                prompt_pack_id="pack-1",
+            )
+
+    captured: dict = {}
+
+    def _submit(records, **kwargs):
+        captured.update(kwargs, records=[record.job_id for record in records])
+        return len(captured["records"])
+
+    controller._get_prompt_pack_builder = lambda: SimpleNamespace(iter_jobs=_iter_jobs)  # type: ignore[assignment]
+    controller._job_service = DummyJobService()
+    controller._submit_normalized_jobs = _submit  # type: ignore[assignment]
+    source = {
+        "kind": "prompt_pack",
+        "entries": [{"pack_id": "pack-1", "pack_name": "Pack 1", "config_snapshot": {}}],
+        "matrix_seed": 11,
+        "run_config": None,
+        "source": "gui",
+        "prompt_source": "pack",
+    }
+    entry = {"group_id": "g1", "source": source, "materialized": 3, "limit": None, "total": 5}
+
+    assert controller._resume_pack_stream(entry) == 2
+    assert captured["records"] == ["job-3", "job-4"]
+    assert captured["stream_resume"] is entry
+    assert captured["stream_source"] == source
+    assert iter_calls[0]["matrix_seed"] == 11
+    assert iter_calls[0]["entries"][0].pack_id == "pack-1"
@@ -0,0 +1,172 @@
+"""Local stand-ins for ComfyUI's ``/ws`` execution event socket.
+
+``FakeComfyWebSocket`` replays scripted frames to a single client.
+``FakeComfyHub`` accepts any number of clients and, like ComfyUI, keeps one
+socket per ``clientId``: a second connection with the same id drops the first.
+Prompts queued through the hub are only announced once ``release_after``
+prompts are queued, so tests can force executions to overlap.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+from collections.abc import Callable
+from urllib.parse import parse_qs, urlsplit
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def server_frame(opcode: int, payload: bytes, *, fin: bool = True) -> bytes:
+    header = bytearray([(0x80 if fin else 0) | opcode])
+    if len(payload) < 126:
+        header.append(len(payload))
+    else:
+        header.append(126)
+        header += struct.pack("!H", len(payload))
+    return bytes(header) + payload
+
+
+def event(event_type: str, **data) -> bytes:
+    return server_frame(0x1, json.dumps({"type": event_type, "data": data}).encode("utf-8"))
+
+
+def _accept_websocket(conn: socket.socket) -> str:
+    """Complete the server side of the handshake; returns the request path."""
+    request = b""
+    while b"\r\n\r\n" not in request:
+        chunk = conn.recv(4096)
+        if not chunk:
+            raise OSError("client closed during handshake")
+        request += chunk
+    lines = request.decode("latin-1").split("\r\n")
+    key = next(line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("sec-websocket-key"))
+    accept = base64.b64encode(hashlib.sha1((key + _GUID).encode()).digest()).decode()
+    conn.sendall(
+        (
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode("latin-1")
+    )
+    return lines[0].split(" ")[1]
+
+
+class FakeComfyWebSocket:
+    """Local Comfy /ws endpoint that replays scripted frames to each client."""
+
+    def __init__(self, frames: list[bytes], *, close_after: bool = False) -> None:
+        self.frames = frames
+        self.close_after = close_after
+        self.paths: list[str] = []
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._listener.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def _serve(self) -> None:
+        try:
+            conn, _ = self._listener.accept()
+        except OSError:
+            return
+        with conn:
+            self.paths.append(_accept_websocket(conn))
+            for frame in self.frames:
+                conn.sendall(frame)
+            if self.close_after:
+                return
+            try:
+                conn.settimeout(2.0)
+                conn.recv(64)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        self._listener.close()
+        self._thread.join(timeout=2.0)
+
+
+class FakeComfyHub:
+    """Multi-client Comfy /ws endpoint with a ``queue_prompt`` for test clients."""
+
+    def __init__(self, prompt_frames: Callable[[str], list[bytes]], *, release_after: int = 1) -> None:
+        self._prompt_frames = prompt_frames
+        self._release_after = release_after
+        self._lock = threading.Lock()
+        self._sockets: dict[str, socket.socket] = {}
+        self._queued: list[tuple[str, str]] = []
+        self.client_ids: list[str] = []
+        self.dropped_client_ids: list[str] = []
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._listener.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            try:
+                path = _accept_websocket(conn)
+            except OSError:
+                conn.close()
+                continue
+            client_id = parse_qs(urlsplit(path).query).get("clientId", [""])[0]
+            with self._lock:
+                self.client_ids.append(client_id)
+                previous = self._sockets.get(client_id)
+                self._sockets[client_id] = conn
+                if previous is not None:
+                    self.dropped_client_ids.append(client_id)
+            if previous is not None:
+                _close_socket(previous)
+
+    def queue_prompt(self, payload: dict) -> dict:
+        """Queue a prompt for ``payload["client_id"]``; returns a Comfy-style response."""
+        with self._lock:
+            prompt_id = f"p-{len(self._queued) + 1}"
+            self._queued.append((str(payload.get("client_id") or ""), prompt_id))
+            release = list(self._queued) if len(self._queued) == self._release_after else []
+        for client_id, queued_prompt_id in release:
+            with self._lock:
+                conn = self._sockets.get(client_id)
+            if conn is None:
+                continue
+            try:
+                for frame in self._prompt_frames(queued_prompt_id):
+                    conn.sendall(frame)
+            except OSError:
+                pass
+        return {"prompt_id": prompt_id}
+
+    def close(self) -> None:
+        self._listener.close()
+        self._thread.join(timeout=2.0)
+        with self._lock:
+            sockets, self._sockets = list(self._sockets.values()), {}
+        for conn in sockets:
+            _close_socket(conn)
+
+
+def _close_socket(conn: socket.socket) -> None:
+    try:
+        conn.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    conn.close()
+
+
+__all__ = ["FakeComfyHub", "FakeComfyWebSocket", "event", "server_frame"]
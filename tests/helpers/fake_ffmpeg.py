@@ -0,0 +1,51 @@
+"""Executable stand-in for FFmpeg's rawvideo encode and PPM decode pipes.
+
+The "video" it writes is a header line (``FAKEVIDEO <w> <h> <count>``)
+followed by the raw RGB frames, so a decode returns exactly what was encoded.
+``FAKE_FFMPEG_SLEEP`` makes it hang; ``FAKE_FFMPEG_FAIL`` makes it exit 1.
+Relies on a shebang line, so it only runs on POSIX.
+"""
+
+from __future__ import annotations
+
+import stat
+import sys
+from pathlib import Path
+
+_SCRIPT = """
+import os, sys, time
+
+args = sys.argv[1:]
+if os.environ.get("FAKE_FFMPEG_SLEEP"):
+    time.sleep(float(os.environ["FAKE_FFMPEG_SLEEP"]))
+if os.environ.get("FAKE_FFMPEG_FAIL"):
+    sys.stderr.write("Invalid data found when processing input\\n")
+    sys.exit(1)
+if "-version" in args:
+    print("ffmpeg version fake")
+    sys.exit(0)
+if "rawvideo" in args:
+    width, height = (int(value) for value in args[args.index("-s") + 1].split("x"))
+    data = sys.stdin.buffer.read()
+    count = len(data) // (width * height * 3)
+    with open(args[-1], "wb") as handle:
+        handle.write(f"FAKEVIDEO {width} {height} {count}\\n".encode())
+        handle.write(data)
+    sys.exit(0)
+if "image2pipe" in args:
+    with open(args[args.index("-i") + 1], "rb") as handle:
+        _magic, width, height, count = handle.readline().split()
+        width, height, count = int(width), int(height), int(count)
+        for _ in range(count):
+            sys.stdout.buffer.write(f"P6\\n{width} {height}\\n255\\n".encode())
+            sys.stdout.buffer.write(handle.read(width * height * 3))
+    sys.exit(0)
+sys.exit(2)
+"""
+
+
+def write_fake_ffmpeg(directory: Path) -> Path:
+    path = Path(directory) / "ffmpeg"
+    path.write_text(f"#!{sys.executable}\n{_SCRIPT}", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
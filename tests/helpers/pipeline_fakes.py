@@ -101,6 +101,7 @@ class FakePipeline:
             "images_processed": int(images_processed),
             "images_per_minute": 60000.0,
             "model_switches": 0,
+            "model_already_loaded": 0,
             "vae_switches": 0,
             "metrics_started": self._metrics_started,
         }
@@ -320,3 +320,23 @@ def test_cache_auto_invalidates_on_mtime_change():
         assert "job1" in job_ids
         assert "job2" in job_ids
         
+
+
+def test_appended_lines_are_tail_read_without_full_reload(tmp_path):
+    """External appends are folded in from the last offset, not by reparsing the file."""
+    history_file = tmp_path / "history.jsonl"
+    first = JobHistoryEntry(job_id="job1", created_at=datetime.now(), status=JobStatus.QUEUED)
+    history_file.write_text(first.to_json() + "\n", encoding="utf-8")
+    store = JSONLJobHistoryStore(history_file)
+    assert [job.job_id for job in store.list_jobs()] == ["job1"]
+
+    completed = JobHistoryEntry(job_id="job1", created_at=first.created_at, status=JobStatus.COMPLETED)
+    second = JobHistoryEntry(job_id="job2", created_at=datetime.now(), status=JobStatus.QUEUED)
+    with history_file.open("a", encoding="utf-8") as handle:
+        handle.write(completed.to_json() + "\n" + second.to_json() + "\n")
+
+    with patch.object(Path, "read_text", side_effect=AssertionError("full reload")):
+        jobs = {job.job_id: job for job in store.list_jobs()}
+
+    assert jobs["job1"].status == JobStatus.COMPLETED
+    assert set(jobs) == {"job1", "job2"}
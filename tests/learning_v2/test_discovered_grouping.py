@@ -220,3 +220,96 @@ def test_engine_candidates_are_ordered_deterministically():
     c1 = engine.build_candidates(records1)
     c2 = engine.build_candidates(records2)
     assert [c.group_id for c in c1] == [c.group_id for c in c2]
+
+
+# ---------------------------------------------------------------------------
+# Similarity (MinHash/LSH) grouping
+# ---------------------------------------------------------------------------
+
+
+def _prompt_record(seed: int, prompt: str, cfg: float = 7.0) -> ScanRecord:
+    from src.learning.output_scanner import _normalize_prompt, _sha256_short
+
+    rec = _make_record(seed=seed, cfg=cfg)
+    rec.positive_prompt = prompt
+    rec.prompt_hash = _sha256_short(f"{_normalize_prompt(prompt)}||".encode("utf-8"))
+    rec.dedupe_key = f"{rec.prompt_hash}-{seed}"
+    return rec
+
+
+_KNIGHT = "a fantasy knight, castle, dramatic lighting, masterpiece, highly detailed, 8k"
+
+
+def test_similarity_mode_merges_near_duplicate_prompts():
+    records = [
+        _prompt_record(1, _KNIGHT + ", <lora:detail:0.6>"),
+        _prompt_record(2, _KNIGHT + ", <lora:detail:0.8>"),
+        _prompt_record(3, _KNIGHT + ", <lora:detail:0.8>, sunset"),
+        _prompt_record(4, "a space explorer, nebula, stars"),
+        _prompt_record(5, "a space explorer, nebula, stars", cfg=5.0),
+    ]
+
+    assert GroupingEngine().build_candidates(records) == []
+
+    engine = GroupingEngine(similarity_threshold=0.6)
+    candidates = engine.build_candidates(records)
+    assert len(candidates) == 1
+    assert len(candidates[0].items) == 3
+    assert candidates[0].varying_fields == ["positive_prompt"]
+    assert candidates[0].group_id == engine.build_candidates(list(reversed(records)))[0].group_id
+
+
+def test_similarity_group_id_survives_new_neighbours():
+    engine = GroupingEngine(similarity_threshold=0.6)
+    singleton = [_prompt_record(seed, _KNIGHT + ", sunset") for seed in (1, 2, 3)]
+    singleton[2].cfg_scale = 5.0
+    stored = {c.group_id for c in engine.build_candidates(singleton)}
+    assert stored == {c.group_id for c in GroupingEngine().build_candidates(singleton)}
+
+    # A neighbour joins, including one whose key sorts before the stored one.
+    neighbours = [_prompt_record(seed, _KNIGHT + f", sunset, tag{seed}") for seed in range(4, 12)]
+    grown = singleton + neighbours
+    (merged,) = engine.build_candidates(grown)
+    assert merged.group_id not in stored  # the smallest key, and so the id, changed
+
+    # The stored bucket keeps its records; only the newcomers form a group.
+    (fresh,) = engine.build_candidates(grown, existing_group_ids=stored)
+    assert fresh.group_id not in stored
+    assert not stored & set(fresh.member_group_ids)
+    assert {i.seed for i in fresh.items} == set(range(4, 12))
+
+    # Once that group is stored too, a rescan creates nothing new.
+    stored |= set(fresh.member_group_ids)
+    assert engine.build_candidates(grown, existing_group_ids=stored) == []
+
+
+def test_similarity_mode_groups_new_neighbour_of_a_stored_group():
+    stored_records = [_prompt_record(seed, _KNIGHT + ", sunset") for seed in (1, 2, 3)]
+    stored_records[2].cfg_scale = 5.0
+    new_records = [_prompt_record(seed, _KNIGHT + ", sunrise", cfg=float(seed)) for seed in (4, 5, 6)]
+    stored = {c.group_id for c in GroupingEngine().build_candidates(stored_records)}
+
+    exact = GroupingEngine().build_candidates(stored_records + new_records, existing_group_ids=stored)
+    similar = GroupingEngine(similarity_threshold=0.6).build_candidates(
+        stored_records + new_records, existing_group_ids=stored
+    )
+
+    assert len(exact) == 1
+    assert [c.group_id for c in similar] == [exact[0].group_id]
+    assert {i.seed for i in similar[0].items} == {4, 5, 6}
+    assert similar[0].varying_fields == ["cfg_scale"]
+
+
+def test_similarity_mode_keeps_exact_group_ids_and_threshold():
+    records = _make_group() + [
+        _prompt_record(10, _KNIGHT),
+        _prompt_record(11, _KNIGHT.replace("castle", "forest")),
+        _prompt_record(12, _KNIGHT.replace("castle", "forest")),
+    ]
+
+    exact_ids = {c.group_id for c in GroupingEngine().build_candidates(records)}
+    similar = GroupingEngine(similarity_threshold=0.6).build_candidates(records)
+    strict = GroupingEngine(similarity_threshold=0.95).build_candidates(records)
+
+    assert {c.group_id for c in similar} > exact_ids
+    assert {c.group_id for c in strict} == exact_ids
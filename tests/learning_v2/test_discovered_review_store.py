@@ -22,6 +22,8 @@ from src.learning.discovered_review_models import (
     DiscoveredReviewExperiment,
     DiscoveredReviewHandle,
     DiscoveredReviewItem,
+    OutputDirectoryIndexEntry,
+    OutputManifestStat,
     OutputScanIndexEntry,
 )
 from src.learning.discovered_review_store import DiscoveredReviewStore
@@ -494,3 +496,18 @@ def test_store_list_handles_order_is_deterministic(store):
     handles1 = store.list_handles()
     handles2 = store.list_handles()
     assert [h.group_id for h in handles1] == [h.group_id for h in handles2]
+
+
+def test_store_directory_index_round_trip(store):
+    entry = OutputDirectoryIndexEntry(
+        path="output/r1/manifests",
+        mtime_ns=123,
+        subdirs=("nested",),
+        images=("img.png",),
+        manifests={"img.json": OutputManifestStat(size=10, mtime_ns=456, scan_key="k")},
+    )
+    store.save_directory_index({entry.path: entry})
+
+    loaded = store.load_directory_index()
+
+    assert loaded == {entry.path: entry}
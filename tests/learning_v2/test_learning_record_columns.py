@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.learning.learning_record_columns import LearningRecordColumns
+from src.learning.recommendation_engine import RecommendationEngine
+
+
+def _record(rating: int, *, sampler: str = "Euler a", cfg: float = 7.0, prompt: str = "castle") -> dict:
+    return {
+        "timestamp": "2026-03-10T21:00:00",
+        "primary_sampler": sampler,
+        "primary_scheduler": "Karras",
+        "primary_steps": 20,
+        "primary_cfg_scale": cfg,
+        "base_config": {"prompt": prompt},
+        "metadata": {
+            "record_kind": "learning_experiment_rating",
+            "user_rating": rating,
+            "variable_under_test": "CFG Scale",
+            "variant_value": cfg,
+        },
+    }
+
+
+def _append(path: Path, records: list[dict]) -> None:
+    with open(path, "a", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record) + "\n")
+
+
+def _random_record(rng: random.Random) -> dict:
+    metadata = {
+        "record_kind": rng.choice(["learning_experiment_rating", "review_tab_feedback", ""]),
+        "user_rating": rng.choice([1, 2, 3, 4, 5, 3.5]),
+        "stage": rng.choice(["txt2img", "img2img"]),
+        "variable_under_test": rng.choice(["", "CFG Scale", "Steps", "LoRA Strength"]),
+        "variant_value": rng.choice([None, 5, 7.0, 0.5]),
+    }
+    if rng.random() < 0.5:
+        metadata["subscores"] = {"anatomy": rng.randint(1, 5), "composition": rng.randint(1, 5)}
+        metadata["rating_context"] = {"has_people": rng.random() < 0.5}
+    if rng.random() < 0.5:
+        metadata["adaptive_refinement"] = {"policy_id": rng.choice(["", "p1", "p2"]), "scale_band": "s"}
+    if rng.random() < 0.5:
+        metadata["secondary_motion"] = {
+            "status": rng.choice(["applied", "skipped"]),
+            "backend_id": rng.choice(["", "b1", "b2"]),
+        }
+    return {
+        "timestamp": "2026-03-10T21:00:00",
+        "base_config": {"prompt": rng.choice(["a knight, castle", "a woman, portrait", "castle"])},
+        "primary_sampler": rng.choice(["Euler", "DPM"]),
+        "primary_scheduler": rng.choice(["Karras", "Normal"]),
+        "primary_steps": rng.choice([20, 20.0, 30]),
+        "primary_cfg_scale": rng.choice([7.0, 5.5]),
+        "metadata": metadata,
+    }
+
+
+def test_refresh_ingests_only_appended_lines(tmp_path: Path) -> None:
+    path = tmp_path / "records.jsonl"
+    scored_batches: list[int] = []
+    engine = RecommendationEngine(path, columnar=False)
+
+    def _scorer(records: list[dict]) -> list[dict]:
+        scored_batches.append(len(records))
+        return engine._score_records(records)
+
+    columns = LearningRecordColumns(path, _scorer)
+    _append(path, [_record(4), _record(5)])
+    assert columns.refresh() is True
+    assert columns.refresh() is False
+
+    _append(path, [_record(3, sampler="DPM")])
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(_record(2))[:20])
+    assert columns.refresh() is True
+
+    assert len(columns) == 3
+    assert sum(scored_batches) == 3
+    assert columns.reload_count == 0
+    assert columns.read_scored_row(2)["primary_sampler"] == "DPM"
+
+
+def test_refresh_reloads_when_ingested_bytes_are_rewritten(tmp_path: Path) -> None:
+    path = tmp_path / "records.jsonl"
+    engine = RecommendationEngine(path, columnar=True)
+    _append(path, [_record(5, sampler="Euler a"), _record(5, sampler="Euler a")])
+    assert engine.recommend("castle", "txt2img").get_best_for_parameter("sampler").recommended_value == "Euler a"
+
+    path.write_text("".join(json.dumps(_record(4, sampler="DPM")) + "\n" for _ in range(3)), encoding="utf-8")
+    best = engine.recommend("castle", "txt2img").get_best_for_parameter("sampler")
+
+    assert best.recommended_value == "DPM"
+    assert best.sample_count == 3
+    assert engine._columns.reload_count == 1
+
+
+def test_columnar_recommendations_match_record_dict_path(tmp_path: Path) -> None:
+    rng = random.Random(7)
+    path = tmp_path / "records.jsonl"
+    _append(path, [_random_record(rng) for _ in range(80)])
+    columnar = RecommendationEngine(path, columnar=True)
+    queries = [
+        ("a woman, portrait", "txt2img", None, None),
+        ("castle", "img2img", {"policy_id": "p1", "scale_band": "s"}, None),
+        ("a knight, castle", "txt2img", None, {"status": "applied", "backend_id": "b1"}),
+    ]
+
+    for round_index in range(2):
+        reference = RecommendationEngine(path, columnar=False)
+        for prompt, stage, refinement, motion in queries:
+            expected = reference.recommend(prompt, stage, refinement, motion)
+            actual = columnar.recommend(prompt, stage, refinement, motion)
+            assert actual.evidence_tier == expected.evidence_tier
+            assert [rec.to_dict() for rec in actual.recommendations] == [
+                rec.to_dict() for rec in expected.recommendations
+            ]
+        _append(path, [_random_record(rng) for _ in range(10)])
+
+    assert columnar._columns.reload_count == 0
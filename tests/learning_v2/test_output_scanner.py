@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -279,3 +280,81 @@ def test_scanner_scan_incremental_finds_artifacts_across_output_routes(tmp_path)
 
     artifact_names = {Path(record.artifact_path).name for record in records}
     assert artifact_names == {"pipe001.png", "test001.png"}
+
+
+# ---------------------------------------------------------------------------
+# OutputScanner directory index
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def trusted_mtimes(monkeypatch):
+    """Trust freshly written mtimes so the directory index is reused in tests."""
+    monkeypatch.setattr("src.learning.output_scanner._RACY_MTIME_WINDOW_NS", -10**12)
+
+
+def test_scanner_reuses_directory_index_for_unchanged_tree(tmp_path, trusted_mtimes, monkeypatch):
+    for i in range(3):
+        _make_scan_fixture(tmp_path, f"img{i:03d}", seed=i)
+    first = OutputScanner(tmp_path)
+    assert len(first.scan_incremental()) == 3
+    assert first.last_scan_stats["manifests_hashed"] == 3
+
+    def _no_listing(*_args, **_kwargs):
+        raise AssertionError("unchanged directories should not be listed")
+
+    monkeypatch.setattr(OutputScanner, "_list_directory", staticmethod(_no_listing))
+    second = OutputScanner(
+        tmp_path,
+        scan_index=first.get_updated_index(),
+        directory_index=first.get_updated_directory_index(),
+    )
+
+    assert len(second.scan_incremental()) == 3
+    assert second.last_scan_stats["directories_listed"] == 0
+    assert second.last_scan_stats["manifests_hashed"] == 0
+
+
+def test_scanner_directory_index_picks_up_new_and_rewritten_manifests(tmp_path, trusted_mtimes):
+    mp, ip = _make_scan_fixture(tmp_path, "img000")
+    first = OutputScanner(tmp_path)
+    record = first.scan_incremental()[0]
+    first.mark_group_assignment(str(ip), _manifest_scan_key(mp), group_id="g-1", eligible=True)
+
+    _make_scan_fixture(tmp_path, "img001", seed=99)
+    _make_manifest(mp, steps=40)
+    stat = mp.stat()
+    os.utime(mp, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = OutputScanner(
+        tmp_path,
+        scan_index=first.get_updated_index(),
+        directory_index=first.get_updated_directory_index(),
+    )
+    records = second.scan_incremental()
+
+    assert record.steps == 20
+    assert sorted((Path(r.artifact_path).name, r.steps) for r in records) == [
+        ("img000.png", 40),
+        ("img001.png", 20),
+    ]
+    assert second.last_scan_stats["manifests_hashed"] == 2
+
+
+def test_scanner_directory_index_matches_glob_scan_and_parallel_mode(tmp_path):
+    _make_scan_fixture(tmp_path / "Pipeline", "pipe001")
+    _make_scan_fixture(tmp_path / "Testing", "test001")
+    _make_manifest(tmp_path / "Testing" / "run1" / "manifests" / "orphan.json")
+    loose = tmp_path / "SVD" / "manifests"
+    _make_manifest(loose / "kept.json")
+    _make_image(loose / "kept.webp")
+
+    serial = OutputScanner(tmp_path).scan_incremental()
+    parallel = OutputScanner(tmp_path, max_workers=4).scan_incremental()
+
+    expected = [
+        str(tmp_path / "Pipeline" / "run1" / "pipe001.png"),
+        str(loose / "kept.webp"),
+        str(tmp_path / "Testing" / "run1" / "test001.png"),
+    ]
+    assert [r.artifact_path for r in serial] == expected
+    assert [r.artifact_path for r in parallel] == expected
@@ -0,0 +1,52 @@
+# Tests: Learning subsystem
+
+"""Tests for MinHash signatures and LSH prompt clustering."""
+
+from __future__ import annotations
+
+import random
+
+import src.learning.prompt_minhash as prompt_minhash
+from src.learning.prompt_minhash import MinHasher, PromptLSHIndex, jaccard, lsh_band_layout, prompt_tokens
+
+
+def test_prompt_tokens_strip_lora_and_attention_weights():
+    left = prompt_tokens("A Knight,  (castle:1.2), <lora:detail:0.6>", "blurry")
+    right = prompt_tokens("a knight, castle, <LORA:detail:1.0>", "Blurry")
+
+    assert left == right == frozenset({"a knight", "castle", "<lora:detail>", "neg:blurry"})
+
+
+def test_minhash_signature_is_deterministic_and_estimates_jaccard(monkeypatch):
+    left = frozenset(f"tag{i}" for i in range(40))
+    right = frozenset(f"tag{i}" for i in range(10, 50))
+    hasher = MinHasher(num_perm=256)
+    signature = hasher.signature(left)
+    other = hasher.signature(right)
+
+    monkeypatch.setattr(prompt_minhash, "np", None)
+    assert MinHasher(num_perm=256).signature(left) == signature
+
+    estimate = sum(a == b for a, b in zip(signature, other)) / 256
+    assert abs(estimate - jaccard(left, right)) < 0.12
+
+
+def test_lsh_index_clusters_only_verified_similar_prompts():
+    rng = random.Random(3)
+    vocabulary = [f"tag{i}" for i in range(500)]
+    index = PromptLSHIndex(threshold=0.6)
+    expected: list[set[str]] = []
+    for family in range(30):
+        base = rng.sample(vocabulary, 12)
+        members = {f"{family}-{member}" for member in range(3)}
+        for member in sorted(members):
+            tokens = list(base)
+            tokens[rng.randrange(12)] = f"{member}-extra"
+            index.add(member, frozenset(tokens))
+        expected.append(members)
+
+    clusters = index.clusters()
+
+    assert sorted(map(sorted, expected)) == sorted(map(sorted, clusters))
+    assert index.compared_pairs < 30 * 3 * 3
+    assert lsh_band_layout(64, 0.6) == (index.bands, index.rows)
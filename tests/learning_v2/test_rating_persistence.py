@@ -144,3 +144,135 @@ def test_get_ratings_missing_fields():
         ratings = writer.get_ratings_for_experiment("exp")
         assert len(ratings) == 1
         assert ratings["b.png"] == 5
+
+
+def _rating_record(image_path: str, rating: int, *, variant_value=7.0):
+    from src.learning.learning_record import LearningRecord
+
+    return LearningRecord(
+        run_id=image_path,
+        timestamp="2026-03-10T21:00:00",
+        base_config={},
+        variant_configs=[],
+        randomizer_mode="",
+        randomizer_plan_size=0,
+        primary_model="model",
+        primary_sampler="Euler a",
+        primary_scheduler="Karras",
+        primary_steps=20,
+        primary_cfg_scale=7.0,
+        metadata={
+            "experiment_name": "exp",
+            "image_path": image_path,
+            "user_rating": rating,
+            "variant_value": variant_value,
+        },
+    )
+
+
+def test_rating_index_picks_up_appended_records():
+    """Verify the index sees records from append_record and from other writers."""
+    from src.learning.learning_record import LearningRecordWriter
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "records.jsonl"
+        writer = LearningRecordWriter(path)
+        writer.append_record(_rating_record("a.png", 4))
+        assert writer.get_ratings_for_experiment("exp") == {"a.png": 4}
+
+        writer.append_record(_rating_record("b.png", 2))
+        with open(path, "a") as f:
+            f.write(json.dumps({"metadata": {"experiment_name": "exp", "image_path": "c.png", "user_rating": 5}}) + "\n")
+
+        assert writer.get_ratings_for_experiment("exp") == {"a.png": 4, "b.png": 2, "c.png": 5}
+        assert writer.get_average_rating_for_variant("exp", 7.0) == 3.0
+        assert writer.get_rated_images("exp", ["a.png", "c.png", "d.png"]) == {"a.png", "c.png"}
+
+
+def test_rating_index_rebuilds_after_rewrite():
+    """Verify a rewritten records file is re-indexed from the start."""
+    from src.learning.learning_record import LearningRecordWriter
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "records.jsonl"
+        writer = LearningRecordWriter(path)
+        writer.append_record(_rating_record("a.png", 4))
+        writer.append_record(_rating_record("b.png", 5))
+        assert writer.is_image_rated("exp", "a.png") is True
+
+        path.write_text(
+            json.dumps({"metadata": {"experiment_name": "exp", "image_path": "z.png", "user_rating": 1}}) + "\n",
+            encoding="utf-8",
+        )
+
+        assert writer.get_ratings_for_experiment("exp") == {"z.png": 1}
+        assert writer.is_image_rated("exp", "a.png") is False
+
+
+def test_get_average_rating_for_unhashable_variant():
+    """Verify list-valued variants (e.g. LoRA stacks) are averaged like scalars."""
+    from src.learning.learning_record import LearningRecordWriter
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "records.jsonl"
+        writer = LearningRecordWriter(path)
+        writer.append_record(_rating_record("a.png", 3, variant_value=["lora_a", 0.5]))
+        writer.append_record(_rating_record("b.png", 5, variant_value=["lora_a", 0.5]))
+        writer.append_record(_rating_record("c.png", 1, variant_value=["lora_b", 0.5]))
+
+        assert writer.get_average_rating_for_variant("exp", ["lora_a", 0.5]) == 4.0
+
+
+def test_group_commit_shares_fsync_and_keeps_records_readable():
+    """Verify group commit batches fsyncs without hiding records from readers."""
+    from src.learning.learning_record import LearningRecordWriter
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "records.jsonl"
+        path.write_text('{"metadata": {"experiment_name": "exp", "image_path": "torn.png"', encoding="utf-8")
+        writer = LearningRecordWriter(path, commit_window_ms=60_000, commit_max_records=1000)
+        try:
+            for index in range(20):
+                writer.append_record(_rating_record(f"{index}.png", 4))
+
+            assert writer.fsync_count == 0
+            assert len(writer.get_ratings_for_experiment("exp")) == 20
+
+            writer.flush()
+            assert writer.fsync_count == 1
+            lines = path.read_text(encoding="utf-8").splitlines()
+            assert lines[0].endswith('"torn.png"')
+            assert [json.loads(line)["metadata"]["image_path"] for line in lines[1:]] == [
+                f"{index}.png" for index in range(20)
+            ]
+        finally:
+            writer.close()
+
+        writer.append_record(_rating_record("late.png", 5))
+        assert writer.fsync_count == 2
+
+
+def test_group_commit_fsyncs_when_record_limit_reached():
+    """Verify the committer fsyncs early once max records are pending."""
+    import time
+
+    from src.learning.learning_record import LearningRecordWriter
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writer = LearningRecordWriter(Path(tmpdir) / "records.jsonl", commit_window_ms=60_000, commit_max_records=3)
+        try:
+            for index in range(3):
+                writer.append_record(_rating_record(f"{index}.png", 3))
+            deadline = time.monotonic() + 5.0
+            while writer.fsync_count == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert writer.fsync_count == 1
+
+            committer = writer._committer
+            if committer is not None:
+                assert not committer.daemon
+                committer.join(timeout=5.0)
+                assert not committer.is_alive()
+            assert writer._committer is None
+        finally:
+            writer.close()
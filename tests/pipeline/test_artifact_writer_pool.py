@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.pipeline.artifact_writer_pool import ArtifactWriterPool
+from src.pipeline.executor import Pipeline
+
+
+class _NoOpStructuredLogger:
+    def __getattr__(self, _name: str) -> Any:
+        def _noop(*_args: Any, **_kwargs: Any) -> None:
+            pass
+
+        return _noop
+
+
+def test_app_shutdown_flushes_pending_writes(monkeypatch) -> None:
+    from src.pipeline import artifact_writer_pool
+    from src.services import persistence_worker
+
+    monkeypatch.setattr(artifact_writer_pool, "_POOL", None)
+    monkeypatch.setattr(persistence_worker, "_shutdown_flushes", [])
+    written: list[int] = []
+
+    def _write(index: int) -> None:
+        time.sleep(0.02)
+        written.append(index)
+
+    pool = artifact_writer_pool.get_artifact_writer_pool()
+    futures = [pool.submit(_write, index) for index in range(4)]
+    persistence_worker._run_shutdown_flushes()
+
+    assert all(future.done() for future in futures)
+    assert sorted(written) == [0, 1, 2, 3]
+    assert artifact_writer_pool._POOL is None
+
+
+def test_submit_blocks_when_max_pending_writes_are_in_flight() -> None:
+    pool = ArtifactWriterPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+    first = pool.submit(release.wait)
+    submitted = threading.Event()
+
+    def _submit_second() -> None:
+        pool.submit(lambda: None)
+        submitted.set()
+
+    thread = threading.Thread(target=_submit_second)
+    thread.start()
+    try:
+        assert not submitted.wait(0.1)
+        release.set()
+        assert submitted.wait(2.0)
+        assert first.result(timeout=2.0) is True
+    finally:
+        release.set()
+        thread.join(timeout=2.0)
+        pool.shutdown()
+
+
+def test_batch_saves_record_host_save_time_per_stage(monkeypatch, tmp_path: Path) -> None:
+    saved_on: list[str] = []
+
+    def _fake_save(image_b64: str, image_path: Path, metadata_builder=None) -> Path:
+        saved_on.append(threading.current_thread().name)
+        time.sleep(0.01)
+        return image_path
+
+    monkeypatch.setattr("src.pipeline.executor.save_image_from_base64", _fake_save)
+    pipeline = Pipeline(client=object(), structured_logger=_NoOpStructuredLogger())
+    pipeline._begin_run_metrics()
+    items = [(f"b64-{i}", tmp_path / f"img_{i}.png", None) for i in range(4)]
+
+    results = pipeline._await_stage_saves("txt2img", pipeline._save_stage_images("txt2img", items))
+    pipeline._record_stage_timing("txt2img", gpu_busy_seconds=1.5)
+    metrics = pipeline.get_run_efficiency_metrics(images_processed=4)
+
+    assert results == [path for _, path, _ in items]
+    assert all(name.startswith("artifact_writer") for name in saved_on)
+    txt2img = metrics["stage_timing"]["txt2img"]
+    assert txt2img["images_saved"] == 4
+    assert txt2img["gpu_busy_seconds"] == 1.5
+    assert txt2img["host_save_seconds"] >= 0.04
+    assert txt2img["host_save_wait_seconds"] > 0
+    assert metrics["gpu_busy_seconds"] == 1.5
+
+
+def test_deferred_stage_save_overlaps_and_waits_only_when_settled(monkeypatch, tmp_path: Path) -> None:
+    release = threading.Event()
+
+    def _slow_save(image_b64: str, image_path: Path, metadata_builder=None) -> Path | None:
+        release.wait(2.0)
+        return None if image_b64 == "bad" else image_path.resolve()
+
+    monkeypatch.setattr("src.pipeline.executor.save_image_from_base64", _slow_save)
+    pipeline = Pipeline(client=object(), structured_logger=_NoOpStructuredLogger())
+    pipeline._begin_run_metrics()
+    finalized: list[Path | None] = []
+
+    committed: list[Path] = []
+
+    def _finalize(path: Path | None) -> Path | None:
+        finalized.append(path)
+        return path
+
+    pipeline.begin_deferred_stage_saves()
+    for name in ("good", "bad"):
+        save = pipeline._save_stage_image("img2img", name, tmp_path / f"{name}.png")
+        pipeline._complete_stage_save(
+            "img2img", save, tmp_path / f"{name}.png", _finalize, lambda path, _result: committed.append(path)
+        )
+
+    # Both stages returned while their writes were still blocked; nothing is
+    # committed (manifests etc.) before the image is on disk.
+    assert finalized == [(tmp_path / "good.png").resolve(), (tmp_path / "bad.png").resolve()]
+    assert committed == []
+    time.sleep(0.05)
+    release.set()
+    failed = pipeline.end_deferred_stage_saves()
+
+    assert failed == {str((tmp_path / "bad.png").resolve())}
+    assert committed == [(tmp_path / "good.png").resolve()]
+    timing = pipeline.get_run_efficiency_metrics(images_processed=2)["stage_timing"]["img2img"]
+    assert timing["images_saved"] == 2
+    assert timing["host_save_seconds"] >= 0.04
+    assert timing["host_save_wait_seconds"] < timing["host_save_seconds"]
+
+    # Outside a deferred window the stage waits and sees the failure itself.
+    save = pipeline._save_stage_image("img2img", "bad", tmp_path / "sync.png")
+    assert pipeline._complete_stage_save("img2img", save, tmp_path / "sync.png", lambda path: path) is None
+
+
+def test_deferred_saves_to_the_same_name_get_distinct_paths(monkeypatch, tmp_path: Path) -> None:
+    from src.utils import file_io
+    from src.utils.file_io import get_unique_output_path
+
+    release = threading.Event()
+    written: list[Path] = []
+
+    def _slow_save(image_b64: str, image_path: Path, metadata_builder=None) -> Path:
+        release.wait(2.0)
+        image_path.write_bytes(image_b64.encode("utf-8"))
+        written.append(image_path)
+        return image_path
+
+    monkeypatch.setattr("src.pipeline.executor.save_image_from_base64", _slow_save)
+    pipeline = Pipeline(client=object(), structured_logger=_NoOpStructuredLogger())
+    pipeline.begin_deferred_stage_saves()
+    paths = []
+    for payload in ("first", "second"):
+        path = get_unique_output_path(tmp_path / "adetailer.png", reserve=True)
+        paths.append(path)
+        save = pipeline._save_stage_image("adetailer", payload, path)
+        pipeline._complete_stage_save("adetailer", save, path, lambda saved: saved)
+    release.set()
+
+    assert pipeline.end_deferred_stage_saves() == set()
+    assert [path.name for path in paths] == ["adetailer.png", "adetailer_copy1.png"]
+    assert sorted(path.read_text() for path in paths) == ["first", "second"]
+    # Reservations are released once the writes finish.
+    assert not file_io._PENDING_OUTPUT_PATHS & {file_io._output_path_key(path) for path in paths}
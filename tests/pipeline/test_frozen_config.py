@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+
+from src.pipeline.config_merger_v2 import (
+    ConfigMergerV2,
+    StageOverrideFlags,
+    StageOverridesBundle,
+    Txt2ImgOverrides,
+)
+from src.pipeline.frozen_config import FrozenConfig, freeze, thaw
+from src.pipeline.job_builder_v2 import JobBuilderV2
+
+
+def _base() -> dict:
+    return {
+        "txt2img": {"model": "base.safetensors", "steps": 20, "cfg_scale": 7.0},
+        "adetailer": {"enabled": True, "models": ["face_yolov8n.pt"]},
+        "pipeline": {"output_dir": "output"},
+    }
+
+
+def test_freeze_thaw_round_trip_is_independent() -> None:
+    original = _base()
+    frozen = freeze(original)
+
+    assert isinstance(frozen, FrozenConfig)
+    assert frozen == original
+    restored = thaw(frozen)
+    assert restored == original
+    restored["txt2img"]["steps"] = 99
+    restored["adetailer"]["models"].append("hand.pt")
+    assert frozen["txt2img"]["steps"] == 20
+    assert list(frozen["adetailer"]["models"]) == ["face_yolov8n.pt"]
+    assert json.loads(json.dumps(restored))["txt2img"]["steps"] == 99
+
+
+def test_set_in_and_layer_share_untouched_sections() -> None:
+    frozen = freeze(_base())
+
+    updated = frozen.set_in(["txt2img", "steps"], 30)
+    layered = frozen.layer({"adetailer": {"enabled": False}})
+
+    assert frozen["txt2img"]["steps"] == 20
+    assert updated["txt2img"]["steps"] == 30
+    assert updated["adetailer"] is frozen["adetailer"]
+    assert layered["adetailer"]["enabled"] is False
+    assert layered["adetailer"]["models"] is frozen["adetailer"]["models"]
+    assert layered["txt2img"] is frozen["txt2img"]
+    with pytest.raises(TypeError):
+        frozen["txt2img"]["steps"] = 1  # type: ignore[index]
+
+
+def test_deepcopy_materializes_plain_containers() -> None:
+    copied = copy.deepcopy({"config": freeze(_base())})
+
+    assert type(copied["config"]) is dict
+    assert type(copied["config"]["adetailer"]["models"]) is list
+
+
+def test_merger_returns_frozen_result_sharing_untouched_sections() -> None:
+    base = freeze({**_base(), "steps": 20})
+    bundle = StageOverridesBundle(txt2img=Txt2ImgOverrides(steps=40))
+
+    merged = ConfigMergerV2.merge_pipeline(
+        base_config=base,
+        stage_overrides=bundle,
+        override_flags=StageOverrideFlags(txt2img_override_enabled=True),
+    )
+
+    assert isinstance(merged, FrozenConfig)
+    assert merged["steps"] == 40
+    assert merged["adetailer"] is base["adetailer"]
+    assert base["steps"] == 20
+
+
+def test_config_overrides_copy_only_the_override_path() -> None:
+    base = {"txt2img": freeze({"steps": 20, "cfg_scale": 7.0}), "adetailer": freeze({"enabled": True})}
+
+    result = JobBuilderV2()._apply_config_overrides(base, {"txt2img.steps": 35})
+
+    assert result["txt2img"]["steps"] == 35
+    assert result["adetailer"] is base["adetailer"]
+    assert base["txt2img"]["steps"] == 20
@@ -17,6 +17,8 @@ from src.services.queue_store_v2 import (
     QueueSnapshotV1,
     UnsupportedQueueSchemaError,
     delete_queue_snapshot,
+    get_queue_journal_path,
+    get_queue_store_stats,
     load_queue_snapshot,
     move_job_down,
     move_job_up,
@@ -319,6 +321,152 @@ class TestQueuePersistenceFlags:
         assert loaded.jobs[0]["queue_schema"] == SCHEMA_VERSION
 
 
+def _queue_entry(queue_id: str, *, status: str = "queued", priority: int = 0) -> dict:
+    return {
+        "queue_id": queue_id,
+        "njr_snapshot": {"normalized_job": {"job_id": queue_id, "prompt": "x" * 200}},
+        "priority": priority,
+        "status": status,
+        "created_at": "2025-01-01T00:00:00Z",
+        "queue_schema": SCHEMA_VERSION,
+        "metadata": {"source": "test"},
+    }
+
+
+class TestQueueJournal:
+    def test_mutations_append_deltas_and_replay(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "queue_state.json"
+        jobs = [_queue_entry(qid) for qid in ("a", "b", "c")]
+        assert save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+        checkpoint = state_file.read_text(encoding="utf-8")
+
+        jobs.append(_queue_entry("d"))
+        assert save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+        jobs = [jobs[2], jobs[0], jobs[1], jobs[3]]  # move "c" to the front
+        assert save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+        jobs = [job for job in jobs if job["queue_id"] != "a"]
+        jobs[0] = dict(jobs[0], priority=5)
+        assert save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs), paused=True), state_file)
+
+        assert state_file.read_text(encoding="utf-8") == checkpoint
+        ops = [
+            json.loads(line)["op"]
+            for line in get_queue_journal_path(state_file).read_text(encoding="utf-8").splitlines()
+        ]
+        assert ops == ["add", "move", "remove", "update", "flags"]
+
+        loaded = load_queue_snapshot(state_file)
+        assert loaded is not None
+        assert [job["queue_id"] for job in loaded.jobs] == ["c", "b", "d"]
+        assert loaded.jobs[0]["priority"] == 5
+        assert loaded.paused is True
+
+    def test_unchanged_save_writes_nothing(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "queue_state.json"
+        snapshot = QueueSnapshotV1(jobs=[_queue_entry("a")])
+        save_queue_snapshot(snapshot, state_file)
+        save_queue_snapshot(snapshot, state_file)
+
+        stats = get_queue_store_stats(state_file)
+        assert stats["noop_saves"] == 1
+        assert not get_queue_journal_path(state_file).exists()
+
+    def test_journal_compacts_into_checkpoint(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr("src.services.queue_store_v2.JOURNAL_COMPACT_MAX_RECORDS", 3)
+        state_file = tmp_path / "queue_state.json"
+        jobs: list[dict] = []
+        for index in range(5):
+            jobs.append(_queue_entry(f"job-{index}"))
+            assert save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+
+        stats = get_queue_store_stats(state_file)
+        assert stats["compactions"] == 1
+        assert stats["journal_records_pending"] == 0
+        loaded = load_queue_snapshot(state_file)
+        assert loaded is not None
+        assert [job["queue_id"] for job in loaded.jobs] == [f"job-{i}" for i in range(5)]
+
+    def test_stale_journal_is_ignored_after_external_rewrite(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "queue_state.json"
+        save_queue_snapshot(QueueSnapshotV1(jobs=[_queue_entry("a")]), state_file)
+        save_queue_snapshot(QueueSnapshotV1(jobs=[_queue_entry("a"), _queue_entry("b")]), state_file)
+        payload = {"jobs": [_queue_entry("z")], "schema_version": SCHEMA_VERSION}
+        state_file.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+
+        loaded = load_queue_snapshot(state_file)
+        assert loaded is not None
+        assert [job["queue_id"] for job in loaded.jobs] == ["z"]
+
+        # The next save cannot diff against the replaced files, so it rewrites the checkpoint.
+        save_queue_snapshot(QueueSnapshotV1(jobs=[_queue_entry("z"), _queue_entry("y")]), state_file)
+        assert not get_queue_journal_path(state_file).exists()
+        reloaded = load_queue_snapshot(state_file)
+        assert [job["queue_id"] for job in reloaded.jobs] == ["z", "y"]
+
+    def test_journal_write_cost_is_smaller_than_checkpoint(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "queue_state.json"
+        jobs = [_queue_entry(f"job-{index}") for index in range(200)]
+        save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+        checkpoint_bytes = get_queue_store_stats(state_file)["last_write_bytes"]
+
+        save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs[1:])), state_file)
+
+        stats = get_queue_store_stats(state_file)
+        assert stats["last_write_kind"] == "journal"
+        assert stats["last_write_bytes"] * 100 < checkpoint_bytes
+        assert stats["avg_bytes_per_mutation"] is not None
+
+    def test_delete_removes_journal(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "queue_state.json"
+        save_queue_snapshot(QueueSnapshotV1(jobs=[_queue_entry("a")]), state_file)
+        save_queue_snapshot(QueueSnapshotV1(jobs=[]), state_file)
+        assert get_queue_journal_path(state_file).exists()
+
+        assert delete_queue_snapshot(state_file) is True
+        assert not get_queue_journal_path(state_file).exists()
+        assert load_queue_snapshot(state_file) is None
+
+    def test_append_after_torn_journal_line_starts_a_new_line(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "queue_state.json"
+        jobs = [_queue_entry("a")]
+        save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+        jobs.append(_queue_entry("b"))
+        save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+        journal_path = get_queue_journal_path(state_file)
+        with journal_path.open("ab") as handle:
+            handle.write(b'{"journal_id":"torn","op":"rem')  # crash mid-append
+
+        assert [job["queue_id"] for job in load_queue_snapshot(state_file).jobs] == ["a", "b"]
+        jobs.append(_queue_entry("c"))
+        save_queue_snapshot(QueueSnapshotV1(jobs=list(jobs)), state_file)
+
+        assert journal_path.read_bytes().endswith(b"\n")
+        loaded = load_queue_snapshot(state_file)
+        assert [job["queue_id"] for job in loaded.jobs] == ["a", "b", "c"]
+
+    def test_virtual_group_cursors_are_journaled_and_replayed(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "queue_state.json"
+        source = {"kind": "prompt_pack", "entries": [{"pack_id": "p", "prompt_text": "x" * 500}]}
+        group = {"group_id": "g1", "source": source, "materialized": 32, "limit": None, "total": 100}
+        save_queue_snapshot(QueueSnapshotV1(jobs=[_queue_entry("a")], virtual_groups=[group]), state_file)
+
+        moved = dict(group, materialized=64)
+        other = {"group_id": "g2", "source": {"kind": "prompt_pack", "entries": []}, "materialized": 0}
+        save_queue_snapshot(QueueSnapshotV1(jobs=[_queue_entry("a")], virtual_groups=[moved, other]), state_file)
+        save_queue_snapshot(QueueSnapshotV1(jobs=[_queue_entry("a")], virtual_groups=[moved]), state_file)
+
+        records = [
+            json.loads(line)
+            for line in get_queue_journal_path(state_file).read_text(encoding="utf-8").splitlines()
+        ]
+        assert [record["op"] for record in records] == ["group_update", "group", "group_remove"]
+        assert records[0]["fields"] == {"materialized": 64}  # the source spec is not rewritten
+
+        loaded = load_queue_snapshot(state_file)
+        assert loaded is not None
+        assert loaded.virtual_groups == [moved]
+
+
 def test_queue_history_snapshots_share_njr(tmp_path: Path, monkeypatch) -> None:
     class _SyncWorker:
         def enqueue(self, task, critical: bool = False) -> bool:
@@ -486,3 +634,33 @@ def test_job_execution_controller_ignores_running_snapshot_entries(monkeypatch)
 
     assert controller.auto_run_enabled is True
     assert controller.get_queue().list_jobs() == []
+
+
+def test_job_execution_controller_keeps_restored_virtual_groups_until_resumed(monkeypatch) -> None:
+    restored = {"group_id": "g1", "source": {"kind": "prompt_pack"}, "materialized": 8, "total": 20}
+
+    def fake_load(*_, **__) -> QueueSnapshotV1:
+        return QueueSnapshotV1(virtual_groups=[restored])
+
+    saved_snapshots: list[QueueSnapshotV1] = []
+    monkeypatch.setattr("src.controller.job_execution_controller.load_queue_snapshot", fake_load)
+    monkeypatch.setattr(
+        "src.controller.job_execution_controller.save_queue_snapshot",
+        lambda snapshot: saved_snapshots.append(snapshot) or True,
+    )
+
+    controller = JobExecutionController(execute_job=lambda job: {"ok": True})
+    assert controller.get_restored_virtual_job_groups() == [restored]
+    assert saved_snapshots[-1].virtual_groups == [restored]
+
+    live = dict(restored, materialized=16)
+    controller.set_virtual_job_group_provider(lambda: [live])
+    controller.persist_queue_state()
+    assert saved_snapshots[-1].virtual_groups == [live]
+
+    controller.forget_restored_virtual_job_groups("g1")
+    controller.set_virtual_job_group_provider(lambda: [])
+    controller.persist_queue_state()
+    assert controller.get_restored_virtual_job_groups() == []
+    assert saved_snapshots[-1].virtual_groups == []
+
@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 from unittest.mock import Mock
 
@@ -56,6 +57,38 @@ def test_run_njr_delegates_to_executor() -> None:
     assert result.metadata["diagnostics_descriptor"]["output_count"] == 1
 
 
+def test_run_njr_settles_deferred_saves_at_stage_boundaries(tmp_path: Path) -> None:
+    calls: list[str] = []
+    failed_path = tmp_path / "b.png"
+
+    class _DeferringPipeline(Mock):
+        def begin_deferred_stage_saves(self) -> None:
+            calls.append("begin")
+
+        def settle_deferred_stage_saves(self) -> set[str]:
+            calls.append("settle")
+            return {str(failed_path.resolve())}
+
+        def end_deferred_stage_saves(self) -> set[str]:
+            calls.append("end")
+            return set()
+
+    runner = PipelineRunner(Mock(), Mock())
+    pipeline = _DeferringPipeline()
+    pipeline.client = Mock()
+    pipeline.run_txt2img_stage.return_value = {
+        "path": str(tmp_path / "a.png"),
+        "all_paths": [str(tmp_path / "a.png"), str(failed_path)],
+    }
+    runner._pipeline = pipeline
+
+    result = runner.run_njr(_minimal_normalized_record(), cancel_token=None)
+
+    assert calls == ["begin", "settle", "end"]
+    assert result.success is True
+    assert [variant["path"] for variant in result.variants] == [str(tmp_path / "a.png")]
+
+
 def test_run_njr_emits_observation_only_adaptive_refinement_metadata() -> None:
     runner = PipelineRunner(Mock(), Mock())
     record = _minimal_normalized_record()
@@ -1428,6 +1461,128 @@ def test_run_njr_executes_sequence_plan_for_video_workflow_stage(tmp_path: Path)
     assert result.metadata["continuity"]["pack_id"] == "cont-seq-001"
 
 
+def _sequence_record(policy: str, job_id: str, input_path: Path, total_segments: int = 3) -> NormalizedJobRecord:
+    return NormalizedJobRecord(
+        job_id=job_id,
+        config={},
+        path_output_dir=str(input_path.parent / "output"),
+        filename_template="{seed}",
+        seed=42,
+        variant_index=0,
+        variant_total=1,
+        batch_index=0,
+        batch_total=1,
+        created_ts=0.0,
+        stage_chain=[
+            StageConfig(
+                stage_type="video_workflow",
+                enabled=True,
+                extra={
+                    "workflow_id": "ltx_multiframe_anchor_v1",
+                    "sequence_metadata": {
+                        "sequence_id": f"seq-{job_id}",
+                        "total_segments": total_segments,
+                        "carry_forward_policy": policy,
+                        "segment_length_frames": 25,
+                        "overlap_frames": 0,
+                    },
+                },
+            )
+        ],
+        input_image_paths=[str(input_path)],
+        start_stage="video_workflow",
+    )
+
+
+class _OverlapTrackingBackend:
+    backend_id = "comfy"
+    capabilities = VideoBackendCapabilities(
+        backend_id="comfy",
+        stage_types=("video_workflow",),
+        requires_input_image=True,
+        supports_prompt_text=True,
+        supports_negative_prompt=True,
+        supports_multiple_anchors=True,
+        supports_pipelined_segments=True,
+    )
+
+    def __init__(self, tmp_path: Path) -> None:
+        self.tmp_path = tmp_path
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.input_images: list[str] = []
+        self.both_running = threading.Event()
+
+    def execute(self, pipeline, request):
+        with self.lock:
+            index = len(self.input_images)
+            self.input_images.append(str(request.input_image_path))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            if self.active >= 2:
+                self.both_running.set()
+        # Hold the first segment until the second is submitted (or give up).
+        if index == 0:
+            self.both_running.wait(timeout=0.5)
+        with self.lock:
+            self.active -= 1
+        out = self.tmp_path / f"seg{index}.mp4"
+        out.write_bytes(b"mp4")
+        return VideoExecutionResult.from_stage_result(
+            backend_id="comfy",
+            stage_name="video_workflow",
+            result={"path": str(out), "video_path": str(out), "output_paths": [str(out)]},
+            backend_metadata={"workflow_id": "ltx_multiframe_anchor_v1"},
+        )
+
+
+def test_run_njr_pipelines_independent_sequence_segments(tmp_path: Path) -> None:
+    runner = PipelineRunner(Mock(), Mock(), runs_base_dir=str(tmp_path / "runs"))
+    input_path = tmp_path / "seed.png"
+    input_path.write_bytes(b"seed")
+    backend = _OverlapTrackingBackend(tmp_path)
+    registry = VideoBackendRegistry()
+    registry.register(backend)
+    runner._video_backends = registry
+    runner._pipeline = Mock()
+
+    result = runner.run_njr(_sequence_record("first_frame", "runner-seq-pipelined", input_path), cancel_token=None)
+
+    assert result.success is True
+    assert backend.max_active == 2
+    seq = result.metadata["sequence_artifact"]
+    assert seq["timing"]["mode"] == "pipelined"
+    assert seq["timing"]["pipeline_depth"] == 2
+    assert [item["segment_index"] for item in seq["segment_provenance"]] == [0, 1, 2]
+    assert seq["all_output_paths"] == [str(tmp_path / f"seg{index}.mp4") for index in range(3)]
+    first, second = seq["segment_provenance"][:2]
+    assert "gpu_idle_gap_seconds" not in first["timing"]
+    assert second["timing"]["gpu_idle_gap_seconds"] >= 0.0
+    assert second["timing"]["submitted_at"] <= first["timing"]["recorded_at"]
+
+
+def test_run_njr_keeps_last_frame_sequences_one_segment_at_a_time(tmp_path: Path) -> None:
+    runner = PipelineRunner(Mock(), Mock(), runs_base_dir=str(tmp_path / "runs"))
+    input_path = tmp_path / "seed.png"
+    input_path.write_bytes(b"seed")
+    backend = _OverlapTrackingBackend(tmp_path)
+    registry = VideoBackendRegistry()
+    registry.register(backend)
+    runner._video_backends = registry
+    runner._pipeline = Mock()
+
+    result = runner.run_njr(
+        _sequence_record("last_frame", "runner-seq-last-frame", input_path, total_segments=2),
+        cancel_token=None,
+    )
+
+    assert result.success is True
+    assert backend.max_active == 1
+    assert backend.input_images == [str(input_path), str(tmp_path / "seg0.mp4")]
+    assert result.metadata["sequence_artifact"]["timing"]["pipeline_depth"] == 1
+
+
 def test_run_njr_sequence_assembly_stamps_assembled_video_artifact(
     tmp_path: Path,
     monkeypatch,
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import json
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 from src.gui.app_state_v2 import PackJobEntry
@@ -638,3 +639,125 @@ def test_prompt_pack_job_builder_warns_when_pack_level_style_lora_is_unavailable
     assert all(tag.name != "style_cinematic_grit" for tag in record.lora_tags)
     assert record.extra_metadata["style_lora"]["applied"] is False
     assert "missing weight file" in str(record.extra_metadata["style_lora"]["warning"])
+
+
+def test_prompt_pack_job_builder_iter_jobs_is_lazy_and_countable(tmp_path: Path) -> None:
+    config_manager = StubConfigManager(tmp_path)
+    pack_txt = config_manager.packs_dir / "lazy-matrix-pack.txt"
+    pack_txt.write_text("A [[job]] in a [[environment]]", encoding="utf-8")
+    pack_txt.with_suffix(".json").write_text(
+        json.dumps(
+            {
+                "pack_data": {
+                    "matrix": {
+                        "enabled": True,
+                        "mode": "sequential",
+                        "limit": 6,
+                        "slots": [
+                            {"name": "job", "values": ["wizard", "knight", "archer"]},
+                            {"name": "environment", "values": ["forest", "castle"]},
+                        ],
+                    }
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    builder = PromptPackNormalizedJobBuilder(
+        config_manager=config_manager,
+        job_builder=JobBuilderV2(time_fn=lambda: 1.0, id_fn=SequentialIdGenerator()),
+        packs_dir=config_manager.packs_dir,
+    )
+    entry = PackJobEntry(
+        pack_id=pack_txt.name,
+        pack_name="Lazy Matrix Pack",
+        prompt_text="A [[job]] in a [[environment]]",
+        config_snapshot={"randomization": {"enabled": False}},
+        stage_flags={"txt2img": True},
+        randomizer_metadata={"enabled": False, "max_variants": 1},
+    )
+    built_entries: list[PackJobEntry] = []
+    original_build = builder._build_jobs_for_entry  # noqa: SLF001
+
+    def _tracking_build(expanded_entry: PackJobEntry):
+        built_entries.append(expanded_entry)
+        return original_build(expanded_entry)
+
+    builder._build_jobs_for_entry = _tracking_build  # type: ignore[method-assign]  # noqa: SLF001
+
+    assert builder.count_jobs([entry]) == 6
+    built_entries.clear()
+    iterator = builder.iter_jobs([entry])
+    first = next(iterator)
+    assert len(built_entries) == 1
+    rest = list(iterator)
+
+    assert len(built_entries) == 6
+    records = [first, *rest]
+    assert [record.variant_index for record in records] == [0, 1, 2, 3, 4, 5]
+    assert {record.variant_total for record in records} == {6}
+    assert records[-1].matrix_slot_values == {"job": "archer", "environment": "castle"}
+
+
+def _matrix_builder(tmp_path: Path, mode: str, limit: int) -> tuple[PromptPackNormalizedJobBuilder, PackJobEntry]:
+    config_manager = StubConfigManager(tmp_path)
+    pack_txt = config_manager.packs_dir / f"{mode}-matrix-pack.txt"
+    pack_txt.write_text("A [[job]] in a [[environment]]", encoding="utf-8")
+    pack_txt.with_suffix(".json").write_text(
+        json.dumps(
+            {
+                "pack_data": {
+                    "matrix": {
+                        "enabled": True,
+                        "mode": mode,
+                        "limit": limit,
+                        "slots": [
+                            {"name": "job", "values": ["wizard", "knight", "archer", "bard"]},
+                            {"name": "environment", "values": ["forest", "castle", "cave"]},
+                        ],
+                    }
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    builder = PromptPackNormalizedJobBuilder(
+        config_manager=config_manager,
+        job_builder=JobBuilderV2(time_fn=lambda: 1.0, id_fn=SequentialIdGenerator()),
+        packs_dir=config_manager.packs_dir,
+    )
+    entry = PackJobEntry(
+        pack_id=pack_txt.name,
+        pack_name="Matrix Pack",
+        prompt_text="A [[job]] in a [[environment]]",
+        config_snapshot={"randomization": {"enabled": False}},
+        stage_flags={"txt2img": True},
+        randomizer_metadata={"enabled": False, "max_variants": 1},
+    )
+    return builder, entry
+
+
+def test_prompt_pack_job_builder_counts_randomized_combinations_one_by_one(tmp_path: Path) -> None:
+    builder, entry = _matrix_builder(tmp_path, "sequential", 4)
+    variants_per_job = {"wizard": 1, "knight": 3, "archer": 2, "bard": 1}
+
+    def _randomized_build(expanded_entry: PackJobEntry):
+        count = variants_per_job[expanded_entry.matrix_slot_values["job"]]
+        return [SimpleNamespace(randomizer_summary={"enabled": True}) for _ in range(count)]
+
+    builder._build_jobs_for_entry = _randomized_build  # type: ignore[method-assign]  # noqa: SLF001
+
+    # Sequential combinations: wizard x3 environments, then knight/forest.
+    assert builder.count_jobs([entry]) == 1 + 1 + 1 + 3
+
+
+def test_prompt_pack_job_builder_matrix_seed_repeats_random_sample(tmp_path: Path) -> None:
+    builder, entry = _matrix_builder(tmp_path, "random", 5)
+
+    def _slots(seed: int) -> list[dict[str, str]]:
+        return [record.matrix_slot_values for record in builder.iter_jobs([entry], matrix_seed=seed)]
+
+    first = _slots(7)
+    assert len(first) == 5
+    assert _slots(7) == first
+    assert builder.count_jobs([entry], matrix_seed=7) == 5
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
+import time
 from pathlib import Path
 from unittest.mock import Mock
 
+import pytest
+from PIL import Image
+
 from src.pipeline import video
+from src.utils.thread_registry import get_thread_registry
+from tests.helpers.fake_ffmpeg import write_fake_ffmpeg
 
 
 def test_resolve_ffmpeg_executable_uses_env_override(monkeypatch, tmp_path: Path):
@@ -108,3 +115,66 @@ def test_create_video_from_images_uses_concat_input(monkeypatch, tmp_path: Path)
     assert ffmpeg_cmd[0] == str(ffmpeg_path)
     assert ffmpeg_cmd[1:5] == ["-f", "concat", "-safe", "0"]
     assert "-r" in ffmpeg_cmd
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake ffmpeg relies on a shebang")
+def test_frames_round_trip_through_ffmpeg_pipes_without_temp_files(tmp_path: Path):
+    ffmpeg = write_fake_ffmpeg(tmp_path)
+    frames = [Image.new("RGB", (6, 4), (index * 40, 10, 200)) for index in range(3)]
+    frames.append(Image.new("RGBA", (6, 4), (1, 2, 3, 128)))
+    output = tmp_path / "out" / "clip.mp4"
+    output.parent.mkdir()
+
+    count = video.encode_frames_to_video(frames, output, fps=12, ffmpeg_executable=ffmpeg)
+    decoded = video.decode_video_frames(output, ffmpeg_executable=ffmpeg)
+
+    assert count == 4
+    assert sorted(path.name for path in output.parent.iterdir()) == ["clip.mp4"]
+    assert [frame.tobytes() for frame in decoded] == [frame.convert("RGB").tobytes() for frame in frames]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake ffmpeg relies on a shebang")
+def test_ffmpeg_pipe_threads_are_tracked_and_joined(tmp_path: Path):
+    ffmpeg = write_fake_ffmpeg(tmp_path)
+    process = video._FFmpegPipeProcess([str(ffmpeg), "-version"], timeout=10.0)
+    tracked = {id(entry.thread) for entry in get_thread_registry().get_active_threads()}
+
+    assert all(not thread.daemon for thread in process._threads)
+    assert all(id(thread) in tracked for thread in process._threads if thread.is_alive())
+
+    process.finish()
+    assert not any(thread.is_alive() for thread in process._threads)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake ffmpeg relies on a shebang")
+def test_ffmpeg_pipe_is_killed_on_timeout_and_cancellation(monkeypatch, tmp_path: Path):
+    ffmpeg = write_fake_ffmpeg(tmp_path)
+    monkeypatch.setenv("FAKE_FFMPEG_SLEEP", "30")
+    cancel_token = Mock()
+    cancel_token.is_cancelled.return_value = True
+
+    started = time.monotonic()
+    with pytest.raises(video.FFmpegPipeError, match="timed out"):
+        video.decode_video_frames(tmp_path / "clip.mp4", ffmpeg_executable=ffmpeg, timeout=0.2)
+    with pytest.raises(video.FFmpegPipeError, match="cancelled"):
+        video.encode_frames_to_video(
+            [Image.new("RGB", (4, 4))],
+            tmp_path / "clip.mp4",
+            ffmpeg_executable=ffmpeg,
+            cancel_token=cancel_token,
+        )
+
+    assert time.monotonic() - started < 10
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake ffmpeg relies on a shebang")
+def test_ffmpeg_pipe_failure_reports_stderr(monkeypatch, tmp_path: Path):
+    ffmpeg = write_fake_ffmpeg(tmp_path)
+    monkeypatch.setenv("FAKE_FFMPEG_FAIL", "1")
+    creator = video.VideoCreator.__new__(video.VideoCreator)
+    creator.ffmpeg_executable = ffmpeg
+    creator.ffmpeg_available = True
+
+    with pytest.raises(video.FFmpegPipeError, match="Invalid data found"):
+        video.decode_video_frames(tmp_path / "clip.mp4", ffmpeg_executable=ffmpeg)
+    assert creator.create_video_from_frames([Image.new("RGB", (4, 4))], tmp_path / "clip.mp4") is False
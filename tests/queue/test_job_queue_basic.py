@@ -159,3 +159,84 @@ def test_cancel_running_job_return_to_queue_requeues_at_back() -> None:
     ordered = queue.list_active_jobs_ordered()
     assert [job.job_id for job in ordered] == ["second", "first"]
     assert running.execution_metadata.return_to_queue_count == 1
+
+
+def _wait_in_thread(queue: JobQueue, timeout: float) -> tuple[threading.Thread, list]:
+    result: list = []
+    started = threading.Event()
+
+    def _wait() -> None:
+        started.set()
+        result.append(queue.wait_for_next_job(timeout=timeout))
+
+    thread = threading.Thread(target=_wait, daemon=True)
+    thread.start()
+    started.wait(1.0)
+    return thread, result
+
+
+def test_wait_for_next_job_wakes_on_submit() -> None:
+    queue = JobQueue()
+    thread, result = _wait_in_thread(queue, timeout=5.0)
+
+    queue.submit(Job("wake-1"))
+    thread.join(2.0)
+
+    assert not thread.is_alive()
+    assert result[0].job_id == "wake-1"
+
+
+def test_wait_for_next_job_respects_pause_and_wakes_on_resume() -> None:
+    queue = JobQueue()
+    queue.pause()
+    queue.submit(Job("paused-1"))
+    thread, result = _wait_in_thread(queue, timeout=5.0)
+    thread.join(0.1)
+    assert thread.is_alive()
+
+    queue.resume()
+    thread.join(2.0)
+
+    assert result[0].job_id == "paused-1"
+
+
+def test_wait_for_next_job_wakes_on_return_to_queue() -> None:
+    queue = JobQueue()
+    queue.submit(Job("requeue-1"))
+    running = queue.get_next_job()
+    queue.mark_running(running.job_id)
+    thread, result = _wait_in_thread(queue, timeout=5.0)
+
+    queue.cancel_running_job(return_to_queue=True)
+    thread.join(2.0)
+
+    assert result[0].job_id == "requeue-1"
+
+
+def test_wait_for_next_job_times_out_and_wake_waiters_releases() -> None:
+    queue = JobQueue()
+    assert queue.wait_for_next_job(timeout=0.01) is None
+
+    thread, result = _wait_in_thread(queue, timeout=30.0)
+    queue.wake_waiters()
+    thread.join(2.0)
+
+    assert not thread.is_alive()
+    assert result == [None]
+
+
+def test_dequeue_latency_stats_track_submit_to_running() -> None:
+    queue = JobQueue()
+    assert queue.get_dequeue_latency_stats()["count"] == 0
+    for job_id in ("lat-1", "lat-2"):
+        queue.submit(Job(job_id))
+    for _ in range(2):
+        job = queue.get_next_job()
+        queue.mark_running(job.job_id)
+        queue.mark_completed(job.job_id)
+
+    stats = queue.get_dequeue_latency_stats()
+
+    assert stats["count"] == 2
+    assert 0.0 <= stats["p50_ms"] <= stats["max_ms"]
+    assert stats["avg_ms"] is not None
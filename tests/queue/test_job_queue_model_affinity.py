@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import random
+
+from src.queue.job_model import Job, JobPriority, JobStatus
+from src.queue.job_queue import JobQueue
+from src.queue.model_affinity import ModelAffinityPolicy, model_affinity_key_for_job
+
+
+def _job(job_id: str, model: str, *, vae: str = "", priority: JobPriority = JobPriority.NORMAL) -> Job:
+    job = Job(job_id, priority=priority)
+    job.snapshot = {"normalized_job": {"base_model": model, "vae": vae}}
+    return job
+
+
+def _drain(queue: JobQueue) -> list[str]:
+    order = []
+    while (job := queue.get_next_job()) is not None:
+        order.append(job.job_id)
+    return order
+
+
+def test_model_affinity_key_normalizes_checkpoint_names() -> None:
+    job = _job("j", "sdxl_base.safetensors [31e35c80fc]", vae="sdxl_vae.safetensors")
+
+    assert model_affinity_key_for_job(job) == ("sdxl_base", "sdxl_vae", "")
+    assert model_affinity_key_for_job(Job("no-model")) is None
+
+
+def test_affinity_disabled_keeps_strict_fifo() -> None:
+    queue = JobQueue()
+    for job_id, model in [("a1", "A"), ("b1", "B"), ("a2", "A"), ("b2", "B")]:
+        queue.submit(_job(job_id, model))
+
+    assert _drain(queue) == ["a1", "b1", "a2", "b2"]
+    assert queue.get_scheduling_stats()["switches_avoided"] == 0
+
+
+def test_affinity_groups_jobs_by_model_within_priority_band() -> None:
+    queue = JobQueue(model_affinity=ModelAffinityPolicy(enabled=True, max_wait_seconds=None))
+    for job_id, model in [("a1", "A"), ("b1", "B"), ("a2", "A"), ("b2", "B"), ("a3", "A")]:
+        queue.submit(_job(job_id, model))
+
+    planned = [job.job_id for job in queue.list_active_jobs_ordered()]
+    order = _drain(queue)
+
+    assert order == ["a1", "a2", "a3", "b1", "b2"]
+    assert planned == order
+    stats = queue.get_scheduling_stats()
+    assert stats["dispatched"] == 5
+    assert stats["switches_avoided"] == 2
+    assert stats["affinity_picks"] == 2
+
+
+def test_affinity_never_crosses_priority_bands() -> None:
+    queue = JobQueue(model_affinity=ModelAffinityPolicy(enabled=True, max_wait_seconds=None))
+    queue.submit(_job("a1", "A"))
+    queue.submit(_job("b-high", "B", priority=JobPriority.HIGH))
+    queue.submit(_job("a-high", "A", priority=JobPriority.HIGH))
+
+    assert _drain(queue) == ["b-high", "a-high", "a1"]
+
+
+def test_affinity_bypass_bound_prevents_starvation() -> None:
+    queue = JobQueue(
+        model_affinity=ModelAffinityPolicy(enabled=True, max_bypass_count=2, max_wait_seconds=None)
+    )
+    queue.submit(_job("a1", "A"))
+    queue.submit(_job("b1", "B"))
+    for index in range(2, 6):
+        queue.submit(_job(f"a{index}", "A"))
+
+    order = _drain(queue)
+
+    assert order == ["a1", "a2", "a3", "b1", "a4", "a5"]
+    assert queue.get_scheduling_stats()["starvation_overrides"] == 1
+
+
+def test_affinity_max_wait_forces_band_head() -> None:
+    queue = JobQueue(model_affinity=ModelAffinityPolicy(enabled=True, max_wait_seconds=0.0))
+    for job_id, model in [("a1", "A"), ("b1", "B"), ("a2", "A")]:
+        queue.submit(_job(job_id, model))
+
+    assert _drain(queue) == ["a1", "b1", "a2"]
+
+
+def test_affinity_pops_match_preview_under_interleaved_edits() -> None:
+    rng = random.Random(7)
+    queue = JobQueue(
+        model_affinity=ModelAffinityPolicy(enabled=True, max_bypass_count=3, max_wait_seconds=None)
+    )
+    next_id = 0
+    dispatched = 0
+    for _ in range(400):
+        action = rng.random()
+        queued = [job.job_id for job in queue.list_jobs(JobStatus.QUEUED)]
+        if action < 0.45 or not queued:
+            priority = rng.choice([JobPriority.NORMAL, JobPriority.NORMAL, JobPriority.HIGH])
+            queue.submit(_job(f"j{next_id}", rng.choice("ABC"), priority=priority))
+            next_id += 1
+        elif action < 0.55:
+            queue.move_to_front(rng.choice(queued))
+        elif action < 0.6:
+            queue.remove(rng.choice(queued))
+        else:
+            planned = [job.job_id for job in queue.list_active_jobs_ordered()]
+            job = queue.get_next_job()
+            assert job is not None and job.job_id == planned[0]
+            queue.mark_running(job.job_id)
+            queue.mark_completed(job.job_id)
+            dispatched += 1
+
+    planned = [job.job_id for job in queue.list_active_jobs_ordered()]
+    assert _drain(queue) == planned
+    assert dispatched > 0
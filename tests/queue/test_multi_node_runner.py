@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.api.client import SDWebUIClient
+from src.api.healthcheck import clear_readiness_failure_state
+from src.cluster.worker_model import WorkerDescriptor, WorkerStatus
+from src.cluster.worker_registry import WorkerRegistry
+from src.queue.job_model import Job, JobStatus
+from src.queue.job_queue import JobQueue
+from src.pipeline.executor import Pipeline
+from src.queue.multi_node_runner import MultiNodeJobRunner, worker_base_url
+from src.queue.worker_matching import requirements_for_job, worker_accepts
+from src.queue.worker_placement import ModelPlacementPolicy, choose_placement, switch_cost
+
+
+class _StubWebUI:
+    """Minimal WebUI: health endpoints, /options and a txt2img that reports its port."""
+
+    def __init__(self, *, delay: float = 0.02, model: str | None = None) -> None:
+        self.delay = delay
+        self.hold = threading.Event()
+        self.hold.set()
+        self.prompts: list[str] = []
+        self.options: dict[str, object] = {"sd_model_checkpoint": model} if model else {}
+        self.model_loads: list[str] = []
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args) -> None:
+                pass
+
+            def _reply(self, body: object) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.endswith("sd-models"):
+                    self._reply([])
+                else:
+                    self._reply(stub.options if self.path.endswith("options") else {})
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path.endswith("options"):
+                    if "sd_model_checkpoint" in payload:
+                        stub.model_loads.append(payload["sd_model_checkpoint"])
+                    stub.options.update(payload)
+                    self._reply(True)
+                    return
+                stub.prompts.append(payload.get("prompt"))
+                stub.hold.wait(10.0)
+                time.sleep(stub.delay)
+                self._reply({"images": [], "info": json.dumps({"port": stub.port})})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def kill(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def close(self) -> None:
+        self.hold.set()
+        try:
+            self.kill()
+        except Exception:
+            pass
+        clear_readiness_failure_state(self.base_url)
+
+
+@pytest.fixture
+def stubs() -> Iterator[list[_StubWebUI]]:
+    servers = [_StubWebUI(), _StubWebUI()]
+    try:
+        yield servers
+    finally:
+        for server in servers:
+            server.close()
+
+
+def _worker(worker_id: str, stub: _StubWebUI, *, tags=(), vram_gb: float = 0.0) -> WorkerDescriptor:
+    return WorkerDescriptor(
+        id=worker_id,
+        name=worker_id,
+        tags=list(tags),
+        vram_gb=vram_gb,
+        metadata={"base_url": stub.base_url},
+    )
+
+
+def _registry(*workers: WorkerDescriptor) -> WorkerRegistry:
+    registry = WorkerRegistry(local_worker=workers[0])
+    for worker in workers[1:]:
+        registry.register_worker(worker)
+    return registry
+
+
+def _client_factory(descriptor: WorkerDescriptor) -> SDWebUIClient:
+    return SDWebUIClient(base_url=worker_base_url(descriptor), timeout=15, max_retries=1, backoff_factor=0)
+
+
+def _txt2img_factory(descriptor: WorkerDescriptor, client: SDWebUIClient):
+    def _run(job: Job) -> dict:
+        response = client.txt2img({"prompt": job.job_id}, raise_on_error=True)
+        info = json.loads(response["info"])
+        return {"success": True, "metadata": {"port": info["port"]}}
+
+    return _run
+
+
+def _job(job_id: str, model: str = "", **cluster) -> Job:
+    job = Job(job_id)
+    job.snapshot = {"normalized_job": {"base_model": model}}
+    if cluster:
+        job.config_snapshot = {"cluster": cluster}
+    return job
+
+
+def _wait_until(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _finished(queue: JobQueue, job_ids: list[str]) -> bool:
+    return all(queue.get_job(job_id).status == JobStatus.COMPLETED for job_id in job_ids)
+
+
+def test_jobs_spread_across_workers_with_their_own_clients(stubs) -> None:
+    queue = JobQueue()
+    registry = _registry(_worker("w0", stubs[0]), _worker("w1", stubs[1]))
+    runner = MultiNodeJobRunner(
+        queue, registry, _txt2img_factory, client_factory=_client_factory, health_interval=0.2
+    )
+    job_ids = [f"job-{index}" for index in range(8)]
+    for job_id in job_ids:
+        queue.submit(_job(job_id))
+
+    runner.start()
+    try:
+        assert _wait_until(lambda: _finished(queue, job_ids))
+    finally:
+        runner.stop()
+
+    by_port = {stub.port: stub for stub in stubs}
+    for job_id in job_ids:
+        job = queue.get_job(job_id)
+        assert job_id in by_port[job.result["metadata"]["port"]].prompts
+        assert job.result["metadata"]["worker_id"] == job.worker_id
+    assert all(stub.prompts for stub in stubs)
+
+
+def test_jobs_route_by_model_family_and_vram(stubs) -> None:
+    queue = JobQueue()
+    xl_worker = _worker("xl", stubs[0], tags=["sdxl"], vram_gb=24)
+    sd15_worker = _worker("sd15", stubs[1], tags=["sd15"], vram_gb=8)
+    runner = MultiNodeJobRunner(
+        queue,
+        _registry(xl_worker, sd15_worker),
+        _txt2img_factory,
+        client_factory=_client_factory,
+        health_interval=0.2,
+    )
+    jobs = {
+        "xl-1": _job("xl-1", "sdxl_base_1.0.safetensors"),
+        "sd15-1": _job("sd15-1", "v1-5-pruned.safetensors"),
+        "big-1": _job("big-1", "", min_vram_gb=16),
+        "xl-2": _job("xl-2", "juggernautXL_v9"),
+    }
+    for job in jobs.values():
+        queue.submit(job)
+
+    runner.start()
+    try:
+        assert _wait_until(lambda: _finished(queue, list(jobs)))
+    finally:
+        runner.stop()
+
+    assert sorted(stubs[0].prompts) == ["big-1", "xl-1", "xl-2"]
+    assert stubs[1].prompts == ["sd15-1"]
+    assert not worker_accepts(sd15_worker, requirements_for_job(jobs["big-1"]))
+
+
+def test_job_no_registered_worker_accepts_fails_instead_of_waiting(stubs) -> None:
+    queue = JobQueue()
+    registry = _registry(
+        _worker("xl", stubs[0], tags=["sdxl"], vram_gb=12),
+        _worker("xl-offline", stubs[1], tags=["sdxl", "gpu1"], vram_gb=8),
+    )
+    registry.update_worker_status("xl-offline", WorkerStatus.OFFLINE)
+    stubs[1].kill()
+    runner = MultiNodeJobRunner(
+        queue, registry, _txt2img_factory, client_factory=_client_factory, health_interval=0.05
+    )
+    queue.submit(_job("sd15", "v1-5-pruned.safetensors"))
+    queue.submit(_job("huge", "sdxl_base_1.0", min_vram_gb=48))
+    queue.submit(_job("xl", "sdxl_base_1.0"))
+    queue.submit(_job("pinned", "sdxl_base_1.0", worker_tags=["gpu1"]))
+
+    runner.start()
+    try:
+        assert _wait_until(lambda: _finished(queue, ["xl"]))
+        assert _wait_until(lambda: queue.get_job("huge").status == JobStatus.FAILED)
+    finally:
+        runner.stop()
+
+    sd15 = queue.get_job("sd15")
+    assert sd15.status == JobStatus.FAILED
+    assert sd15.error_message == "No registered worker can run this job (requires model family sd15)"
+    assert "48 GB VRAM" in queue.get_job("huge").error_message
+    # Only an offline worker can run it; it waits for that worker to come back.
+    assert queue.get_job("pinned").status == JobStatus.QUEUED
+
+
+def test_job_on_dead_worker_is_reassigned_and_late_result_discarded(stubs) -> None:
+    queue = JobQueue()
+    dead, alive = stubs
+    dead.hold.clear()
+    registry = _registry(_worker("dead", dead), _worker("alive", alive, tags=["sdxl"]))
+    runner = MultiNodeJobRunner(
+        queue,
+        registry,
+        _txt2img_factory,
+        client_factory=_client_factory,
+        health_interval=0.05,
+        probe_timeout=0.2,
+        probe_failure_threshold=1,
+    )
+    # Only the "dead" worker accepts SD1.5 jobs at first; pin the job there.
+    queue.submit(_job("stuck", "v1-5-pruned"))
+
+    runner.start()
+    try:
+        assert _wait_until(lambda: dead.prompts == ["stuck"])
+        registry.get_worker("alive").tags = []
+        dead.kill()
+        assert _wait_until(lambda: registry.get_worker("dead").status == WorkerStatus.OFFLINE)
+        assert _wait_until(lambda: _finished(queue, ["stuck"]))
+        dead.hold.set()  # the original request now returns; its result must be ignored
+        time.sleep(0.2)
+    finally:
+        runner.stop()
+
+    job = queue.get_job("stuck")
+    assert job.status == JobStatus.COMPLETED
+    assert job.worker_id == "alive"
+    assert job.result["metadata"]["port"] == alive.port
+    assert job.execution_metadata.return_to_queue_count == 1
+    assert job.execution_metadata.last_control_action == "worker_lost"
+    states = {state["worker_id"]: state for state in runner.get_worker_states()}
+    assert states["dead"]["jobs_lost"] == 1
+    assert states["dead"]["jobs_completed"] == 0
+    assert states["alive"]["jobs_completed"] == 1
+
+
+def test_connection_error_marks_worker_offline_and_requeues() -> None:
+    queue = JobQueue()
+    registry = WorkerRegistry(local_worker=WorkerDescriptor(id="a", name="a"))
+    registry.register_worker(WorkerDescriptor(id="b", name="b", status=WorkerStatus.OFFLINE))
+    calls: list[str] = []
+
+    def _factory(descriptor: WorkerDescriptor, _client: object):
+        def _run(job: Job) -> dict:
+            calls.append(descriptor.id)
+            if descriptor.id == "a":
+                raise requests.ConnectionError("connection refused")
+            return {"success": True}
+
+        return _run
+
+    healthy = {"a": False, "b": True}
+    runner = MultiNodeJobRunner(
+        queue,
+        registry,
+        _factory,
+        client_factory=lambda _descriptor: object(),
+        probe=lambda descriptor, _client: healthy[descriptor.id],
+        health_interval=0.05,
+    )
+    queue.submit(_job("j1"))
+
+    runner.start()
+    try:
+        assert _wait_until(lambda: _finished(queue, ["j1"]))
+    finally:
+        runner.stop()
+
+    assert calls[0] == "a"
+    assert calls[-1] == "b"
+    assert registry.get_worker("a").status == WorkerStatus.OFFLINE
+    assert registry.get_worker("b").status == WorkerStatus.ONLINE
+    assert registry.get_worker("b").last_heartbeat is not None
+
+
+class _NoOpStructuredLogger:
+    def __getattr__(self, _name: str):
+        return lambda *_args, **_kwargs: None
+
+
+def _pipeline_factory(descriptor: WorkerDescriptor, client: SDWebUIClient):
+    client._options_min_interval_seconds = 0.0
+    pipeline = Pipeline(client, _NoOpStructuredLogger())
+
+    def _run(job: Job) -> dict:
+        pipeline._ensure_model_and_vae(job.snapshot["normalized_job"]["base_model"], None)
+        client.txt2img({"prompt": job.job_id}, raise_on_error=True)
+        return {"success": True}
+
+    return _run
+
+
+def test_jobs_follow_the_worker_with_their_model_resident() -> None:
+    stubs = [_StubWebUI(model="modelA.safetensors [0a1b2c3d]"), _StubWebUI(model="modelB.safetensors")]
+    queue = JobQueue()
+    registry = _registry(_worker("wa", stubs[0]), _worker("wb", stubs[1]))
+
+    def _client(descriptor: WorkerDescriptor) -> SDWebUIClient:
+        return SDWebUIClient(
+            base_url=worker_base_url(descriptor), max_retries=1, backoff_factor=0, options_write_enabled=True
+        )
+
+    runner = MultiNodeJobRunner(
+        queue,
+        registry,
+        _pipeline_factory,
+        client_factory=_client,
+        health_interval=0.2,
+        placement=ModelPlacementPolicy(model_switch_cost_seconds=20.0, expected_job_seconds=0.05),
+    )
+    job_ids = []
+    for index in range(3):
+        for model in ("modelA", "modelB"):
+            job_id = f"{model}-{index}"
+            job_ids.append(job_id)
+            queue.submit(_job(job_id, f"{model}.safetensors"))
+
+    try:
+        runner.start()
+        assert _wait_until(lambda: _finished(queue, job_ids))
+        runner.stop()
+    finally:
+        for stub in stubs:
+            stub.close()
+
+    assert sorted(stubs[0].prompts) == ["modelA-0", "modelA-1", "modelA-2"]
+    assert sorted(stubs[1].prompts) == ["modelB-0", "modelB-1", "modelB-2"]
+    assert stubs[0].model_loads == [] and stubs[1].model_loads == []
+    states = {state["worker_id"]: state for state in runner.get_worker_states()}
+    assert states["wa"]["model_switches"] == 0
+    assert states["wa"]["resident_dispatches"] == 3
+    assert states["wb"]["resident_model"] == "modelB.safetensors"
+    assert 0.0 < states["wb"]["utilization"] <= 1.0
+
+
+def _placement(worker_id, jobs, residents, *, busy=None, job_seconds=10.0, waited=0.0):
+    return choose_placement(
+        worker_id,
+        jobs,
+        job_key=lambda job: requirements_for_job(job).model_key,
+        residents=residents,
+        busy=busy or {},
+        can_run=lambda _worker_id, _job: True,
+        waited_seconds=lambda _job: waited,
+        job_seconds=job_seconds,
+        policy=ModelPlacementPolicy(model_switch_cost_seconds=20.0),
+    )
+
+
+def test_placement_prefers_resident_job_and_leaves_others_to_their_worker() -> None:
+    jobs = [_job("b1", "modelB"), _job("a1", "modelA"), _job("c1", "modelC")]
+    residents = {"wa": ("modela", "automatic"), "wb": ("modelb", "automatic")}
+
+    assert _placement("wa", jobs, residents).job_id == "a1"
+    # "b1" is left for the idle wb; nothing resident remains, so wa loads "c1".
+    assert _placement("wa", [jobs[0], jobs[2]], residents).job_id == "c1"
+    assert _placement("wa", [jobs[0]], residents) is None
+
+
+def test_placement_switches_when_resident_worker_backlog_exceeds_load_cost() -> None:
+    jobs = [_job(f"b{index}", "modelB") for index in range(4)]
+    residents = {"wa": ("modela", "automatic"), "wb": ("modelb", "automatic")}
+
+    # wb is busy: b0 starts there in 10s (kept for wb), b1 would wait 20s, which
+    # is no better than loading modelB on wa.
+    picked = _placement("wa", jobs, residents, busy={"wb": True})
+    assert picked is not None and picked.job_id == "b1"
+    assert _placement("wa", jobs[:1], residents, busy={"wb": True}) is None
+    assert _placement("wa", jobs[:1], residents, waited=900.0).job_id == "b0"
+    assert switch_cost(("modela", "automatic"), ("modela", "vae-x", ""), ModelPlacementPolicy()) == 2.0
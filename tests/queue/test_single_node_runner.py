@@ -127,3 +127,22 @@ def test_worker_allows_legacy_result_without_success_to_complete() -> None:
     runner.stop()
 
     assert completed is not None
+
+
+def test_worker_wakes_on_submit_without_waiting_for_poll_interval() -> None:
+    """Idle workers block on the queue and dequeue as soon as a job is submitted."""
+    job_queue = JobQueue()
+    runner = SingleNodeJobRunner(
+        job_queue=job_queue, run_callable=lambda job: {"success": True}, poll_interval=30.0
+    )
+    runner.start()
+    time.sleep(0.05)
+
+    job_queue.submit(Job(job_id="runner-wakeup"))
+
+    assert _wait_for_status(job_queue, "runner-wakeup", status=JobStatus.COMPLETED) is not None
+    started = time.monotonic()
+    runner.stop()
+    assert time.monotonic() - started < 2.0
+    assert not runner.is_running()
+    assert job_queue.get_dequeue_latency_stats()["count"] == 1
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+from src.queue.job_history_store import (
+    JobHistoryEntry,
+    JSONLJobHistoryStore,
+    create_job_history_store,
+)
+from src.queue.job_model import Job, JobPriority, JobStatus
+from src.queue.sqlite_job_history_store import SQLiteJobHistoryStore, import_jsonl_history
+
+
+def _entry(job_id: str, created_at: datetime, status: JobStatus = JobStatus.QUEUED) -> JobHistoryEntry:
+    return JobHistoryEntry(job_id=job_id, created_at=created_at, status=status)
+
+
+def test_sqlite_history_records_submission_and_status(tmp_path):
+    store = SQLiteJobHistoryStore(tmp_path / "history.sqlite3")
+    job = Job(job_id="job-1", priority=JobPriority.NORMAL, worker_id="local")
+    seen: list[JobHistoryEntry] = []
+    store.register_callback(seen.append)
+
+    store.record_job_submission(job)
+    run_ts = datetime.utcnow()
+    store.record_status_change(job.job_id, JobStatus.RUNNING, run_ts)
+    store.record_status_change(
+        job.job_id, JobStatus.COMPLETED, run_ts + timedelta(seconds=2), result={"ok": True}
+    )
+
+    entry = store.get_job("job-1")
+    assert entry is not None
+    assert entry.status == JobStatus.COMPLETED
+    assert entry.worker_id == "local"
+    assert entry.result == {"ok": True}
+    assert entry.duration_ms == 2000
+    assert [e.status for e in seen] == [JobStatus.QUEUED, JobStatus.RUNNING, JobStatus.COMPLETED]
+    assert store.count_jobs() == 1
+
+
+def test_sqlite_history_pages_by_created_at_and_filters_status(tmp_path):
+    store = SQLiteJobHistoryStore(tmp_path / "history.sqlite3")
+    base = datetime(2025, 1, 1)
+    for index in range(10):
+        status = JobStatus.FAILED if index % 2 else JobStatus.COMPLETED
+        store.save_entry(_entry(f"job-{index}", base + timedelta(minutes=index), status))
+
+    first_page = store.list_jobs(limit=3)
+    second_page = store.list_jobs(limit=3, offset=3)
+    failed = store.list_jobs(status=JobStatus.FAILED, limit=50)
+
+    assert [e.job_id for e in first_page] == ["job-9", "job-8", "job-7"]
+    assert [e.job_id for e in second_page] == ["job-6", "job-5", "job-4"]
+    assert [e.job_id for e in failed] == ["job-9", "job-7", "job-5", "job-3", "job-1"]
+
+
+def test_sqlite_history_recent_jobs_follow_write_order(tmp_path):
+    store = SQLiteJobHistoryStore(tmp_path / "history.sqlite3")
+    base = datetime(2025, 1, 1)
+    store.save_entry(_entry("old", base))
+    store.save_entry(_entry("new", base + timedelta(hours=1)))
+    store.record_status_change("old", JobStatus.COMPLETED, base + timedelta(hours=2))
+
+    recent = store.list_recent_jobs(limit=2)
+    completed = store.list_recent_jobs(statuses={JobStatus.COMPLETED}, limit=5)
+
+    assert [e.job_id for e in recent] == ["old", "new"]
+    assert [e.job_id for e in completed] == ["old"]
+
+
+def test_import_jsonl_history_keeps_latest_line_and_tails_new_lines(tmp_path):
+    jsonl_path = tmp_path / "history.jsonl"
+    base = datetime(2025, 1, 1)
+    lines = [
+        _entry("job-a", base).to_json(),
+        _entry("job-b", base + timedelta(minutes=1)).to_json(),
+        _entry("job-a", base, JobStatus.COMPLETED).to_json(),
+    ]
+    jsonl_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    store = SQLiteJobHistoryStore(tmp_path / "history.sqlite3")
+
+    assert import_jsonl_history(jsonl_path, store) == 3
+    assert store.get_job("job-a").status == JobStatus.COMPLETED
+    assert import_jsonl_history(jsonl_path, store) == 0
+
+    with jsonl_path.open("a", encoding="utf-8") as handle:
+        handle.write(_entry("job-b", base, JobStatus.FAILED).to_json() + "\n")
+        handle.write('{"job_id": "partial"')
+
+    assert import_jsonl_history(jsonl_path, store) == 1
+    assert store.get_job("job-b").status == JobStatus.FAILED
+    assert store.get_job("partial") is None
+    assert store.count_jobs() == 2
+
+
+def test_create_job_history_store_selects_backend(tmp_path):
+    jsonl_path = tmp_path / "job_history.jsonl"
+    jsonl_path.write_text(_entry("legacy", datetime(2025, 1, 1)).to_json() + "\n", encoding="utf-8")
+
+    assert isinstance(create_job_history_store(jsonl_path), JSONLJobHistoryStore)
+    assert isinstance(create_job_history_store(tmp_path / "h.db"), SQLiteJobHistoryStore)
+
+    store = create_job_history_store(jsonl_path, backend="sqlite")
+    assert isinstance(store, SQLiteJobHistoryStore)
+    assert store.path == tmp_path / "job_history.sqlite3"
+    assert store.get_job("legacy") is not None
@@ -277,3 +277,24 @@ class TestPersistenceWorker:
         
         finally:
             worker.stop()
+
+    def test_shutdown_runs_registered_flushes(self):
+        """Test that shutdown flushes group-committed writers and skips discarded ones."""
+        from src.services.persistence_worker import register_shutdown_flush, shutdown_persistence_worker
+
+        calls = []
+
+        class _Writer:
+            def close(self):
+                calls.append("close")
+
+        writer = _Writer()
+        discarded = _Writer()
+        register_shutdown_flush(writer.close)
+        register_shutdown_flush(discarded.close)
+        del discarded
+
+        shutdown_persistence_worker(timeout=1.0)
+        shutdown_persistence_worker(timeout=1.0)
+
+        assert calls == ["close"]
@@ -7,7 +7,7 @@ by appending _copy1, _copy2, etc.
 
 import pytest
 from pathlib import Path
-from src.utils.file_io import get_unique_output_path
+from src.utils.file_io import get_unique_output_path, release_output_path
 
 
 def test_no_collision_returns_original(tmp_path):
@@ -158,3 +158,19 @@ def test_special_chars_in_stem(tmp_path):
     result = get_unique_output_path(test_file)
     assert result.name == "image-2024.12.25_copy1.png", \
         f"Special chars should be preserved: {result.name}"
+
+
+def test_reserved_path_counts_as_taken_until_released(tmp_path):
+    """Verify a name queued for writing is not handed out twice."""
+    test_file = tmp_path / "pending.png"
+
+    first = get_unique_output_path(test_file, reserve=True)
+    second = get_unique_output_path(test_file, reserve=True)
+    try:
+        assert first == test_file
+        assert second.name == "pending_copy1.png"
+    finally:
+        release_output_path(first)
+        release_output_path(second)
+
+    assert get_unique_output_path(test_file) == test_file
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.pipeline.job_models_v2 import NormalizedJobRecord
+from src.queue.job_history_store import (
+    JobHistoryEntry,
+    JSONLJobHistoryStore,
+    compact_history_file,
+)
+from src.queue.job_model import Job, JobStatus
+from src.services.queue_store_v2 import (
+    SCHEMA_VERSION,
+    QueueSnapshotV1,
+    load_queue_snapshot,
+    save_queue_snapshot,
+)
+from src.services.persistence_worker import PersistenceWorker
+from src.utils.config_blob_store import (
+    BLOB_REF_KEY,
+    BLOB_REF_VERSION,
+    UnresolvedConfigBlobError,
+    blob_ref_sha,
+    blob_store_dir_for,
+    get_config_blob_store,
+    hydrate_snapshot,
+    is_blob_ref,
+    referenced_blob_shas,
+    resolve_blob_ref,
+)
+from src.utils.snapshot_builder_v2 import build_job_snapshot, normalized_job_from_snapshot
+
+
+@pytest.fixture
+def blobs_enabled(monkeypatch):
+    monkeypatch.setattr("src.config.app_config._config_blob_store_enabled", True)
+
+
+@pytest.fixture
+def sync_persistence(monkeypatch):
+    """Run persistence tasks inline through the real worker dispatch."""
+    worker = PersistenceWorker()
+
+    class _SyncWorker:
+        def enqueue(self, task, critical: bool = False) -> bool:
+            worker._process_task(task)
+            return True
+
+    monkeypatch.setattr(
+        "src.services.persistence_worker.get_persistence_worker", lambda: _SyncWorker()
+    )
+
+
+def _variant_snapshot(index: int) -> dict:
+    config = {
+        "txt2img": {
+            "model": "sdxl_base.safetensors",
+            "sampler_name": "DPM++ 2M",
+            "steps": 30,
+            "cfg_scale": 6.5,
+            "width": 1024,
+            "height": 1024,
+            "prompt": f"portrait variant {index}",
+            "negative_prompt": "blurry, lowres, watermark, " * 8,
+        },
+        "adetailer": {"enabled": True, "model": "face_yolov8n.pt", "confidence": 0.35},
+        "upscale": {"enabled": True, "upscaler": "4x-UltraSharp", "scale": 2.0},
+        "seed": 1000 + index,
+    }
+    record = NormalizedJobRecord(
+        job_id=f"variant-{index}",
+        config=config,
+        path_output_dir="output",
+        filename_template="{seed}",
+        seed=1000 + index,
+        positive_prompt=f"portrait variant {index}",
+    )
+    job = Job(job_id=record.job_id, prompt_source="pack")
+    return build_job_snapshot(job, record)
+
+
+def test_dehydrate_and_hydrate_round_trip(tmp_path: Path) -> None:
+    store = get_config_blob_store(tmp_path / "blobs")
+    original = _variant_snapshot(0)
+    expected = json.loads(json.dumps(original))
+
+    dehydrated = store.dehydrate_snapshot(original)
+
+    assert is_blob_ref(dehydrated["normalized_job"])
+    assert is_blob_ref(resolve_blob_ref(dehydrated["normalized_job"])["config"])
+    assert is_blob_ref(dehydrated["config_layers"])
+    assert not is_blob_ref(original["normalized_job"]["config"])
+    stored = json.loads(json.dumps(dehydrated))
+    stored_copy = json.loads(json.dumps(stored))
+    restored = hydrate_snapshot(stored)
+    assert restored == expected
+    assert stored == stored_copy
+
+
+def test_similar_configs_are_stored_as_patches(tmp_path: Path) -> None:
+    store = get_config_blob_store(tmp_path / "blobs")
+    first = store.dehydrate_snapshot(_variant_snapshot(1))
+    second = store.dehydrate_snapshot(_variant_snapshot(2))
+
+    njr_ref = second["normalized_job"]
+    assert blob_ref_sha(njr_ref) == blob_ref_sha(first["normalized_job"])
+    assert ["job_id"] in [path for path, _ in njr_ref[BLOB_REF_KEY]["set"]]
+    config_ref = resolve_blob_ref(njr_ref)["config"]
+    assert blob_ref_sha(config_ref) == blob_ref_sha(resolve_blob_ref(first["normalized_job"])["config"])
+    assert ["txt2img", "prompt"] in [path for path, _ in config_ref[BLOB_REF_KEY]["set"]]
+    record = normalized_job_from_snapshot(json.loads(json.dumps(second)))
+    assert record is not None
+    assert record.config["txt2img"]["prompt"] == "portrait variant 2"
+    assert record.config["seed"] == 1002
+
+
+def test_missing_blob_is_reported_not_defaulted(tmp_path: Path) -> None:
+    ref = {BLOB_REF_KEY: {"v": BLOB_REF_VERSION, "sha": "0" * 64}}
+    snapshot = {"normalized_job": {"job_id": "orphan", "config": ref}}
+
+    with pytest.raises(UnresolvedConfigBlobError, match="normalized_job.config"):
+        hydrate_snapshot(snapshot)
+    assert normalized_job_from_snapshot(snapshot) is None
+    assert snapshot["normalized_job"]["config"] is ref
+
+    entry = JobHistoryEntry(
+        job_id="orphan", created_at=datetime(2025, 1, 1), status=JobStatus.COMPLETED, snapshot=snapshot
+    )
+    assert JobHistoryEntry.from_json(entry.to_json()).snapshot == snapshot
+
+
+def test_only_versioned_envelopes_are_refs() -> None:
+    config = {"$blob": "0" * 64}
+    snapshot = {"normalized_job": {"job_id": "plain", "config": config}}
+
+    assert not is_blob_ref(config)
+    assert not is_blob_ref({BLOB_REF_KEY: {"v": BLOB_REF_VERSION, "sha": "0" * 64}, "extra": 1})
+    assert hydrate_snapshot(snapshot) is snapshot
+    with pytest.raises(UnresolvedConfigBlobError, match="unsupported reference version 2"):
+        hydrate_snapshot({"config_layers": {BLOB_REF_KEY: {"v": 2, "sha": "0" * 64}}})
+
+
+def test_history_entries_reference_shared_blobs(tmp_path: Path, monkeypatch, blobs_enabled) -> None:
+    class _SyncWorker:
+        def enqueue(self, task, critical: bool = False) -> bool:
+            with open(task.data["file_path"], "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(task.data["payload"]) + "\n")
+            return True
+
+    monkeypatch.setattr(
+        "src.services.persistence_worker.get_persistence_worker", lambda: _SyncWorker()
+    )
+    history_path = tmp_path / "history.jsonl"
+    store = JSONLJobHistoryStore(history_path)
+    inline_bytes = 0
+    for index in range(20):
+        snapshot = _variant_snapshot(index)
+        inline_bytes += len(json.dumps(snapshot))
+        job = Job(job_id=f"variant-{index}")
+        job.snapshot = snapshot
+        store.record_job_submission(job)
+
+    assert history_path.stat().st_size * 2 < inline_bytes
+    assert blob_store_dir_for(history_path).exists()
+    reloaded = JSONLJobHistoryStore(history_path).get_job("variant-7")
+    assert reloaded is not None
+    assert reloaded.snapshot["normalized_job"]["config"]["txt2img"]["prompt"] == "portrait variant 7"
+
+
+def test_queue_store_round_trips_blob_refs(tmp_path: Path, blobs_enabled) -> None:
+    state_file = tmp_path / "queue_state.json"
+    jobs = [
+        {
+            "queue_id": f"variant-{index}",
+            "njr_snapshot": _variant_snapshot(index),
+            "priority": 1,
+            "status": "queued",
+            "created_at": "2025-01-01T00:00:00Z",
+            "queue_schema": SCHEMA_VERSION,
+        }
+        for index in range(3)
+    ]
+    assert save_queue_snapshot(QueueSnapshotV1(jobs=jobs[:2]), state_file)
+    assert save_queue_snapshot(QueueSnapshotV1(jobs=jobs), state_file)
+    assert BLOB_REF_KEY in state_file.read_text(encoding="utf-8")
+
+    loaded = load_queue_snapshot(state_file)
+
+    assert loaded is not None
+    configs = [job["njr_snapshot"]["normalized_job"]["config"] for job in loaded.jobs]
+    assert [config["seed"] for config in configs] == [1000, 1001, 1002]
+
+
+def test_history_entry_json_without_refs_is_unchanged() -> None:
+    entry = JobHistoryEntry(
+        job_id="plain",
+        created_at=datetime(2025, 1, 1),
+        status=JobStatus.COMPLETED,
+        snapshot={"normalized_job": {"job_id": "plain", "config": {"a": 1}}},
+    )
+
+    assert JobHistoryEntry.from_json(entry.to_json()).snapshot == entry.snapshot
+
+
+def _blob_files(root: Path) -> set[str]:
+    return {path.stem for path in root.glob("*/*.json")}
+
+
+def test_history_compaction_collects_unreferenced_blobs(
+    tmp_path: Path, monkeypatch, blobs_enabled, sync_persistence
+) -> None:
+    monkeypatch.setattr("src.utils.config_blob_store.BLOB_GC_GRACE_S", 0.0)
+    history_path = tmp_path / "history.jsonl"
+    history = JSONLJobHistoryStore(history_path)
+    for index in range(3):
+        job = Job(job_id=f"variant-{index}")
+        job.snapshot = _variant_snapshot(index)
+        history.record_job_submission(job)
+        history.record_status_change(job.job_id, JobStatus.COMPLETED, datetime(2025, 1, 2))
+    queue_job = {
+        "queue_id": "queued",
+        "njr_snapshot": _variant_snapshot(7),
+        "priority": 1,
+        "status": "queued",
+        "created_at": "2025-01-01T00:00:00Z",
+        "queue_schema": SCHEMA_VERSION,
+    }
+    state_file = tmp_path / "queue_state.json"
+    assert save_queue_snapshot(QueueSnapshotV1(jobs=[queue_job]), state_file)
+    store = get_config_blob_store(blob_store_dir_for(history_path))
+    orphan = store.put({"orphan": "x" * 512})
+    before = _blob_files(store.root)
+
+    assert compact_history_file(history_path) == 3
+
+    after = _blob_files(store.root)
+    assert before - after == {orphan}
+    assert len(history_path.read_text(encoding="utf-8").splitlines()) == 3
+    reloaded = JSONLJobHistoryStore(history_path)
+    for index in range(3):
+        entry = reloaded.get_job(f"variant-{index}")
+        assert entry is not None and entry.status == JobStatus.COMPLETED
+        assert entry.snapshot["normalized_job"]["config"]["seed"] == 1000 + index
+    loaded = load_queue_snapshot(state_file)
+    assert loaded is not None
+    assert loaded.jobs[0]["njr_snapshot"]["normalized_job"]["config"]["seed"] == 1007
+
+
+def test_blob_gc_keeps_everything_when_a_referrer_fails(tmp_path: Path, monkeypatch) -> None:
+    store = get_config_blob_store(tmp_path / "blobs")
+    orphan = store.put({"orphan": "y" * 512})
+
+    def _broken():
+        raise OSError("unreadable")
+
+    store.register_referrer("broken", _broken)
+    assert store.collect_garbage(grace_s=0.0)["blobs_collected"] == 0
+    assert orphan in _blob_files(store.root)
+
+
+def test_recently_used_blobs_survive_gc(tmp_path: Path) -> None:
+    store = get_config_blob_store(tmp_path / "blobs")
+    sha = store.put({"pending": "z" * 512})
+
+    assert store.collect_garbage()["blobs_collected"] == 0
+    assert sha in _blob_files(store.root)
+    assert referenced_blob_shas({"a": [{BLOB_REF_KEY: {"v": BLOB_REF_VERSION, "sha": sha}}]}) == {sha}
+
+
+def test_history_compacts_itself_once_lines_pile_up(
+    tmp_path: Path, monkeypatch, blobs_enabled, sync_persistence
+) -> None:
+    monkeypatch.setattr("src.queue.job_history_store.HISTORY_COMPACT_MIN_LINES", 6)
+    history_path = tmp_path / "history.jsonl"
+    history = JSONLJobHistoryStore(history_path)
+    job = Job(job_id="busy")
+    job.snapshot = _variant_snapshot(0)
+    history.record_job_submission(job)
+    for status in (JobStatus.RUNNING, JobStatus.FAILED, JobStatus.QUEUED, JobStatus.RUNNING):
+        history.record_status_change("busy", status, datetime(2025, 1, 2))
+    history.record_status_change("busy", JobStatus.COMPLETED, datetime(2025, 1, 3))
+
+    history.invalidate_cache()
+    assert [entry.job_id for entry in history.list_jobs()] == ["busy"]
+
+    assert len(history_path.read_text(encoding="utf-8").splitlines()) == 1
+    entry = history.list_jobs()[0]
+    assert entry.status == JobStatus.COMPLETED
+    assert entry.snapshot["normalized_job"]["config"]["seed"] == 1000
+
+
+def test_history_snapshots_hydrate_on_first_access(
+    tmp_path: Path, monkeypatch, blobs_enabled, sync_persistence
+) -> None:
+    history_path = tmp_path / "history.jsonl"
+    history = JSONLJobHistoryStore(history_path)
+    for index in range(3):
+        job = Job(job_id=f"variant-{index}")
+        job.snapshot = _variant_snapshot(index)
+        history.record_job_submission(job)
+    lines = history_path.read_text(encoding="utf-8").splitlines()
+    calls: list[str] = []
+    real_hydrate = hydrate_snapshot
+
+    def _counting_hydrate(snapshot):
+        calls.append(snapshot["normalized_job"][BLOB_REF_KEY]["sha"])
+        return real_hydrate(snapshot)
+
+    monkeypatch.setattr("src.queue.job_history_store.hydrate_snapshot", _counting_hydrate)
+    entries = [JobHistoryEntry.from_json(line) for line in lines]
+
+    assert calls == []
+    assert json.loads(entries[0].to_json())["snapshot"] == json.loads(lines[0])["snapshot"]
+    assert calls == []
+    assert entries[1].snapshot["normalized_job"]["config"]["seed"] == 1001
+    assert entries[1].snapshot["normalized_job"]["config"]["seed"] == 1001
+    assert len(calls) == 1
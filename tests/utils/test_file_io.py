@@ -7,7 +7,7 @@ from unittest.mock import patch
 
 from PIL import Image
 
-from src.utils.file_io import save_image_from_base64
+from src.utils.file_io import ImageBase64Cache, load_image_to_base64, save_image_from_base64
 from src.utils.image_metadata import (
     ImageMetadataContractV26,
     build_contract_kv,
@@ -56,3 +56,90 @@ def test_save_image_from_base64_embeds_png_metadata_inline(tmp_path: Path) -> No
     decoded = decode_payload(stored)
     assert decoded.status == "ok"
     assert decoded.payload == payload
+
+
+def _write_png(path: Path, size: tuple[int, int] = (8, 8), color=(10, 20, 30)) -> bytes:
+    image = Image.new("RGB", size, color=color)
+    image.save(path, format="PNG")
+    return path.read_bytes()
+
+
+def test_load_image_to_base64_uploads_png_bytes_without_reencoding(tmp_path: Path) -> None:
+    image_path = tmp_path / "input.png"
+    raw = _write_png(image_path)
+
+    with patch.object(Image.Image, "save", side_effect=AssertionError("re-encoded")):
+        encoded = load_image_to_base64(image_path)
+
+    assert encoded is not None
+    assert base64.b64decode(encoded) == raw
+
+
+def test_load_image_to_base64_rejects_non_images(tmp_path: Path) -> None:
+    bogus = tmp_path / "bogus.png"
+    bogus.write_bytes(b"not an image")
+
+    assert load_image_to_base64(bogus) is None
+
+
+def test_image_base64_cache_reloads_rewritten_files(tmp_path: Path) -> None:
+    image_path = tmp_path / "input.png"
+    _write_png(image_path)
+    cache = ImageBase64Cache(max_bytes=1024 * 1024)
+
+    first = cache.get(image_path)
+    assert cache.get(image_path) is first
+    _write_png(image_path, size=(16, 16), color=(200, 0, 0))
+    second = cache.get(image_path)
+
+    assert second is not None and second != first
+    assert len(cache) == 1
+
+
+def test_image_base64_cache_evicts_by_byte_budget(tmp_path: Path) -> None:
+    paths = [tmp_path / f"img{index}.png" for index in range(3)]
+    for index, path in enumerate(paths):
+        _write_png(path, color=(index, index, index))
+    cache = ImageBase64Cache(max_bytes=0)
+    entry_size = len(cache.get(paths[0]) or "")
+    assert len(cache) == 0
+
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    for path in paths:
+        cache.get(path)
+
+    assert len(cache) == 2
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_save_image_from_base64_keeps_png_bytes(tmp_path: Path) -> None:
+    source = _png_base64(size=(32, 32))
+    output_path = tmp_path / "raw.png"
+
+    with patch.object(Image.Image, "save", side_effect=AssertionError("re-encoded")):
+        saved_path = save_image_from_base64(
+            source,
+            output_path,
+            metadata_builder=lambda image: {"size": f"{image.size[0]}x{image.size[1]}"},
+        )
+
+    assert saved_path == output_path.resolve()
+    raw = base64.b64decode(source)
+    written = output_path.read_bytes()
+    assert raw[raw.index(b"IDAT") - 4 :] == written[written.index(b"IDAT") - 4 :]
+    assert read_image_metadata(output_path)["size"] == "32x32"
+
+
+def test_save_image_from_base64_embeds_jpg_metadata_in_one_encode(tmp_path: Path) -> None:
+    output_path = tmp_path / "inline.jpg"
+
+    with patch("src.utils.image_metadata.write_image_metadata") as write_spy:
+        saved_path = save_image_from_base64(
+            _png_base64(),
+            output_path,
+            metadata_builder=lambda _image: {"k": "v"},
+        )
+
+    assert saved_path == output_path.resolve()
+    assert write_spy.called is False
+    assert read_image_metadata(output_path)["k"] == "v"
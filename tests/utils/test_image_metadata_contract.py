@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 import random
 import string
 from pathlib import Path
+from unittest.mock import patch
 
 from PIL import Image
 
@@ -14,9 +16,12 @@ from src.utils.image_metadata import (
     encode_payload,
     extract_embedded_metadata,
     read_image_metadata,
+    read_png_text_chunks,
     resolve_model_vae_fields,
     resolve_prompt_fields,
     write_image_metadata,
+    write_portable_review_metadata,
+    read_portable_review_metadata,
 )
 
 
@@ -218,3 +223,111 @@ def test_build_payload_from_manifest_preserves_prompt_and_model_fields(tmp_path:
     assert payload["stage_manifest"]["final_prompt"] == "final prompt"
     assert payload["stage_manifest"]["model"] == "modelA"
     assert payload["stage_manifest"]["vae"] == "vaeA"
+
+
+def _png_image_data(data: bytes) -> bytes:
+    # Concatenated IDAT chunks, located by the IDAT type tag.
+    start = data.index(b"IDAT") - 4
+    end = data.index(b"IEND") - 4
+    return data[start:end]
+
+
+def test_png_metadata_is_spliced_without_reencoding(tmp_path: Path) -> None:
+    image_path = tmp_path / "splice.png"
+    _write_png(image_path, size=(64, 64))
+    original = image_path.read_bytes()
+
+    with patch.object(Image.Image, "save", side_effect=AssertionError("re-encoded")):
+        assert write_image_metadata(image_path, {"alpha": "1", "beta": "two"})
+        assert write_image_metadata(image_path, {"alpha": "3"})
+
+    updated = image_path.read_bytes()
+    assert updated.startswith(original[: original.index(b"IEND") - 4])
+    assert _png_image_data(updated).startswith(_png_image_data(original))
+    stored = read_image_metadata(image_path)
+    assert stored["alpha"] == "3"
+    assert stored["beta"] == "two"
+    with Image.open(image_path) as img:
+        img.load()
+        assert img.size == (64, 64)
+
+
+def test_review_metadata_updates_rewrite_only_the_png_tail(tmp_path: Path) -> None:
+    image_path = tmp_path / "review.png"
+    _write_png(image_path, size=(64, 64))
+    original_size = image_path.stat().st_size
+
+    for rating in range(5):
+        result = write_portable_review_metadata(image_path, {"rating": rating})
+        assert result.storage == "embedded"
+
+    metadata_size = len(json.dumps({"rating": 4}, sort_keys=True)) + len("stablenew_review") + 17
+    assert image_path.stat().st_size == original_size + metadata_size
+    assert read_portable_review_metadata(image_path).payload == {"rating": 4}
+
+
+def test_png_metadata_update_failure_leaves_original_file_intact(tmp_path: Path) -> None:
+    image_path = tmp_path / "crash.png"
+    _write_png(image_path, size=(64, 64))
+    assert write_image_metadata(image_path, {"alpha": "1"})
+    before = image_path.read_bytes()
+
+    with patch("src.utils.image_metadata.os.fsync", side_effect=OSError("disk gone")):
+        assert write_image_metadata(image_path, {"alpha": "2"}) is False
+
+    assert image_path.read_bytes() == before
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["crash.png"]
+    assert read_image_metadata(image_path)["alpha"] == "1"
+
+
+def test_jpg_metadata_keeps_compressed_image_data(tmp_path: Path) -> None:
+    image_path = tmp_path / "splice.jpg"
+    _write_jpg(image_path, size=(32, 32))
+    original = image_path.read_bytes()
+    scan = original[original.index(b"\xff\xda") :]
+
+    with patch.object(Image.Image, "save", side_effect=AssertionError("re-encoded")):
+        assert write_image_metadata(image_path, {ImageMetadataContractV26.KEY_SCHEMA: "x", "k": "v"})
+        assert write_image_metadata(image_path, {"k": "w"})
+
+    updated = image_path.read_bytes()
+    assert updated.endswith(scan)
+    assert updated.count(b"Exif\x00\x00") == 1
+    assert read_image_metadata(image_path)["k"] == "w"
+
+
+def test_jpg_metadata_update_failure_leaves_original_file_intact(tmp_path: Path) -> None:
+    image_path = tmp_path / "crash.jpg"
+    _write_jpg(image_path, size=(32, 32))
+    assert write_image_metadata(image_path, {"k": "1"})
+    before = image_path.read_bytes()
+
+    with patch("src.utils.image_metadata.os.fsync", side_effect=OSError("disk gone")):
+        assert write_image_metadata(image_path, {"k": "2"}) is False
+
+    assert image_path.read_bytes() == before
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["crash.jpg"]
+    assert read_image_metadata(image_path)["k"] == "1"
+
+
+def test_png_text_chunks_are_read_without_pil(tmp_path: Path) -> None:
+    from PIL import PngImagePlugin
+
+    image_path = tmp_path / "chunks.png"
+    info = PngImagePlugin.PngInfo()
+    info.add_text("plain", "caf\u00e9")
+    info.add_text("zipped", "z" * 500, zip=True)
+    info.add_itxt("unicode", "\u2713 ok", zip=True)
+    Image.new("RGB", (16, 16)).save(image_path, pnginfo=info)
+    assert write_image_metadata(image_path, {"tail": "after IDAT"})
+    with Image.open(image_path) as img:
+        img.load()
+        expected = {key: str(value) for key, value in img.text.items()}
+
+    with patch.object(Image, "open", side_effect=AssertionError("PIL used")):
+        assert read_png_text_chunks(image_path) == expected
+        assert read_image_metadata(image_path) == expected
+
+    jpeg_named_png = tmp_path / "really_a.png"
+    Image.new("RGB", (8, 8)).save(jpeg_named_png, format="JPEG")
+    assert read_image_metadata(jpeg_named_png) == {}
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import socket
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from src.video import ComfyWorkflowVideoBackend, VideoExecutionRequest
+from src.video.comfy_api_client import ComfyApiClient
+from src.video.comfy_execution_stream import (
+    ComfyExecutionFailed,
+    ComfyExecutionStreamError,
+    wait_for_prompt_completion,
+    websocket_url,
+)
+from tests.helpers.fake_comfy_ws import FakeComfyWebSocket as _FakeComfyWebSocket
+from tests.helpers.fake_comfy_ws import event as _event
+from tests.helpers.fake_comfy_ws import server_frame as _server_frame
+
+
+def _completed_run_frames(prompt_id: str, output_path: str) -> list[bytes]:
+    executed = json.dumps(
+        {
+            "type": "executed",
+            "data": {"node": "4", "prompt_id": prompt_id, "output": {"videos": [{"filename": output_path}]}},
+        }
+    ).encode("utf-8")
+    return [
+        _event("status", status={"exec_info": {"queue_remaining": 1}}),
+        _event("execution_start", prompt_id=prompt_id),
+        _event("progress", value=1, max=4, node="3", prompt_id="someone-else"),
+        _event("progress", value=2, max=4, node="3", prompt_id=prompt_id),
+        _server_frame(0x9, b"hi"),
+        _server_frame(0x2, b"\x00\x00\x00\x01preview-bytes"),
+        _event("progress", value=4, max=4, node="3", prompt_id=prompt_id),
+        _server_frame(0x1, executed[:20], fin=False),
+        _server_frame(0x0, executed[20:]),
+        _event("executing", node=None, prompt_id=prompt_id),
+    ]
+
+
+def test_websocket_url_maps_http_scheme_and_client_id() -> None:
+    assert websocket_url("http://127.0.0.1:8188/", "job-1") == "ws://127.0.0.1:8188/ws?clientId=job-1"
+    assert websocket_url("https://comfy.local", "c") == "wss://comfy.local/ws?clientId=c"
+
+
+def test_execution_stream_reports_progress_and_completion(tmp_path: Path) -> None:
+    server = _FakeComfyWebSocket(_completed_run_frames("p-1", str(tmp_path / "clip.mp4")))
+    progress: list[tuple[str, int, int]] = []
+    try:
+        with ComfyApiClient(base_url=server.base_url).open_execution_stream("job-7") as stream:
+            completion = wait_for_prompt_completion(
+                stream,
+                "p-1",
+                timeout=5.0,
+                on_progress=lambda node, value, maximum: progress.append((node, value, maximum)),
+            )
+    finally:
+        server.close()
+
+    assert server.paths == ["/ws?clientId=job-7"]
+    assert progress == [("3", 2, 4), ("3", 4, 4)]
+    assert completion.outputs == {"4": {"videos": [{"filename": str(tmp_path / "clip.mp4")}]}}
+    assert completion.history_entry()["status"]["completed"] is True
+
+
+def test_execution_stream_raises_on_execution_error() -> None:
+    server = _FakeComfyWebSocket(
+        [_event("execution_error", prompt_id="p-1", node_id="3", exception_message="CUDA out of memory")]
+    )
+    try:
+        stream = ComfyApiClient(base_url=server.base_url).open_execution_stream("job-7")
+        with pytest.raises(ComfyExecutionFailed, match="CUDA out of memory"):
+            wait_for_prompt_completion(stream, "p-1", timeout=5.0)
+        stream.close()
+    finally:
+        server.close()
+
+
+def test_backend_completes_from_websocket_without_polling_history(tmp_path: Path) -> None:
+    server = _FakeComfyWebSocket(_completed_run_frames("p-1", str(tmp_path / "clip.mp4")))
+    client = Mock()
+    pipeline = Mock()
+    backend = ComfyWorkflowVideoBackend(client=client, history_poll_interval=0.01, history_timeout=5.0)
+    request = VideoExecutionRequest(
+        backend_id="comfy",
+        stage_name="video_workflow",
+        stage_config={},
+        output_dir=tmp_path,
+    )
+    try:
+        stream = ComfyApiClient(base_url=server.base_url).open_execution_stream("job-7")
+        entry = backend._wait_for_prompt_result(
+            client,
+            stream,
+            prompt_id="p-1",
+            pipeline=pipeline,
+            request=request,
+        )
+        stream.close()
+    finally:
+        server.close()
+
+    assert entry["outputs"]["4"]["videos"][0]["filename"] == str(tmp_path / "clip.mp4")
+    client.get_history.assert_not_called()
+    last_update = pipeline._emit_stage_detail_update.call_args.kwargs
+    assert last_update["stage_name"] == "video_workflow"
+    assert last_update["progress"] == 1.0
+    assert last_update["current_step"] == 4
+
+
+def test_backend_falls_back_to_history_polling_when_websocket_drops(tmp_path: Path) -> None:
+    server = _FakeComfyWebSocket(
+        [_event("progress", value=1, max=4, node="3", prompt_id="p-1")],
+        close_after=True,
+    )
+    client = Mock()
+    client.get_history.side_effect = [{}, {"p-1": {"outputs": {"4": {}}, "status": {"completed": True}}}]
+    backend = ComfyWorkflowVideoBackend(client=client, history_poll_interval=0.01, history_timeout=5.0)
+    request = VideoExecutionRequest(
+        backend_id="comfy",
+        stage_name="video_workflow",
+        stage_config={},
+        output_dir=tmp_path,
+    )
+    try:
+        stream = ComfyApiClient(base_url=server.base_url).open_execution_stream("job-7")
+        entry = backend._wait_for_prompt_result(
+            client,
+            stream,
+            prompt_id="p-1",
+            pipeline=Mock(),
+            request=request,
+        )
+    finally:
+        server.close()
+
+    assert entry["outputs"] == {"4": {}}
+    assert client.get_history.call_count == 2
+
+
+def test_backend_checks_history_when_open_websocket_goes_quiet(tmp_path: Path) -> None:
+    # The socket stays open but never reports completion for the prompt.
+    server = _FakeComfyWebSocket([_event("progress", value=1, max=4, node="3", prompt_id="p-1")])
+    done = {"p-1": {"outputs": {"4": {}}, "status": {"completed": True}}}
+    client = Mock()
+    client.get_history.side_effect = [{}, done, done]
+    backend = ComfyWorkflowVideoBackend(
+        client=client,
+        history_poll_interval=0.01,
+        history_timeout=30.0,
+        stream_idle_check_interval=0.1,
+    )
+    request = VideoExecutionRequest(
+        backend_id="comfy",
+        stage_name="video_workflow",
+        stage_config={},
+        output_dir=tmp_path,
+    )
+    started = time.monotonic()
+    try:
+        stream = ComfyApiClient(base_url=server.base_url).open_execution_stream("job-7")
+        entry = backend._wait_for_prompt_result(
+            client,
+            stream,
+            prompt_id="p-1",
+            pipeline=Mock(),
+            request=request,
+        )
+        stream.close()
+    finally:
+        server.close()
+
+    assert entry["outputs"] == {"4": {}}
+    assert client.get_history.call_count == 3
+    assert time.monotonic() - started < 1.5
+
+
+def test_wait_for_prompt_completion_keeps_listening_while_idle_check_is_false() -> None:
+    server = _FakeComfyWebSocket([_event("executing", node=None, prompt_id="p-1")])
+    checks: list[float] = []
+    try:
+        with ComfyApiClient(base_url=server.base_url).open_execution_stream("job-7") as stream:
+            completion = wait_for_prompt_completion(
+                stream,
+                "p-1",
+                timeout=5.0,
+                idle_check=lambda: checks.append(time.monotonic()) or False,
+                idle_interval=0.1,
+            )
+    finally:
+        server.close()
+
+    assert completion.finished_off_stream is False
+    assert checks == []
+
+
+def test_open_execution_stream_raises_when_websocket_unavailable() -> None:
+    listener = socket.create_server(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+
+    with pytest.raises(ComfyExecutionStreamError):
+        ComfyApiClient(base_url=f"http://127.0.0.1:{port}").open_execution_stream("job-7", timeout=1.0)
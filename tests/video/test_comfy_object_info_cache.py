@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from src.video import build_default_workflow_registry
+from src.video.comfy_object_info_cache import ComfyObjectInfoCache, system_stats_fingerprint
+
+_READY_OBJECT_INFO = {
+    "StableNewLTXAnchorBridge": {"input": {}},
+    "models": {"checkpoints": ["ltx_video.safetensors"]},
+}
+
+
+def _system_stats(version: str = "0.3.10", vram_free: int = 1000) -> dict:
+    return {
+        "system": {"os": "nt", "comfyui_version": version, "python_version": "3.11", "ram_free": 5},
+        "devices": [{"name": "cuda:0 RTX", "type": "cuda", "index": 0, "vram_total": 24, "vram_free": vram_free}],
+    }
+
+
+def _client(object_info: dict, *, base_url: str = "http://127.0.0.1:8188") -> Mock:
+    client = Mock()
+    client.base_url = base_url
+    client.get_system_stats.return_value = _system_stats()
+    client.get_object_info.return_value = object_info
+    return client
+
+
+def test_fingerprint_ignores_free_memory_but_tracks_install_identity() -> None:
+    assert system_stats_fingerprint(_system_stats(vram_free=1)) == system_stats_fingerprint(_system_stats(vram_free=9))
+    assert system_stats_fingerprint(_system_stats("0.3.10")) != system_stats_fingerprint(_system_stats("0.3.11"))
+
+
+def test_ready_verdict_is_reused_across_segments_until_invalidated() -> None:
+    spec = build_default_workflow_registry().get("ltx_multiframe_anchor_v1")
+    cache = ComfyObjectInfoCache()
+    client = _client(_READY_OBJECT_INFO)
+
+    for _ in range(4):
+        verdict, object_info = cache.probe_workflow(client, spec)
+        assert verdict.ready is True
+        assert object_info == _READY_OBJECT_INFO
+
+    assert client.get_object_info.call_count == 1
+    stats = cache.stats()
+    assert stats["object_info_hits"] == 3
+    assert stats["verdict_hits"] == 3
+    assert stats["verdict_hit_rate"] == 0.75
+
+    cache.invalidate("http://127.0.0.1:8188/")
+    cache.probe_workflow(client, spec)
+    assert client.get_object_info.call_count == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_new_fingerprint_on_same_url_refetches_object_info() -> None:
+    spec = build_default_workflow_registry().get("ltx_multiframe_anchor_v1")
+    cache = ComfyObjectInfoCache()
+    client = _client(_READY_OBJECT_INFO)
+
+    cache.probe_workflow(client, spec)
+    client.get_system_stats.return_value = _system_stats("0.3.11")
+    cache.probe_workflow(client, spec)
+
+    assert client.get_object_info.call_count == 2
+
+
+def test_missing_dependency_is_confirmed_against_a_fresh_payload() -> None:
+    spec = build_default_workflow_registry().get("ltx_multiframe_anchor_v1")
+    cache = ComfyObjectInfoCache()
+    client = _client({"models": {"checkpoints": []}})
+
+    first, _ = cache.probe_workflow(client, spec)
+    # The user installs the nodes; a cached negative verdict must not stick.
+    client.get_object_info.return_value = _READY_OBJECT_INFO
+    second, object_info = cache.probe_workflow(client, spec)
+
+    assert first.ready is False
+    assert second.ready is True
+    assert object_info == _READY_OBJECT_INFO
+    assert client.get_object_info.call_count == 2
+
+
+def test_clients_without_base_url_bypass_the_cache() -> None:
+    spec = build_default_workflow_registry().get("ltx_multiframe_anchor_v1")
+    cache = ComfyObjectInfoCache()
+    client = Mock()
+    client.get_object_info.return_value = _READY_OBJECT_INFO
+
+    cache.probe_workflow(client, spec)
+    cache.probe_workflow(client, spec)
+
+    assert client.get_object_info.call_count == 2
+    assert cache.stats()["instances"] == 0
+
+
+def test_process_manager_start_invalidates_its_base_url(monkeypatch) -> None:
+    from src.video import comfy_process_manager as manager_module
+
+    invalidated: list[str | None] = []
+    monkeypatch.setattr(manager_module, "invalidate_comfy_object_info", invalidated.append)
+    monkeypatch.setattr(manager_module.subprocess, "Popen", Mock(return_value=Mock(stdout=None, stderr=None)))
+    manager = manager_module.ComfyProcessManager(
+        manager_module.ComfyProcessConfig(command=["comfy"], base_url="http://127.0.0.1:8190")
+    )
+    try:
+        manager.start()
+    finally:
+        monkeypatch.setattr(manager_module, "_GLOBAL_COMFY_PROCESS_MANAGER", None)
+
+    assert invalidated == ["http://127.0.0.1:8190"]
@@ -748,3 +748,98 @@ def test_comfy_workflow_backend_preserves_original_video_when_secondary_motion_u
     assert result.replay_manifest_fragment["secondary_motion_summary"]["status"] == "unavailable"
     assert container_payloads[0]["secondary_motion_summary"]["status"] == "unavailable"
 
+
+
+def test_comfy_workflow_backend_runs_concurrent_segments_on_separate_websockets(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    """Pipelined segments of one job must not share a Comfy clientId: Comfy
+    keeps one /ws socket per id, so the older segment would lose its events."""
+    import threading
+
+    from src.video.comfy_api_client import ComfyApiClient
+    from tests.helpers.fake_comfy_ws import FakeComfyHub, event
+
+    for name in ("start.png", "end.png", "p-1.mp4", "p-2.mp4"):
+        (tmp_path / name).write_bytes(b"data")
+
+    def _prompt_frames(prompt_id: str) -> list[bytes]:
+        output = {"videos": [{"filename": str(tmp_path / f"{prompt_id}.mp4")}]}
+        return [
+            event("execution_start", prompt_id=prompt_id),
+            event("progress", value=1, max=1, node="3", prompt_id=prompt_id),
+            event("executed", node="4", prompt_id=prompt_id, output=output),
+            event("executing", node=None, prompt_id=prompt_id),
+        ]
+
+    hub = FakeComfyHub(_prompt_frames, release_after=2)
+    client = Mock()
+    client.get_object_info.return_value = {
+        "StableNewLTXAnchorBridge": {
+            "input": {
+                "required": {"start_anchor": ["IMAGE"], "end_anchor": ["IMAGE"]},
+                "optional": {"prompt": ["STRING", {"default": "", "multiline": True}]},
+            }
+        },
+        "StableNewSaveVideo": {
+            "input": {"required": {"images": ["IMAGE"], "output_dir": ["STRING", {"default": ""}]}}
+        },
+        "LoadImage": {"input": {"required": {"image": [["start.png", "end.png"], {"image_upload": True}]}}},
+        "models": {"checkpoints": ["ltx_video.safetensors"]},
+    }
+    client.upload_image.side_effect = lambda path: {"name": Path(path).name, "subfolder": "", "type": "input"}
+    client.queue_prompt.side_effect = hub.queue_prompt
+    client.get_history.return_value = {}
+    client.open_execution_stream.side_effect = (
+        lambda client_id: ComfyApiClient(base_url=hub.base_url).open_execution_stream(client_id)
+    )
+    monkeypatch.setattr("src.video.comfy_workflow_backend.wait_for_comfy_ready", lambda *_a, **_k: True)
+    monkeypatch.setattr("src.video.comfy_workflow_backend.write_video_container_metadata", lambda *_a, **_k: True)
+    backend = ComfyWorkflowVideoBackend(
+        client=client,
+        process_manager=_ready_process_manager(),
+        history_poll_interval=0.01,
+        history_timeout=5.0,
+    )
+
+    results: dict[int, object] = {}
+    errors: list[BaseException] = []
+
+    def _run_segment(index: int) -> None:
+        try:
+            results[index] = backend.execute_segment(
+                pipeline=Mock(),
+                request=VideoExecutionRequest(
+                    backend_id="comfy",
+                    stage_name="video_workflow",
+                    stage_config={"workflow_id": "ltx_multiframe_anchor_v1", "workflow_version": "1.0.0"},
+                    output_dir=tmp_path / f"seg{index}",
+                    input_image_path=tmp_path / "start.png",
+                    end_anchor_path=tmp_path / "end.png",
+                    image_name=f"seg{index}",
+                    prompt="a stormy sea",
+                    job_id="job-pipelined",
+                ),
+                segment_index=index,
+                segment_id=f"seg-{index}",
+                carry_forward_policy="none",
+            )
+        except BaseException as exc:  # noqa: BLE001 - surfaced by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_run_segment, args=(index,)) for index in range(2)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=15.0)
+    finally:
+        hub.close()
+
+    assert errors == []
+    assert hub.dropped_client_ids == []
+    assert len(set(hub.client_ids)) == 2
+    assert all(client_id.startswith("job-pipelined-") for client_id in hub.client_ids)
+    assert sorted(Path(result.primary_path).name for result in results.values()) == ["p-1.mp4", "p-2.mp4"]
+    client.get_history.assert_not_called()
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import pytest
 from PIL import Image
 
-from src.video.motion.secondary_motion_engine import apply_secondary_motion_to_frames
+from src.video.motion.secondary_motion_engine import (
+    _compute_offsets,
+    _compute_offsets_batch,
+    _derive_seed,
+    _translate_frame,
+    apply_secondary_motion_to_frames,
+)
 from src.video.motion.secondary_motion_models import SecondaryMotionIntent, SecondaryMotionPolicy
 
 
@@ -82,3 +89,63 @@ def test_secondary_motion_engine_respects_cap_clamps() -> None:
     assert result.status == "applied"
     assert int((result.metrics or {}).get("max_abs_dx", 0)) <= 3
     assert int((result.metrics or {}).get("cap_pixels", 0)) == 3
+
+
+def _sway_policy() -> SecondaryMotionPolicy:
+    return SecondaryMotionPolicy(
+        policy_id="shared_motion_batch_v1",
+        enabled=True,
+        backend_mode="apply_shared_postprocess_candidate",
+        intensity=0.8,
+        damping=0.97,
+        frequency_hz=0.35,
+        cap_pixels=5,
+    )
+
+
+def _noise_frames(count: int, mode: str, size: tuple[int, int] = (24, 16)) -> list[Image.Image]:
+    frames: list[Image.Image] = []
+    for index in range(count):
+        image = Image.effect_noise(size, 64).convert(mode)
+        image.putpixel((index % size[0], 0), (255,) * len(mode) if len(mode) > 1 else 255)
+        frames.append(image)
+    return frames
+
+
+def test_batched_offsets_match_per_frame_offsets() -> None:
+    pytest.importorskip("numpy")
+    policy = _sway_policy()
+
+    dx, dy = _compute_offsets_batch(count=200, seed=4321, policy=policy)
+
+    assert [(int(x), int(y)) for x, y in zip(dx, dy)] == [
+        _compute_offsets(index=index, seed=4321, policy=policy) for index in range(200)
+    ]
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L"])
+def test_batched_engine_matches_per_frame_pil_path_across_chunks(mode: str) -> None:
+    pytest.importorskip("numpy")
+    policy = _sway_policy()
+    frames = _noise_frames(7, mode)
+    seed = _derive_seed(77, policy)
+    expected = [
+        _translate_frame(frame, *_compute_offsets(index=index, seed=seed, policy=policy))
+        for index, frame in enumerate(frames)
+    ]
+
+    output_frames, result = apply_secondary_motion_to_frames(frames, policy=policy, seed=77, chunk_frames=3)
+
+    assert result.status == "applied"
+    assert [frame.mode for frame in output_frames] == [mode] * 7
+    assert [frame.tobytes() for frame in output_frames] == [frame.tobytes() for frame in expected]
+
+
+def test_mixed_size_clip_uses_per_frame_path() -> None:
+    policy = _sway_policy()
+    frames = _noise_frames(2, "RGB") + _noise_frames(1, "RGB", size=(10, 10))
+
+    output_frames, result = apply_secondary_motion_to_frames(frames, policy=policy, seed=5)
+
+    assert [frame.size for frame in output_frames] == [(24, 16), (24, 16), (10, 10)]
+    assert result.frames_out == 3
@@ -1,42 +1,30 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-from src.video.motion.secondary_motion_video_reencode import apply_secondary_motion_to_video
+import pytest
+from PIL import Image
 
+from src.pipeline.video import decode_video_frames, encode_frames_to_video
+from src.video import video_export
+from src.video.motion import secondary_motion_video_reencode
+from src.video.motion.secondary_motion_video_reencode import (
+    VIDEO_REENCODE_APPLICATION_PATH,
+    apply_secondary_motion_to_video,
+)
+from tests.helpers.fake_ffmpeg import write_fake_ffmpeg
 
+
+@pytest.mark.skipif(os.name == "nt", reason="fake ffmpeg relies on a shebang")
 def test_apply_secondary_motion_to_video_promotes_reencoded_artifact(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "bin").mkdir()
+    ffmpeg = write_fake_ffmpeg(tmp_path / "bin")
+    for module in (secondary_motion_video_reencode, video_export):
+        monkeypatch.setattr(module, "resolve_ffmpeg_executable", lambda: str(ffmpeg))
+    frames = [Image.new("RGB", (32, 24), (index * 20, 80, 160)) for index in range(4)]
     source_video = tmp_path / "clip.mp4"
-    source_video.write_bytes(b"mp4")
-    extracted_frame = tmp_path / "extracted_000001.png"
-    motion_frame = tmp_path / "motion_000001.png"
-    extracted_frame.write_bytes(b"png")
-    motion_frame.write_bytes(b"png")
-    promoted_paths: dict[str, object] = {}
-
-    monkeypatch.setattr(
-        "src.video.motion.secondary_motion_video_reencode._extract_video_frames",
-        lambda **_kwargs: [extracted_frame],
-    )
-    monkeypatch.setattr(
-        "src.video.motion.secondary_motion_video_reencode.run_secondary_motion_worker",
-        lambda _payload: {
-            "status": "applied",
-            "policy_id": "workflow_motion_v1",
-            "output_paths": [str(motion_frame)],
-        },
-    )
-
-    def _fake_export(*, image_paths, output_path, fps):
-        promoted_paths["image_paths"] = [str(path) for path in image_paths]
-        promoted_paths["output_path"] = str(output_path)
-        promoted_paths["fps"] = fps
-        output_path.write_bytes(b"mp4")
-
-    monkeypatch.setattr(
-        "src.video.motion.secondary_motion_video_reencode.export_image_sequence_video",
-        _fake_export,
-    )
+    encode_frames_to_video(frames, source_video, fps=12, ffmpeg_executable=ffmpeg)
 
     result = apply_secondary_motion_to_video(
         video_path=source_video,
@@ -52,24 +40,25 @@ def test_apply_secondary_motion_to_video_promotes_reencoded_artifact(tmp_path: P
                 "enabled": True,
                 "policy_id": "workflow_motion_v1",
                 "backend_mode": "apply_shared_postprocess_candidate",
+                "intensity": 0.5,
+                "cap_pixels": 4,
             },
         },
         fps=12,
     )
 
-    assert result["primary_path"] == str(tmp_path / "clip_secondary_motion.mp4")
+    reencoded = tmp_path / "clip_secondary_motion.mp4"
+    assert result["primary_path"] == str(reencoded)
     assert result["source_video_path"] == str(source_video)
+    assert result["frame_paths"] == []
+    assert Path(result["thumbnail_path"]).exists()
     assert result["secondary_motion_summary"]["status"] == "applied"
-    assert result["secondary_motion_summary"]["application_path"] == "video_reencode_worker"
+    assert result["secondary_motion_summary"]["application_path"] == VIDEO_REENCODE_APPLICATION_PATH
     assert result["secondary_motion"]["apply_result"]["source_video_path"] == str(source_video)
-    assert result["secondary_motion"]["apply_result"]["reencoded_video_path"] == str(
-        tmp_path / "clip_secondary_motion.mp4"
-    )
-    assert promoted_paths == {
-        "image_paths": [str(motion_frame)],
-        "output_path": str(tmp_path / "clip_secondary_motion.mp4"),
-        "fps": 12,
-    }
+    assert result["secondary_motion"]["apply_result"]["reencoded_video_path"] == str(reencoded)
+    assert len(decode_video_frames(reencoded, ffmpeg_executable=ffmpeg)) == 4
+    assert [path.name for path in tmp_path.glob("*.png")] == ["clip_secondary_motion_thumbnail.png"]
+    assert not [path for path in tmp_path.rglob("*") if path.is_dir() and path.name != "bin"]
 
 
 def test_apply_secondary_motion_to_video_records_unavailable_when_ffmpeg_missing(
@@ -105,5 +94,5 @@ def test_apply_secondary_motion_to_video_records_unavailable_when_ffmpeg_missing
     assert result["video_path"] == str(source_video)
     assert result["secondary_motion_summary"]["status"] == "unavailable"
     assert result["secondary_motion_summary"]["skip_reason"] == "ffmpeg_unavailable"
-    assert result["secondary_motion_summary"]["application_path"] == "video_reencode_worker"
+    assert result["secondary_motion_summary"]["application_path"] == VIDEO_REENCODE_APPLICATION_PATH
     assert result["secondary_motion"]["apply_result"]["source_video_path"] == str(source_video)
\ No newline at end of file
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.video.svd_errors import SVDPostprocessError
+from src.video.svd_frame_buffer import read_frame_buffer, write_frame_buffer
+from src.video.svd_persistent_worker import PersistentSVDPostprocessWorker
+from src.video.svd_postprocess import SVDPostprocessRunner
+
+# Speaks the --serve protocol without torch: doubles each frame's size.
+_FAKE_SERVE_SCRIPT = """
+import json, sys
+from src.video.svd_frame_buffer import read_frame_buffer, write_frame_buffer
+
+def respond(message):
+    sys.stdout.write(json.dumps(message) + "\\n")
+    sys.stdout.flush()
+
+respond({"ready": True, "pid": 0})
+for line in sys.stdin:
+    request = json.loads(line)
+    if request.get("action") == "shutdown":
+        respond({"id": request.get("id"), "ok": True})
+        break
+    if request["payload"].get("fail"):
+        respond({"id": request["id"], "ok": False, "error": "weights missing"})
+        continue
+    frames = read_frame_buffer(request["input"])
+    resized = [frame.resize((frame.width * 2, frame.height * 2)) for frame in frames]
+    descriptor = write_frame_buffer(resized, request["output_path"])
+    respond({"id": request["id"], "ok": True, "frames": descriptor, "result": {"action": request["action"]}})
+"""
+
+
+def _fake_worker(**kwargs) -> PersistentSVDPostprocessWorker:
+    return PersistentSVDPostprocessWorker(command=[sys.executable, "-c", _FAKE_SERVE_SCRIPT], **kwargs)
+
+
+def _fail_one_shot(*_args, **_kwargs):
+    raise AssertionError("one-shot worker should not run")
+
+
+def test_frame_buffer_round_trips_mixed_sizes_without_png(tmp_path: Path) -> None:
+    frames = [Image.new("RGB", (4, 2), (10, 20, 30)), Image.new("RGBA", (3, 5), (200, 100, 50, 7))]
+
+    descriptor = write_frame_buffer(frames, tmp_path / "frames.rgb")
+    loaded = read_frame_buffer(descriptor)
+
+    assert descriptor["sizes"] == [[4, 2], [3, 5]]
+    assert (tmp_path / "frames.rgb").stat().st_size == (4 * 2 + 3 * 5) * 3
+    assert [frame.size for frame in loaded] == [(4, 2), (3, 5)]
+    assert loaded[1].getpixel((0, 0)) == (200, 100, 50)
+
+
+def test_runner_reuses_one_persistent_worker_across_stages(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("src.video.svd_postprocess.subprocess.run", _fail_one_shot)
+    worker = _fake_worker()
+    runner = SVDPostprocessRunner(worker=worker)
+    try:
+        frames = [Image.new("RGB", (8, 8), "red"), Image.new("RGB", (8, 8), "blue")]
+        restored = runner._run_worker_stage(
+            stage_name="face_restore",
+            action="face_restore",
+            frames=frames,
+            payload={},
+            work_dir=tmp_path,
+        )
+        upscaled, result = runner._run_worker_stage(
+            stage_name="upscale",
+            action="upscale",
+            frames=restored,
+            payload={},
+            work_dir=tmp_path,
+            expect_result=True,
+        )
+        stats = worker.stats()
+    finally:
+        worker.shutdown()
+
+    assert frames == []
+    assert [frame.size for frame in upscaled] == [(32, 32), (32, 32)]
+    assert upscaled[1].getpixel((0, 0)) == (0, 0, 255)
+    assert result == {"action": "upscale"}
+    assert stats["spawns"] == 1
+    assert stats["requests"] == 2
+    assert not list(tmp_path.glob("*.rgb"))
+
+
+def test_worker_reported_error_raises_without_restarting(tmp_path: Path) -> None:
+    worker = _fake_worker()
+    runner = SVDPostprocessRunner(worker=worker)
+    try:
+        with pytest.raises(SVDPostprocessError, match="weights missing"):
+            runner._run_worker_stage(
+                stage_name="upscale",
+                action="upscale",
+                frames=[Image.new("RGB", (8, 8), "red")],
+                payload={"fail": True},
+                work_dir=tmp_path,
+            )
+        processed = runner._run_worker_stage(
+            stage_name="upscale",
+            action="upscale",
+            frames=[Image.new("RGB", (8, 8), "red")],
+            payload={},
+            work_dir=tmp_path,
+        )
+        stats = worker.stats()
+    finally:
+        worker.shutdown()
+
+    assert len(processed) == 1
+    assert stats["spawns"] == 1
+
+
+def test_runner_falls_back_to_one_shot_worker_when_persistent_worker_dies(tmp_path: Path, monkeypatch) -> None:
+    worker = PersistentSVDPostprocessWorker(
+        command=[sys.executable, "-c", "import sys; sys.stderr.write('No module named torch\\n'); sys.exit(1)"]
+    )
+    calls: list[str] = []
+
+    def _fake_run(cmd, cwd, capture_output, text, check):
+        payload = __import__("json").loads(cmd[-1])
+        calls.append(payload["action"])
+        output_dir = Path(payload["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        Image.new("RGB", (8, 8), "green").save(output_dir / "frame_000000.png")
+        return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    monkeypatch.setattr("src.video.svd_postprocess.subprocess.run", _fake_run)
+
+    processed = SVDPostprocessRunner(worker=worker)._run_worker_stage(
+        stage_name="face_restore",
+        action="face_restore",
+        frames=[Image.new("RGB", (8, 8), "white")],
+        payload={},
+        work_dir=tmp_path,
+    )
+
+    assert calls == ["face_restore"]
+    assert processed[0].getpixel((0, 0)) == (0, 128, 0)
+    assert worker.stats()["failures"] == 1
+
+
+def test_persistent_worker_exits_after_idle_timeout(tmp_path: Path) -> None:
+    worker = _fake_worker(idle_shutdown_seconds=0.05)
+    try:
+        worker.run(
+            stage_name="upscale",
+            action="upscale",
+            frames=[Image.new("RGB", (4, 4), "red")],
+            payload={},
+            work_dir=tmp_path,
+        )
+        deadline = time.monotonic() + 5.0
+        while worker.stats()["running"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert worker.stats()["running"] is False
+    finally:
+        worker.shutdown()
+
+
+def test_shutdown_cancels_idle_wait_and_joins_worker_threads(tmp_path: Path) -> None:
+    worker = _fake_worker(idle_shutdown_seconds=60.0)
+    worker.run(
+        stage_name="upscale",
+        action="upscale",
+        frames=[Image.new("RGB", (4, 4), "red")],
+        payload={},
+        work_dir=tmp_path,
+    )
+    threads = [worker._idle_thread, worker._stderr_thread]
+    assert all(thread is not None and not thread.daemon for thread in threads)
+
+    started = time.monotonic()
+    worker.shutdown()
+
+    assert time.monotonic() - started < 5.0
+    assert not any(thread.is_alive() for thread in threads)
+    assert worker.stats()["running"] is False
@@ -92,3 +92,41 @@ def test_run_secondary_motion_routes_through_shared_worker(tmp_path: Path, monke
 
     assert captured["seed"] == 123
     assert result["status"] == "applied"
+
+
+def test_serve_keeps_runtime_warm_across_requests(tmp_path: Path, monkeypatch) -> None:
+    import io
+    import json
+
+    from src.video.svd_frame_buffer import read_frame_buffer, write_frame_buffer
+
+    builds: list[dict] = []
+    monkeypatch.setattr(worker, "_build_realesrgan", lambda payload: builds.append(payload) or "upsampler")
+    monkeypatch.setattr(
+        worker,
+        "_apply_realesrgan",
+        lambda image, *, upsampler, scale: image.resize((int(image.width * scale), int(image.height * scale))),
+    )
+    payload = {"model_path": "RealESRGAN_x2.pth", "scale": 2.0, "tile": 0}
+    requests = []
+    for index in range(2):
+        descriptor = write_frame_buffer([Image.new("RGB", (8, 8), "white")], tmp_path / f"in{index}.rgb")
+        requests.append(
+            {
+                "id": index,
+                "action": "upscale",
+                "payload": payload,
+                "input": descriptor,
+                "output_path": str(tmp_path / f"out{index}.rgb"),
+            }
+        )
+    requests.append({"id": 2, "action": "shutdown"})
+    responses = io.StringIO()
+
+    worker.serve(io.StringIO("".join(json.dumps(item) + "\n" for item in requests)), responses)
+
+    messages = [json.loads(line) for line in responses.getvalue().splitlines()]
+    assert messages[0]["ready"] is True
+    assert [message["ok"] for message in messages[1:]] == [True, True, True]
+    assert len(builds) == 1
+    assert read_frame_buffer(messages[2]["frames"])[0].size == (16, 16)